@@ -1,10 +1,672 @@
-from flask import Flask, render_template
+import os
+import time
+from typing import Optional
+from datetime import datetime, timedelta
+from flask import Flask, Response, g, render_template, jsonify, request, send_file
+from utils.properties_utils import leer_properties, obtener_property
+from utils.snapshot_calendario import LectorSnapshot
+from utils.indice_calendario import IndiceCalendario
+from utils.ligas_fantasy import RegistroLigas
+from utils.metricas import MetricasWeb, EstadisticasCron, CTE_PREFIJO_METRICAS
+from utils.exportacion_calendario import FeedsCalendario, generar_exportacion, CTE_TIPOS_CONTENIDO
+from utils.registro_cambios import RegistroCambios
+from utils.excepciones import ExcepcionSnapshot, ExcepcionResultados, ExcepcionCambios, ExcepcionExportacion
+
+# Constantes para la configuración
+CTE_RUTA_CONFIG = "src/config/"
+CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
+CTE_FORMATO_FECHA_URL = "%d-%m-%Y"
+CTE_NUMERO_PROXIMAS_DEFECTO = 10
+CTE_NUMERO_CLASIFICACION_DEFECTO = 20
+CTE_NUMERO_CLASIFICACION_MAXIMO = 200
+CTE_NUMERO_VECINOS_DEFECTO = 5
+CTE_NUMERO_VECINOS_MAXIMO = 50
+CTE_RUTA_SIN_REGLA = "<sin_ruta>"
+CTE_TIPO_CONTENIDO_METRICAS = "text/plain; version=0.0.4; charset=utf-8"
 
 app = Flask(__name__)
+_lector_snapshot = None
+_indice_calendario = (None, None)
+_cuerpo_calendario = (None, None)
+_registro_ligas = None
+_estadisticas_cron = None
+_feeds_calendario = None
+_registro_cambios = None
+_limite_cambios = None
+_metricas_web = None
+
+
+def obtener_lector_snapshot() -> LectorSnapshot:
+
+    """
+    Devuelve el lector del snapshot del calendario, creándolo en el primer uso.
+
+    Cada worker proyecta el mismo fichero con mmap, por lo que todos comparten
+    la misma copia del calendario en la caché de páginas del sistema.
+
+    Parámetros:
+        None
+
+    Salida:
+        LectorSnapshot: Lector del snapshot publicado por el cron.
+    """
+
+    global _lector_snapshot
+
+    if _lector_snapshot is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        ruta_snapshot = obtener_property(propiedades, 'snapshot', 'ruta')
+        intervalo = float(obtener_property(propiedades, 'snapshot', 'intervalo_comprobacion_segundos', default=1))
+        _lector_snapshot = LectorSnapshot(ruta_snapshot, intervalo)
+
+    return _lector_snapshot
+
+
+def obtener_indice_calendario() -> IndiceCalendario:
+
+    """
+    Devuelve el índice de fechas del calendario, reconstruyéndolo solo cuando cambia el snapshot.
+
+    Parámetros:
+        None
+
+    Salida:
+        IndiceCalendario: Índice construido sobre el snapshot vigente.
+    """
+
+    global _indice_calendario
+
+    lector = obtener_lector_snapshot()
+    identidad = lector.obtener_identidad()
+
+    acierto = _indice_calendario[0] == identidad
+
+    if not acierto:
+        _indice_calendario = (identidad, lector.crear_indice_calendario())
+
+    obtener_metricas_web().registrar_cache("indice_calendario", acierto)
+
+    return _indice_calendario[1]
+
+
+def obtener_cuerpo_calendario() -> bytes:
+
+    """
+    Devuelve el calendario completo serializado a JSON, regenerándolo solo cuando cambia el snapshot.
+
+    Parámetros:
+        None
+
+    Salida:
+        bytes: Cuerpo de la respuesta de /calendario.
+    """
+
+    global _cuerpo_calendario
+
+    lector = obtener_lector_snapshot()
+    identidad = lector.obtener_identidad()
+
+    acierto = _cuerpo_calendario[0] == identidad
+
+    if not acierto:
+        _cuerpo_calendario = (identidad, app.json.response(lector.obtener_grupos_desglosados()).get_data())
+
+    obtener_metricas_web().registrar_cache("cuerpo_calendario", acierto)
+
+    return _cuerpo_calendario[1]
+
+
+def obtener_registro_ligas() -> RegistroLigas:
+
+    """
+    Devuelve el registro de ligas de fantasy, creándolo en el primer uso.
+
+    Parámetros:
+        None
+
+    Salida:
+        RegistroLigas: Ligas con su clasificación incremental.
+
+    Lanza:
+        ExcepcionResultados: Si el fichero de ligas existe pero no se puede leer (sin fichero no hay ligas).
+    """
+
+    global _registro_ligas
+
+    if _registro_ligas is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        _registro_ligas = RegistroLigas(obtener_property(propiedades, 'ligas', 'ruta'),
+                                        obtener_property(propiedades, 'resultados', 'directorio'),
+                                        obtener_metricas_web())
+
+    return _registro_ligas
+
+
+def obtener_estadisticas_cron() -> EstadisticasCron:
+
+    """
+    Devuelve las estadísticas que publica el cron tras cada actualización, creándolas en el primer uso.
+
+    Parámetros:
+        None
+
+    Salida:
+        EstadisticasCron: Lector de las estadísticas del cron.
+    """
+
+    global _estadisticas_cron
+
+    if _estadisticas_cron is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        _estadisticas_cron = EstadisticasCron(obtener_property(propiedades, 'metricas', 'ruta_estadisticas_cron'))
+
+    return _estadisticas_cron
+
+
+def obtener_metricas_web() -> MetricasWeb:
+
+    """
+    Devuelve las métricas de la aplicación web, creándolas en el primer uso. Con la clave
+    'directorio_web' de la sección 'metricas', las métricas se agregan entre todos los workers.
+
+    Parámetros:
+        None
+
+    Salida:
+        MetricasWeb: Métricas de la aplicación web.
+    """
+
+    global _metricas_web
+
+    if _metricas_web is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        _metricas_web = MetricasWeb(directorio=obtener_property(propiedades, 'metricas', 'directorio_web'))
+
+    return _metricas_web
+
+
+def obtener_feeds_calendario() -> FeedsCalendario:
+
+    """
+    Devuelve los feeds de exportación pre-generados por el cron, creándolos en el primer uso.
+
+    Parámetros:
+        None
+
+    Salida:
+        FeedsCalendario: Feeds por temporada y género.
+    """
+
+    global _feeds_calendario
+
+    if _feeds_calendario is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        _feeds_calendario = FeedsCalendario(obtener_property(propiedades, 'exportacion', 'directorio_feeds'),
+                                            obtener_property(propiedades, 'fechas', 'formato_generico'))
+
+    return _feeds_calendario
+
+
+def obtener_registro_cambios() -> RegistroCambios:
+
+    """
+    Devuelve el registro de cambios del calendario que escribe el cron, creándolo en el primer uso.
+
+    Parámetros:
+        None
+
+    Salida:
+        RegistroCambios: Registro de cambios (de solo lectura para la aplicación).
+    """
+
+    global _registro_cambios, _limite_cambios
+
+    if _registro_cambios is None:
+        propiedades = leer_properties(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        _limite_cambios = int(obtener_property(propiedades, 'cambios', 'limite_por_peticion'))
+        _registro_cambios = RegistroCambios(obtener_property(propiedades, 'cambios', 'directorio'))
+
+    return _registro_cambios
+
+
+def _leer_parametro_entero(nombre: str, defecto: Optional[int] = None, minimo: int = 0,
+                          maximo: Optional[int] = None) -> int:
+
+    """
+    Lee un parámetro entero de la URL: por debajo del mínimo es un error y por encima del máximo
+    se recorta al máximo.
+
+    Parámetros:
+        nombre (str): Nombre del parámetro.
+        defecto (int, optional): Valor si no se indica. Default es None (parámetro obligatorio).
+        minimo (int, optional): Valor mínimo admitido. Default es 0.
+        maximo (int, optional): Valor máximo devuelto. Default es sin máximo.
+
+    Salida:
+        int: Valor del parámetro.
+
+    Lanza:
+        ValueError: Si falta un parámetro obligatorio, no es un entero o es menor que el mínimo
+                    (el mensaje es el que se devuelve al cliente con un 400).
+    """
+
+    texto = request.args.get(nombre)
+    rango = f"mayor o igual que {minimo}" + (f" (máximo {maximo})" if maximo is not None else "")
+
+    if texto is None:
+        if defecto is None:
+            raise ValueError(f"Falta el parámetro '{nombre}' (entero {rango})")
+
+        return defecto
+
+    try:
+        valor = int(texto)
+
+    except ValueError:
+        raise ValueError(f"'{nombre}' debe ser un entero {rango}") from None
+
+    if valor < minimo:
+        raise ValueError(f"'{nombre}' debe ser un entero {rango}")
+
+    return valor if maximo is None else min(valor, maximo)
+
+
+@app.before_request
+def iniciar_medicion():
+
+    """
+    Guarda el instante de inicio de la petición para medir su latencia.
+
+    Parámetros:
+        None
+
+    Salida:
+        None
+    """
+
+    g.inicio_peticion = time.perf_counter()
+
+
+@app.after_request
+def registrar_peticion(respuesta):
+
+    """
+    Registra en las métricas una petición que ha generado respuesta.
+
+    Parámetros:
+        respuesta (Response): Respuesta de la petición.
+
+    Salida:
+        Response: La misma respuesta, sin modificar.
+    """
+
+    _registrar_peticion(respuesta.status_code)
+    return respuesta
+
+
+@app.teardown_request
+def registrar_peticion_fallida(excepcion):
+
+    """
+    Registra como error 500 una petición terminada por una excepción no controlada.
+
+    Parámetros:
+        excepcion (Exception): Excepción que ha terminado la petición (None si no la hubo).
+
+    Salida:
+        None
+    """
+
+    # Las excepciones no controladas no pasan por after_request
+    if excepcion is not None:
+        _registrar_peticion(500)
+
+
+def _registrar_peticion(estado: int) -> None:
+
+    """
+    Registra la petición en curso con su regla de ruta, método, código de estado y latencia. Solo
+    registra una vez cada petición: el instante de inicio se consume al registrarla.
+
+    Parámetros:
+        estado (int): Código de estado HTTP de la respuesta.
+
+    Salida:
+        None
+    """
+
+    if 'inicio_peticion' in g:
+        ruta = request.url_rule.rule if request.url_rule is not None else CTE_RUTA_SIN_REGLA
+        obtener_metricas_web().registrar_peticion(ruta, request.method, estado, time.perf_counter() - g.pop('inicio_peticion'))
+
 
 @app.route('/')
 def saludo():
     return render_template('index.html', nombre='Jose Eloy')
 
+
+@app.route('/calendario')
+def calendario():
+    try:
+        return Response(obtener_cuerpo_calendario(), mimetype=app.json.mimetype)
+
+    except ExcepcionSnapshot as es:
+        return jsonify({'error': str(es)}), 503
+
+
+@app.route('/calendario/dia/<fecha>')
+def calendario_dia(fecha):
+
+    """
+    Devuelve las competiciones que se disputan en algún momento del día indicado.
+
+    Parámetros:
+        fecha (str): Día en formato dd-mm-aaaa.
+
+    Salida:
+        Response: Lista JSON de competiciones ordenadas por inicio (400 si la fecha es inválida, 503 sin snapshot).
+    """
+
+    try:
+        dia = datetime.strptime(fecha, CTE_FORMATO_FECHA_URL)
+        return jsonify(obtener_indice_calendario().competiciones_en_dia(dia))
+
+    except ValueError:
+        return jsonify({'error': f"Fecha inválida '{fecha}', se espera el formato dd-mm-aaaa"}), 400
+
+    except ExcepcionSnapshot as es:
+        return jsonify({'error': str(es)}), 503
+
+
+@app.route('/calendario/rango')
+def calendario_rango():
+
+    """
+    Devuelve las competiciones que se solapan con el rango de días de los parámetros 'desde' y
+    'hasta' (dd-mm-aaaa), ambos incluidos.
+
+    Parámetros:
+        None
+
+    Salida:
+        Response: Lista JSON de competiciones ordenadas por inicio (400 si falta una fecha, es inválida o
+                  'hasta' es anterior a 'desde'; 503 sin snapshot).
+    """
+
+    try:
+        desde = datetime.strptime(request.args.get('desde', ''), CTE_FORMATO_FECHA_URL)
+        hasta = datetime.strptime(request.args.get('hasta', ''), CTE_FORMATO_FECHA_URL)
+
+    except ValueError:
+        return jsonify({'error': "Parámetros 'desde' y 'hasta' obligatorios con el formato dd-mm-aaaa"}), 400
+
+    if hasta < desde:
+        return jsonify({'error': "'hasta' no puede ser anterior a 'desde'"}), 400
+
+    try:
+        # 'hasta' incluye el día completo
+        return jsonify(obtener_indice_calendario().competiciones_en_rango(desde, hasta + timedelta(days=1, seconds=-1)))
+
+    except ExcepcionSnapshot as es:
+        return jsonify({'error': str(es)}), 503
+
+
+@app.route('/calendario/proximas')
+def calendario_proximas():
+
+    """
+    Devuelve las siguientes competiciones que empiezan a partir de ahora. El parámetro 'n' indica
+    cuántas (CTE_NUMERO_PROXIMAS_DEFECTO si falta o no es un entero; ninguna si es negativo).
+
+    Parámetros:
+        None
+
+    Salida:
+        Response: Lista JSON de hasta 'n' competiciones ordenadas por inicio (503 sin snapshot).
+    """
+
+    try:
+        numero = request.args.get('n', CTE_NUMERO_PROXIMAS_DEFECTO, type=int)
+        return jsonify(obtener_indice_calendario().proximas_competiciones(datetime.now(), numero))
+
+    except ExcepcionSnapshot as es:
+        return jsonify({'error': str(es)}), 503
+
+
+@app.route('/calendario/exportar.<formato>')
+def calendario_exportar(formato):
+
+    """
+    Exporta el calendario del snapshot en iCalendar, CSV o JSON Lines, generándolo por trozos mientras
+    se envía. Admite los filtros 'temporada' y 'genero'.
+
+    Parámetros:
+        formato (str): Formato de la exportación (extensión de la URL).
+
+    Salida:
+        Response: Documento exportado como adjunto (404 si el formato no existe, 503 sin snapshot).
+    """
+
+    if formato not in CTE_TIPOS_CONTENIDO:
+        return jsonify({'error': f"Formato '{formato}' no soportado"}), 404
+
+    try:
+        lector = obtener_lector_snapshot()
+        grupos = lector.obtener_grupos_desglosados()
+        formato_fecha = lector.obtener_formato_fecha()
+        generado = lector.obtener_fecha_generacion()
+
+    except ExcepcionSnapshot as es:
+        return jsonify({'error': str(es)}), 503
+
+    # Se genera por trozos mientras se envía: la exportación completa nunca está en memoria
+    trozos = generar_exportacion(grupos, formato, formato_fecha, request.args.get('temporada', type=int),
+                                 request.args.get('genero'), generado)
+
+    return Response(trozos, content_type=CTE_TIPOS_CONTENIDO[formato],
+                    headers={'Content-Disposition': f'attachment; filename="calendario.{formato}"'})
+
+
+@app.route('/calendario/feeds')
+def calendario_feeds():
+
+    """
+    Lista los feeds pre-generados por el cron.
+
+    Parámetros:
+        None
+
+    Salida:
+        Response: JSON con los nombres de los feeds ('<temporada>_<genero>'), 503 si el índice está dañado.
+    """
+
+    try:
+        return jsonify(sorted(obtener_feeds_calendario().leer_indice()))
+
+    except ExcepcionExportacion as ee:
+        return jsonify({'error': str(ee)}), 503
+
+
+@app.route('/calendario/feeds/<nombre>.<formato>')
+def calendario_feed(nombre, formato):
+
+    """
+    Sirve un feed pre-generado tal cual, con ETag y Last-Modified para las peticiones condicionales.
+
+    Parámetros:
+        nombre (str): Nombre del feed ('<temporada>_<genero>').
+        formato (str): Formato del feed.
+
+    Salida:
+        Response: Fichero del feed (404 si no existe, 503 si el índice está dañado).
+    """
+
+    try:
+        ruta = obtener_feeds_calendario().obtener_ruta_feed(nombre, formato)
+
+        if ruta is None:
+            return jsonify({'error': f"Feed '{nombre}.{formato}' no encontrado"}), 404
+
+        # Fichero pre-generado por el cron: se sirve tal cual, con ETag y Last-Modified para las peticiones condicionales
+        return send_file(os.path.abspath(ruta), mimetype=CTE_TIPOS_CONTENIDO[formato].split(";")[0], conditional=True)
+
+    except ExcepcionExportacion as ee:
+        return jsonify({'error': str(ee)}), 503
+
+    except FileNotFoundError:
+        # El cron lo ha eliminado entre la consulta del índice y el envío
+        return jsonify({'error': f"Feed '{nombre}.{formato}' no encontrado"}), 404
+
+
+@app.route('/calendario/cambios')
+def calendario_cambios():
+
+    """
+    Devuelve los cambios del calendario posteriores a 'cursor', como mucho 'limite' (por defecto y
+    como máximo, el 'limite_por_peticion' configurado; uno mayor se recorta).
+
+    Un cursor ausente, o un cursor o límite no entero o por debajo de su mínimo (0 y 1), es un error
+    del cliente (400); un cursor posterior a la última secuencia indica que el registro se ha
+    reiniciado (410) y el consumidor debe volver a sincronizar desde 0. Un error al leer el
+    registro devuelve 503.
+
+    Parámetros:
+        None
+
+    Salida:
+        Response: JSON con 'cambios', 'cursor' (para la siguiente petición), 'ultima_secuencia' y 'hay_mas'.
+    """
+
+    registro = obtener_registro_cambios()
+
+    try:
+        cursor = _leer_parametro_entero('cursor')
+        limite = _leer_parametro_entero('limite', _limite_cambios, 1, _limite_cambios)
+
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+    try:
+        cambios, ultima_secuencia = registro.leer_desde(cursor, limite)
+
+    except ExcepcionCambios as ec:
+        if cursor <= registro.ultima_secuencia():
+            return jsonify({'error': str(ec)}), 503
+
+        # Cursor de otro registro (p. ej. reiniciado): el consumidor debe volver a sincronizar desde 0
+        return jsonify({'error': str(ec), 'ultima_secuencia': registro.ultima_secuencia()}), 410
+
+    siguiente = cambios[-1]['secuencia'] if cambios else cursor
+
+    return jsonify({'cambios': cambios, 'cursor': siguiente, 'ultima_secuencia': ultima_secuencia,
+                    'hay_mas': siguiente < ultima_secuencia})
+
+
+@app.route('/ligas/<liga>/clasificacion')
+def liga_clasificacion(liga):
+
+    """
+    Devuelve los 'n' primeros equipos de una liga (entre 1 y CTE_NUMERO_CLASIFICACION_MAXIMO; uno
+    mayor se recorta).
+
+    Parámetros:
+        liga (str): Identificador de la liga.
+
+    Salida:
+        Response: JSON con la liga, su número de equipos y la clasificación (400 si 'n' no es válido,
+                  404 si la liga no existe).
+    """
+
+    try:
+        numero = _leer_parametro_entero('n', CTE_NUMERO_CLASIFICACION_DEFECTO, 1, CTE_NUMERO_CLASIFICACION_MAXIMO)
+
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+    try:
+        liga_fantasy = obtener_registro_ligas().obtener_liga(liga)
+
+        if liga_fantasy is None:
+            return jsonify({'error': f"Liga '{liga}' no encontrada"}), 404
+
+        return jsonify({'liga': liga,
+                        'equipos': len(liga_fantasy.clasificacion),
+                        'clasificacion': liga_fantasy.clasificacion.obtener_top(numero)})
+
+    except ExcepcionResultados as er:
+        return jsonify({'error': str(er)}), 503
+
+
+@app.route('/ligas/<liga>/equipos/<equipo>')
+def liga_equipo(liga, equipo):
+
+    """
+    Devuelve la posición y los puntos de un equipo junto a sus 'vecinos' equipos anteriores y
+    posteriores (entre 1 y CTE_NUMERO_VECINOS_MAXIMO; uno mayor se recorta).
+
+    Parámetros:
+        liga (str): Identificador de la liga.
+        equipo (str): Nombre del equipo.
+
+    Salida:
+        Response: JSON con el equipo, su posición, sus puntos y sus vecinos (400 si 'vecinos' no es
+                  válido, 404 si la liga o el equipo no existen).
+    """
+
+    try:
+        numero = _leer_parametro_entero('vecinos', CTE_NUMERO_VECINOS_DEFECTO, 1, CTE_NUMERO_VECINOS_MAXIMO)
+
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+
+    try:
+        liga_fantasy = obtener_registro_ligas().obtener_liga(liga)
+
+        if liga_fantasy is None or equipo not in liga_fantasy.clasificacion:
+            return jsonify({'error': f"Equipo '{equipo}' no encontrado en la liga '{liga}'"}), 404
+
+        return jsonify({'equipo': equipo,
+                        'posicion': liga_fantasy.clasificacion.obtener_posicion(equipo),
+                        'puntos': liga_fantasy.clasificacion.obtener_puntos(equipo),
+                        'vecinos': liga_fantasy.clasificacion.obtener_vecinos(equipo, numero)})
+
+    except ExcepcionResultados as er:
+        return jsonify({'error': str(er)}), 503
+
+
+@app.route('/metrics')
+def metricas():
+
+    """
+    Expone las métricas en el formato de texto de Prometheus: peticiones, latencias y cachés de la
+    aplicación web (de todos los workers si hay directorio de métricas compartido), estado del
+    snapshot servido y estadísticas de la última actualización del cron.
+
+    Parámetros:
+        None
+
+    Salida:
+        Response: Texto de la exposición.
+    """
+
+    lineas = obtener_metricas_web().exportar()
+    ahora = time.time()
+
+    try:
+        lector = obtener_lector_snapshot()
+        lineas += [f"# HELP {CTE_PREFIJO_METRICAS}_snapshot_edad_segundos Segundos desde la publicación del snapshot servido.",
+                   f"# TYPE {CTE_PREFIJO_METRICAS}_snapshot_edad_segundos gauge",
+                   f"{CTE_PREFIJO_METRICAS}_snapshot_edad_segundos {ahora - lector.obtener_fecha_generacion():.3f}",
+                   f"# TYPE {CTE_PREFIJO_METRICAS}_snapshot_competiciones gauge",
+                   f"{CTE_PREFIJO_METRICAS}_snapshot_competiciones {lector.obtener_numero_competiciones()}"]
+
+    except ExcepcionSnapshot:
+        lineas += [f"# TYPE {CTE_PREFIJO_METRICAS}_snapshot_disponible gauge", f"{CTE_PREFIJO_METRICAS}_snapshot_disponible 0"]
+
+    lineas += obtener_estadisticas_cron().exportar(ahora)
+
+    return Response("\n".join(lineas) + "\n", content_type=CTE_TIPO_CONTENIDO_METRICAS)
+
+
 if __name__ == '__main__':
     app.run(debug=True)
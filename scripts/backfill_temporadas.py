@@ -0,0 +1,237 @@
+# scripts/backfill_temporadas.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+from scripts.subprocesos.scrapping_base import ScrappingBase
+from scripts.subprocesos.scrapping_desglosar_grupos_competiciones import DesglosarGruposCompeticiones
+from scripts.subprocesos.scrapping_obtener_grupos_competiciones import ObtenerGruposCompeticiones
+from utils.archivo_temporadas import ArchivoTemporadas
+from utils.config import Config
+from utils.excepciones import ManejoExcepciones, ExcepcionConfig
+from utils import string_utils
+
+# Temporadas que se desglosan a la vez si no se configura otro valor
+CTE_TEMPORADAS_PARALELAS_DEFECTO = 4
+
+
+def parsear_rango_temporadas(texto: str) -> Tuple[int, int]:
+
+    """
+    Convierte un rango de temporadas de la línea de comandos en sus años inicial y final.
+
+    Ejemplo:
+        '2015-2024' se convierte en (2015, 2024) y '2019' en (2019, 2019).
+
+    Parámetros:
+        texto (str): Rango 'aaaa-aaaa' o una única temporada 'aaaa'.
+
+    Salida:
+        tuple[int, int]: Primera y última temporada (incluidas).
+
+    Lanza:
+        ValueError: Si el texto no es un rango de años válido.
+    """
+
+    partes = texto.split("-")
+
+    if len(partes) > 2 or not all(parte.strip().isdigit() and len(parte.strip()) == 4 for parte in partes):
+        raise ValueError(f"Rango de temporadas inválido '{texto}', se espera el formato aaaa-aaaa")
+
+    desde, hasta = int(partes[0]), int(partes[-1])
+
+    if desde > hasta:
+        raise ValueError(f"Rango de temporadas inválido '{texto}': la primera temporada es posterior a la última")
+
+    return desde, hasta
+
+
+def tipo_rango_temporadas(texto: str) -> Tuple[int, int]:
+
+    """
+    Tipo argparse de las opciones --temporadas: convierte el rango con parsear_rango_temporadas y
+    traduce su error al que argparse muestra como uso incorrecto.
+
+    Parámetros:
+        texto (str): Rango 'aaaa-aaaa' o una única temporada 'aaaa'.
+
+    Salida:
+        tuple[int, int]: Primera y última temporada (incluidas).
+
+    Lanza:
+        argparse.ArgumentTypeError: Si el texto no es un rango de años válido.
+    """
+
+    import argparse
+
+    try:
+        return parsear_rango_temporadas(texto)
+
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+class BackfillTemporadas:
+
+    """
+    Carga en el archivo histórico las temporadas pasadas del calendario.
+
+    La portada de Velogames solo enlaza los grupos de la temporada actual, pero cada grupo
+    mantiene las temporadas anteriores en la misma URL con otro año (ej. /italy/2019/). Se
+    obtienen los grupos de la portada una vez y, para cada temporada del rango, se desglosan
+    sus grupos con el año de la temporada (las fechas de inicio de las vueltas se publican sin
+    año). Las temporadas se desglosan en paralelo en hilos que comparten la sesión HTTP, la caché
+    de codificaciones por host y el límite de peticiones por segundo de ScrappingBase, y cada
+    temporada se escribe en el archivo en cuanto termina.
+
+    Los grupos que no existen en una temporada (o fallan) quedan fuera de ella y se informan en
+    el resumen; el resto de la temporada se archiva igualmente.
+
+    Atributos:
+        config (Config): Configuración del proceso.
+        logger (logging.Logger): Logger del proceso.
+        anyo_desde (int): Primera temporada del rango.
+        anyo_hasta (int): Última temporada del rango (incluida).
+    """
+
+    def __init__(self, config: Config, anyo_desde: int, anyo_hasta: int) -> None:
+
+        """
+        Inicializa el backfill leyendo la sección [backfill] de la configuración general.
+
+        Parámetros:
+            config (Config): Configuración del proceso.
+            anyo_desde (int): Primera temporada del rango.
+            anyo_hasta (int): Última temporada del rango (incluida).
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionConfig: Si falta o es inválida la configuración necesaria.
+        """
+
+        self.config = config
+        self.logger = config.obtener_logger()
+        self.anyo_desde = anyo_desde
+        self.anyo_hasta = anyo_hasta
+        self._bloqueo_archivo = threading.Lock()
+
+        try:
+            config_general = config.obtener_fichero_config_general()
+            self._formato_fecha = config_general["fechas.formato_generico"]
+            self._archivo = ArchivoTemporadas(config_general["archivo.directorio"])
+            self._temporadas_paralelas = max(1, int(config_general.get("backfill.temporadas_paralelas",
+                                                                       CTE_TEMPORADAS_PARALELAS_DEFECTO)))
+
+        except (KeyError, ValueError) as e:
+            raise ExcepcionConfig("Falta o es inválida la configuración de la sección [backfill]") from e
+
+
+    def ejecutar(self) -> Dict[int, dict]:
+
+        """
+        Desglosa y archiva todas las temporadas del rango.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Temporada -> resumen con 'grupos', 'competiciones' y 'grupos_fallidos' (URLs),
+                  o con 'error' si la temporada no se pudo desglosar ni archivar.
+
+        Lanza:
+            ExcepcionScrapping: Si no se pueden obtener los grupos de la portada.
+        """
+
+        self.logger.info(f"Iniciado backfill de las temporadas {self.anyo_desde}-{self.anyo_hasta}")
+        grupos_actuales = ObtenerGruposCompeticiones().ejecutar()
+        resumen = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._temporadas_paralelas, thread_name_prefix="backfill") as ejecutor:
+                futuros = {ejecutor.submit(self._procesar_temporada, anyo, self._obtener_grupos_temporada(grupos_actuales, anyo)): anyo
+                           for anyo in range(self.anyo_desde, self.anyo_hasta + 1)}
+
+                for futuro in as_completed(futuros):
+                    anyo = futuros[futuro]
+
+                    try:
+                        resumen[anyo] = futuro.result()
+
+                    except Exception as e:
+                        self.logger.error(f"No se pudo completar la temporada {anyo}:\n"
+                                          f"{ManejoExcepciones.formatear_trazas_excepciones(e)}")
+                        resumen[anyo] = {'error': str(e)}
+
+        finally:
+            ScrappingBase.cerrar_sesion_http()
+
+        completas = [anyo for anyo, datos in resumen.items() if 'error' not in datos and not datos['grupos_fallidos']]
+        self.logger.info(f"Finalizado backfill: {len(completas)} de {len(resumen)} temporadas completas")
+
+        return dict(sorted(resumen.items()))
+
+
+    def _obtener_grupos_temporada(self, grupos_actuales: List[dict], anyo: int) -> List[dict]:
+
+        """
+        Construye los grupos de una temporada a partir de los de la temporada actual cambiando el año de su URL.
+
+        Parámetros:
+            grupos_actuales (list[dict]): Grupos obtenidos de la portada.
+            anyo (int): Temporada.
+
+        Salida:
+            list[dict]: Grupos de la temporada (sin los que no tienen año en la URL).
+        """
+
+        grupos_temporada = []
+
+        for grupo in grupos_actuales:
+            url = string_utils.sustituir_anyo_url(grupo['url'], anyo)
+
+            if url is None:
+                self.logger.warning(f"El grupo '{grupo.get('nombre')}' no tiene año en su URL '{grupo['url']}', se omite")
+                continue
+
+            grupos_temporada.append({**grupo, 'url': url})
+
+        return grupos_temporada
+
+
+    def _procesar_temporada(self, anyo: int, grupos_temporada: List[dict]) -> dict:
+
+        """
+        Desglosa los grupos de una temporada y la escribe en el archivo.
+
+        Parámetros:
+            anyo (int): Temporada.
+            grupos_temporada (list[dict]): Grupos de la temporada.
+
+        Salida:
+            dict: Resumen de la temporada.
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre algún error al inicializar el desglose.
+            ExcepcionArchivo: Si ocurre algún error al escribir el archivo.
+        """
+
+        desglose = DesglosarGruposCompeticiones(grupos_temporada, anyo_temporada=anyo)
+        grupos_desglosados = list(desglose.ejecutar())
+        grupos_fallidos = [grupo['url'] for grupo in desglose.grupos_fallidos]
+
+        if grupos_fallidos:
+            self.logger.warning(f"Temporada {anyo}: {len(grupos_fallidos)} grupos sin desglosar: {grupos_fallidos}")
+
+        if grupos_desglosados:
+            with self._bloqueo_archivo:
+                temporadas = self._archivo.guardar_calendario(grupos_desglosados, self._formato_fecha)
+
+            self.logger.info(f"Temporada {anyo} archivada ({len(grupos_desglosados)} grupos, temporadas {temporadas})")
+
+        return {
+            'grupos': len(grupos_desglosados),
+            'competiciones': sum(len(grupo.get('desglose_grupo_competiciones') or []) for grupo in grupos_desglosados),
+            'grupos_fallidos': grupos_fallidos
+        }
@@ -0,0 +1,283 @@
+# scripts/benchmark_parseo.py
+
+import logging
+import math
+import time
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING
+from scripts.subprocesos.extractor_fragmento_html import ExtractorFragmentoHtml
+from scripts.subprocesos.scrapping_base import ScrappingBase
+from scripts.subprocesos.scrapping_desglosar_grupos_competiciones import DesglosarGruposCompeticiones
+from scripts.subprocesos.scrapping_obtener_grupos_competiciones import ObtenerGruposCompeticiones
+from utils.config import Config
+from utils.excepciones import ManejoExcepciones
+from utils.generador_html_velogames import GeneradorHtmlVelogames
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Constantes para la configuración
+CTE_RUTA_CONFIG = "src/config/"
+CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
+
+# Los subprocesos de scrapping leen la configuración del proceso de actualización del calendario
+CTE_PROCESO_CALENDARIO = "cron_actualizar_calendario"
+
+CTE_TAMANYOS_DEFECTO = "10,100,1000,5000"
+CTE_REPETICIONES_DEFECTO = 3
+
+# Exponente de escalado (log t2/t1 / log n2/n1) a partir del cual se marca un caso como superlineal
+CTE_EXPONENTE_SUPERLINEAL = 1.2
+
+# Tamaño mínimo a partir del cual se evalúa el exponente (con pocos elementos domina el coste fijo)
+CTE_TAMANYO_MINIMO_EXPONENTE = 100
+
+
+class BenchmarkParseo:
+
+    """
+    Mide cómo escala el parseo de las páginas de Velogames con el número de elementos, usando
+    páginas sintéticas de GeneradorHtmlVelogames del tamaño indicado.
+
+    Por cada caso y tamaño se mide por separado la construcción del árbol (parseo) y la extracción
+    con los métodos de los subprocesos de scrapping, sin red:
+        - portada: _encontrar_encabezado_todas_competiciones y _extraer_grupos_competiciones (n grupos).
+        - grupo_vueltas: tipo de grupo, excepción de clásicas femeninas y datos de cada vuelta,
+          la parte de _extraer_info_vueltas que no descarga páginas (n vueltas).
+        - etapas: _obtener_numero_etapas sobre la página completa (n etapas).
+        - etapas_incremental: igual, sobre el fragmento de la tabla que extrae la lectura incremental.
+        - clasicas: _extraer_clasicas, la parte de _extraer_info_clasicas que no descarga (n clásicas).
+    De cada medida se toma el mínimo de las repeticiones. El log de los subprocesos se silencia
+    durante las mediciones para no medir su escritura.
+
+    Atributos:
+        tamanyos (list[int]): Tamaños de página a medir, en orden creciente.
+        repeticiones (int): Repeticiones de cada medida.
+    """
+
+    def __init__(self, tamanyos: List[int], repeticiones: int = CTE_REPETICIONES_DEFECTO, semilla: int = 0) -> None:
+
+        """
+        Inicializa el benchmark creando las instancias de los subprocesos (no hacen peticiones al crearse).
+
+        Parámetros:
+            tamanyos (list[int]): Tamaños de página a medir.
+            repeticiones (int, optional): Repeticiones de cada medida. Default es CTE_REPETICIONES_DEFECTO.
+            semilla (int, optional): Semilla del generador de páginas. Default es 0.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si la configuración de los subprocesos no es válida.
+        """
+
+        self.tamanyos = sorted(set(tamanyos))
+        self.repeticiones = max(1, repeticiones)
+        self._generador = GeneradorHtmlVelogames(semilla)
+        self._grupos = ObtenerGruposCompeticiones()
+        self._desglose = DesglosarGruposCompeticiones([])
+
+
+    def ejecutar(self) -> Dict[str, List[dict]]:
+
+        """
+        Mide todos los casos con todos los tamaños.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Caso -> lista (por tamaño) de {'tamanyo', 'bytes', 'parseo_s', 'extraccion_s', 'elementos', 'exponente'}.
+        """
+
+        casos = {
+            'portada': (self._generador.pagina_portada, self._extraer_portada),
+            'grupo_vueltas': (self._generador.pagina_grupo_vueltas, self._extraer_grupo_vueltas),
+            'etapas': (self._generador.pagina_etapas, self._desglose._obtener_numero_etapas),
+            'etapas_incremental': (self._generador.pagina_etapas, self._desglose._obtener_numero_etapas),
+            'clasicas': (self._generador.pagina_clasicas, lambda soup: self._desglose._extraer_clasicas(soup, "races.php"))
+        }
+        resultados = {}
+        logger = self._desglose.logger
+        nivel = logger.level
+        logger.setLevel(logging.WARNING)
+
+        try:
+            for caso, (generar, extraer) in casos.items():
+                mediciones = []
+
+                for tamanyo in self.tamanyos:
+                    contenido = generar(tamanyo).encode("utf-8")
+
+                    if caso == 'etapas_incremental':
+                        preparar = lambda contenido=contenido: self._leer_fragmento_tabla(contenido)
+                    else:
+                        preparar = lambda contenido=contenido: contenido
+
+                    medicion = self._medir(preparar, extraer)
+                    medicion.update(tamanyo=tamanyo, bytes=len(contenido))
+                    mediciones.append(medicion)
+
+                _calcular_exponentes(mediciones)
+                resultados[caso] = mediciones
+
+        finally:
+            logger.setLevel(nivel)
+
+        return resultados
+
+
+    def _medir(self, preparar: Callable[[], object], extraer: Callable[['BeautifulSoup'], object]) -> dict:
+
+        """
+        Mide el mínimo de las repeticiones del parseo (preparar + crear_soup) y de la extracción.
+
+        Parámetros:
+            preparar (Callable): Devuelve el contenido a parsear (la página o el fragmento de ella).
+            extraer (Callable): Método de extracción que recibe el soup.
+
+        Salida:
+            dict: 'parseo_s', 'extraccion_s' y 'elementos' (tamaño del resultado de la extracción).
+        """
+
+        parseo = extraccion = math.inf
+        elementos = 0
+
+        for _ in range(self.repeticiones):
+            inicio = time.perf_counter()
+            soup = ScrappingBase.crear_soup(preparar(), "utf-8")
+            medio = time.perf_counter()
+            resultado = extraer(soup)
+            fin = time.perf_counter()
+
+            parseo = min(parseo, medio - inicio)
+            extraccion = min(extraccion, fin - medio)
+            elementos = resultado if isinstance(resultado, int) else len(resultado)
+            soup.decompose()
+
+        return {'parseo_s': parseo, 'extraccion_s': extraccion, 'elementos': elementos}
+
+
+    def _extraer_portada(self, soup: 'BeautifulSoup') -> list:
+        h1_todas_competiciones = self._grupos._encontrar_encabezado_todas_competiciones(soup)
+        return self._grupos._extraer_grupos_competiciones(h1_todas_competiciones)
+
+
+    def _extraer_grupo_vueltas(self, soup: 'BeautifulSoup') -> list:
+        self._desglose._determinar_tipo_grupo(soup)
+        excepcion_clasicas_femeninas = self._desglose._buscar_excepcion_clasicas_femeninas(soup, None)
+        return self._desglose._extraer_datos_vueltas(soup, excepcion_clasicas_femeninas)
+
+
+    def _leer_fragmento_tabla(self, contenido: bytes) -> str:
+        extractor = ExtractorFragmentoHtml('table', self._desglose.clase_tabla_etapas)
+        extractor.feed(contenido.decode("utf-8"))
+        return extractor.obtener_fragmento() or ""
+
+
+def formatear_informe(resultados: Dict[str, List[dict]]) -> str:
+
+    """
+    Formatea las mediciones como tabla, marcando los casos que escalan de forma superlineal.
+
+    Parámetros:
+        resultados (dict): Salida de BenchmarkParseo.ejecutar().
+
+    Salida:
+        str: Informe para la consola.
+    """
+
+    lineas = [f"{'caso':<20}{'n':>7}{'KiB':>9}{'parseo ms':>11}{'extracción ms':>15}{'µs/elem':>9}{'exponente':>11}"]
+    superlineales = []
+
+    for caso, mediciones in resultados.items():
+        for medicion in mediciones:
+            total = medicion['parseo_s'] + medicion['extraccion_s']
+            exponente = medicion['exponente']
+            marca = ""
+
+            if exponente is not None and exponente > CTE_EXPONENTE_SUPERLINEAL:
+                marca = "  SUPERLINEAL"
+                superlineales.append(f"{caso} (n={medicion['tamanyo']})")
+
+            lineas.append(f"{caso:<20}{medicion['tamanyo']:>7}{medicion['bytes'] / 1024:>9.1f}"
+                          f"{1000 * medicion['parseo_s']:>11.2f}{1000 * medicion['extraccion_s']:>15.2f}"
+                          f"{1e6 * total / max(1, medicion['tamanyo']):>9.1f}"
+                          f"{'' if exponente is None else f'{exponente:.2f}':>11}{marca}")
+
+    lineas.append(f"Escalado superlineal (exponente > {CTE_EXPONENTE_SUPERLINEAL}): "
+                  f"{', '.join(superlineales) if superlineales else 'ninguno'}")
+
+    return "\n".join(lineas)
+
+
+def _calcular_exponentes(mediciones: List[dict]) -> None:
+
+    """
+    Añade a cada medición el exponente de escalado del tiempo total respecto a la anterior
+    (1 es lineal, 2 cuadrático); None para la primera y para los tamaños pequeños.
+
+    Parámetros:
+        mediciones (list[dict]): Mediciones de un caso en orden creciente de tamaño.
+
+    Salida:
+        None
+    """
+
+    anterior: Tuple[int, float] = None
+
+    for medicion in mediciones:
+        total = medicion['parseo_s'] + medicion['extraccion_s']
+        medicion['exponente'] = None
+
+        if anterior is not None and medicion['tamanyo'] >= CTE_TAMANYO_MINIMO_EXPONENTE and anterior[1] > 0:
+            medicion['exponente'] = math.log(total / anterior[1]) / math.log(medicion['tamanyo'] / anterior[0])
+
+        anterior = (medicion['tamanyo'], total)
+
+
+def main(tamanyos: List[int], repeticiones: int, directorio: str = None, url_base: str = None) -> None:
+
+    """
+    Función principal: ejecuta el benchmark y muestra el informe, o escribe un sitio sintético en 'directorio'.
+
+    Parámetros:
+        tamanyos (list[int]): Tamaños de página a medir (o, al escribir el sitio, el mayor es el número de grupos).
+        repeticiones (int): Repeticiones de cada medida.
+        directorio (str, optional): Si se indica, escribe en él un sitio sintético en lugar de medir.
+        url_base (str, optional): URL en la que se servirá el sitio escrito.
+
+    Salida:
+        None
+    """
+
+    config = Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=CTE_PROCESO_CALENDARIO)
+    logger = config.obtener_logger()
+
+    try:
+        if directorio:
+            generador = GeneradorHtmlVelogames(url_base=url_base) if url_base else GeneradorHtmlVelogames()
+            paginas = generador.escribir_sitio(directorio, max(tamanyos), vueltas_por_grupo=10, etapas_por_vuelta=21,
+                                               clasicas_por_grupo=30)
+            print(f"Escritas {paginas} páginas en '{directorio}' para servir en {generador.url_base}")
+            return
+
+        print(formatear_informe(BenchmarkParseo(tamanyos, repeticiones).ejecutar()))
+
+    except Exception as e:
+        logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mide cómo escala el parseo de páginas de Velogames sintéticas")
+    parser.add_argument("--tamanyos", default=CTE_TAMANYOS_DEFECTO,
+                        help=f"Tamaños de página separados por comas (por defecto {CTE_TAMANYOS_DEFECTO})")
+    parser.add_argument("--repeticiones", type=int, default=CTE_REPETICIONES_DEFECTO, help="Repeticiones de cada medida")
+    parser.add_argument("--directorio", help="Escribe un sitio sintético en este directorio en lugar de medir")
+    parser.add_argument("--url-base", help="URL en la que se servirá el sitio sintético (con --directorio)")
+    argumentos = parser.parse_args()
+
+    main([int(tamanyo) for tamanyo in argumentos.tamanyos.split(",")], argumentos.repeticiones,
+         argumentos.directorio, argumentos.url_base)
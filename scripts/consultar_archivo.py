@@ -0,0 +1,106 @@
+# scripts/consultar_archivo.py
+
+import csv
+import os
+import sys
+from typing import List, Optional, Tuple
+from utils.archivo_temporadas import ArchivoTemporadas, CTE_ESQUEMA
+from utils.config import Config
+from utils.excepciones import ManejoExcepciones, ExcepcionArchivo
+
+# Constantes para la configuración
+CTE_RUTA_CONFIG = "src/config/"
+CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
+
+# Tipo de las columnas de fecha en el esquema del archivo (segundos desde epoch)
+CTE_TIPO_FECHA = "q"
+
+
+def main(tabla: str, columnas: List[str], contar: bool = False, temporadas: Optional[Tuple[int, int]] = None) -> None:
+
+    """
+    Consulta el archivo histórico de temporadas y escribe el resultado como CSV en la salida estándar.
+
+    Solo se leen los ficheros de las columnas pedidas. Con 'contar' se cuentan las filas por valor
+    de una columna de texto sin decodificarla fila a fila; si no, se listan las columnas fila a fila
+    (las fechas en formato aaaa-mm-dd).
+
+    Parámetros:
+        tabla (str): Tabla del archivo ('grupos', 'vueltas', 'clasicas' o 'resultados').
+        columnas (list[str]): Columnas a leer (una sola si se cuenta).
+        contar (bool, optional): Si es True, cuenta las filas por valor de la columna. Default es False.
+        temporadas (tuple, optional): (primera, última) temporada a consultar. Default son todas las archivadas.
+
+    Salida:
+        None
+    """
+
+    proceso = os.path.splitext(os.path.basename(__file__))[0]
+    config = Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=proceso)
+    logger = config.obtener_logger()
+
+    try:
+        archivo = ArchivoTemporadas(config.obtener_fichero_config_general().get("archivo.directorio"))
+        seleccionadas = [temporada for temporada in archivo.obtener_temporadas()
+                         if temporadas is None or temporadas[0] <= temporada <= temporadas[1]]
+        escritor = csv.writer(sys.stdout)
+
+        if contar:
+            if len(columnas) != 1:
+                raise ExcepcionArchivo("Solo se puede contar por una columna")
+
+            escritor.writerow([columnas[0], "filas"])
+            totales = archivo.contar_por(tabla, columnas[0], seleccionadas)
+
+            for valor, filas in sorted(totales.items(), key=lambda total: (-total[1], total[0])):
+                escritor.writerow([valor, filas])
+
+        else:
+            valores = archivo.leer_columnas(tabla, columnas, seleccionadas)
+            escritor.writerow(columnas)
+
+            for fila in zip(*(valores[columna] for columna in columnas)):
+                escritor.writerow([_formatear_valor(tabla, columna, valor) for columna, valor in zip(columnas, fila)])
+
+        sys.stdout.flush()
+
+    except Exception as e:
+        logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+
+def _formatear_valor(tabla: str, columna: str, valor) -> str:
+
+    """
+    Convierte un valor archivado en el texto de su celda CSV.
+
+    Parámetros:
+        tabla (str): Tabla del valor.
+        columna (str): Columna del valor.
+        valor: Valor leído del archivo.
+
+    Salida:
+        str: Fecha aaaa-mm-dd (vacía si es nula) para las columnas de fecha, o el propio valor.
+    """
+
+    if CTE_ESQUEMA[tabla].get(columna) == CTE_TIPO_FECHA:
+        fecha = ArchivoTemporadas.epoch_a_datetime(valor)
+        return fecha.date().isoformat() if fecha else ""
+
+    return valor
+
+
+if __name__ == "__main__":
+    import argparse
+    from scripts.backfill_temporadas import tipo_rango_temporadas
+
+    parser = argparse.ArgumentParser(description="Consulta el archivo histórico de temporadas (salida CSV)")
+    parser.add_argument("tabla", choices=sorted(CTE_ESQUEMA), help="Tabla del archivo")
+    parser.add_argument("columnas", help="Columnas separadas por comas (ej. descripcion,fecha_inicio,numero_etapas)")
+    parser.add_argument("--contar", action="store_true",
+                        help="Cuenta las filas por valor de la columna (de texto) en lugar de listarlas")
+    parser.add_argument("--temporadas", metavar="DESDE-HASTA", type=tipo_rango_temporadas,
+                        help="Solo las temporadas indicadas (ej. 2015-2024); por defecto, todas las archivadas")
+    argumentos = parser.parse_args()
+
+    main(argumentos.tabla, [columna.strip() for columna in argumentos.columnas.split(",") if columna.strip()],
+         argumentos.contar, argumentos.temporadas)
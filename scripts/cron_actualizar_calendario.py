@@ -2,15 +2,39 @@
 
 from scripts.subprocesos.scrapping_desglosar_grupos_competiciones import DesglosarGruposCompeticiones
 from scripts.subprocesos.scrapping_obtener_grupos_competiciones import ObtenerGruposCompeticiones
+from scripts.subprocesos.scrapping_obtener_ciclistas_competiciones import ObtenerCiclistasCompeticiones
+from scripts.subprocesos.scrapping_obtener_resultados_etapas import ObtenerResultadosEtapas
 from utils.config import Config
-from utils.excepciones import ManejoExcepciones
+from utils.excepciones import ManejoExcepciones, ExcepcionScrapping, ExcepcionOptimizador, ExcepcionSnapshot, ExcepcionPlazoAgotado
+from utils.diario_ejecucion import DiarioEjecucion
+from utils import calendario_bd, db_utils, snapshot_calendario, string_utils
+from utils.tabla_ciclistas import TablaCiclistas
+from utils.optimizador_equipo import OptimizadorEquipo
+from utils.archivo_temporadas import ArchivoTemporadas
+from utils.exportacion_calendario import FeedsCalendario
+from utils.registro_cambios import RegistroCambios
+from utils.revalidacion_urls import RevalidacionUrls
+from utils.planificador_descargas import PlanificadorDescargas
+from utils.plazo_ejecucion import PlazoEjecucion
+from scripts.subprocesos.scrapping_base import ScrappingBase
+from utils.indice_calendario import IndiceCalendario
+from utils.memoria_utils import ContabilidadMemoria
+from utils.metricas import EstadisticasCron, CTE_ESTADO_OK, CTE_ESTADO_ERROR
+from utils.bloqueo_utils import BloqueoFichero
+from datetime import datetime
+import importlib
 import os
+import time
+from typing import Optional
 
 # Constantes para la configuración
 CTE_RUTA_CONFIG = "src/config/"
 CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
 
-def main():
+# Módulos cuya importación se difiere hasta el primer uso
+CTE_MODULOS_DIFERIDOS = ["requests", "bs4", "mysql.connector"]
+
+def main(daemon: bool = False, temporadas: tuple = None, presupuesto_segundos: Optional[float] = None):
 
     """
     Función principal que se ejecuta al iniciar el script.
@@ -20,7 +44,12 @@ def main():
     pueda ocurrir durante la ejecución.
 
     Parámetros:
-        None
+        daemon (bool, optional): Si es True, se queda en ejecución y planifica las actualizaciones
+                                 por sí mismo en lugar de hacer una única actualización. Default es False.
+        temporadas (tuple, optional): (primera, última) temporada a cargar en el archivo histórico en
+                                      lugar de actualizar el calendario actual. Default es None.
+        presupuesto_segundos (float, optional): Plazo total de cada actualización (0 sin límite).
+                                                Default es el de 'ejecucion.presupuesto_segundos'.
     
     Salida:
         None
@@ -30,58 +59,683 @@ def main():
     config = Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=proceso)
 
     logger = config.obtener_logger()
+
+    if daemon:
+        from functools import partial
+        from scripts.daemon_calendario import DaemonCalendario
+        DaemonCalendario(config, partial(ejecutar_actualizacion, presupuesto_segundos=presupuesto_segundos)).ejecutar()
+        return
+
+    if temporadas:
+        from scripts.backfill_temporadas import BackfillTemporadas
+
+        try:
+            resumen = BackfillTemporadas(config, *temporadas).ejecutar()
+
+            for anyo, datos in resumen.items():
+                logger.info(f"Temporada {anyo}: {datos}")
+
+        except Exception as e:
+            logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+        return
+
     logger.info("Iniciado proceso de actualización del calendario de competiciones")
-    conexion = None
+    bloqueo = BloqueoFichero(config.obtener_fichero_config_general().get("ejecucion.ruta_bloqueo"))
 
     try:
-        objeto_competiciones = ObtenerGruposCompeticiones()
-        grupos_competiciones = objeto_competiciones.ejecutar()
-
-        objeto_desglose_competiciones = DesglosarGruposCompeticiones(grupos_competiciones)
-        grupos_competiciones_desglosados = objeto_desglose_competiciones.ejecutar()
-
-        # Al final del proceso, luego de haber llenado self.resultados
-        log_mensaje = "\n"
-
-        for grupos_competiciones in grupos_competiciones_desglosados:
-            log_mensaje += f"Nombre: {grupos_competiciones['nombre']}\n"
-            log_mensaje += f"Género: {grupos_competiciones['genero']}\n"
-            log_mensaje += f"URL: {grupos_competiciones['url']}\n"
-            log_mensaje += f"Tipo de Grupo: {grupos_competiciones['tipo_grupo']}\n"
-
-            desglose = grupos_competiciones.get('desglose_grupo_competiciones')
-            if desglose:
-                log_mensaje += "Desglose de Competiciones:\n"
-                if grupos_competiciones['tipo_grupo'] == 'grupo_vueltas':  # Para vueltas por etapas
-                    for competicion in desglose:
-                        log_mensaje += f"  - Competición: {competicion['descripcion']}\n"
-                        log_mensaje += f"    - URL: {competicion['url']}\n"
-                        log_mensaje += f"    - Número de Etapas: {competicion['numero_etapas']}\n"
-                        log_mensaje += f"    - Tipo de Vuelta: {competicion['tipo_vuelta']}\n"
-                        log_mensaje += f"    - Fecha de Inicio: {competicion['fecha_inicio']}\n"
-                        log_mensaje += f"    - Fecha de Fin: {competicion['fecha_fin']}\n"
-                else:  # Para grupos de clásicas
-                    for competicion in desglose:
-                        log_mensaje += f"  - Clásica: {competicion['numero_clasica']}\n"
-                        log_mensaje += f"    - Fecha: {competicion['fecha_clasica']}\n"
-                        log_mensaje += f"    - Nombre: {competicion['nombre_clasica']}\n"
-                        log_mensaje += f"    - Categoría: {competicion['categoria']}\n"
-            
-            log_mensaje += "\n"  # Línea en blanco para separar cada resultado
-
-        # Imprime el mensaje completo con logger.debug
-        logger.info(log_mensaje)
-
-        # Aquí continuaría la lógica para actualizar el calendario.
-        # ...
+        if not bloqueo.adquirir():
+            logger.warning("Ya hay otra actualización del calendario en curso, se omite esta ejecución")
+            return
+
+        ejecutar_actualizacion(config, presupuesto_segundos)
 
     except Exception as e:
         trazas_error = ManejoExcepciones.formatear_trazas_excepciones(e)
         logger.error(trazas_error)
 
     finally:
+        bloqueo.liberar()
         logger.info("Finalizado proceso de actualización del calendario de competiciones")
 
 
+def ejecutar_actualizacion(config: Config, presupuesto_segundos: Optional[float] = None,
+                           conexion_bd: Optional[db_utils.ConexionPersistente] = None) -> list[dict]:
+
+    """
+    Ejecuta actualizar_calendario con su plazo de ejecución y publica su duración, su resultado y
+    el número de tareas omitidas por agotarse el plazo en el fichero de estadísticas que lee el
+    endpoint /metrics de la aplicación web.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        presupuesto_segundos (float, optional): Plazo total de la actualización (0 sin límite).
+                                                Default es el de 'ejecucion.presupuesto_segundos'.
+        conexion_bd (ConexionPersistente, optional): Conexión que se reutiliza para persistir el calendario
+                                                     (la del daemon). Default es abrir y cerrar una.
+
+    Salida:
+        list[dict]: Calendario desglosado.
+
+    Lanza:
+        Las mismas excepciones que actualizar_calendario.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+    estadisticas = EstadisticasCron(config_general.get("metricas.ruta_estadisticas_cron"))
+
+    if presupuesto_segundos is None:
+        presupuesto_segundos = float(config_general.get("ejecucion.presupuesto_segundos", 0) or 0)
+
+    plazo = PlazoEjecucion(presupuesto_segundos)
+    inicio = time.time()
+
+    try:
+        grupos_competiciones_desglosados = actualizar_calendario(config, plazo, conexion_bd)
+
+    except Exception:
+        estadisticas.publicar(CTE_ESTADO_ERROR, inicio, time.time(), omisiones=len(plazo.omisiones))
+        raise
+
+    finally:
+        _informar_omisiones(config, plazo)
+
+    estadisticas.publicar(CTE_ESTADO_OK, inicio, time.time(), grupos=len(grupos_competiciones_desglosados),
+                          competiciones=sum(len(grupo.get('desglose_grupo_competiciones') or [])
+                                            for grupo in grupos_competiciones_desglosados),
+                          omisiones=len(plazo.omisiones))
+
+    return grupos_competiciones_desglosados
+
+
+def actualizar_calendario(config: Config, plazo: Optional[PlazoEjecucion] = None,
+                          conexion_bd: Optional[db_utils.ConexionPersistente] = None) -> list[dict]:
+
+    """
+    Ejecuta una actualización completa del calendario: obtiene los grupos de competiciones,
+    los desglosa, publica el snapshot y registra el resultado en el log.
+
+    Cada grupo desglosado se guarda en el diario de ejecución. Si algún grupo no se puede desglosar,
+    se conserva el snapshot anterior y el diario, y la siguiente ejecución solo repite los grupos
+    que faltan.
+
+    El plazo se propaga a todas las peticiones HTTP como timeout. Una vez agotado no se lanzan más
+    descargas: los grupos conocidos que faltan conservan su desglose anterior, los nuevos quedan
+    fuera hasta la próxima ejecución, lo obtenido se publica igualmente y las etapas de ciclistas y
+    resultados se omiten; todo ello queda registrado en las omisiones del plazo. Si se agota antes
+    de obtener los grupos de la portada, se conserva el calendario anterior sin publicar nada.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        plazo (PlazoEjecucion, optional): Plazo de la actualización. Default es sin límite.
+        conexion_bd (ConexionPersistente, optional): Conexión que se reutiliza para persistir el calendario.
+                                                     Default es abrir y cerrar una.
+
+    Salida:
+        list[dict]: Calendario desglosado (el anterior si el plazo se agota antes de obtener los grupos).
+
+    Lanza:
+        ExcepcionScrapping: Si ocurre algún error durante el scrapping o quedan grupos sin desglosar.
+        ExcepcionSnapshot: Si ocurre algún error al publicar el snapshot.
+        ExcepcionExportacion: Si ocurre algún error al actualizar los feeds del calendario.
+        ExcepcionDiarioEjecucion: Si ocurre algún error en el diario de ejecución.
+        ExcepcionArchivo: Si ocurre algún error al archivar las temporadas.
+        ExcepcionConexionBaseDeDatos / ExcepcionBaseDeDatos: Si ocurre algún error al persistir el calendario.
+    """
+
+    logger = config.obtener_logger()
+    config_general = config.obtener_fichero_config_general()
+    contabilidad = ContabilidadMemoria(logger, string_utils.a_booleano(config_general.get("memoria.medir", "false")))
+    plazo = plazo or PlazoEjecucion()
+    ScrappingBase.establecer_plazo_ejecucion(plazo)
+
+    try:
+        revalidacion = _abrir_revalidacion(config)
+        planificador = _crear_planificador(config, plazo)
+
+        with contabilidad.etapa("obtener_grupos"):
+            objeto_competiciones = ObtenerGruposCompeticiones(revalidacion)
+
+            try:
+                grupos_competiciones = objeto_competiciones.ejecutar()
+
+            except (ExcepcionScrapping, ExcepcionPlazoAgotado) as e:
+                if not ManejoExcepciones.causada_por(e, ExcepcionPlazoAgotado):
+                    raise
+
+                logger.warning("Plazo de ejecución agotado antes de obtener los grupos de competiciones; "
+                               "se conserva el calendario anterior")
+                plazo.registrar_omision("obtención de los grupos de competiciones (se conserva el calendario anterior)")
+
+                return _leer_calendario_anterior(config)
+
+        with contabilidad.etapa("desglosar_grupos"):
+            diario = _abrir_diario(config, grupos_competiciones)
+            objeto_desglose_competiciones = DesglosarGruposCompeticiones(grupos_competiciones, diario,
+                                                                         revalidacion=revalidacion,
+                                                                         planificador=planificador)
+            grupos_competiciones_desglosados = objeto_desglose_competiciones.ejecutar()
+
+        # Lo observado en las páginas descargadas se guarda aunque haya grupos fallidos
+        if revalidacion is not None:
+            revalidacion.guardar()
+            logger.info(f"Revalidación de páginas: {revalidacion.estadisticas}")
+
+        if objeto_desglose_competiciones.grupos_fallidos:
+            raise ExcepcionScrapping(f"Quedan {len(objeto_desglose_competiciones.grupos_fallidos)} grupos sin desglosar; "
+                                     f"se conserva el snapshot anterior y el diario en '{diario.directorio}'")
+
+        # Se registra cada grupo por separado para no acumular el calendario entero en un único mensaje
+        for grupo_competiciones in grupos_competiciones_desglosados:
+            logger.info(_formatear_grupo_log(grupo_competiciones))
+
+        # El snapshot y los feeds comparten el instante de generación (DTSTAMP de los eventos iCalendar)
+        generado = int(time.time())
+
+        with contabilidad.etapa("publicar_snapshot"):
+            _publicar_snapshot(config, grupos_competiciones_desglosados, generado)
+            diario.eliminar()
+
+        with contabilidad.etapa("actualizar_feeds"):
+            _actualizar_feeds(config, grupos_competiciones_desglosados, generado)
+
+        with contabilidad.etapa("registrar_cambios"):
+            _registrar_cambios(config, grupos_competiciones_desglosados)
+
+        if string_utils.a_booleano(config_general.get("ejecucion.persistir_calendario")):
+            with contabilidad.etapa("persistir_calendario"):
+                _persistir_calendario(config, grupos_competiciones_desglosados, conexion_bd)
+
+        if string_utils.a_booleano(config_general.get("ejecucion.actualizar_ciclistas")) and \
+                _etapa_en_plazo(plazo, "actualizar_ciclistas"):
+            with contabilidad.etapa("actualizar_ciclistas"):
+                tabla_ciclistas = actualizar_ciclistas(config, grupos_competiciones_desglosados)
+                optimizar_equipos(config, tabla_ciclistas)
+
+        resultados_competiciones = None
+
+        if string_utils.a_booleano(config_general.get("ejecucion.actualizar_resultados")) and \
+                _etapa_en_plazo(plazo, "actualizar_resultados"):
+            with contabilidad.etapa("actualizar_resultados"):
+                resultados_competiciones = actualizar_resultados(config, grupos_competiciones_desglosados)
+
+        with contabilidad.etapa("archivar_temporadas"):
+            _archivar_temporadas(config, grupos_competiciones_desglosados, resultados_competiciones)
+
+        indice_calendario = IndiceCalendario(grupos_competiciones_desglosados, config_general.get("fechas.formato_generico"))
+        competiciones_hoy = indice_calendario.competiciones_en_dia(datetime.now())
+        logger.info(f"Competiciones en curso hoy: {len(competiciones_hoy)} de {len(indice_calendario)}")
+
+    finally:
+        ScrappingBase.establecer_plazo_ejecucion(None)
+        contabilidad.finalizar()
+
+    # Aquí continuaría la lógica para actualizar el calendario.
+    # ...
+
+    return grupos_competiciones_desglosados
+
+
+def actualizar_ciclistas(config: Config, grupos_competiciones_desglosados: list[dict]) -> TablaCiclistas:
+
+    """
+    Descarga los ciclistas (equipo, precio y puntos) de las competiciones activas del calendario.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+
+    Salida:
+        TablaCiclistas: Ciclistas de todas las competiciones en formato columnar.
+
+    Lanza:
+        ExcepcionScrapping: Si ocurre algún error al inicializar el scrapping de ciclistas.
+    """
+
+    inicio = time.perf_counter()
+    tabla_ciclistas = ObtenerCiclistasCompeticiones(grupos_competiciones_desglosados).ejecutar()
+    config.obtener_logger().info(f"Ciclistas de {len(tabla_ciclistas.competiciones)} competiciones actualizados "
+                                 f"en {time.perf_counter() - inicio:.1f} s")
+
+    return tabla_ciclistas
+
+
+def optimizar_equipos(config: Config, tabla_ciclistas: TablaCiclistas) -> dict:
+
+    """
+    Calcula el equipo óptimo de cada competición con las reglas de la sección [equipo] y lo registra en el log.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        tabla_ciclistas (TablaCiclistas): Ciclistas de las competiciones.
+
+    Salida:
+        dict: URL de la competición -> equipo óptimo (ver OptimizadorEquipo.optimizar).
+    """
+
+    logger = config.obtener_logger()
+    config_general = config.obtener_fichero_config_general()
+    presupuesto = float(config_general.get("equipo.presupuesto"))
+    numero_ciclistas = int(config_general.get("equipo.numero_ciclistas"))
+    divisiones_precio = int(config_general.get("equipo.divisiones_precio", 1))
+    equipos = {}
+
+    for url in tabla_ciclistas.competiciones:
+
+        try:
+            equipo = OptimizadorEquipo.desde_tabla(tabla_ciclistas, url, presupuesto, numero_ciclistas,
+                                                   divisiones_precio).optimizar()
+
+        except ExcepcionOptimizador as e:
+            logger.warning(f"No se pudo calcular el equipo óptimo de {url}: {e}")
+            continue
+
+        inicio, _ = tabla_ciclistas.rango_competicion(url)
+        nombres = [tabla_ciclistas.nombres[inicio + indice] for indice in equipo['ciclistas']]
+        logger.info(f"Equipo óptimo de {url} ({equipo['puntos']:.0f} puntos, coste {equipo['coste']:g}): {', '.join(nombres)}")
+        equipos[url] = equipo
+
+    return equipos
+
+
+def actualizar_resultados(config: Config, grupos_competiciones_desglosados: list[dict]) -> dict:
+
+    """
+    Ingiere los resultados de las etapas disputadas desde la última ejecución y registra el
+    líder de cada vuelta empezada.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+
+    Salida:
+        dict: URL de la vuelta -> ResultadosCompeticion.
+
+    Lanza:
+        ExcepcionScrapping: Si ocurre algún error al inicializar el scrapping de resultados.
+        ExcepcionResultados: Si no se pueden leer o guardar los resultados guardados.
+    """
+
+    logger = config.obtener_logger()
+    resultados_competiciones = ObtenerResultadosEtapas(grupos_competiciones_desglosados).ejecutar()
+
+    for url, resultados in resultados_competiciones.items():
+        lideres = resultados.clasificacion(3)
+
+        if lideres:
+            logger.info(f"Clasificación de {url}: " + ", ".join(f"{lider['posicion']}. {lider['ciclista']} "
+                                                             f"({lider['puntos']:g})" for lider in lideres))
+
+    return resultados_competiciones
+
+
+def _abrir_revalidacion(config: Config) -> Optional[RevalidacionUrls]:
+
+    """
+    Abre el estado de revalidación por URL si está activo en la configuración.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+
+    Salida:
+        RevalidacionUrls: Estado de revalidación, o None si está desactivada (se descarga todo).
+
+    Lanza:
+        ExcepcionRevalidacion: Si los intervalos configurados no son válidos.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+
+    if not string_utils.a_booleano(config_general.get("revalidacion.activa", "false")):
+        return None
+
+    return RevalidacionUrls(config_general.get("revalidacion.ruta"),
+                            float(config_general.get("revalidacion.intervalo_minimo_minutos")) * 60,
+                            float(config_general.get("revalidacion.intervalo_maximo_minutos")) * 60,
+                            float(config_general.get("revalidacion.factor_crecimiento", 2)))
+
+
+def _etapa_en_plazo(plazo: PlazoEjecucion, etapa: str) -> bool:
+
+    """
+    Indica si una etapa opcional de la actualización se puede ejecutar; si el plazo se ha agotado,
+    la registra como omitida.
+
+    Parámetros:
+        plazo (PlazoEjecucion): Plazo de la actualización.
+        etapa (str): Nombre de la etapa.
+
+    Salida:
+        bool: True si queda plazo para ejecutar la etapa.
+    """
+
+    if not plazo.agotado():
+        return True
+
+    plazo.registrar_omision(f"etapa {etapa}")
+    return False
+
+
+def _informar_omisiones(config: Config, plazo: PlazoEjecucion) -> None:
+
+    """
+    Registra en el log lo que se ha dejado sin hacer por agotarse el plazo de la actualización.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        plazo (PlazoEjecucion): Plazo de la actualización.
+
+    Salida:
+        None
+    """
+
+    if plazo.omisiones:
+        config.obtener_logger().warning(f"Plazo de {plazo.presupuesto_segundos:g} s agotado; se ha omitido "
+                                        f"({len(plazo.omisiones)}): " + "; ".join(plazo.omisiones))
+
+
+def _crear_planificador(config: Config, plazo: PlazoEjecucion) -> PlanificadorDescargas:
+
+    """
+    Crea el planificador de descargas con las fechas del calendario publicado en el snapshot
+    (sin snapshot, todos los grupos son nuevos y se descargan en el orden de la portada).
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        plazo (PlazoEjecucion): Plazo de la actualización, que marca cuándo dejar de descargar grupos conocidos.
+
+    Salida:
+        PlanificadorDescargas: Planificador de la actualización.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+
+    return PlanificadorDescargas(_leer_calendario_anterior(config), config_general.get("fechas.formato_generico"),
+                                 plazo, float(config_general.get("planificacion.factor_pasado", 3)))
+
+
+def _leer_calendario_anterior(config: Config) -> list[dict]:
+
+    """
+    Lee el calendario publicado en el snapshot por la última actualización terminada.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+
+    Salida:
+        list[dict]: Grupos desglosados del snapshot (vacía si no hay snapshot o no se puede leer).
+    """
+
+    try:
+        return snapshot_calendario.LectorSnapshot(config.obtener_fichero_config_general().get("snapshot.ruta")).obtener_grupos_desglosados()
+
+    except ExcepcionSnapshot:
+        return []
+
+
+def _abrir_diario(config: Config, grupos_competiciones: list[dict]) -> DiarioEjecucion:
+
+    """
+    Abre el diario de ejecución de la lista de grupos a desglosar (reanuda uno previo si existe).
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones (list[dict]): Grupos de competiciones a desglosar.
+
+    Salida:
+        DiarioEjecucion: Diario de la ejecución.
+
+    Lanza:
+        ExcepcionDiarioEjecucion: Si no se puede abrir el diario.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+    diario = DiarioEjecucion(config_general.get("diario.directorio"),
+                             [string_utils.completar_url(grupo['url']) for grupo in grupos_competiciones],
+                             float(config_general.get("diario.antiguedad_maxima_horas")) * 3600)
+
+    if diario.reanudado:
+        config.obtener_logger().info(f"Reanudando la actualización desde el diario '{diario.directorio}'")
+
+    return diario
+
+
+def _publicar_snapshot(config: Config, grupos_competiciones_desglosados: list[dict], generado: int) -> None:
+
+    """
+    Publica el calendario desglosado como snapshot binario para los workers de la aplicación web.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+        generado (int): Instante de generación del calendario en segundos desde epoch.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionSnapshot: Si ocurre algún error al publicar el snapshot.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+    ruta_snapshot = config_general.get("snapshot.ruta")
+    formato_fecha = config_general.get("fechas.formato_generico")
+
+    bytes_escritos = snapshot_calendario.publicar_snapshot(ruta_snapshot, grupos_competiciones_desglosados, formato_fecha,
+                                                            generado)
+    config.obtener_logger().info(f"Snapshot del calendario publicado en {ruta_snapshot} ({bytes_escritos} bytes)")
+
+
+def _actualizar_feeds(config: Config, grupos_competiciones_desglosados: list[dict], generado: int) -> None:
+
+    """
+    Regenera los feeds de exportación (iCalendar, CSV y JSON-lines) de los grupos que han cambiado.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+        generado (int): Instante de generación del calendario en segundos desde epoch.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionExportacion: Si ocurre algún error al escribir los feeds.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+    feeds = FeedsCalendario(config_general.get("exportacion.directorio_feeds"), config_general.get("fechas.formato_generico"))
+    estadisticas = feeds.actualizar(grupos_competiciones_desglosados, generado)
+    config.obtener_logger().info(f"Feeds del calendario actualizados en {feeds.directorio}: {estadisticas}")
+
+
+def _registrar_cambios(config: Config, grupos_competiciones_desglosados: list[dict]) -> None:
+
+    """
+    Añade al registro de cambios las altas, bajas y modificaciones del calendario desde la actualización anterior.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionCambios: Si ocurre algún error al escribir el registro.
+    """
+
+    from collections import Counter
+
+    registro = RegistroCambios(config.obtener_fichero_config_general().get("cambios.directorio"))
+    cambios = registro.registrar(grupos_competiciones_desglosados)
+    tipos = dict(Counter(cambio['tipo'] for cambio in cambios))
+    config.obtener_logger().info(f"Registrados {len(cambios)} cambios del calendario {tipos or ''}"
+                                 f"(última secuencia {registro.ultima_secuencia()})")
+
+
+def _formatear_grupo_log(grupo_competiciones: dict) -> str:
+
+    """
+    Construye el mensaje de log con el desglose de un grupo de competiciones.
+
+    Parámetros:
+        grupo_competiciones (dict): Grupo desglosado.
+
+    Salida:
+        str: Mensaje con el grupo y sus competiciones.
+    """
+
+    lineas = ["",
+              f"Nombre: {grupo_competiciones['nombre']}",
+              f"Género: {grupo_competiciones['genero']}",
+              f"URL: {grupo_competiciones['url']}",
+              f"Tipo de Grupo: {grupo_competiciones['tipo_grupo']}"]
+
+    desglose = grupo_competiciones.get('desglose_grupo_competiciones')
+
+    if desglose:
+        lineas.append("Desglose de Competiciones:")
+
+        if grupo_competiciones['tipo_grupo'] == 'grupo_vueltas':  # Para vueltas por etapas
+            for competicion in desglose:
+                lineas += [f"  - Competición: {competicion['descripcion']}",
+                           f"    - URL: {competicion['url']}",
+                           f"    - Número de Etapas: {competicion['numero_etapas']}",
+                           f"    - Tipo de Vuelta: {competicion['tipo_vuelta']}",
+                           f"    - Fecha de Inicio: {competicion['fecha_inicio']}",
+                           f"    - Fecha de Fin: {competicion['fecha_fin']}"]
+
+        else:  # Para grupos de clásicas
+            for competicion in desglose:
+                lineas += [f"  - Clásica: {competicion['numero_clasica']}",
+                           f"    - Fecha: {competicion['fecha_clasica']}",
+                           f"    - Nombre: {competicion['nombre_clasica']}",
+                           f"    - Categoría: {competicion['categoria']}"]
+
+    return "\n".join(lineas)
+
+
+def _persistir_calendario(config: Config, grupos_competiciones_desglosados: list[dict],
+                          conexion_bd: Optional[db_utils.ConexionPersistente] = None) -> None:
+
+    """
+    Guarda el calendario desglosado en la base de datos configurada (MySQL o SQLite).
+
+    Con conexión persistente se usa la suya y se deja abierta (si falla se invalida para que la
+    siguiente actualización abra otra); sin ella, se abre una conexión solo para esta actualización.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+        conexion_bd (ConexionPersistente, optional): Conexión persistente. Default es abrir y cerrar una.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionConexionBaseDeDatos: Si no se puede abrir la conexión.
+        ExcepcionBaseDeDatos: Si falla alguna sentencia (la transacción se deshace).
+    """
+
+    if conexion_bd is None:
+        ruta_properties = string_utils.obtener_nombre_properties_proceso(f"{config.ruta_config}{config.nombre_config}")
+        conexion = db_utils.obtener_conexion(ruta_properties)
+
+    else:
+        conexion = conexion_bd.obtener()
+
+    try:
+        calendario_bd.crear_esquema(conexion)
+        filas = calendario_bd.guardar_calendario(conexion, grupos_competiciones_desglosados,
+                                                 config.obtener_fichero_config_general().get("fechas.formato_generico"))
+        config.obtener_logger().info(f"Calendario guardado en la base de datos ({filas} filas)")
+
+    except Exception:
+        if conexion_bd is not None:
+            conexion_bd.invalidar()
+        raise
+
+    finally:
+        if conexion_bd is None:
+            conexion.close()
+
+
+def _archivar_temporadas(config: Config, grupos_competiciones_desglosados: list[dict],
+                         resultados_competiciones: dict = None) -> None:
+
+    """
+    Guarda las temporadas del calendario (y los resultados obtenidos) en el archivo histórico columnar.
+
+    Parámetros:
+        config (Config): Configuración del proceso.
+        grupos_competiciones_desglosados (list[dict]): Calendario desglosado.
+        resultados_competiciones (dict, optional): URL de la vuelta -> ResultadosCompeticion.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionArchivo: Si ocurre algún error al escribir el archivo.
+    """
+
+    config_general = config.obtener_fichero_config_general()
+    archivo = ArchivoTemporadas(config_general.get("archivo.directorio"))
+    temporadas = archivo.guardar_calendario(grupos_competiciones_desglosados, config_general.get("fechas.formato_generico"),
+                                            resultados_competiciones)
+    config.obtener_logger().info(f"Temporadas archivadas en {archivo.directorio}: {temporadas}")
+
+
+def informe_arranque() -> None:
+
+    """
+    Muestra por consola dónde se va el tiempo de arranque del proceso.
+
+    Mide en un intérprete limpio el coste de importar este script y, en el proceso actual,
+    el de cada fase de inicialización: creación de Config (logging y lectura de los ficheros
+    de configuración) y carga de los módulos pesados que se importan en su primer uso.
+
+    Parámetros:
+        None
+
+    Salida:
+        None
+    """
+
+    from utils.arranque_utils import generar_informe_importaciones
+
+    fases = []
+    proceso = os.path.splitext(os.path.basename(__file__))[0]
+
+    inicio = time.perf_counter()
+    Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=proceso)
+    fases.append(("Config (logging y ficheros de configuración)", time.perf_counter() - inicio))
+
+    for modulo in CTE_MODULOS_DIFERIDOS:
+        inicio = time.perf_counter()
+        importlib.import_module(modulo)
+        fases.append((f"Importación diferida de {modulo}", time.perf_counter() - inicio))
+
+    print(generar_informe_importaciones(__spec__.name if __spec__ else proceso, fases=fases))
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    from scripts.backfill_temporadas import tipo_rango_temporadas
+
+    parser = argparse.ArgumentParser(description="Actualiza el calendario de competiciones de Velogames")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Se queda en ejecución y planifica las actualizaciones según el calendario")
+    parser.add_argument("--informe-arranque", action="store_true",
+                        help="Muestra el coste de importaciones e inicialización en lugar de ejecutar el proceso")
+    parser.add_argument("--temporadas", metavar="DESDE-HASTA", type=tipo_rango_temporadas,
+                        help="Carga en paralelo las temporadas pasadas indicadas (ej. 2015-2024) en el archivo histórico")
+    parser.add_argument("--presupuesto", metavar="SEGUNDOS", type=float,
+                        help="Plazo total de cada actualización; agotado, no se lanzan más descargas y se publica "
+                             "lo obtenido (por defecto, ejecucion.presupuesto_segundos)")
+    argumentos = parser.parse_args()
+
+    if argumentos.informe_arranque:
+        informe_arranque()
+    else:
+        main(daemon=argumentos.daemon, temporadas=argumentos.temporadas, presupuesto_segundos=argumentos.presupuesto)
\ No newline at end of file
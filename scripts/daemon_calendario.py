@@ -0,0 +1,203 @@
+# scripts/daemon_calendario.py
+
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from scripts.subprocesos.scrapping_base import ScrappingBase
+from utils.bloqueo_utils import BloqueoFichero
+from utils import string_utils
+from utils.config import Config
+from utils.db_utils import ConexionPersistente
+from utils.excepciones import ManejoExcepciones, ExcepcionConfig
+from utils.indice_calendario import IndiceCalendario
+
+# Espera mínima entre actualizaciones, aunque la siguiente carrera empiece antes
+CTE_ESPERA_MINIMA_SEGUNDOS = 60
+
+
+class DaemonCalendario:
+
+    """
+    Proceso de larga duración que actualiza el calendario con una cadencia adaptada a él.
+
+    Mantiene en memoria la configuración, la sesión HTTP y el resto de estado de clase de los
+    subprocesos de scrapping entre actualizaciones, en lugar de arrancar en frío en cada ejecución
+    del cron del sistema. La espera entre actualizaciones depende del calendario:
+        - Hay competiciones hoy: 'intervalo_carrera_en_curso_minutos'.
+        - La siguiente empieza en menos de 'dias_carrera_proxima': 'intervalo_carrera_proxima_minutos'.
+        - La siguiente empieza en más de 'dias_fuera_temporada' (o no hay): 'intervalo_fuera_temporada_minutos'.
+        - En otro caso: 'intervalo_temporada_minutos'.
+    Nunca se espera más allá del inicio de la siguiente competición. Tras un error se reintenta
+    con 'intervalo_reintento_minutos'.
+
+    La conexión a la base de datos también se mantiene abierta entre actualizaciones: se abre en
+    la primera que persiste el calendario, se vuelve a abrir si se pierde y se cierra al salir.
+
+    Atributos:
+        config (Config): Configuración del proceso.
+        logger (logging.Logger): Logger del proceso.
+    """
+
+    def __init__(self, config: Config, funcion_actualizacion: Callable[..., list]) -> None:
+
+        """
+        Inicializa el daemon leyendo la cadencia de la sección [daemon] de la configuración general.
+
+        Parámetros:
+            config (Config): Configuración del proceso.
+            funcion_actualizacion (Callable): Función que ejecuta una actualización completa y
+                                              devuelve el calendario desglosado; recibe la configuración
+                                              y la conexión persistente como 'conexion_bd'.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionConfig: Si falta algún valor de configuración del daemon.
+        """
+
+        self.config = config
+        self.logger = config.obtener_logger()
+        self._funcion_actualizacion = funcion_actualizacion
+        self._parada = threading.Event()
+        self._indice: Optional[IndiceCalendario] = None
+        self._conexion_bd = ConexionPersistente(
+            string_utils.obtener_nombre_properties_proceso(f"{config.ruta_config}{config.nombre_config}"))
+
+        try:
+            config_general = config.obtener_fichero_config_general()
+            self._formato_fecha = config_general["fechas.formato_generico"]
+            self._bloqueo = BloqueoFichero(config_general["ejecucion.ruta_bloqueo"])
+
+            self._intervalo_en_curso = timedelta(minutes=float(config_general["daemon.intervalo_carrera_en_curso_minutos"]))
+            self._intervalo_proxima = timedelta(minutes=float(config_general["daemon.intervalo_carrera_proxima_minutos"]))
+            self._intervalo_temporada = timedelta(minutes=float(config_general["daemon.intervalo_temporada_minutos"]))
+            self._intervalo_fuera_temporada = timedelta(minutes=float(config_general["daemon.intervalo_fuera_temporada_minutos"]))
+            self._intervalo_reintento = timedelta(minutes=float(config_general["daemon.intervalo_reintento_minutos"]))
+            self._dias_carrera_proxima = timedelta(days=float(config_general["daemon.dias_carrera_proxima"]))
+            self._dias_fuera_temporada = timedelta(days=float(config_general["daemon.dias_fuera_temporada"]))
+
+        except (KeyError, ValueError) as e:
+            raise ExcepcionConfig("Falta o es inválida la configuración de la sección [daemon]") from e
+
+
+    def ejecutar(self) -> None:
+
+        """
+        Bucle principal: actualiza, calcula la siguiente espera y duerme hasta la siguiente
+        actualización o hasta recibir SIGTERM/SIGINT.
+
+        La señal solo interrumpe la espera; una actualización en curso termina antes de salir.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        signal.signal(signal.SIGTERM, self.detener)
+        signal.signal(signal.SIGINT, self.detener)
+        self.logger.info("Iniciado daemon de actualización del calendario de competiciones")
+
+        try:
+            while not self._parada.is_set():
+                exito = self._actualizar()
+                espera = self._calcular_espera(datetime.now(), exito)
+                siguiente = datetime.now() + espera
+                self.logger.info(f"Siguiente actualización del calendario: {siguiente:%d-%m-%Y %H:%M:%S}")
+                self._parada.wait(espera.total_seconds())
+
+        finally:
+            ScrappingBase.cerrar_sesion_http()
+            self._conexion_bd.cerrar()
+            self.logger.info("Finalizado daemon de actualización del calendario de competiciones")
+
+
+    def detener(self, *args) -> None:
+
+        """
+        Solicita la parada ordenada del daemon (también se usa como manejador de señales).
+
+        Parámetros:
+            *args: Número de señal y frame cuando se invoca como manejador (no se utilizan).
+
+        Salida:
+            None
+        """
+
+        self.logger.info("Solicitada la parada del daemon de actualización del calendario")
+        self._parada.set()
+
+
+    def _actualizar(self) -> bool:
+
+        """
+        Ejecuta una actualización si no hay otra en curso (de este u otro proceso).
+
+        Parámetros:
+            None
+
+        Salida:
+            bool: True si la actualización terminó correctamente.
+        """
+
+        if not self._bloqueo.adquirir():
+            self.logger.warning("Ya hay otra actualización del calendario en curso, se pospone")
+            return False
+
+        try:
+            self.logger.info("Iniciada actualización del calendario de competiciones")
+            grupos_desglosados = self._funcion_actualizacion(self.config, conexion_bd=self._conexion_bd)
+            self._indice = IndiceCalendario(grupos_desglosados, self._formato_fecha)
+
+            return True
+
+        except Exception as e:
+            self.logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+            return False
+
+        finally:
+            self._bloqueo.liberar()
+            self.logger.info("Finalizada actualización del calendario de competiciones")
+
+
+    def _calcular_espera(self, ahora: datetime, exito: bool) -> timedelta:
+
+        """
+        Calcula cuánto esperar hasta la siguiente actualización según el estado del calendario.
+
+        Parámetros:
+            ahora (datetime): Instante actual.
+            exito (bool): Si la última actualización terminó correctamente.
+
+        Salida:
+            timedelta: Tiempo de espera hasta la siguiente actualización.
+        """
+
+        if not exito:
+            return self._intervalo_reintento
+
+        if self._indice is None:
+            return self._intervalo_temporada
+
+        if self._indice.competiciones_en_dia(ahora):
+            return self._intervalo_en_curso
+
+        siguiente_inicio = self._indice.siguiente_inicio(ahora)
+
+        if siguiente_inicio is None or siguiente_inicio - ahora > self._dias_fuera_temporada:
+            espera = self._intervalo_fuera_temporada
+
+        elif siguiente_inicio - ahora <= self._dias_carrera_proxima:
+            espera = self._intervalo_proxima
+
+        else:
+            espera = self._intervalo_temporada
+
+        if siguiente_inicio is not None:
+            espera = min(espera, max(siguiente_inicio - ahora, timedelta(seconds=CTE_ESPERA_MINIMA_SEGUNDOS)))
+
+        return espera
@@ -0,0 +1,81 @@
+# scripts/exportar_calendario.py
+
+import os
+import sys
+from typing import Optional
+from utils.config import Config
+from utils.excepciones import ManejoExcepciones
+from utils.exportacion_calendario import FeedsCalendario, generar_exportacion, CTE_TIPOS_CONTENIDO
+from utils import fichero_utils
+from utils.snapshot_calendario import LectorSnapshot
+
+# Constantes para la configuración
+CTE_RUTA_CONFIG = "src/config/"
+CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
+
+
+def main(formato: str, salida: Optional[str] = None, temporada: Optional[int] = None, genero: Optional[str] = None,
+         regenerar_feeds: bool = False) -> None:
+
+    """
+    Exporta el calendario publicado en el snapshot como iCalendar, CSV o JSON-lines, o regenera los feeds.
+
+    La exportación se escribe por trozos a medida que se genera (en un fichero, de forma atómica,
+    o en la salida estándar), sin construirla entera en memoria.
+
+    Parámetros:
+        formato (str): 'ics', 'csv' o 'jsonl'.
+        salida (str, optional): Fichero de salida. Default es la salida estándar.
+        temporada (int, optional): Si se indica, solo los grupos de esa temporada.
+        genero (str, optional): Si se indica, solo los grupos de ese género.
+        regenerar_feeds (bool, optional): Si es True, actualiza los feeds pre-generados en lugar de exportar.
+
+    Salida:
+        None
+    """
+
+    proceso = os.path.splitext(os.path.basename(__file__))[0]
+    config = Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=proceso)
+    logger = config.obtener_logger()
+    config_general = config.obtener_fichero_config_general()
+
+    try:
+        lector = LectorSnapshot(config_general.get("snapshot.ruta"))
+        grupos = lector.obtener_grupos_desglosados()
+        formato_fecha = lector.obtener_formato_fecha()
+        generado = lector.obtener_fecha_generacion()
+
+        if regenerar_feeds:
+            feeds = FeedsCalendario(config_general.get("exportacion.directorio_feeds"), formato_fecha)
+            logger.info(f"Feeds del calendario actualizados en {feeds.directorio}: {feeds.actualizar(grupos, generado)}")
+            return
+
+        trozos = generar_exportacion(grupos, formato, formato_fecha, temporada, genero, generado)
+
+        if salida:
+            fichero_utils.escribir_atomico_trozos(salida, (trozo.encode("utf-8") for trozo in trozos))
+            logger.info(f"Calendario exportado en formato {formato} en {salida}")
+
+        else:
+            for trozo in trozos:
+                sys.stdout.write(trozo)
+
+            sys.stdout.flush()
+
+    except Exception as e:
+        logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exporta el calendario de competiciones publicado")
+    parser.add_argument("--formato", choices=sorted(CTE_TIPOS_CONTENIDO), default="ics", help="Formato de la exportación")
+    parser.add_argument("--salida", help="Fichero de salida (por defecto, la salida estándar)")
+    parser.add_argument("--temporada", type=int, help="Solo los grupos de esta temporada")
+    parser.add_argument("--genero", choices=["masculino", "femenino"], help="Solo los grupos de este género")
+    parser.add_argument("--regenerar-feeds", action="store_true",
+                        help="Actualiza los feeds pre-generados por temporada y género en lugar de exportar")
+    argumentos = parser.parse_args()
+
+    main(argumentos.formato, argumentos.salida, argumentos.temporada, argumentos.genero, argumentos.regenerar_feeds)
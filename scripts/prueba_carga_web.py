@@ -0,0 +1,606 @@
+# scripts/prueba_carga_web.py
+
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from utils.config import Config
+from utils.excepciones import ManejoExcepciones, ExcepcionConfig, ExcepcionPruebaCarga
+from utils import snapshot_calendario
+
+# Constantes para la configuración
+CTE_RUTA_CONFIG = "src/config/"
+CTE_NOMBRE_CONFIG_PROPERTIES = "config.properties"
+
+# Rutas de la aplicación que se pueden incluir en la mezcla de peticiones ('@fecha@' se sustituye por un día de la temporada)
+CTE_RUTAS_PRUEBA = {
+    'calendario': "/calendario",
+    'dia': "/calendario/dia/@fecha@",
+    'proximas': "/calendario/proximas?n=10",
+    'metrics': "/metrics"
+}
+
+CTE_FORMATO_FECHA_URL = "%d-%m-%Y"
+CTE_PERCENTILES = (50, 95, 99)
+CTE_SEGUNDOS_ESPERA_ARRANQUE = 30
+CTE_TIMEOUT_PETICION_SEGUNDOS = 30
+
+
+class PruebaCargaWeb:
+
+    """
+    Prueba de carga de las rutas del calendario de la aplicación web.
+
+    Arranca la aplicación como en producción: varios procesos worker que aceptan conexiones del
+    mismo socket y atienden cada una en un hilo, sobre un directorio de trabajo temporal con una
+    copia de la configuración y un snapshot sintético del calendario. Después la
+    bombardea desde varios procesos cliente con la concurrencia y la mezcla de rutas indicadas
+    durante un tiempo fijo (descartando un calentamiento inicial) y calcula el rendimiento y
+    los percentiles de latencia de cada ruta y del total.
+
+    Cada ejecución se añade como una línea JSON al fichero de resultados, con la versión del
+    código, para poder comparar la capacidad entre versiones; el informe incluye la variación
+    respecto a la última ejecución con los mismos parámetros.
+
+    Atributos:
+        config (Config): Configuración del proceso.
+        logger (logging.Logger): Logger del proceso.
+        parametros (dict): Parámetros de la prueba (workers, concurrencia, mezcla, duración...).
+    """
+
+    def __init__(self, config: Config, **sobrescritos) -> None:
+
+        """
+        Inicializa la prueba leyendo la sección [prueba_carga] de la configuración general.
+
+        Parámetros:
+            config (Config): Configuración del proceso.
+            **sobrescritos: Parámetros que sustituyen a los de la configuración (los None se ignoran).
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionConfig: Si falta o es inválida la configuración de la prueba.
+        """
+
+        self.config = config
+        self.logger = config.obtener_logger()
+
+        try:
+            config_general = config.obtener_fichero_config_general()
+            self._formato_fecha = config_general["fechas.formato_generico"]
+            self._ruta_resultados = config_general["prueba_carga.ruta_resultados"]
+
+            valores = {
+                'trabajadores': config_general["prueba_carga.trabajadores"],
+                'procesos_cliente': config_general["prueba_carga.procesos_cliente"],
+                'concurrencia': config_general["prueba_carga.concurrencia"],
+                'duracion_segundos': config_general["prueba_carga.duracion_segundos"],
+                'calentamiento_segundos': config_general["prueba_carga.calentamiento_segundos"],
+                'mezcla': config_general["prueba_carga.mezcla"],
+                'grupos_sinteticos': config_general["prueba_carga.grupos_sinteticos"],
+                'competiciones_por_grupo': config_general["prueba_carga.competiciones_por_grupo"]
+            }
+            valores.update({clave: valor for clave, valor in sobrescritos.items() if valor is not None})
+
+            self.parametros = {
+                'trabajadores': int(valores['trabajadores']),
+                'procesos_cliente': int(valores['procesos_cliente']),
+                'concurrencia': int(valores['concurrencia']),
+                'duracion_segundos': float(valores['duracion_segundos']),
+                'calentamiento_segundos': float(valores['calentamiento_segundos']),
+                'mezcla': parsear_mezcla(valores['mezcla']),
+                'grupos_sinteticos': int(valores['grupos_sinteticos']),
+                'competiciones_por_grupo': int(valores['competiciones_por_grupo'])
+            }
+
+        except (KeyError, ValueError) as e:
+            raise ExcepcionConfig("Falta o es inválida la configuración de la sección [prueba_carga]") from e
+
+        if min(self.parametros['trabajadores'], self.parametros['procesos_cliente'], self.parametros['concurrencia']) < 1:
+            raise ExcepcionConfig("Los workers, procesos cliente y concurrencia de la prueba de carga deben ser al menos 1")
+
+
+    def ejecutar(self, etiqueta: Optional[str] = None) -> dict:
+
+        """
+        Ejecuta la prueba completa: prepara el entorno, arranca los workers, lanza la carga,
+        guarda el resultado y detiene los workers.
+
+        Parámetros:
+            etiqueta (str, optional): Versión con la que se guarda el resultado. Default es el commit actual.
+
+        Salida:
+            dict: Resultado de la prueba (el que se añade al fichero de resultados).
+
+        Lanza:
+            ExcepcionPruebaCarga: Si la aplicación no llega a responder.
+        """
+
+        import multiprocessing
+
+        directorio = tempfile.mkdtemp(prefix="prueba_carga_")
+        contexto = multiprocessing.get_context("fork")
+        trabajadores = []
+        escucha = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        try:
+            fechas = self._preparar_directorio(directorio)
+
+            escucha.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            escucha.bind(("127.0.0.1", 0))
+            escucha.listen(1024)
+            puerto = escucha.getsockname()[1]
+
+            # Se importa antes de crear los workers para que la compartan ya cargada
+            import app as aplicacion_web
+
+            for _ in range(self.parametros['trabajadores']):
+                trabajador = contexto.Process(target=_servir_trabajador,
+                                              args=(aplicacion_web.app, escucha.fileno(), directorio),
+                                              daemon=True)
+                trabajador.start()
+                trabajadores.append(trabajador)
+
+            self._esperar_arranque(puerto)
+            self.logger.info(f"Prueba de carga: {self.parametros['trabajadores']} workers en el puerto {puerto}, "
+                             f"concurrencia {self.parametros['concurrencia']} durante {self.parametros['duracion_segundos']} s")
+
+            resultado = self._lanzar_carga(puerto, fechas)
+
+        finally:
+            for trabajador in trabajadores:
+                trabajador.terminate()
+
+            for trabajador in trabajadores:
+                trabajador.join()
+
+            escucha.close()
+            shutil.rmtree(directorio, ignore_errors=True)
+
+        resultado = {
+            'fecha': datetime.now().isoformat(timespec="seconds"),
+            'version': etiqueta or _obtener_version_codigo(),
+            'parametros': self.parametros,
+            **resultado
+        }
+        resultado['anterior'] = self._guardar_resultado(resultado)
+
+        return resultado
+
+
+    def _preparar_directorio(self, directorio: str) -> List[str]:
+
+        """
+        Crea el directorio de trabajo de los workers: una copia de la configuración general que apunta
+        a un snapshot sintético publicado en el propio directorio.
+
+        Parámetros:
+            directorio (str): Directorio de trabajo temporal.
+
+        Salida:
+            list[str]: Días de la temporada sintética en el formato de la URL, para la ruta 'dia'.
+        """
+
+        import configparser
+
+        anyo = datetime.now().year
+        grupos = generar_calendario_sintetico(self.parametros['grupos_sinteticos'], self.parametros['competiciones_por_grupo'],
+                                              anyo, self._formato_fecha)
+        ruta_snapshot = os.path.join(directorio, "datos", "calendario.snap")
+        os.makedirs(os.path.dirname(ruta_snapshot))
+        snapshot_calendario.publicar_snapshot(ruta_snapshot, grupos, self._formato_fecha)
+
+        propiedades = configparser.ConfigParser(interpolation=None)
+        propiedades.read(f"{CTE_RUTA_CONFIG}{CTE_NOMBRE_CONFIG_PROPERTIES}")
+        propiedades.set("snapshot", "ruta", ruta_snapshot)
+        propiedades.set("metricas", "ruta_estadisticas_cron", os.path.join(directorio, "datos", "estadisticas_cron.json"))
+
+        os.makedirs(os.path.join(directorio, CTE_RUTA_CONFIG))
+
+        with open(os.path.join(directorio, CTE_RUTA_CONFIG, CTE_NOMBRE_CONFIG_PROPERTIES), "w", encoding="utf-8") as fichero:
+            propiedades.write(fichero)
+
+        inicio = datetime(anyo, 1, 1)
+
+        return [(inicio + timedelta(days=dia)).strftime(CTE_FORMATO_FECHA_URL) for dia in range(365)]
+
+
+    def _esperar_arranque(self, puerto: int) -> None:
+
+        import http.client
+
+        limite = time.monotonic() + CTE_SEGUNDOS_ESPERA_ARRANQUE
+
+        while True:
+            try:
+                conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=CTE_TIMEOUT_PETICION_SEGUNDOS)
+                conexion.request("GET", CTE_RUTAS_PRUEBA['calendario'])
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                conexion.close()
+
+                if respuesta.status == 200:
+                    return
+
+            except OSError:
+                pass
+
+            if time.monotonic() > limite:
+                raise ExcepcionPruebaCarga(f"La aplicación no respondió en {CTE_SEGUNDOS_ESPERA_ARRANQUE} s")
+
+            time.sleep(0.1)
+
+
+    def _lanzar_carga(self, puerto: int, fechas: List[str]) -> dict:
+
+        """
+        Reparte la concurrencia entre los procesos cliente y agrega sus latencias.
+
+        Parámetros:
+            puerto (int): Puerto de la aplicación.
+            fechas (list[str]): Días para la ruta 'dia'.
+
+        Salida:
+            dict: 'total' y 'rutas' con peticiones, errores, rendimiento y percentiles.
+        """
+
+        procesos = min(self.parametros['procesos_cliente'], self.parametros['concurrencia'])
+        hilos = [self.parametros['concurrencia'] // procesos + (1 if indice < self.parametros['concurrencia'] % procesos else 0)
+                 for indice in range(procesos)]
+        inicio_medicion = time.time() + self.parametros['calentamiento_segundos']
+        fin = inicio_medicion + self.parametros['duracion_segundos']
+        latencias: Dict[str, List[float]] = {nombre: [] for nombre in self.parametros['mezcla']}
+        errores: Dict[str, int] = {nombre: 0 for nombre in self.parametros['mezcla']}
+
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(_ejecutar_cliente, puerto, self.parametros['mezcla'], hilos[indice], fechas,
+                                       inicio_medicion, fin, indice)
+                       for indice in range(procesos)]
+
+            for futuro in futuros:
+                latencias_cliente, errores_cliente = futuro.result()
+
+                for nombre in latencias:
+                    latencias[nombre] += latencias_cliente[nombre]
+                    errores[nombre] += errores_cliente[nombre]
+
+        duracion = self.parametros['duracion_segundos']
+        rutas = {nombre: _resumir_latencias(latencias[nombre], errores[nombre], duracion) for nombre in latencias}
+        total = _resumir_latencias([latencia for lista in latencias.values() for latencia in lista],
+                                   sum(errores.values()), duracion)
+
+        return {'total': total, 'rutas': rutas}
+
+
+    def _guardar_resultado(self, resultado: dict) -> Optional[dict]:
+
+        """
+        Añade el resultado al fichero de resultados y devuelve el de la última ejecución anterior con los mismos parámetros.
+
+        Parámetros:
+            resultado (dict): Resultado de la prueba.
+
+        Salida:
+            dict: Resultado anterior comparable o None si no hay ninguno.
+        """
+
+        anterior = None
+
+        if os.path.exists(self._ruta_resultados):
+            with open(self._ruta_resultados, encoding="utf-8") as fichero:
+                for linea in fichero:
+                    if linea.strip():
+                        registro = json.loads(linea)
+
+                        if registro.get('parametros') == resultado['parametros']:
+                            anterior = registro
+
+        directorio = os.path.dirname(self._ruta_resultados)
+
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        with open(self._ruta_resultados, "a", encoding="utf-8") as fichero:
+            fichero.write(json.dumps({clave: valor for clave, valor in resultado.items() if clave != 'anterior'},
+                                     ensure_ascii=False) + "\n")
+
+        self.logger.info(f"Resultado de la prueba de carga guardado en '{self._ruta_resultados}'")
+
+        return anterior
+
+
+def parsear_mezcla(texto: str) -> Dict[str, float]:
+
+    """
+    Convierte la mezcla de peticiones de la configuración en pesos por ruta.
+
+    Ejemplo:
+        'calendario:1,dia:6,proximas:3' se convierte en {'calendario': 1.0, 'dia': 6.0, 'proximas': 3.0}
+
+    Parámetros:
+        texto (str): Pares 'ruta:peso' separados por comas (rutas de CTE_RUTAS_PRUEBA).
+
+    Salida:
+        dict: Ruta -> peso.
+
+    Lanza:
+        ValueError: Si alguna ruta no existe o algún peso no es un número positivo.
+    """
+
+    mezcla = {}
+
+    for elemento in texto.split(","):
+        nombre, _, peso = elemento.strip().partition(":")
+
+        if nombre not in CTE_RUTAS_PRUEBA:
+            raise ValueError(f"Ruta '{nombre}' desconocida en la mezcla; disponibles: {', '.join(CTE_RUTAS_PRUEBA)}")
+
+        mezcla[nombre] = float(peso or 1)
+
+        if mezcla[nombre] <= 0:
+            raise ValueError(f"El peso de la ruta '{nombre}' debe ser positivo")
+
+    return mezcla
+
+
+def generar_calendario_sintetico(numero_grupos: int, competiciones_por_grupo: int, anyo: int,
+                                 formato_fecha: str, semilla: int = 0) -> List[dict]:
+
+    """
+    Genera un calendario desglosado sintético (misma estructura que DesglosarGruposCompeticiones)
+    con grupos de vueltas y de clásicas alternos repartidos por la temporada.
+
+    Parámetros:
+        numero_grupos (int): Número de grupos.
+        competiciones_por_grupo (int): Competiciones de cada grupo.
+        anyo (int): Temporada.
+        formato_fecha (str): Formato de las fechas.
+        semilla (int, optional): Semilla del generador, para que el calendario sea reproducible. Default es 0.
+
+    Salida:
+        list[dict]: Calendario desglosado.
+    """
+
+    aleatorio = random.Random(semilla)
+    inicio_temporada = datetime(anyo, 1, 15)
+    grupos = []
+
+    for indice_grupo in range(numero_grupos):
+        es_grupo_vueltas = indice_grupo % 2 == 0
+        desglose = []
+
+        for indice in range(competiciones_por_grupo):
+            inicio = inicio_temporada + timedelta(days=aleatorio.randrange(300))
+
+            if es_grupo_vueltas:
+                numero_etapas = aleatorio.choice((5, 6, 7, 8, 21))
+                desglose.append({
+                    'url': f"https://www.velogames.com/sintetico/{indice_grupo}/{indice}/",
+                    'descripcion': f"Vuelta sintética {indice_grupo}-{indice}",
+                    'tipo_vuelta': "gran_vuelta" if numero_etapas == 21 else "vuelta_menor",
+                    'numero_etapas': numero_etapas,
+                    'fecha_inicio': inicio.strftime(formato_fecha),
+                    'fecha_fin': (inicio + timedelta(days=numero_etapas - 1)).strftime(formato_fecha)
+                })
+
+            else:
+                desglose.append({
+                    'numero_clasica': str(indice + 1),
+                    'fecha_clasica': (inicio + timedelta(hours=11)).strftime(formato_fecha),
+                    'nombre_clasica': f"Clásica sintética {indice_grupo}-{indice}",
+                    'categoria': aleatorio.choice("ABC")
+                })
+
+        grupos.append({
+            'nombre': f"Grupo sintético {indice_grupo}",
+            'genero': aleatorio.choice(("masculino", "femenino")),
+            'url': f"https://www.velogames.com/sintetico/{indice_grupo}/",
+            'tipo_grupo': "grupo_vueltas" if es_grupo_vueltas else "grupo_clasicas",
+            'desglose_grupo_competiciones': desglose
+        })
+
+    return grupos
+
+
+def formatear_informe(resultado: dict) -> str:
+
+    """
+    Formatea el resultado de una prueba de carga como tabla, con la variación respecto a la anterior comparable.
+
+    Parámetros:
+        resultado (dict): Resultado devuelto por PruebaCargaWeb.ejecutar().
+
+    Salida:
+        str: Informe para la consola.
+    """
+
+    anterior = resultado.get('anterior') or {}
+    lineas = [f"Prueba de carga {resultado['fecha']} (versión {resultado['version']})",
+              f"{'ruta':<12}{'peticiones':>12}{'errores':>9}{'pet/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+
+    for nombre, datos in list(resultado['rutas'].items()) + [("TOTAL", resultado['total'])]:
+        lineas.append(f"{nombre:<12}{datos['peticiones']:>12}{datos['errores']:>9}{datos['peticiones_por_segundo']:>10.1f}"
+                      + "".join(f"{datos[f'p{percentil}_ms']:>10.2f}" for percentil in CTE_PERCENTILES))
+
+    if anterior:
+        total_anterior = anterior['total']
+        lineas.append(f"Respecto a {anterior['fecha']} (versión {anterior['version']}): "
+                      f"pet/s {_variacion(resultado['total']['peticiones_por_segundo'], total_anterior['peticiones_por_segundo'])}, "
+                      f"p99 {_variacion(resultado['total']['p99_ms'], total_anterior['p99_ms'])}")
+
+    return "\n".join(lineas)
+
+
+def _servir_trabajador(aplicacion, descriptor: int, directorio: str) -> None:
+
+    """
+    Sirve la aplicación en un proceso worker aceptando conexiones del socket compartido.
+
+    Parámetros:
+        aplicacion (Flask): Aplicación web.
+        descriptor (int): Descriptor del socket de escucha heredado del proceso padre.
+        directorio (str): Directorio de trabajo con la configuración de la prueba.
+
+    Salida:
+        None
+    """
+
+    import logging
+    from werkzeug.serving import make_server
+
+    os.chdir(directorio)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    servidor = make_server("127.0.0.1", 0, aplicacion, threaded=True, fd=descriptor)
+    servidor.serve_forever()
+
+
+def _ejecutar_cliente(puerto: int, mezcla: Dict[str, float], hilos: int, fechas: List[str],
+                      inicio_medicion: float, fin: float, semilla: int) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+
+    """
+    Proceso cliente: lanza peticiones desde varios hilos hasta 'fin' y devuelve las latencias
+    de las que empiezan después de 'inicio_medicion'.
+
+    Parámetros:
+        puerto (int): Puerto de la aplicación.
+        mezcla (dict): Ruta -> peso.
+        hilos (int): Hilos de este proceso (peticiones simultáneas).
+        fechas (list[str]): Días para la ruta 'dia'.
+        inicio_medicion (float): Instante (epoch) a partir del cual se miden las peticiones.
+        fin (float): Instante (epoch) en que se deja de lanzar peticiones.
+        semilla (int): Semilla de la elección de rutas.
+
+    Salida:
+        tuple: (ruta -> latencias en segundos, ruta -> errores).
+    """
+
+    import http.client
+
+    nombres = list(mezcla)
+    pesos = [mezcla[nombre] for nombre in nombres]
+    latencias = {nombre: [] for nombre in nombres}
+    errores = {nombre: 0 for nombre in nombres}
+    bloqueo = threading.Lock()
+
+    def lanzar(indice_hilo: int) -> None:
+        aleatorio = random.Random(semilla * 1000 + indice_hilo)
+        latencias_hilo = {nombre: [] for nombre in nombres}
+        errores_hilo = {nombre: 0 for nombre in nombres}
+
+        while (ahora := time.time()) < fin:
+            nombre = aleatorio.choices(nombres, pesos)[0]
+            ruta = CTE_RUTAS_PRUEBA[nombre].replace("@fecha@", aleatorio.choice(fechas))
+            inicio = time.perf_counter()
+
+            try:
+                conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=CTE_TIMEOUT_PETICION_SEGUNDOS)
+                conexion.request("GET", ruta)
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                conexion.close()
+                correcta = respuesta.status == 200
+
+            except OSError:
+                correcta = False
+
+            if ahora >= inicio_medicion:
+                latencias_hilo[nombre].append(time.perf_counter() - inicio)
+                errores_hilo[nombre] += 0 if correcta else 1
+
+        with bloqueo:
+            for nombre in nombres:
+                latencias[nombre] += latencias_hilo[nombre]
+                errores[nombre] += errores_hilo[nombre]
+
+    hilos_cliente = [threading.Thread(target=lanzar, args=(indice,)) for indice in range(hilos)]
+
+    for hilo in hilos_cliente:
+        hilo.start()
+
+    for hilo in hilos_cliente:
+        hilo.join()
+
+    return latencias, errores
+
+
+def _resumir_latencias(latencias: List[float], errores: int, duracion: float) -> dict:
+    ordenadas = sorted(latencias)
+    resumen = {
+        'peticiones': len(ordenadas),
+        'errores': errores,
+        'peticiones_por_segundo': len(ordenadas) / duracion if duracion else 0.0,
+        'media_ms': 1000 * sum(ordenadas) / len(ordenadas) if ordenadas else 0.0
+    }
+
+    for percentil in CTE_PERCENTILES:
+        # Percentil por rango más cercano
+        resumen[f'p{percentil}_ms'] = 1000 * ordenadas[max(0, math.ceil(percentil / 100 * len(ordenadas)) - 1)] if ordenadas else 0.0
+
+    return resumen
+
+
+def _variacion(actual: float, anterior: float) -> str:
+    return f"{100 * (actual - anterior) / anterior:+.1f}%" if anterior else "n/d"
+
+
+def _obtener_version_codigo() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocida"
+
+
+def main(etiqueta: Optional[str] = None, **sobrescritos) -> None:
+
+    """
+    Función principal: ejecuta la prueba de carga y muestra el informe por consola.
+
+    Parámetros:
+        etiqueta (str, optional): Versión con la que se guarda el resultado. Default es el commit actual.
+        **sobrescritos: Parámetros de la prueba que sustituyen a los de la configuración.
+
+    Salida:
+        None
+    """
+
+    proceso = os.path.splitext(os.path.basename(__file__))[0]
+    config = Config(ruta_config=CTE_RUTA_CONFIG, nombre_config=CTE_NOMBRE_CONFIG_PROPERTIES, proceso=proceso)
+    logger = config.obtener_logger()
+
+    try:
+        print(formatear_informe(PruebaCargaWeb(config, **sobrescritos).ejecutar(etiqueta)))
+
+    except Exception as e:
+        logger.error(ManejoExcepciones.formatear_trazas_excepciones(e))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prueba de carga de las rutas del calendario de la aplicación web")
+    parser.add_argument("--trabajadores", type=int, help="Procesos worker de la aplicación")
+    parser.add_argument("--procesos-cliente", type=int, help="Procesos que generan la carga")
+    parser.add_argument("--concurrencia", type=int, help="Peticiones simultáneas en total")
+    parser.add_argument("--duracion", type=float, help="Segundos de medición")
+    parser.add_argument("--calentamiento", type=float, help="Segundos iniciales que no se miden")
+    parser.add_argument("--mezcla", help=f"Pesos por ruta, ej. 'calendario:1,dia:6,proximas:3' (rutas: {', '.join(CTE_RUTAS_PRUEBA)})")
+    parser.add_argument("--etiqueta", help="Versión con la que se guarda el resultado (por defecto, el commit actual)")
+    argumentos = parser.parse_args()
+
+    main(etiqueta=argumentos.etiqueta, trabajadores=argumentos.trabajadores,
+         procesos_cliente=argumentos.procesos_cliente,
+         concurrencia=argumentos.concurrencia, duracion_segundos=argumentos.duracion,
+         calentamiento_segundos=argumentos.calentamiento, mezcla=argumentos.mezcla)
@@ -0,0 +1,132 @@
+# scripts/subprocesos/extractor_fragmento_html.py
+
+from html.parser import HTMLParser
+from typing import List, Optional
+
+
+class ExtractorFragmentoHtml(HTMLParser):
+
+    """
+    Parser incremental que reconstruye el HTML del primer elemento con una etiqueta y clase dadas.
+
+    Se alimenta por trozos con feed() a medida que llega la respuesta HTTP y marca 'completo'
+    en cuanto se cierra el elemento buscado, de forma que el resto de la página no hace falta
+    descargarlo ni parsearlo. Los elementos anidados con la misma etiqueta se tienen en cuenta
+    para no cortar el fragmento antes de tiempo.
+
+    Atributos:
+        etiqueta (str): Etiqueta del elemento buscado (ej. 'table').
+        clase (str): Clase CSS del elemento buscado (ej. 'responsive').
+        completo (bool): True cuando el elemento buscado se ha cerrado.
+    """
+
+    def __init__(self, etiqueta: str, clase: str) -> None:
+
+        """
+        Inicializa el extractor.
+
+        Parámetros:
+            etiqueta (str): Etiqueta del elemento buscado.
+            clase (str): Clase CSS del elemento buscado.
+
+        Salida:
+            None
+        """
+
+        super().__init__(convert_charrefs=False)
+        self.etiqueta = etiqueta.lower()
+        self.clase = clase
+        self.completo = False
+        self._profundidad = 0
+        self._partes: List[str] = []
+
+
+    def obtener_fragmento(self) -> Optional[str]:
+
+        """
+        Devuelve el HTML reconstruido del elemento buscado.
+
+        Parámetros:
+            None
+
+        Salida:
+            str: HTML del elemento (completo o hasta donde se haya leído) o None si no se ha encontrado.
+        """
+
+        if not self._partes:
+            return None
+
+        return "".join(self._partes)
+
+
+    def _tiene_clase(self, atributos: list) -> bool:
+
+        """
+        Comprueba si los atributos de una etiqueta incluyen la clase buscada
+        (como valor completo del atributo o como una de sus clases).
+
+        Parámetros:
+            atributos (list): Lista de tuplas (nombre, valor) de la etiqueta.
+
+        Salida:
+            bool: True si la etiqueta tiene la clase buscada.
+        """
+
+        for nombre, valor in atributos:
+
+            if nombre == 'class' and valor and (valor == self.clase or self.clase in valor.split()):
+                return True
+
+        return False
+
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+
+        if self.completo:
+            return
+
+        if self._profundidad == 0:
+
+            if tag != self.etiqueta or not self._tiene_clase(attrs):
+                return
+
+        self._partes.append(self.get_starttag_text())
+
+        if tag == self.etiqueta:
+            self._profundidad += 1
+
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+
+        if self._profundidad > 0 and not self.completo:
+            self._partes.append(self.get_starttag_text())
+
+
+    def handle_endtag(self, tag: str) -> None:
+
+        if self._profundidad == 0 or self.completo:
+            return
+
+        self._partes.append(f"</{tag}>")
+
+        if tag == self.etiqueta:
+            self._profundidad -= 1
+            self.completo = self._profundidad == 0
+
+
+    def handle_data(self, data: str) -> None:
+
+        if self._profundidad > 0 and not self.completo:
+            self._partes.append(data)
+
+
+    def handle_entityref(self, name: str) -> None:
+
+        if self._profundidad > 0 and not self.completo:
+            self._partes.append(f"&{name};")
+
+
+    def handle_charref(self, name: str) -> None:
+
+        if self._profundidad > 0 and not self.completo:
+            self._partes.append(f"&#{name};")
@@ -1,15 +1,74 @@
 # scripts/subprocesos/scrapping_base.py
 
-from bs4 import BeautifulSoup
-import requests
 from utils.config import Config
 from utils import string_utils
-from utils.excepciones import ExcepcionScrapping
-from requests.exceptions import RequestException
-from typing import Optional, Any
+from utils.excepciones import ExcepcionScrapping, ExcepcionPlazoAgotado
+from utils.limitador_tasa import LimitadorTasa
+from utils.plazo_ejecucion import PlazoEjecucion
+from typing import Callable, Dict, Optional, Any, Tuple, Union, TYPE_CHECKING
+from urllib.parse import urlsplit
+import re
+import threading
+
+# bs4 y requests se importan en el primer uso para no penalizar el arranque del proceso
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    import requests
+    from utils.revalidacion_urls import RevalidacionUrls
+
+# Tamaño de los trozos en la lectura incremental de respuestas
+CTE_TAMANYO_TROZO_LECTURA = 16 * 1024
+
+# Bytes del inicio de la página en los que se busca la declaración <meta charset>
+CTE_BYTES_BUSQUEDA_META_CHARSET = 4 * 1024
+CTE_PATRON_CHARSET_CABECERA = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+CTE_PATRON_CHARSET_META = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+CTE_CODIFICACION_POR_DEFECTO = "utf-8"
+
+# Timeout de conexión y de cada lectura de una petición si la configuración no indica otro
+CTE_TIMEOUT_PETICION_SEGUNDOS = 30
+
+# Conexiones keep-alive que la sesión compartida mantiene por host (descargas concurrentes)
+CTE_CONEXIONES_POR_HOST = 16
+
+def _es_codificacion_valida(codificacion: str) -> bool:
+
+    """
+    Comprueba que Python conoce la codificación indicada.
+
+    Parámetros:
+        codificacion (str): Nombre de la codificación.
+
+    Salida:
+        bool: True si la codificación existe.
+    """
+
+    import codecs
+
+    try:
+        codecs.lookup(codificacion)
+        return True
+
+    except LookupError:
+        return False
+
 
 class ScrappingBase:
 
+    # Sesión HTTP compartida por todos los subprocesos (reutiliza conexiones keep-alive)
+    _sesion_http = None
+
+    # Codificación resuelta para cada host (se detecta una vez y se reutiliza)
+    _codificaciones_host: Dict[str, str] = {}
+    _bloqueo_codificaciones = threading.Lock()
+
+    # Limitador de peticiones compartido por todos los subprocesos e hilos (None si no hay límite)
+    _limitador_tasa: Optional[LimitadorTasa] = None
+    _bloqueo_limitador = threading.Lock()
+
+    # Plazo de la ejecución en curso, que acota el timeout de cada petición (None si no hay plazo)
+    _plazo_ejecucion: Optional[PlazoEjecucion] = None
+
     def __init__(self) -> None:
 
         """
@@ -31,6 +90,16 @@ class ScrappingBase:
             self.config_general = config_instance.obtener_fichero_config_general()
             self.config_proceso = config_instance.obtener_fichero_config_proceso()
 
+            self.codificacion_forzada = self.obtener_valor_config_general("http", "codificacion_forzada") or None
+            self.codificacion_por_defecto = self.obtener_valor_config_general("http", "codificacion_por_defecto",
+                                                                              CTE_CODIFICACION_POR_DEFECTO)
+            self.memoria_acotada = string_utils.a_booleano(self.obtener_valor_config_general("memoria", "modo_acotado", "false"))
+            self.revalidacion: Optional['RevalidacionUrls'] = None
+            self.timeout_peticion = float(self.obtener_valor_config_general("http", "timeout_segundos",
+                                                                            CTE_TIMEOUT_PETICION_SEGUNDOS))
+            self._configurar_limitador_tasa(float(self.obtener_valor_config_general("http", "peticiones_por_segundo", 0) or 0),
+                                            int(self.obtener_valor_config_general("http", "rafaga_peticiones", 1) or 1))
+
         except Exception as e:
             raise ExcepcionScrapping(f"Error al inicializar la clase base de Scrapping") from e
 
@@ -85,7 +154,219 @@ class ScrappingBase:
             raise ExcepcionScrapping(f"Error inesperado leer la propiedad '{clave}' de la sección {seccion}") from e
 
 
-    def obtener_soup_pagina(self, url: str) -> BeautifulSoup:
+    @classmethod
+    def obtener_sesion_http(cls) -> 'requests.Session':
+
+        """
+        Devuelve la sesión HTTP compartida, creándola en el primer uso.
+
+        Mantener la sesión entre peticiones (y entre actualizaciones en modo daemon)
+        evita repetir la conexión TCP y el handshake TLS con cada página.
+
+        Parámetros:
+            None
+
+        Salida:
+            requests.Session: Sesión HTTP compartida.
+        """
+
+        if cls._sesion_http is None:
+            import requests
+            sesion = requests.Session()
+            adaptador = requests.adapters.HTTPAdapter(pool_connections=CTE_CONEXIONES_POR_HOST,
+                                                      pool_maxsize=CTE_CONEXIONES_POR_HOST)
+            sesion.mount("http://", adaptador)
+            sesion.mount("https://", adaptador)
+            ScrappingBase._sesion_http = sesion
+
+        return cls._sesion_http
+
+
+    @classmethod
+    def cerrar_sesion_http(cls) -> None:
+
+        """
+        Cierra la sesión HTTP compartida y sus conexiones abiertas.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        if ScrappingBase._sesion_http is not None:
+            ScrappingBase._sesion_http.close()
+            ScrappingBase._sesion_http = None
+
+
+    @classmethod
+    def _configurar_limitador_tasa(cls, peticiones_por_segundo: float, rafaga: int) -> None:
+
+        """
+        Crea el limitador de peticiones compartido la primera vez (las siguientes instancias lo reutilizan).
+
+        Parámetros:
+            peticiones_por_segundo (float): Ritmo máximo de peticiones; 0 desactiva el límite.
+            rafaga (int): Peticiones seguidas permitidas tras estar inactivo.
+
+        Salida:
+            None
+        """
+
+        with cls._bloqueo_limitador:
+            if ScrappingBase._limitador_tasa is None and peticiones_por_segundo > 0:
+                ScrappingBase._limitador_tasa = LimitadorTasa(peticiones_por_segundo, rafaga)
+
+
+    @classmethod
+    def establecer_plazo_ejecucion(cls, plazo: Optional[PlazoEjecucion]) -> None:
+
+        """
+        Establece el plazo de la ejecución en curso para todos los subprocesos e hilos (None lo quita).
+
+        Parámetros:
+            plazo (PlazoEjecucion): Plazo de la ejecución.
+
+        Salida:
+            None
+        """
+
+        ScrappingBase._plazo_ejecucion = plazo
+
+
+    def plazo_agotado(self) -> bool:
+
+        """
+        Indica si se ha agotado el plazo de la ejecución en curso.
+
+        Parámetros:
+            None
+
+        Salida:
+            bool: True si hay un plazo establecido y ya ha vencido.
+        """
+
+        plazo = ScrappingBase._plazo_ejecucion
+        return plazo is not None and plazo.agotado()
+
+
+    def registrar_omision(self, descripcion: str) -> None:
+
+        """
+        Registra en el plazo de la ejecución en curso un trabajo que se deja sin hacer (sin plazo no hace nada).
+
+        Parámetros:
+            descripcion (str): Trabajo omitido.
+
+        Salida:
+            None
+        """
+
+        plazo = ScrappingBase._plazo_ejecucion
+
+        if plazo is not None:
+            plazo.registrar_omision(descripcion)
+
+
+    def _calcular_timeout(self, url: str) -> float:
+
+        """
+        Devuelve el timeout de una petición: el configurado, acotado por lo que queda del plazo de la ejecución.
+
+        Parámetros:
+            url (str): URL de la petición.
+
+        Salida:
+            float: Timeout en segundos para la conexión y para cada lectura.
+
+        Lanza:
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se ha agotado.
+        """
+
+        plazo = ScrappingBase._plazo_ejecucion
+
+        if plazo is None:
+            return self.timeout_peticion
+
+        return plazo.acotar_timeout(self.timeout_peticion, f"no se solicita {url}")
+
+
+    def _comprobar_plazo_lectura(self, url: str) -> None:
+
+        """
+        Interrumpe la lectura de una respuesta si el plazo de la ejecución se ha agotado entre dos bloques.
+
+        Parámetros:
+            url (str): URL que se está leyendo.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se ha agotado.
+        """
+
+        plazo = ScrappingBase._plazo_ejecucion
+
+        if plazo is not None:
+            plazo.comprobar(f"lectura de {url} interrumpida")
+
+
+    def _esperar_turno_peticion(self, url: str) -> None:
+
+        """
+        Espera, si hay límite de peticiones por segundo, hasta que la petición tenga turno; nunca
+        más allá del plazo de la ejecución.
+
+        Parámetros:
+            url (str): URL de la petición.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se agota antes de que la petición tenga turno.
+        """
+
+        limitador = ScrappingBase._limitador_tasa
+        plazo = ScrappingBase._plazo_ejecucion
+
+        if limitador is not None:
+            if plazo is not None:
+                plazo.comprobar(f"no se solicita {url}")
+
+            esperado = limitador.esperar(plazo.restante() if plazo is not None else None)
+
+            if esperado is None:
+                raise ExcepcionPlazoAgotado(f"Plazo de ejecución de {plazo.presupuesto_segundos:g} s agotado "
+                                            f"esperando turno de petición: no se solicita {url}")
+
+            if esperado:
+                self.logger.debug(f"Petición retenida {esperado:.2f} s por el límite de peticiones por segundo")
+
+
+    def obtener_revalidado(self, url: str, descargar: Callable[[], Any]) -> Any:
+
+        """
+        Obtiene el resultado extraído de una página, descargándola solo si su intervalo de revalidación
+        ha vencido (o siempre, si el subproceso no tiene revalidación).
+
+        Parámetros:
+            url (str): URL de la página.
+            descargar (Callable): Descarga la página y devuelve el resultado extraído de ella.
+
+        Salida:
+            Any: Resultado de 'descargar' o el último registrado para la URL.
+        """
+
+        if self.revalidacion is None:
+            return descargar()
+
+        return self.revalidacion.obtener(url, descargar)
+
+
+    def obtener_soup_pagina(self, url: str) -> 'BeautifulSoup':
 
         """
         Realiza la solicitud HTTP y convierte el contenido de la página a un objeto BeautifulSoup.
@@ -98,22 +379,226 @@ class ScrappingBase:
 
         Lanza:
             ExcepcionScrapping: Si ocurre un error al realizar la solicitud HTTP.
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se agota antes o durante la solicitud.
+        """
+
+        contenido, codificacion = self.obtener_contenido_pagina(url)
+
+        try:
+            return self.crear_soup(contenido, codificacion)
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error inesperado al obtener contenido de la página {url}") from e
+
+
+    def obtener_contenido_pagina(self, url: str) -> Tuple[bytes, Optional[str]]:
+
+        """
+        Realiza la solicitud HTTP y devuelve el contenido sin decodificar de la página.
+
+        Parámetros:
+            url (str): URL de la página a la que se hará la solicitud.
+
+        Salida:
+            tuple: Bytes del cuerpo de la respuesta y su codificación (ver _resolver_codificacion).
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre un error al realizar la solicitud HTTP.
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se agota antes o durante la solicitud.
         """
 
+        import requests
+
         try:
             self.logger.info(f"Realizando la solicitud a: {url}")
-            response = requests.get(url)
-            response.raise_for_status()
+            self._esperar_turno_peticion(url)
+
+            with self.obtener_sesion_http().get(url, timeout=self._calcular_timeout(url), stream=True) as response:
+                response.raise_for_status()
+                trozos = []
+
+                # El plazo se comprueba entre trozos: una respuesta lenta no puede alargar la ejecución indefinidamente
+                for trozo in response.iter_content(chunk_size=CTE_TAMANYO_TROZO_LECTURA):
+                    self._comprobar_plazo_lectura(url)
+                    trozos.append(trozo)
 
-            return BeautifulSoup(response.text, 'html.parser')
+                contenido = b"".join(trozos)
+
+            return contenido, self._resolver_codificacion(url, response.headers.get('Content-Type'), contenido)
+
+        except ExcepcionPlazoAgotado:
+            raise
+
+        except requests.RequestException as re:
+            if self.plazo_agotado():
+                raise ExcepcionPlazoAgotado(f"Plazo de ejecución agotado durante la solicitud a {url}") from re
 
-        except RequestException as re:
             raise ExcepcionScrapping(f"Error al realizar la solicitud HTTP a {url}") from re
 
         except Exception as e:
             raise ExcepcionScrapping(f"Error inesperado al obtener contenido de la página {url}") from e
 
 
+    def obtener_fragmento_pagina(self, url: str, etiqueta: str, clase: str) -> Optional[str]:
+
+        """
+        Descarga una página por trozos y devuelve solo el HTML del primer elemento con la etiqueta
+        y clase indicadas, cerrando la conexión en cuanto ese elemento termina.
+
+        El resto de la página no se descarga, decodifica ni parsea.
+
+        Parámetros:
+            url (str): URL de la página a la que se hará la solicitud.
+            etiqueta (str): Etiqueta del elemento buscado (ej. 'table').
+            clase (str): Clase CSS del elemento buscado (ej. 'responsive').
+
+        Salida:
+            str: HTML del elemento o None si la página no lo contiene.
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre un error al realizar la solicitud HTTP.
+            ExcepcionPlazoAgotado: Si el plazo de la ejecución se agota antes o durante la solicitud.
+        """
+
+        import codecs
+        import requests
+        from .extractor_fragmento_html import ExtractorFragmentoHtml
+
+        try:
+            self.logger.info(f"Realizando la solicitud incremental a: {url}")
+            extractor = ExtractorFragmentoHtml(etiqueta, clase)
+            self._esperar_turno_peticion(url)
+
+            with self.obtener_sesion_http().get(url, timeout=self._calcular_timeout(url), stream=True) as response:
+                response.raise_for_status()
+                decodificador = None
+                bytes_leidos = 0
+
+                for trozo in response.iter_content(chunk_size=CTE_TAMANYO_TROZO_LECTURA):
+                    self._comprobar_plazo_lectura(url)
+                    bytes_leidos += len(trozo)
+
+                    if decodificador is None:
+                        codificacion = self._resolver_codificacion(url, response.headers.get('Content-Type'), trozo)
+                        decodificador = codecs.getincrementaldecoder(codificacion)(errors='replace')
+
+                    extractor.feed(decodificador.decode(trozo))
+
+                    if extractor.completo:
+                        break
+
+            self.logger.debug(f"Lectura incremental de {url} detenida tras {bytes_leidos} bytes")
+
+            return extractor.obtener_fragmento()
+
+        except ExcepcionPlazoAgotado:
+            raise
+
+        except requests.RequestException as re:
+            if self.plazo_agotado():
+                raise ExcepcionPlazoAgotado(f"Plazo de ejecución agotado durante la solicitud a {url}") from re
+
+            raise ExcepcionScrapping(f"Error al realizar la solicitud HTTP a {url}") from re
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error inesperado al obtener contenido de la página {url}") from e
+
+
+    def _resolver_codificacion(self, url: str, content_type: Optional[str], inicio_contenido: bytes) -> str:
+
+        """
+        Resuelve la codificación de una respuesta sin analizar el cuerpo completo.
+
+        Orden de resolución:
+            1. Codificación forzada en la configuración ([http] codificacion_forzada).
+            2. charset declarado en la cabecera Content-Type de la respuesta.
+            3. Codificación ya resuelta para el mismo host.
+            4. <meta charset> en los primeros bytes de la página (se guarda para el host).
+            5. Codificación por defecto de la configuración ([http] codificacion_por_defecto).
+
+        Parámetros:
+            url (str): URL de la respuesta.
+            content_type (str): Cabecera Content-Type de la respuesta (o None).
+            inicio_contenido (bytes): Primeros bytes del cuerpo (o el cuerpo completo).
+
+        Salida:
+            str: Nombre de la codificación a usar.
+        """
+
+        if self.codificacion_forzada:
+            return self.codificacion_forzada
+
+        if content_type:
+            coincidencia = CTE_PATRON_CHARSET_CABECERA.search(content_type)
+
+            if coincidencia and _es_codificacion_valida(coincidencia.group(1)):
+                return coincidencia.group(1)
+
+        host = urlsplit(url).netloc
+        codificacion = ScrappingBase._codificaciones_host.get(host)
+
+        if codificacion is not None:
+            return codificacion
+
+        coincidencia = CTE_PATRON_CHARSET_META.search(inicio_contenido[:CTE_BYTES_BUSQUEDA_META_CHARSET])
+        codificacion = coincidencia.group(1).decode('ascii') if coincidencia else self.codificacion_por_defecto
+
+        if not _es_codificacion_valida(codificacion):
+            codificacion = self.codificacion_por_defecto
+
+        with ScrappingBase._bloqueo_codificaciones:
+            ScrappingBase._codificaciones_host.setdefault(host, codificacion)
+
+        self.logger.debug(f"Codificación resuelta para {host}: {codificacion}")
+
+        return codificacion
+
+
+    @staticmethod
+    def crear_soup(contenido: Union[bytes, str], codificacion: Optional[str] = None) -> 'BeautifulSoup':
+
+        """
+        Convierte el contenido de una página a un objeto BeautifulSoup.
+
+        Si se conoce la codificación, los bytes se decodifican una sola vez con ella (los bytes
+        inválidos se sustituyen), sin que BeautifulSoup tenga que detectar el charset.
+
+        Parámetros:
+            contenido (bytes | str): Bytes de la página o HTML ya decodificado.
+            codificacion (str, optional): Codificación de los bytes, si se conoce.
+
+        Salida:
+            BeautifulSoup: Objeto BeautifulSoup con el contenido de la página.
+        """
+
+        from bs4 import BeautifulSoup
+
+        if isinstance(contenido, bytes) and codificacion:
+            contenido = contenido.decode(codificacion, errors='replace')
+
+        return BeautifulSoup(contenido, 'html.parser')
+
+
+    def liberar_soup(self, soup: Optional['BeautifulSoup']) -> None:
+
+        """
+        En modo de memoria acotada, destruye el árbol de un soup ya extraído.
+
+        Los árboles de BeautifulSoup están llenos de referencias cruzadas (padre, hermanos, hijos),
+        así que no se liberan por conteo de referencias al salir de ámbito sino cuando pasa el
+        recolector de ciclos. decompose() rompe esas referencias y libera el árbol en el momento.
+
+        Parámetros:
+            soup (BeautifulSoup): Árbol a liberar (puede ser None).
+
+        Salida:
+            None
+        """
+
+        if self.memoria_acotada and soup is not None:
+            soup.decompose()
+
+
     def limpiar_nombre_competicion(self, nombre_competicion: str, textos_eliminar: list[str]) -> str:
 
         """
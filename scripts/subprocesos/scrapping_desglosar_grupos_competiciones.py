@@ -1,32 +1,120 @@
 # scripts/subprocesos/scrapping_desglosar_grupos_competiciones.py
 
 import os
+import sys
 from .scrapping_base import ScrappingBase
-from bs4 import BeautifulSoup
-from typing import List, Dict, Tuple
+from .selector_compilado import SelectorCompilado
+from typing import Any, List, Dict, Optional, Tuple, Union, TYPE_CHECKING
 from utils import fecha_utils, string_utils
-from utils.excepciones import ExcepcionScrapping
+from utils.excepciones import ExcepcionScrapping, ExcepcionPlazoAgotado, ManejoExcepciones
+from utils.lista_desbordable import ListaDesbordable
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from utils.diario_ejecucion import DiarioEjecucion
+    from utils.revalidacion_urls import RevalidacionUrls
+    from utils.planificador_descargas import PlanificadorDescargas
+
+# Instancia de desglose que usa cada proceso worker del pool de parseo
+_desglose_worker = None
+
+
+def _inicializar_worker_parseo(desglose: 'DesglosarGruposCompeticiones') -> None:
+
+    """
+    Guarda en el proceso worker la copia de la instancia de desglose con la configuración cargada.
+
+    Parámetros:
+        desglose (DesglosarGruposCompeticiones): Instancia enviada al crear el pool.
+
+    Salida:
+        None
+    """
+
+    global _desglose_worker
+    _desglose_worker = desglose
+
+
+def _parsear_en_worker(nombre_metodo: str, *args) -> Any:
+
+    """
+    Ejecuta un método de parseo de la instancia de desglose dentro del proceso worker.
+
+    Parámetros:
+        nombre_metodo (str): Nombre del método de parseo a ejecutar.
+        *args: Argumentos del método (bytes de la página, codificación, ...).
+
+    Salida:
+        Any: Registros extraídos de la página (nunca objetos BeautifulSoup).
+    """
+
+    return getattr(_desglose_worker, nombre_metodo)(*args)
+
+
+def _registrar_detalle_revalidado(revalidacion: 'RevalidacionUrls', url: str, futuro: 'Future') -> None:
+
+    """
+    Registra en la revalidación el resultado de una página de detalle parseada en el pool, si ha terminado bien.
+
+    Parámetros:
+        revalidacion (RevalidacionUrls): Estado de revalidación de las URLs.
+        url (str): URL de la página de detalle.
+        futuro (Future): Parseo de la página en el pool.
+
+    Salida:
+        None
+    """
+
+    if not futuro.cancelled() and futuro.exception() is None:
+        revalidacion.registrar(url, futuro.result())
+
 
 class DesglosarGruposCompeticiones(ScrappingBase):
 
-    def __init__(self, competiciones: list[dict]) -> None:
+    def __init__(self, competiciones: list[dict], diario: Optional['DiarioEjecucion'] = None,
+                 anyo_temporada: Optional[int] = None, revalidacion: Optional['RevalidacionUrls'] = None,
+                 planificador: Optional['PlanificadorDescargas'] = None) -> None:
 
         """
         Inicializa la clase de obtención de grupos de competiciones.
 
         Parámetros:
             competiciones (list[dict]): Lista de grupos de competiciones.
+            diario (DiarioEjecucion, optional): Diario donde se guarda cada grupo terminado y del que
+                                                se recuperan los de una ejecución anterior interrumpida.
+            anyo_temporada (int, optional): Año con el que se completan las fechas de inicio de las vueltas
+                                            (que la web publica sin año). Default es el año actual.
+            revalidacion (RevalidacionUrls, optional): Si se indica, las páginas de grupo y de detalle solo se
+                                                       descargan cuando vence su intervalo de revalidación; si no,
+                                                       se reutiliza lo extraído de ellas la última vez.
+            planificador (PlanificadorDescargas, optional): Si se indica, los grupos se descargan por orden de
+                                                            prioridad y, agotado el plazo de la ejecución, los
+                                                            que quedan conservan su desglose anterior.
 
         Salida:
             None
 
         Lanza:
-            ExcepcionScrapping: Si ocurre algún error al inicializar la clase base de scrapping.
+            ExcepcionScrapping: Si ocurre algún error al inicializar la clase base de scrapping
+                                o la configuración del proceso no es válida.
         """
 
         super().__init__()
         self.competiciones = competiciones
+        self.diario = diario
+        self.anyo_temporada = anyo_temporada
+        self.revalidacion = revalidacion
+        self.planificador = planificador
         self.resultados = []
+        self.grupos_fallidos = []
+        self.grupos_descartados = []
+        self.grupos_omitidos = []
+        self._urls_interrumpidas_plazo = set()
+        self._cargar_valores_configuracion()
+        self._almacen_grupos = ListaDesbordable(self.maximo_grupos_memoria if self.memoria_acotada else sys.maxsize,
+                                                self.directorio_desbordamiento)
+        self._grupos_desglosados = {}
 
 
     def ejecutar(self) -> list[dict]:
@@ -38,6 +126,20 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         o un grupo de clásicas. Busca excepciones en las que una competición dentro de grupo de vueltas
         debe ser tratada como un nuevo grupo de clásicas (sucede con las clásicas de primevera femeninas).
 
+        Los grupos ya guardados en el diario no se vuelven a descargar, y con revalidación tampoco los
+        que no han vencido o quedan fuera del máximo por ejecución. Con planificador, los grupos se
+        descargan de más a menos prioritarios y los que se descartan al agotarse el plazo quedan
+        en 'grupos_descartados' con su desglose anterior. Un grupo que falla no detiene
+        el resto: se registra y se reintenta hasta 'reintentos_grupos_fallidos' veces al final. Los que
+        siguen fallando quedan en 'grupos_fallidos' y no aparecen en la salida. Si el plazo de la
+        ejecución se ha agotado, los que tienen desglose anterior (en el planificador o en la
+        revalidación) se descartan igual, y los que no lo tienen y ha interrumpido el plazo quedan en
+        'grupos_omitidos' en lugar de contar como fallidos.
+
+        En modo de memoria acotada, los árboles de cada página se destruyen tras extraer sus datos y
+        solo se mantienen en memoria 'maximo_grupos_memoria' grupos desglosados; el resto se vuelca a
+        disco y la salida es una ListaDesbordable (recorrible como una lista) en lugar de una lista.
+
         Parámetros:
             None
 
@@ -46,13 +148,251 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         """
 
         self.logger.info("Iniciando el desglose de los grupos de competiciones...")
-        self._cargar_valores_configuracion()
-        
+
+        pendientes = self._ordenar_por_prioridad(self._omitir_grupos_no_vencidos(self._recuperar_grupos_diario()))
+
+        if self.procesos_parseo > 0 and pendientes:
+            fallidos = self._ejecutar_con_pool_parseo(pendientes)
+
+        else:
+            fallidos = self._desglosar_grupos(pendientes, con_presupuesto=True)
+
+        for intento in range(1, self.reintentos_grupos_fallidos + 1):
+
+            if not fallidos or self.plazo_agotado():
+                break
+
+            self.logger.warning(f"Reintento {intento} de {len(fallidos)} grupos fallidos")
+            fallidos = self._desglosar_grupos(fallidos)
+
+        if self.plazo_agotado():
+            # Los grupos conocidos interrumpidos por el plazo conservan su desglose anterior en vez de perderse
+            fallidos = [competicion for competicion in fallidos if not self._descartar_por_presupuesto(competicion)]
+            fallidos = [competicion for competicion in fallidos if not self._omitir_por_plazo(competicion)]
+
+        if self.grupos_descartados:
+            self.logger.warning(f"Plazo de ejecución agotado: {len(self.grupos_descartados)} "
+                                f"grupos conservan su desglose anterior ({', '.join(self.grupos_descartados)})")
+
+        if self.grupos_omitidos:
+            self.logger.warning(f"Plazo de ejecución agotado: {len(self.grupos_omitidos)} grupos sin desglose anterior "
+                                f"quedan fuera del calendario hasta la próxima ejecución ({', '.join(self.grupos_omitidos)})")
+
+        self.grupos_fallidos = fallidos
+        self.resultados = self._componer_resultados()
+
+        if fallidos:
+            self.logger.error(f"No se han podido desglosar {len(fallidos)} grupos: "
+                              f"{', '.join(competicion['nombre'] for competicion in fallidos)}")
+
+        self.logger.info("Desglose de grupos de competiciones finalizado.")
+
+        return self.resultados
+
+
+    def _recuperar_grupos_diario(self) -> list[dict]:
+
+        """
+        Recupera del diario los grupos ya desglosados en una ejecución anterior.
+
+        Parámetros:
+            None
+
+        Salida:
+            list[dict]: Competiciones que quedan pendientes de desglosar.
+        """
+
+        if self.diario is None:
+            return list(self.competiciones)
+
+        pendientes = []
+
         for competicion in self.competiciones:
+            url = string_utils.completar_url(competicion['url'])
+            grupo = self.diario.obtener_grupo(url)
+
+            if grupo is None:
+                pendientes.append(competicion)
+
+            else:
+                self._guardar_grupo_desglosado(url, grupo)
+
+        if len(pendientes) < len(self.competiciones):
+            self.logger.info(f"Recuperados del diario {len(self.competiciones) - len(pendientes)} grupos ya desglosados")
+
+        return pendientes
+
+
+    def _omitir_grupos_no_vencidos(self, competiciones: list[dict]) -> list[dict]:
+
+        """
+        Reutiliza el último desglose de los grupos que no toca revalidar en esta ejecución: los que no han
+        vencido y, si hay 'maximo_grupos_revalidados', los vencidos con menos retraso que los elegidos.
+
+        Parámetros:
+            competiciones (list[dict]): Grupos pendientes de desglosar.
+
+        Salida:
+            list[dict]: Grupos que hay que descargar.
+        """
+
+        if self.revalidacion is None or not competiciones:
+            return competiciones
+
+        urls = [string_utils.completar_url(competicion['url']) for competicion in competiciones]
+        seleccionadas = self.revalidacion.seleccionar(urls, self.maximo_grupos_revalidados)
+        pendientes = []
+
+        for competicion, url in zip(competiciones, urls):
+            if url in seleccionadas:
+                pendientes.append(competicion)
+
+            else:
+                desglose = self.revalidacion.resultado_omitido(url)
+                self._agregar_grupo(competicion, desglose['tipo_grupo'], desglose['desglose_grupo_competiciones'])
+
+        self.logger.info(f"Revalidación: se descargan {len(pendientes)} de {len(competiciones)} grupos")
+
+        return pendientes
+
+
+    def _ordenar_por_prioridad(self, competiciones: list[dict]) -> list[dict]:
+
+        """
+        Ordena los grupos pendientes por la prioridad del planificador (competiciones en curso primero).
+
+        Parámetros:
+            competiciones (list[dict]): Grupos pendientes de desglosar.
+
+        Salida:
+            list[dict]: Grupos en orden de descarga (el orden de la salida no cambia).
+        """
+
+        if self.planificador is None:
+            return competiciones
+
+        return sorted(competiciones, key=lambda competicion: self.planificador.prioridad(
+            string_utils.completar_url(competicion['url'])))
+
+
+    def _descartar_por_presupuesto(self, competicion: dict) -> bool:
+
+        """
+        Si el plazo de la ejecución se ha agotado y se conoce el desglose anterior del grupo, lo agrega
+        con ese desglose en lugar de descargarlo.
+
+        Parámetros:
+            competicion (dict): Grupo a punto de descargarse.
+
+        Salida:
+            bool: True si el grupo se ha descartado.
+        """
+
+        agotado = self.planificador.presupuesto_agotado() if self.planificador is not None else self.plazo_agotado()
+
+        if not agotado:
+            return False
+
+        anterior = self._obtener_desglose_anterior(string_utils.completar_url(competicion['url']))
+
+        if anterior is None:
+            return False
+
+        self._agregar_grupo(competicion, anterior['tipo_grupo'], anterior['desglose_grupo_competiciones'])
+        self.grupos_descartados.append(competicion['nombre'])
+        self.registrar_omision(f"descarga del grupo '{competicion['nombre']}' (conserva su desglose anterior)")
+
+        return True
+
+
+    def _obtener_desglose_anterior(self, url: str) -> Optional[dict]:
+
+        """
+        Busca el último desglose conocido de un grupo: el del calendario anterior (planificador) o,
+        si no, el último registrado en la revalidación.
+
+        Parámetros:
+            url (str): URL del grupo.
+
+        Salida:
+            dict: {'tipo_grupo', 'desglose_grupo_competiciones'} del grupo, o None si no se conoce.
+        """
+
+        anterior = self.planificador.grupo_anterior(url) if self.planificador is not None else None
+
+        if anterior is None and self.revalidacion is not None and self.revalidacion.conocida(url):
+            anterior = self.revalidacion.resultado_omitido(url)
+
+        return anterior
+
+
+    def _omitir_por_plazo(self, competicion: dict) -> bool:
+
+        """
+        Deja fuera de la salida, como omitido y no como fallido, un grupo sin desglose anterior cuya
+        descarga ha interrumpido el plazo de la ejecución.
+
+        Parámetros:
+            competicion (dict): Grupo que ha fallado.
+
+        Salida:
+            bool: True si el grupo se ha omitido.
+        """
+
+        if string_utils.completar_url(competicion['url']) not in self._urls_interrumpidas_plazo:
+            return False
+
+        self.grupos_omitidos.append(competicion['nombre'])
+        self.registrar_omision(f"descarga del grupo '{competicion['nombre']}' (sin desglose anterior)")
+
+        return True
+
+
+    def _registrar_grupo_revalidado(self, competicion: dict, tipo_grupo: str, desglose_grupo_competiciones: list) -> None:
+
+        """
+        Registra el desglose recién descargado de un grupo para ajustar su intervalo de revalidación.
+
+        Parámetros:
+            competicion (dict): Grupo de competiciones.
+            tipo_grupo (str): Tipo del grupo (vueltas o clásicas).
+            desglose_grupo_competiciones (list): Competiciones extraídas del grupo.
+
+        Salida:
+            None
+        """
+
+        if self.revalidacion is not None:
+            self.revalidacion.registrar(string_utils.completar_url(competicion['url']),
+                                        {'tipo_grupo': tipo_grupo, 'desglose_grupo_competiciones': desglose_grupo_competiciones})
+
+
+    def _desglosar_grupos(self, competiciones: list[dict], con_presupuesto: bool = False) -> list[dict]:
+
+        """
+        Desglosa los grupos uno a uno, aislando los fallos de cada grupo.
+
+        Parámetros:
+            competiciones (list[dict]): Grupos de competiciones a desglosar.
+            con_presupuesto (bool, optional): Si es True, se descartan los grupos que quedan al agotarse el
+                                              plazo de la ejecución (no en los reintentos). Default es False.
+
+        Salida:
+            list[dict]: Grupos que han fallado.
+        """
+
+        fallidos = []
+
+        for competicion in competiciones:
+
+            if con_presupuesto and self._descartar_por_presupuesto(competicion):
+                continue
+
             nombre = competicion['nombre']
             genero = competicion['genero']
             url = string_utils.completar_url(competicion['url'])
             self.logger.info(f"Procesando competición: {nombre} ({genero})")
+            soup = None
 
             try:
                 soup = self.obtener_soup_pagina(url)
@@ -60,19 +400,298 @@ class DesglosarGruposCompeticiones(ScrappingBase):
                 excepcion_clasicas_femeninas = self._buscar_excepcion_clasicas_femeninas(soup, genero)
                 desglose_grupo_competiciones = self._extraer_info_grupo(soup, tipo_grupo, url, excepcion_clasicas_femeninas)
                 self._agregar_grupo(competicion, tipo_grupo, desglose_grupo_competiciones)
+                self._registrar_grupo_revalidado(competicion, tipo_grupo, desglose_grupo_competiciones)
 
             except Exception as e:
-                raise ExcepcionScrapping(f"Error al procesar la competición '{nombre}'") from e
+                self._registrar_fallo_grupo(competicion, e)
+                fallidos.append(competicion)
 
-        self.logger.info("Desglose de grupos de competiciones finalizado.")
+            finally:
+                self.liberar_soup(soup)
 
-        return self.resultados
+        return fallidos
+
+
+    def _registrar_fallo_grupo(self, competicion: dict, excepcion: Exception) -> None:
+
+        """
+        Registra en el log y en el diario el fallo al desglosar un grupo, y si lo ha causado el plazo
+        de la ejecución, lo anota para no contarlo como fallido.
+
+        Parámetros:
+            competicion (dict): Grupo que ha fallado.
+            excepcion (Exception): Error producido.
+
+        Salida:
+            None
+        """
+
+        url = string_utils.completar_url(competicion['url'])
+        error = ExcepcionScrapping(f"Error al procesar la competición '{competicion['nombre']}'")
+        error.__cause__ = excepcion
+        self.logger.warning(ManejoExcepciones.formatear_trazas_excepciones(error))
+
+        if ManejoExcepciones.causada_por(excepcion, ExcepcionPlazoAgotado):
+            self._urls_interrumpidas_plazo.add(url)
+
+        if self.diario is not None:
+            intentos = self.diario.registrar_fallo(url, competicion['nombre'], f"{type(excepcion).__name__}: {excepcion}")
+            self.logger.info(f"Fallos acumulados del grupo '{competicion['nombre']}': {intentos}")
+
+
+    def __getstate__(self) -> dict:
+
+        """
+        Estado que se envía a los procesos worker del pool de parseo: solo la configuración cargada,
+        sin las competiciones de entrada, el diario ni los resultados acumulados.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Atributos de la instancia que se serializan.
+        """
+
+        estado = self.__dict__.copy()
+        estado.pop('competiciones', None)
+        estado.pop('resultados', None)
+        estado.pop('diario', None)
+        estado.pop('revalidacion', None)
+        estado.pop('planificador', None)
+        estado.pop('grupos_descartados', None)
+        estado.pop('grupos_fallidos', None)
+        estado.pop('grupos_omitidos', None)
+        estado.pop('_urls_interrumpidas_plazo', None)
+        estado.pop('_grupos_desglosados', None)
+        estado.pop('_almacen_grupos', None)
+
+        return estado
+
+
+    def _ejecutar_con_pool_parseo(self, competiciones: list[dict]) -> list[dict]:
+
+        """
+        Desglosa los grupos enviando los bytes de cada página a un pool de procesos de parseo.
+
+        La descarga sigue en este proceso, mientras la construcción de los árboles BeautifulSoup y
+        los recorridos find_all se reparten entre 'procesos_parseo' procesos, que devuelven solo los
+        registros extraídos. Se trabaja en tres pasadas para solapar descargas y parseo:
+            1. Descarga de las páginas de grupo y envío al pool.
+            2. Según el tipo de grupo, descarga de las páginas de etapas o de clásicas y envío al pool.
+            3. Composición del desglose de cada grupo.
+        Un grupo que falla en cualquier pasada se registra y no continúa a las siguientes.
+
+        Parámetros:
+            competiciones (list[dict]): Grupos de competiciones a desglosar.
+
+        Salida:
+            list[dict]: Grupos que han fallado.
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.logger.info(f"Parseo de páginas repartido en {self.procesos_parseo} procesos")
+
+        with ProcessPoolExecutor(max_workers=self.procesos_parseo,
+                                 initializer=_inicializar_worker_parseo,
+                                 initargs=(self,)) as pool:
+
+            fallidos = []
+            grupos_enviados = []
+
+            for competicion in competiciones:
+
+                if self._descartar_por_presupuesto(competicion):
+                    continue
+
+                url = string_utils.completar_url(competicion['url'])
+                self.logger.info(f"Procesando competición: {competicion['nombre']} ({competicion['genero']})")
+
+                try:
+                    contenido, codificacion = self.obtener_contenido_pagina(url)
+                    futuro = pool.submit(_parsear_en_worker, '_parsear_pagina_grupo', contenido, codificacion)
+                    grupos_enviados.append((competicion, url, futuro))
+
+                except Exception as e:
+                    self._registrar_fallo_grupo(competicion, e)
+                    fallidos.append(competicion)
+
+            detalles_enviados = []
+
+            for competicion, url, futuro in grupos_enviados:
+
+                try:
+                    tipo_grupo, datos_vueltas = futuro.result()
+
+                    if tipo_grupo == self.tipo_grupo_vueltas:
+                        futuros = [(datos_vuelta, self._enviar_pagina_detalle(pool, '_parsear_pagina_etapas', datos_vuelta['url'],
+                                                                              self.lectura_incremental_etapas))
+                                   for datos_vuelta in datos_vueltas]
+
+                    elif tipo_grupo == self.tipo_grupo_clasicas:
+                        futuros = self._enviar_pagina_detalle(pool, '_parsear_pagina_clasicas', url)
+
+                    else:
+                        raise ExcepcionScrapping(f"Tipo de grupo no reconocido: {tipo_grupo}")
+
+                    detalles_enviados.append((competicion, tipo_grupo, futuros))
+
+                except Exception as e:
+                    self._registrar_fallo_grupo(competicion, e)
+                    fallidos.append(competicion)
+
+            for competicion, tipo_grupo, futuros in detalles_enviados:
+
+                try:
+                    if tipo_grupo == self.tipo_grupo_vueltas:
+                        desglose_grupo_competiciones = []
+
+                        for datos_vuelta, futuro in futuros:
+                            numero_etapas = futuro.result()
+                            fecha_fin, tipo_vuelta = self._calcular_fecha_fin_tipo_vuelta(numero_etapas,
+                                                                                          datos_vuelta['fecha_inicio'])
+                            desglose_grupo_competiciones.append(self._crear_vuelta(datos_vuelta, numero_etapas,
+                                                                                   tipo_vuelta, fecha_fin))
+
+                    else:
+                        desglose_grupo_competiciones = futuros.result()
+
+                    self._agregar_grupo(competicion, tipo_grupo, desglose_grupo_competiciones)
+                    self._registrar_grupo_revalidado(competicion, tipo_grupo, desglose_grupo_competiciones)
+
+                except Exception as e:
+                    self._registrar_fallo_grupo(competicion, e)
+                    fallidos.append(competicion)
+
+        return fallidos
+
+
+    def _enviar_pagina_detalle(self, pool: 'ProcessPoolExecutor', nombre_metodo: str, url: str,
+                               solo_tabla_etapas: bool = False) -> 'Future':
+
+        """
+        Descarga la página de detalle (races.php) de una competición y la envía al pool de parseo.
+        Con revalidación, si la página no ha vencido se devuelve ya resuelto su último resultado, y si
+        se descarga, su resultado se registra al terminar el parseo.
+
+        Parámetros:
+            pool (ProcessPoolExecutor): Pool de procesos de parseo.
+            nombre_metodo (str): Método de parseo a aplicar en el worker.
+            url (str): URL de la competición.
+            solo_tabla_etapas (bool, optional): Si es True, se lee la página de forma incremental y solo
+                                                se envía la tabla de etapas. Default es False.
+
+        Salida:
+            Future: Resultado pendiente del parseo.
+        """
+
+        from concurrent.futures import Future
+
+        url_detalle = url + self.url_info_detalle
+
+        if self.revalidacion is not None and not self.revalidacion.vencida(url_detalle):
+            futuro = Future()
+            futuro.set_result(self.revalidacion.resultado_omitido(url_detalle))
+            return futuro
+
+        if solo_tabla_etapas:
+            fragmento = self.obtener_fragmento_pagina(url_detalle, 'table', self.clase_tabla_etapas) or ""
+            contenido, codificacion = fragmento.encode('utf-8'), 'utf-8'
+
+        else:
+            contenido, codificacion = self.obtener_contenido_pagina(url_detalle)
+
+        futuro = pool.submit(_parsear_en_worker, nombre_metodo, contenido, codificacion, url_detalle)
+
+        if self.revalidacion is not None:
+            futuro.add_done_callback(lambda terminado: _registrar_detalle_revalidado(self.revalidacion, url_detalle, terminado))
+
+        return futuro
+
+
+    def _parsear_pagina_grupo(self, contenido: bytes, codificacion: str) -> Tuple[str, list[dict]]:
+
+        """
+        Parsea la página de un grupo (se ejecuta en un worker del pool de parseo).
+
+        Parámetros:
+            contenido (bytes): Bytes de la página del grupo.
+            codificacion (str): Codificación de los bytes, si se conoce.
+
+        Salida:
+            tuple: Tipo de grupo y, si es de vueltas, los datos básicos de cada vuelta.
+        """
+
+        soup = self.crear_soup(contenido, codificacion)
+
+        try:
+            tipo_grupo = self._determinar_tipo_grupo(soup)
+
+            if tipo_grupo != self.tipo_grupo_vueltas:
+                return tipo_grupo, []
+
+            excepcion_clasicas_femeninas = self._buscar_excepcion_clasicas_femeninas(soup, None)
+
+            return tipo_grupo, self._extraer_datos_vueltas(soup, excepcion_clasicas_femeninas)
+
+        finally:
+            self.liberar_soup(soup)
+
+
+    def _parsear_pagina_etapas(self, contenido: bytes, codificacion: str, url: str) -> int:
+
+        """
+        Parsea la página de etapas de una vuelta (se ejecuta en un worker del pool de parseo).
+
+        Parámetros:
+            contenido (bytes): Bytes de la página de etapas.
+            codificacion (str): Codificación de los bytes, si se conoce.
+            url (str): URL de la página (para los mensajes de error).
+
+        Salida:
+            int: Número de etapas válidas.
+        """
+
+        soup = None
+
+        try:
+            soup = self.crear_soup(contenido, codificacion)
+            return self._obtener_numero_etapas(soup)
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error al obtener el número de etapas de {url}") from e
+
+        finally:
+            self.liberar_soup(soup)
+
+
+    def _parsear_pagina_clasicas(self, contenido: bytes, codificacion: str, url: str) -> list:
+
+        """
+        Parsea la página de clásicas de un grupo (se ejecuta en un worker del pool de parseo).
+
+        Parámetros:
+            contenido (bytes): Bytes de la página de clásicas.
+            codificacion (str): Codificación de los bytes, si se conoce.
+            url (str): URL de la página (para los mensajes de error).
+
+        Salida:
+            list: Lista de diccionarios con la información de cada clásica.
+        """
+
+        soup = self.crear_soup(contenido, codificacion)
+
+        try:
+            return self._extraer_clasicas(soup, url)
+
+        finally:
+            self.liberar_soup(soup)
 
 
     def _agregar_grupo(self, competicion, tipo_grupo, desglose_grupo_competiciones):
 
         """
-        Agrega un grupo de competiciones a la lista de resultados.
+        Agrega un grupo de competiciones a los resultados y guarda su punto de control en el diario.
 
         Parámetros:
             competicion (dict): Un diccionario que contiene información sobre la competición, 
@@ -85,13 +704,67 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             None: Este método no retorna ningún valor, simplemente agrega el resultado a la lista.
         """
 
-        self.resultados.append({
+        url = string_utils.completar_url(competicion['url'])
+        grupo = {
             'nombre': competicion['nombre'],
             'genero': competicion['genero'],
-            'url': string_utils.completar_url(competicion['url']),
+            'url': url,
             'tipo_grupo': tipo_grupo,
             'desglose_grupo_competiciones': desglose_grupo_competiciones
-        })
+        }
+
+        if self.diario is not None:
+            self.diario.guardar_grupo(url, grupo)
+
+        self._guardar_grupo_desglosado(url, grupo)
+
+
+    def _guardar_grupo_desglosado(self, url: str, grupo: dict) -> None:
+
+        """
+        Guarda un grupo desglosado en el almacén (que lo vuelca a disco si se supera el máximo en memoria).
+        Si el grupo ya estaba (reintento), la entrada anterior queda sin referencia.
+
+        Parámetros:
+            url (str): URL del grupo.
+            grupo (dict): Grupo desglosado.
+
+        Salida:
+            None
+        """
+
+        self._grupos_desglosados[url] = len(self._almacen_grupos)
+        self._almacen_grupos.append(grupo)
+
+
+    def _componer_resultados(self) -> Union[list, ListaDesbordable]:
+
+        """
+        Compone la salida con los grupos desglosados en el orden de las competiciones de entrada.
+
+        Parámetros:
+            None
+
+        Salida:
+            list | ListaDesbordable: Grupos desglosados (ListaDesbordable en modo de memoria acotada).
+        """
+
+        urls = [string_utils.completar_url(competicion['url']) for competicion in self.competiciones]
+        indices = [self._grupos_desglosados[url] for url in urls if url in self._grupos_desglosados]
+
+        if not self.memoria_acotada:
+            return [self._almacen_grupos[indice] for indice in indices]
+
+        resultados = ListaDesbordable(self.maximo_grupos_memoria, self.directorio_desbordamiento)
+
+        for indice in indices:
+            resultados.append(self._almacen_grupos[indice])
+
+        self._almacen_grupos.cerrar()
+        self._almacen_grupos = ListaDesbordable(self.maximo_grupos_memoria, self.directorio_desbordamiento)
+        self._grupos_desglosados = {}
+
+        return resultados
 
 
     def _cargar_valores_configuracion(self) -> None:
@@ -151,11 +824,56 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             self.columna_nombre_clasica = int(self.obtener_valor_config_proceso(nombre_subproceso, "columna_nombre_clasica"))
             self.columna_categoria_clasica = int(self.obtener_valor_config_proceso(nombre_subproceso, "columna_categoria_clasica"))
 
+            self._preparar_plan_extraccion()
+
+            self.procesos_parseo = int(self.obtener_valor_config_proceso(nombre_subproceso, "procesos_parseo", 0))
+            self.lectura_incremental_etapas = string_utils.a_booleano(
+                self.obtener_valor_config_proceso(nombre_subproceso, "lectura_incremental_etapas", "false"))
+            self.maximo_grupos_revalidados = int(self.obtener_valor_config_general("revalidacion", "maximo_grupos_por_ejecucion", 0))
+            self.reintentos_grupos_fallidos = int(self.obtener_valor_config_proceso(nombre_subproceso,
+                                                                                    "reintentos_grupos_fallidos", 1))
+
+            self.maximo_grupos_memoria = int(self.obtener_valor_config_general("memoria", "maximo_grupos_memoria", 50))
+            self.directorio_desbordamiento = self.obtener_valor_config_general("memoria", "directorio_desbordamiento") or None
+
         except Exception as e:
             raise ExcepcionScrapping(f"Error al cargar los valores de configuración de '{nombre_subproceso}'") from e
 
 
-    def _determinar_tipo_grupo(self, soup: BeautifulSoup) -> str:
+    def _preparar_plan_extraccion(self) -> None:
+
+        """
+        Compila los selectores CSS y divide las listas de la configuración una sola vez,
+        para que el parseo de cada página y de cada fila no repita ese trabajo.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si algún selector o lista de la configuración no es válido.
+        """
+
+        self.selector_competicion = SelectorCompilado.por_clases('div', self.clase_competicion)
+        self.selector_grupo_vueltas = SelectorCompilado.por_clases('span', self.clase_grupo_vueltas)
+        self.selector_enlace_competiciones = SelectorCompilado.por_clases('a', self.clases_enlace_competiciones)
+        self.selector_tabla_etapas = SelectorCompilado.por_clases('table', self.clase_tabla_etapas)
+
+        self.lista_cadenas_no_contar_etapa = string_utils.dividir_lista(self.cadenas_no_contar_etapa)
+        self.lista_textos_eliminar_competicion = string_utils.dividir_lista(self.textos_eliminar_competicion)
+        self.sustitucion_tour_masculino = string_utils.dividir_lista(self.texto_sustituir_tour_masculino)
+        self.sustitucion_tour_femenino = string_utils.dividir_lista(self.texto_sustituir_tour_femenino)
+
+        for clave, sustitucion in (("texto_sustituir_tour_masculino", self.sustitucion_tour_masculino),
+                                   ("texto_sustituir_tour_femenino", self.sustitucion_tour_femenino)):
+
+            if len(sustitucion) != 2:
+                raise ExcepcionScrapping(f"'{clave}' debe tener el texto a sustituir y el reemplazo separados por ','")
+
+
+    def _determinar_tipo_grupo(self, soup: 'BeautifulSoup') -> str:
 
         """
         Determina si la competición es un grupo de vueltas o un grupo de clásicas.
@@ -179,7 +897,7 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             raise ExcepcionScrapping(f"No ha sido posible determinar el tipo grupo de competciones") from e
 
 
-    def _es_grupo_vueltas(self, soup: BeautifulSoup) -> bool:
+    def _es_grupo_vueltas(self, soup: 'BeautifulSoup') -> bool:
 
         """
         Determina si una competición es grupo de vueltas o grupo de clásicas.
@@ -197,19 +915,19 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             ExcepcionScrapping: Si no se encuentran las etiquetas para determinar si es grupo de vueltas o grupo de clásicas.
         """
 
-        postcontent = soup.find('div', class_=self.clase_competicion)
+        postcontent = self.selector_competicion.select_one(soup)
 
         if postcontent is None:
             raise ExcepcionScrapping(f"No fue posible encontrar 'div' con clase '{self.clase_competicion}'")
 
-        if postcontent.find('span', class_=self.clase_grupo_vueltas):
+        if self.selector_grupo_vueltas.select_one(postcontent):
             return True
 
         else:
             return False
 
 
-    def _extraer_url_descripcion_y_fecha_inicio_vuelta(self, postcontent: BeautifulSoup) -> Dict[str, str]:
+    def _extraer_url_descripcion_y_fecha_inicio_vuelta(self, postcontent: 'BeautifulSoup') -> Dict[str, str]:
 
         """
         Extrae la URL, descripcion y fecha de inicio de la competición.
@@ -227,7 +945,8 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         try:
             etiquetas_tipo_fecha = postcontent.find_all('span')
             etiqueta_fecha_inicio = etiquetas_tipo_fecha[self.numero_etiqueta_fecha_vuelta_x_etapas - 1]
-            fecha_inicio_completa = fecha_utils.completar_anyo(etiqueta_fecha_inicio.text.strip().split('\n')[0])
+            fecha_inicio_completa = fecha_utils.completar_anyo(etiqueta_fecha_inicio.text.strip().split('\n')[0],
+                                                               self.anyo_temporada)
             fecha_inicio_limpia = fecha_utils.limpiar_fecha(fecha_inicio_completa)
             fecha_inicio = fecha_utils.convertir_formato_fecha(fecha_inicio_limpia,
                                                                self.formato_fecha_vuelta_x_etapas,
@@ -236,7 +955,7 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             h2_tag = postcontent.find('h2')
             nombre_competicion = self._ajustar_nombre_competicion(h2_tag.text)
 
-            hiperenlace = postcontent.find('a', class_=self.clases_enlace_competiciones)
+            hiperenlace = self.selector_enlace_competiciones.select_one(postcontent)
             url = string_utils.completar_url(hiperenlace['href']) if hiperenlace else ""
 
             return {
@@ -268,14 +987,8 @@ class DesglosarGruposCompeticiones(ScrappingBase):
 
         try:
             url_etapas = url + self.url_info_detalle
-            soup_etapas = self.obtener_soup_pagina(url_etapas)
-            numero_etapas = self._obtener_numero_etapas(soup_etapas)
-            
-            tipo_vuelta = self._determinar_tipo_vuelta(numero_etapas)
-            jornadas_descanso = self.jornadas_descanso_gran_vuelta if tipo_vuelta == self.tipo_gran_vuelta else 0
-            fecha_fin = fecha_utils.sumar_dias_a_fecha(fecha_inicio,
-                                                       numero_etapas - 1 + jornadas_descanso,
-                                                       self.formato_fecha_generico)
+            numero_etapas = self.obtener_revalidado(url_etapas, lambda: self._descargar_numero_etapas(url_etapas))
+            fecha_fin, tipo_vuelta = self._calcular_fecha_fin_tipo_vuelta(numero_etapas, fecha_inicio)
         
             return numero_etapas, fecha_fin, tipo_vuelta
 
@@ -283,6 +996,53 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             raise ExcepcionScrapping(f"Error al obtener (número de etapas, fecha de fin, tipo de vuelta)") from e
 
 
+    def _descargar_numero_etapas(self, url_etapas: str) -> int:
+
+        """
+        Descarga la página de etapas de una vuelta (entera o solo su tabla) y cuenta las etapas.
+
+        Parámetros:
+            url_etapas (str): URL de la página de etapas.
+
+        Salida:
+            int: Número de etapas válidas.
+        """
+
+        if self.lectura_incremental_etapas:
+            soup_etapas = self.crear_soup(self.obtener_fragmento_pagina(url_etapas, 'table', self.clase_tabla_etapas) or "")
+
+        else:
+            soup_etapas = self.obtener_soup_pagina(url_etapas)
+
+        numero_etapas = self._obtener_numero_etapas(soup_etapas)
+        self.liberar_soup(soup_etapas)
+
+        return numero_etapas
+
+
+    def _calcular_fecha_fin_tipo_vuelta(self, numero_etapas: int, fecha_inicio: str) -> Tuple[str, str]:
+
+        """
+        Calcula el tipo de vuelta y la fecha de fin a partir del número de etapas.
+        Si la competición es una gran vuelta, se suman las jornadas de descanso.
+
+        Parámetros:
+            numero_etapas (int): Número de etapas de la vuelta.
+            fecha_inicio (str): Fecha de inicio de la competición.
+
+        Salida:
+            tuple: Fecha de fin calculada y tipo de vuelta.
+        """
+
+        tipo_vuelta = self._determinar_tipo_vuelta(numero_etapas)
+        jornadas_descanso = self.jornadas_descanso_gran_vuelta if tipo_vuelta == self.tipo_gran_vuelta else 0
+        fecha_fin = fecha_utils.sumar_dias_a_fecha(fecha_inicio,
+                                                   numero_etapas - 1 + jornadas_descanso,
+                                                   self.formato_fecha_generico)
+
+        return fecha_fin, tipo_vuelta
+
+
     def _obtener_numero_etapas(self, soup_etapas) -> int:
 
         """
@@ -297,12 +1057,12 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         """
 
         try:
-            tabla_etapas = soup_etapas.find('table', class_=self.clase_tabla_etapas)
+            tabla_etapas = self.selector_tabla_etapas.select_one(soup_etapas)
             if tabla_etapas:
                 etapas = tabla_etapas.find('tbody').find_all('tr')
                 numero_etapas = len([etapa for etapa in etapas 
                                     if not string_utils.contiene_cualquier_subcadena(etapa.get_text().strip(),
-                                                                                     self.cadenas_no_contar_etapa.split(','))])
+                                                                                     self.lista_cadenas_no_contar_etapa)])
             
             else:
                 numero_etapas = 0
@@ -332,7 +1092,7 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             return self.tipo_vuelta_menor
 
 
-    def _extraer_info_vueltas(self, soup: BeautifulSoup, ignorar_primera_competicion: list) -> list:
+    def _extraer_info_vueltas(self, soup: 'BeautifulSoup', ignorar_primera_competicion: list) -> list:
 
         """
         Procesa todas las competiciones dentro del objeto soup, obteniendo su información básica y detalles,
@@ -358,13 +1118,7 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         vueltas: list = []
         
         try:
-            postcontents = soup.find_all('div', class_='postcontent')
-
-            if ignorar_primera_competicion:
-                postcontents = postcontents[1:]
-
-            for postcontent in postcontents:
-                datos_vuelta = self._extraer_url_descripcion_y_fecha_inicio_vuelta(postcontent)
+            for datos_vuelta in self._extraer_datos_vueltas(soup, ignorar_primera_competicion):
                 numero_etapas, fecha_fin, tipo_vuelta = self._obtener_numero_etapas_fecha_fin_tipo_vuelta(datos_vuelta['url'],
                                                                                                           datos_vuelta['fecha_inicio'])
 
@@ -376,6 +1130,28 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             raise ExcepcionScrapping(f"Error al extraer información de una vueltas por etapas") from e
 
 
+    def _extraer_datos_vueltas(self, soup: 'BeautifulSoup', ignorar_primera_competicion: list) -> list[dict]:
+
+        """
+        Extrae la URL, descripción y fecha de inicio de todas las vueltas de la página del grupo,
+        sin consultar la página de etapas de cada una.
+
+        Parámetros:
+            soup (BeautifulSoup): Objeto BeautifulSoup que contiene el HTML de las competiciones.
+            ignorar_primera_competicion (list): Ignora la primera competición (excepción de clásicas femeninas).
+
+        Salida:
+            list[dict]: Lista de diccionarios con 'url', 'descripcion' y 'fecha_inicio' de cada vuelta.
+        """
+
+        postcontents = self.selector_competicion.select(soup)
+
+        if ignorar_primera_competicion:
+            postcontents = postcontents[1:]
+
+        return [self._extraer_url_descripcion_y_fecha_inicio_vuelta(postcontent) for postcontent in postcontents]
+
+
     def _crear_vuelta(self, datos_vuelta: dict, numero_etapas: int, tipo_vuelta: str, fecha_fin: str) -> dict:
     
         """
@@ -402,7 +1178,7 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         }
 
 
-    def _buscar_excepcion_clasicas_femeninas(self, soup: BeautifulSoup, genero: str) -> list[dict]:
+    def _buscar_excepcion_clasicas_femeninas(self, soup: 'BeautifulSoup', genero: str) -> list[dict]:
 
         """
         Busca excepciones que convierten una competición de vueltas en una nueva competición de clásicas.
@@ -419,14 +1195,14 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         """
 
         nuevas_competiciones = []
-        postcontent = soup.find('div', class_=self.clase_competicion)
+        postcontent = self.selector_competicion.select_one(soup)
 
         if postcontent is not None:
             h2_tag = postcontent.find('h2')
 
             if h2_tag and string_utils.contiene_subcadena(h2_tag.text, self.cadena_clasicas_femeninas):
-                nombre_competicion = self.limpiar_nombre_competicion(h2_tag.text, self.textos_eliminar_competicion.split(','))
-                hiperenlace = postcontent.find('a', class_=self.clases_enlace_competiciones)
+                nombre_competicion = self.limpiar_nombre_competicion(h2_tag.text, self.lista_textos_eliminar_competicion)
+                hiperenlace = self.selector_enlace_competiciones.select_one(postcontent)
                 url = hiperenlace['href'] if hiperenlace else ""
 
                 nuevas_competiciones.append({
@@ -482,9 +1258,51 @@ class DesglosarGruposCompeticiones(ScrappingBase):
             ExcepcionScrapping: Si ocurre algún error durante la extracción de la información.
         """
 
+        url_clasicas_grupo = url + self.url_info_detalle
+
+        try:
+            return self.obtener_revalidado(url_clasicas_grupo, lambda: self._descargar_clasicas(url_clasicas_grupo))
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error al extraer la información de clásicas de {url_clasicas_grupo}") from e
+
+
+    def _descargar_clasicas(self, url_clasicas_grupo: str) -> list:
+
+        """
+        Descarga la página de clásicas de un grupo y extrae sus clásicas.
+
+        Parámetros:
+            url_clasicas_grupo (str): URL de la página de clásicas del grupo.
+
+        Salida:
+            list: Clásicas del grupo.
+        """
+
+        soup_clasicas = self.obtener_soup_pagina(url_clasicas_grupo)
+        clasicas = self._extraer_clasicas(soup_clasicas, url_clasicas_grupo)
+        self.liberar_soup(soup_clasicas)
+
+        return clasicas
+
+
+    def _extraer_clasicas(self, soup_clasicas: 'BeautifulSoup', url_clasicas_grupo: str) -> list:
+
+        """
+        Extrae la información de cada clásica de la tabla de la página de clásicas del grupo.
+
+        Parámetros:
+            soup_clasicas (BeautifulSoup): Objeto BeautifulSoup con la página de clásicas.
+            url_clasicas_grupo (str): URL de la página (para los mensajes de error).
+
+        Salida:
+            list: Lista de diccionarios con la información de cada clásica (número, fecha, nombre, categoría).
+
+        Lanza:
+            ExcepcionScrapping: Si no se encuentra la tabla de clásicas.
+        """
+
         try:
-            url_clasicas_grupo = url + self.url_info_detalle
-            soup_clasicas = self.obtener_soup_pagina(url_clasicas_grupo)
             tabla = soup_clasicas.find('table')
 
             if not tabla:
@@ -580,9 +1398,9 @@ class DesglosarGruposCompeticiones(ScrappingBase):
         """
 
         try:
-            texto_sustituir_tour_masculino = self.texto_sustituir_tour_masculino.split(',')
-            texto_sustituir_tour_femenino = self.texto_sustituir_tour_femenino.split(',')
-            textos_eliminar = self.textos_eliminar_competicion.split(',')
+            texto_sustituir_tour_masculino = self.sustitucion_tour_masculino
+            texto_sustituir_tour_femenino = self.sustitucion_tour_femenino
+            textos_eliminar = self.lista_textos_eliminar_competicion
 
             nombre_competicion = string_utils.sustituir_cadena_con_marcador(
                 nombre_competicion,
@@ -0,0 +1,286 @@
+# scripts/subprocesos/scrapping_obtener_ciclistas_competiciones.py
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from .scrapping_base import ScrappingBase
+from .selector_compilado import SelectorCompilado
+from utils import fecha_utils, string_utils
+from utils.excepciones import ExcepcionScrapping, ExcepcionPlazoAgotado, ManejoExcepciones
+from utils.tabla_ciclistas import TablaCiclistas
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+class ObtenerCiclistasCompeticiones(ScrappingBase):
+
+    def __init__(self, grupos_desglosados: list[dict]) -> None:
+
+        """
+        Inicializa la clase de obtención de los ciclistas (equipo, precio y puntos) de cada competición.
+
+        Parámetros:
+            grupos_desglosados (list[dict]): Salida de DesglosarGruposCompeticiones.ejecutar().
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre algún error al inicializar la clase o la configuración no es válida.
+        """
+
+        try:
+            super().__init__()
+            self.grupos_desglosados = grupos_desglosados
+            self.competiciones_fallidas = []
+            self.competiciones_omitidas = []
+            self._cargar_valores_configuracion()
+
+        except ExcepcionScrapping as es:
+            raise ExcepcionScrapping(f"Error al inicializar el proceso de obtención de ciclistas de las competiciones") from es
+
+
+    def ejecutar(self) -> TablaCiclistas:
+
+        """
+        Descarga en paralelo la tabla de ciclistas de cada competición activa y las reúne en una
+        tabla columnar.
+
+        Las descargas se reparten entre 'hilos_descarga' hilos que comparten la sesión HTTP; de cada
+        página solo se lee y parsea la tabla de ciclistas. Una competición que falla se registra en
+        'competiciones_fallidas' y no detiene el resto. Las que quedan sin descargar al agotarse el plazo
+        de la ejecución se registran en 'competiciones_omitidas'.
+
+        Parámetros:
+            None
+
+        Salida:
+            TablaCiclistas: Ciclistas de todas las competiciones descargadas.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.logger.info("Iniciando la obtención de ciclistas de las competiciones...")
+        urls_competiciones = self._obtener_urls_competiciones(datetime.now())
+        tabla_ciclistas = TablaCiclistas()
+        self.obtener_sesion_http()
+
+        with ThreadPoolExecutor(max_workers=self.hilos_descarga) as pool:
+            futuros = [(url, pool.submit(self._obtener_ciclistas_competicion, url)) for url in urls_competiciones]
+
+            for url, futuro in futuros:
+
+                try:
+                    tabla_ciclistas.agregar_competicion(url, futuro.result())
+
+                except ExcepcionPlazoAgotado:
+                    self.competiciones_omitidas.append(url)
+                    self.registrar_omision(f"ciclistas de {url}")
+
+                except Exception as e:
+                    error = ExcepcionScrapping(f"Error al obtener los ciclistas de la competición '{url}'")
+                    error.__cause__ = e
+                    self.logger.warning(ManejoExcepciones.formatear_trazas_excepciones(error))
+                    self.competiciones_fallidas.append(url)
+
+        if self.competiciones_omitidas:
+            self.logger.warning(f"Plazo de ejecución agotado: {len(self.competiciones_omitidas)} competiciones sin "
+                                f"descargar sus ciclistas")
+
+        self.logger.info(f"Se obtuvieron {len(tabla_ciclistas)} ciclistas de {len(tabla_ciclistas.competiciones)} "
+                         f"competiciones ({len(self.competiciones_fallidas)} fallidas).")
+
+        return tabla_ciclistas
+
+
+    def _cargar_valores_configuracion(self) -> None:
+
+        """
+        Carga en variables los valores del archivo de configuración.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre algún error al cargar las configuraciones.
+        """
+
+        nombre_subproceso = os.path.splitext(os.path.basename(__file__))[0]
+
+        try:
+            self.tipo_grupo_vueltas = self.obtener_valor_config_proceso(nombre_subproceso, "tipo_grupo_vueltas")
+            self.tipo_grupo_clasicas = self.obtener_valor_config_proceso(nombre_subproceso, "tipo_grupo_clasicas")
+            self.url_ciclistas = self.obtener_valor_config_proceso(nombre_subproceso, "url_ciclistas")
+            self.clase_tabla_ciclistas = self.obtener_valor_config_proceso(nombre_subproceso, "clase_tabla_ciclistas")
+
+            self.cabecera_ciclista = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_ciclista")
+            self.cabecera_equipo = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_equipo")
+            self.cabecera_precio = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_precio")
+            self.cabecera_puntos = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_puntos")
+
+            self.hilos_descarga = int(self.obtener_valor_config_proceso(nombre_subproceso, "hilos_descarga", 8))
+            self.solo_competiciones_activas = string_utils.a_booleano(
+                self.obtener_valor_config_proceso(nombre_subproceso, "solo_competiciones_activas", "true"))
+            self.formato_fecha_generico = self.obtener_valor_config_general("fechas", "formato_generico")
+
+            self.selector_tabla_ciclistas = SelectorCompilado.por_clases('table', self.clase_tabla_ciclistas)
+            self.selector_cabeceras = SelectorCompilado('th')
+            self.selector_celdas = SelectorCompilado('td')
+            self.selector_filas = SelectorCompilado('tr')
+
+            if self.hilos_descarga < 1:
+                raise ExcepcionScrapping("'hilos_descarga' debe ser al menos 1")
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error al cargar los valores de configuración de '{nombre_subproceso}'") from e
+
+
+    def _obtener_urls_competiciones(self, ahora: datetime) -> List[str]:
+
+        """
+        Obtiene las URLs de las competiciones cuyos ciclistas se descargan: cada vuelta por etapas
+        y cada grupo de clásicas (que comparte una única lista de ciclistas).
+
+        Con 'solo_competiciones_activas' se omiten las competiciones ya terminadas.
+
+        Parámetros:
+            ahora (datetime): Instante de referencia para decidir si una competición está activa.
+
+        Salida:
+            list[str]: URLs de las competiciones, sin repetidos y en el orden del calendario.
+        """
+
+        urls = {}
+
+        for grupo in self.grupos_desglosados:
+            desglose = grupo.get('desglose_grupo_competiciones') or []
+
+            if grupo['tipo_grupo'] == self.tipo_grupo_vueltas:
+                for vuelta in desglose:
+                    if self._esta_activa(vuelta.get('fecha_fin'), ahora):
+                        urls[vuelta['url']] = True
+
+            elif grupo['tipo_grupo'] == self.tipo_grupo_clasicas:
+                if not self.solo_competiciones_activas or any(self._esta_activa(clasica.get('fecha_clasica'), ahora)
+                                                              for clasica in desglose):
+                    urls[grupo['url']] = True
+
+        return list(urls)
+
+
+    def _esta_activa(self, fecha_fin: Optional[str], ahora: datetime) -> bool:
+
+        """
+        Indica si una competición que termina en la fecha indicada sigue activa.
+
+        Parámetros:
+            fecha_fin (str): Fecha de fin en el formato genérico (o None si no se conoce).
+            ahora (datetime): Instante de referencia.
+
+        Salida:
+            bool: True si la competición no ha terminado o no se filtra por actividad.
+        """
+
+        if not self.solo_competiciones_activas or not fecha_fin:
+            return True
+
+        fin = fecha_utils.convertir_a_datetime(fecha_fin, self.formato_fecha_generico)
+
+        return fin.date() >= ahora.date()
+
+
+    def _obtener_ciclistas_competicion(self, url: str) -> List[Tuple[str, str, float, float]]:
+
+        """
+        Descarga y parsea la tabla de ciclistas de una competición (se ejecuta en un hilo del pool).
+
+        Parámetros:
+            url (str): URL de la competición.
+
+        Salida:
+            list[tuple]: Filas (nombre, equipo, precio, puntos).
+
+        Lanza:
+            ExcepcionScrapping: Si la página no contiene la tabla de ciclistas o le faltan columnas.
+        """
+
+        url_ciclistas = url.rstrip('/') + self.url_ciclistas
+        fragmento = self.obtener_fragmento_pagina(url_ciclistas, 'table', self.clase_tabla_ciclistas)
+
+        if fragmento is None:
+            raise ExcepcionScrapping(f"No se encontró la tabla de ciclistas en {url_ciclistas}")
+
+        tabla = self.selector_tabla_ciclistas.select_one(self.crear_soup(fragmento))
+
+        return self._extraer_ciclistas(tabla, url_ciclistas)
+
+
+    def _extraer_ciclistas(self, tabla: 'BeautifulSoup', url_ciclistas: str) -> List[Tuple[str, str, float, float]]:
+
+        """
+        Extrae las filas de la tabla de ciclistas localizando cada columna por su cabecera.
+
+        Parámetros:
+            tabla (BeautifulSoup): Tabla de ciclistas.
+            url_ciclistas (str): URL de la página (para los mensajes de error).
+
+        Salida:
+            list[tuple]: Filas (nombre, equipo, precio, puntos). Si la tabla no tiene columna de
+                         puntos (competición sin empezar) los puntos son 0.
+
+        Lanza:
+            ExcepcionScrapping: Si faltan las columnas de ciclista, equipo o precio.
+        """
+
+        columnas = self._localizar_columnas(tabla)
+
+        for cabecera in (self.cabecera_ciclista, self.cabecera_equipo, self.cabecera_precio):
+            if cabecera not in columnas:
+                raise ExcepcionScrapping(f"La tabla de ciclistas de {url_ciclistas} no tiene la columna '{cabecera}'")
+
+        columna_ciclista = columnas[self.cabecera_ciclista]
+        columna_equipo = columnas[self.cabecera_equipo]
+        columna_precio = columnas[self.cabecera_precio]
+        columna_puntos = columnas.get(self.cabecera_puntos)
+        numero_columnas = max(columnas.values()) + 1
+        filas = []
+
+        for fila in self.selector_filas.select(tabla):
+            celdas = [celda.get_text(strip=True) for celda in self.selector_celdas.select(fila)]
+
+            if len(celdas) < numero_columnas or not celdas[columna_ciclista]:
+                continue
+
+            puntos = string_utils.a_numero(celdas[columna_puntos]) if columna_puntos is not None else 0.0
+            filas.append((celdas[columna_ciclista], celdas[columna_equipo],
+                          string_utils.a_numero(celdas[columna_precio]), puntos))
+
+        return filas
+
+
+    def _localizar_columnas(self, tabla: 'BeautifulSoup') -> Dict[str, int]:
+
+        """
+        Asocia cada cabecera configurada con su posición en la tabla (sin distinguir mayúsculas).
+
+        Parámetros:
+            tabla (BeautifulSoup): Tabla de ciclistas.
+
+        Salida:
+            dict: Cabecera configurada -> índice de columna.
+        """
+
+        cabeceras = [cabecera.get_text(strip=True) for cabecera in self.selector_cabeceras.select(tabla)]
+        columnas = {}
+
+        for buscada in (self.cabecera_ciclista, self.cabecera_equipo, self.cabecera_precio, self.cabecera_puntos):
+            for indice, cabecera in enumerate(cabeceras):
+                if string_utils.comparar_cadenas_ignorando_case(cabecera, buscada):
+                    columnas[buscada] = indice
+                    break
+
+        return columnas
@@ -1,20 +1,26 @@
 # scripts/subprocesos/scrapping_obtener_grupos_competiciones.py
 
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TYPE_CHECKING
 from .scrapping_base import ScrappingBase
+from .selector_compilado import SelectorCompilado
 from utils import string_utils
 from utils.excepciones import ExcepcionScrapping
 
+if TYPE_CHECKING:
+    from utils.revalidacion_urls import RevalidacionUrls
+
 class ObtenerGruposCompeticiones(ScrappingBase):
 
-    def __init__(self) -> None:
+    def __init__(self, revalidacion: Optional['RevalidacionUrls'] = None) -> None:
 
         """
         Inicializa la clase de obtención de grupos de competiciones.
 
         Parámetros:
-            None
+            revalidacion (RevalidacionUrls, optional): Si se indica, la portada solo se descarga cuando vence
+                                                       su intervalo de revalidación y, si no, se reutilizan
+                                                       los grupos obtenidos la última vez.
 
         Salida:
             None
@@ -25,6 +31,8 @@ class ObtenerGruposCompeticiones(ScrappingBase):
 
         try:
             super().__init__()
+            self.revalidacion = revalidacion
+            self._cargar_valores_configuracion()
         
         except ExcepcionScrapping as es:
             raise ExcepcionScrapping(f"Error al inicializar el proceso obtención de grupos de competiciones") from es
@@ -47,33 +55,47 @@ class ObtenerGruposCompeticiones(ScrappingBase):
 
         try:
             self.logger.info("Iniciando la obtención de grupos de competiciones...")
-            self._cargar_valores_configuracion()
-            soup = self.obtener_soup_pagina(self.url_velogames)
-            h1_todas_competiciones = self._encontrar_encabezado_todas_competiciones(soup)
-
-            if h1_todas_competiciones:
-                competiciones = self._extraer_grupos_competiciones(h1_todas_competiciones)
-                self.logger.info(f"Se encontraron {len(competiciones)} competiciones.")
-                return competiciones
-
-            else:
-                self.logger.warning("No se encontró el encabezado de competiciones con 'All Contests'.")
-                return []
+            competiciones = self.obtener_revalidado(self.url_velogames, self._descargar_grupos_competiciones)
+            self.logger.info(f"Se encontraron {len(competiciones)} competiciones.")
+            return competiciones
 
         except Exception as e:
             raise ExcepcionScrapping(f"Error en el proceso de obtención de grupos de competiciones") from e
 
 
+    def _descargar_grupos_competiciones(self) -> List[Dict[str, str]]:
+
+        """
+        Descarga la portada y extrae los grupos de competiciones que siguen al encabezado 'All Contests'.
+
+        Parámetros:
+            None
+
+        Salida:
+            list: Grupos de competiciones (vacía si no se encuentra el encabezado).
+        """
+
+        soup = self.obtener_soup_pagina(self.url_velogames)
+        h1_todas_competiciones = self._encontrar_encabezado_todas_competiciones(soup)
+
+        if h1_todas_competiciones:
+            return self._extraer_grupos_competiciones(h1_todas_competiciones)
+
+        self.logger.warning("No se encontró el encabezado de competiciones con 'All Contests'.")
+        return []
+
+
     def _cargar_valores_configuracion(self) -> None:
 
         """
-        Carga en variables los valores del archivo de configuración.
+        Carga en variables los valores del archivo de configuración y prepara el plan de extracción:
+        selectores CSS compilados y listas ya divididas, que se reutilizan en cada página y fila.
 
         Parámetros: 
             Ninguno.
 
         Lanza:
-            ExcepcionScrapping: Si ocurre algún error al cargar las configuraciones.
+            ExcepcionScrapping: Si ocurre algún error al cargar las configuraciones o algún selector es inválido.
         """
 
         nombre_subproceso = os.path.splitext(os.path.basename(__file__))[0]
@@ -86,6 +108,14 @@ class ObtenerGruposCompeticiones(ScrappingBase):
             self.palabras_femenino = self.obtener_valor_config_proceso(nombre_subproceso, "palabras_femenino")
             self.clases_enlace_competiciones = self.obtener_valor_config_proceso(nombre_subproceso, "clases_enlace_competiciones")
 
+            self.selector_h1_all_contests = SelectorCompilado(self.clase_h1_all_contests)
+            self.selector_enlace_competiciones = SelectorCompilado.por_clases('a', self.clases_enlace_competiciones)
+            self.lista_texto_eliminar_competiciones = string_utils.dividir_lista(self.texto_eliminar_competiciones)
+            self.lista_palabras_femenino = string_utils.dividir_lista(self.palabras_femenino)
+
+            if not self.url_velogames or not self.texto_all_contests:
+                raise ExcepcionScrapping("Faltan 'url_velogames' o 'texto_all_contests' en la configuración")
+
         except Exception as e:
             raise ExcepcionScrapping(f"Error al cargar los valores de configuración de '{nombre_subproceso}'") from e
 
@@ -103,7 +133,7 @@ class ObtenerGruposCompeticiones(ScrappingBase):
         """
 
         try:
-            h1_elements = soup.select(self.clase_h1_all_contests)
+            h1_elements = self.selector_h1_all_contests.select(soup)
 
             for h1 in h1_elements:
                 if string_utils.comparar_cadenas_ignorando_case(h1.text.strip(), self.texto_all_contests):
@@ -134,11 +164,11 @@ class ObtenerGruposCompeticiones(ScrappingBase):
             self.logger.info("Extrayendo grupos de competiciones...")
             competiciones = []
 
-            for a in h1_todas_competiciones.find_all_next('a', class_=self.clases_enlace_competiciones):
-                nombre_competicion = self.limpiar_nombre_competicion(a.text, self.texto_eliminar_competiciones.split(','))
+            for a in h1_todas_competiciones.find_all_next(self.selector_enlace_competiciones.match):
+                nombre_competicion = self.limpiar_nombre_competicion(a.text, self.lista_texto_eliminar_competiciones)
                 url_competicion = a['href']
                 genero_competicion = self._determinar_genero_competicion(nombre_competicion,
-                                                                         self.palabras_femenino.split(","))
+                                                                         self.lista_palabras_femenino)
 
                 competiciones.append({'nombre': nombre_competicion,
                     'genero': genero_competicion,
@@ -0,0 +1,281 @@
+# scripts/subprocesos/scrapping_obtener_resultados_etapas.py
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from .scrapping_base import ScrappingBase
+from .selector_compilado import SelectorCompilado
+from utils import fecha_utils, string_utils
+from utils.excepciones import ExcepcionScrapping, ExcepcionPlazoAgotado, ManejoExcepciones
+from utils.resultados_competicion import ResultadosCompeticion, CTE_SIN_POSICION
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Marcador del número de etapa en la URL de resultados
+CTE_MARCADOR_ETAPA = "@etapa@"
+
+CTE_HTTP_NO_ENCONTRADO = 404
+
+
+class ObtenerResultadosEtapas(ScrappingBase):
+
+    def __init__(self, grupos_desglosados: list[dict]) -> None:
+
+        """
+        Inicializa la clase de obtención de resultados de las etapas de las vueltas.
+
+        Parámetros:
+            grupos_desglosados (list[dict]): Salida de DesglosarGruposCompeticiones.ejecutar().
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre algún error al inicializar la clase o la configuración no es válida.
+        """
+
+        try:
+            super().__init__()
+            self.grupos_desglosados = grupos_desglosados
+            self.etapas_fallidas = []
+            self.etapas_omitidas = []
+            self._cargar_valores_configuracion()
+
+        except ExcepcionScrapping as es:
+            raise ExcepcionScrapping(f"Error al inicializar el proceso de obtención de resultados de etapas") from es
+
+
+    def ejecutar(self) -> Dict[str, ResultadosCompeticion]:
+
+        """
+        Ingiere los resultados de las etapas ya disputadas que todavía no se tenían.
+
+        Para cada vuelta empezada se cargan sus resultados guardados y solo se descargan las etapas
+        pendientes anteriores a hoy (la de hoy puede estar en curso). Las descargas se hacen en
+        paralelo; la ingesta es por orden de etapa y cada competición modificada se guarda al final.
+        Una etapa sin tabla de resultados (jornada de descanso, aún no publicada) queda pendiente
+        para la siguiente ejecución, igual que las que no se descargan por agotarse el plazo de la
+        ejecución (registradas en 'etapas_omitidas').
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: URL de la vuelta -> ResultadosCompeticion, de todas las vueltas empezadas.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.logger.info("Iniciando la obtención de resultados de etapas...")
+        ahora = datetime.now()
+        resultados_competiciones = {}
+        etapas_descarga = []
+
+        for vuelta in self._obtener_vueltas_empezadas(ahora):
+            resultados = ResultadosCompeticion.cargar(self.directorio_resultados, vuelta['url'],
+                                                      int(vuelta['numero_etapas']), self.puntos_posicion_etapa)
+            resultados_competiciones[vuelta['url']] = resultados
+            dias_disputados = (ahora.date() - self._obtener_fecha(vuelta['fecha_inicio']).date()).days
+            etapas_descarga.extend((resultados, etapa) for etapa in resultados.etapas_pendientes(dias_disputados))
+
+        self.obtener_sesion_http()
+        competiciones_modificadas = {}
+
+        with ThreadPoolExecutor(max_workers=self.hilos_descarga) as pool:
+            futuros = [(resultados, etapa, pool.submit(self._obtener_resultados_etapa, resultados.url, etapa))
+                       for resultados, etapa in etapas_descarga]
+
+            for resultados, etapa, futuro in futuros:
+
+                try:
+                    resultado_etapa = futuro.result()
+
+                    if resultado_etapa is None:
+                        self.logger.debug(f"Etapa {etapa} de {resultados.url} sin resultados publicados")
+                        continue
+
+                    resultados.agregar_etapa(etapa, *resultado_etapa)
+                    competiciones_modificadas[resultados.url] = resultados
+
+                except ExcepcionPlazoAgotado:
+                    self.etapas_omitidas.append((resultados.url, etapa))
+                    self.registrar_omision(f"resultados de la etapa {etapa} de {resultados.url}")
+
+                except Exception as e:
+                    error = ExcepcionScrapping(f"Error al obtener los resultados de la etapa {etapa} de '{resultados.url}'")
+                    error.__cause__ = e
+                    self.logger.warning(ManejoExcepciones.formatear_trazas_excepciones(error))
+                    self.etapas_fallidas.append((resultados.url, etapa))
+
+        for resultados in competiciones_modificadas.values():
+            resultados.guardar(self.directorio_resultados)
+
+        if self.etapas_omitidas:
+            self.logger.warning(f"Plazo de ejecución agotado: {len(self.etapas_omitidas)} etapas pendientes sin descargar")
+
+        self.logger.info(f"Resultados de etapas actualizados en {len(competiciones_modificadas)} de "
+                         f"{len(resultados_competiciones)} vueltas empezadas ({len(self.etapas_fallidas)} etapas fallidas).")
+
+        return resultados_competiciones
+
+
+    def _cargar_valores_configuracion(self) -> None:
+
+        """
+        Carga en variables los valores del archivo de configuración.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre algún error al cargar las configuraciones.
+        """
+
+        nombre_subproceso = os.path.splitext(os.path.basename(__file__))[0]
+
+        try:
+            self.tipo_grupo_vueltas = self.obtener_valor_config_proceso(nombre_subproceso, "tipo_grupo_vueltas")
+            self.url_resultados_etapa = self.obtener_valor_config_proceso(nombre_subproceso, "url_resultados_etapa")
+            self.clase_tabla_resultados = self.obtener_valor_config_proceso(nombre_subproceso, "clase_tabla_resultados")
+            self.cabecera_ciclista = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_ciclista")
+            self.cabecera_posicion = self.obtener_valor_config_proceso(nombre_subproceso, "cabecera_posicion")
+            self.hilos_descarga = int(self.obtener_valor_config_proceso(nombre_subproceso, "hilos_descarga", 8))
+
+            self.puntos_posicion_etapa = [float(puntos) for puntos in string_utils.dividir_lista(
+                self.obtener_valor_config_proceso(nombre_subproceso, "puntos_posicion_etapa"))]
+
+            self.formato_fecha_generico = self.obtener_valor_config_general("fechas", "formato_generico")
+            self.directorio_resultados = self.obtener_valor_config_general("resultados", "directorio")
+
+            self.selector_tabla_resultados = SelectorCompilado.por_clases('table', self.clase_tabla_resultados)
+            self.selector_cabeceras = SelectorCompilado('th')
+            self.selector_celdas = SelectorCompilado('td')
+            self.selector_filas = SelectorCompilado('tr')
+
+            if CTE_MARCADOR_ETAPA not in (self.url_resultados_etapa or ""):
+                raise ExcepcionScrapping(f"'url_resultados_etapa' debe contener el marcador {CTE_MARCADOR_ETAPA}")
+
+            if not self.puntos_posicion_etapa or not self.directorio_resultados or self.hilos_descarga < 1:
+                raise ExcepcionScrapping("Faltan 'puntos_posicion_etapa', el directorio de resultados o 'hilos_descarga'")
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Error al cargar los valores de configuración de '{nombre_subproceso}'") from e
+
+
+    def _obtener_vueltas_empezadas(self, ahora: datetime) -> List[dict]:
+
+        """
+        Obtiene las vueltas del calendario que ya han empezado y tienen número de etapas.
+
+        Parámetros:
+            ahora (datetime): Instante de referencia.
+
+        Salida:
+            list[dict]: Vueltas tal y como aparecen en el desglose, sin URLs repetidas.
+        """
+
+        vueltas = {}
+
+        for grupo in self.grupos_desglosados:
+
+            if grupo['tipo_grupo'] != self.tipo_grupo_vueltas:
+                continue
+
+            for vuelta in grupo.get('desglose_grupo_competiciones') or []:
+
+                if vuelta.get('fecha_inicio') and vuelta.get('numero_etapas') \
+                        and self._obtener_fecha(vuelta['fecha_inicio']) <= ahora:
+                    vueltas.setdefault(vuelta['url'], vuelta)
+
+        return list(vueltas.values())
+
+
+    def _obtener_fecha(self, fecha: str) -> datetime:
+        return fecha_utils.convertir_a_datetime(fecha, self.formato_fecha_generico)
+
+
+    def _obtener_resultados_etapa(self, url: str, numero_etapa: int) -> Optional[Tuple[List[str], List[int]]]:
+
+        """
+        Descarga y parsea la tabla de resultados de una etapa (se ejecuta en un hilo del pool).
+
+        Parámetros:
+            url (str): URL de la vuelta.
+            numero_etapa (int): Número de la etapa.
+
+        Salida:
+            tuple: (ciclistas, posiciones) o None si la etapa todavía no tiene resultados.
+
+        Lanza:
+            ExcepcionScrapping: Si ocurre un error al descargar o parsear la etapa.
+        """
+
+        url_etapa = url.rstrip('/') + self.url_resultados_etapa.replace(CTE_MARCADOR_ETAPA, str(numero_etapa))
+
+        try:
+            fragmento = self.obtener_fragmento_pagina(url_etapa, 'table', self.clase_tabla_resultados)
+
+        except ExcepcionScrapping as es:
+            # Una etapa sin página (404) todavía no se ha publicado; cualquier otro error se propaga
+            if getattr(getattr(es.__cause__, 'response', None), 'status_code', None) == CTE_HTTP_NO_ENCONTRADO:
+                return None
+            raise
+
+        if fragmento is None:
+            return None
+
+        tabla = self.selector_tabla_resultados.select_one(self.crear_soup(fragmento))
+        ciclistas, posiciones = self._extraer_resultados(tabla, url_etapa)
+
+        return (ciclistas, posiciones) if ciclistas else None
+
+
+    def _extraer_resultados(self, tabla: 'BeautifulSoup', url_etapa: str) -> Tuple[List[str], List[int]]:
+
+        """
+        Extrae ciclista y posición de cada fila. Si la tabla no tiene columna de posición, la
+        posición es el orden de la fila; una posición no numérica (DNF, DNS...) no puntúa.
+
+        Parámetros:
+            tabla (BeautifulSoup): Tabla de resultados.
+            url_etapa (str): URL de la etapa (para los mensajes de error).
+
+        Salida:
+            tuple: (ciclistas, posiciones).
+
+        Lanza:
+            ExcepcionScrapping: Si la tabla no tiene la columna de ciclista.
+        """
+
+        cabeceras = [cabecera.get_text(strip=True) for cabecera in self.selector_cabeceras.select(tabla)]
+        columna_ciclista = next((indice for indice, cabecera in enumerate(cabeceras)
+                                 if string_utils.comparar_cadenas_ignorando_case(cabecera, self.cabecera_ciclista)), None)
+        columna_posicion = next((indice for indice, cabecera in enumerate(cabeceras)
+                                 if string_utils.comparar_cadenas_ignorando_case(cabecera, self.cabecera_posicion)), None)
+
+        if columna_ciclista is None:
+            raise ExcepcionScrapping(f"La tabla de resultados de {url_etapa} no tiene la columna '{self.cabecera_ciclista}'")
+
+        ciclistas = []
+        posiciones = []
+
+        for fila in self.selector_filas.select(tabla):
+            celdas = [celda.get_text(strip=True) for celda in self.selector_celdas.select(fila)]
+
+            if len(celdas) <= max(columna_ciclista, columna_posicion or 0) or not celdas[columna_ciclista]:
+                continue
+
+            if columna_posicion is None:
+                posicion = len(ciclistas) + 1
+
+            else:
+                posicion = int(string_utils.a_numero(celdas[columna_posicion], CTE_SIN_POSICION))
+
+            ciclistas.append(celdas[columna_ciclista])
+            posiciones.append(posicion)
+
+        return ciclistas, posiciones
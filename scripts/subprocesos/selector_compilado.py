@@ -0,0 +1,126 @@
+# scripts/subprocesos/selector_compilado.py
+
+from typing import Any, List, Optional, TYPE_CHECKING
+from utils.excepciones import ExcepcionScrapping
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+
+class SelectorCompilado:
+
+    """
+    Selector CSS compilado una única vez con soupsieve y reutilizable en todas las páginas.
+
+    Se serializa por su patrón y se vuelve a compilar al deserializarse, de modo que puede
+    enviarse a los procesos worker del pool de parseo.
+
+    Atributos:
+        patron (str): Selector CSS (ej. 'div.postcontent').
+    """
+
+    def __init__(self, patron: str) -> None:
+
+        """
+        Compila el selector.
+
+        Parámetros:
+            patron (str): Selector CSS.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionScrapping: Si el selector está vacío o no es un selector CSS válido.
+        """
+
+        import soupsieve
+
+        if not patron or not patron.strip():
+            raise ExcepcionScrapping("El selector CSS no puede estar vacío")
+
+        try:
+            self.patron = patron.strip()
+            self._compilado = soupsieve.compile(self.patron)
+
+        except Exception as e:
+            raise ExcepcionScrapping(f"Selector CSS inválido '{patron}'") from e
+
+
+    @classmethod
+    def por_clases(cls, etiqueta: str, clases: str) -> 'SelectorCompilado':
+
+        """
+        Crea el selector de una etiqueta con una o varias clases separadas por espacios.
+
+        Ejemplo:
+            ('a', 'button small') se convierte en 'a.button.small'.
+
+        Parámetros:
+            etiqueta (str): Nombre de la etiqueta.
+            clases (str): Clases CSS separadas por espacios.
+
+        Salida:
+            SelectorCompilado: Selector compilado.
+
+        Lanza:
+            ExcepcionScrapping: Si no se indica ninguna clase.
+        """
+
+        if not clases or not clases.split():
+            raise ExcepcionScrapping(f"No se ha configurado ninguna clase para el selector de '{etiqueta}'")
+
+        return cls(etiqueta + "".join(f".{clase}" for clase in clases.split()))
+
+
+    def __reduce__(self) -> tuple:
+        return (SelectorCompilado, (self.patron,))
+
+
+    def __repr__(self) -> str:
+        return f"SelectorCompilado({self.patron!r})"
+
+
+    def select(self, tag: 'Tag') -> List['Tag']:
+
+        """
+        Devuelve todos los descendientes de la etiqueta que cumplen el selector.
+
+        Parámetros:
+            tag (Tag): Etiqueta o documento BeautifulSoup en el que buscar.
+
+        Salida:
+            list[Tag]: Etiquetas encontradas, en orden de documento.
+        """
+
+        return self._compilado.select(tag)
+
+
+    def select_one(self, tag: 'Tag') -> Optional['Tag']:
+
+        """
+        Devuelve el primer descendiente de la etiqueta que cumple el selector.
+
+        Parámetros:
+            tag (Tag): Etiqueta o documento BeautifulSoup en el que buscar.
+
+        Salida:
+            Tag: Primera etiqueta encontrada o None.
+        """
+
+        return self._compilado.select_one(tag)
+
+
+    def match(self, tag: Any) -> bool:
+
+        """
+        Indica si una etiqueta cumple el selector (utilizable como filtro de find_all/find_all_next).
+
+        Parámetros:
+            tag (Tag): Etiqueta a comprobar.
+
+        Salida:
+            bool: True si la etiqueta cumple el selector.
+        """
+
+        return self._compilado.match(tag)
@@ -0,0 +1,87 @@
+# tests/test_clasificacion_liga.py
+
+import random
+import unittest
+from utils.clasificacion_liga import ClasificacionLiga, CTE_TAMANYO_BLOQUE
+
+
+class TestClasificacionLiga(unittest.TestCase):
+
+    def _referencia(self, puntos: dict) -> list:
+
+        """
+        Clasificación esperada calculada ordenando todo: (posición con empates, equipo, puntos).
+        """
+
+        ordenados = sorted(puntos.items(), key=lambda elemento: (-elemento[1], elemento[0]))
+
+        return [(sum(1 for otros in puntos.values() if otros > valor) + 1, equipo, valor) for equipo, valor in ordenados]
+
+
+    def _comprobar(self, clasificacion: ClasificacionLiga, puntos: dict) -> None:
+        referencia = self._referencia(puntos)
+        indices = {equipo: indice for indice, (_, equipo, _) in enumerate(referencia)}
+
+        self.assertEqual(len(clasificacion), len(puntos))
+        self.assertEqual([(elemento['posicion'], elemento['equipo'], elemento['puntos']) for elemento in clasificacion.obtener_top(len(puntos))],
+                         referencia)
+
+        for equipo in random.Random(len(puntos)).sample(sorted(puntos), min(50, len(puntos))):
+            indice = indices[equipo]
+            self.assertEqual(clasificacion.obtener_posicion(equipo), referencia[indice][0])
+            self.assertEqual([(elemento['posicion'], elemento['equipo']) for elemento in clasificacion.obtener_vecinos(equipo, 3)],
+                             [(posicion, nombre) for posicion, nombre, _ in referencia[max(0, indice - 3):indice + 4]])
+
+
+    def test_empates_top_y_vecinos(self) -> None:
+        clasificacion = ClasificacionLiga({'a': 10, 'b': 20, 'c': 20, 'd': 5})
+
+        self.assertEqual(clasificacion.obtener_top(3), [{'posicion': 1, 'equipo': 'b', 'puntos': 20},
+                                                        {'posicion': 1, 'equipo': 'c', 'puntos': 20},
+                                                        {'posicion': 3, 'equipo': 'a', 'puntos': 10}])
+        self.assertEqual(clasificacion.obtener_posicion('c'), 1)
+        self.assertEqual([elemento['equipo'] for elemento in clasificacion.obtener_vecinos('a', 1)], ['c', 'a', 'd'])
+        self.assertEqual(clasificacion.obtener_top(0), [])
+
+
+    def test_actualizaciones(self) -> None:
+        clasificacion = ClasificacionLiga({'a': 10, 'b': 20, 'c': 20})
+
+        clasificacion.aplicar_deltas({'a': 15, 'd': 0})
+        self.assertEqual(clasificacion.obtener_posicion('a'), 1)
+        self.assertEqual(clasificacion.obtener_posicion('d'), 4)
+        self.assertEqual(clasificacion.obtener_vecinos('b', 1)[0], {'posicion': 1, 'equipo': 'a', 'puntos': 25})
+
+        clasificacion.eliminar_equipo('a')
+        self.assertNotIn('a', clasificacion)
+        self.assertEqual(clasificacion.obtener_top(1)[0]['posicion'], 1)
+
+        with self.assertRaises(KeyError):
+            clasificacion.obtener_posicion('a')
+
+
+    def test_actualizaciones_entre_bloques(self) -> None:
+        # Suficientes equipos para que haya varios bloques y alguno se parta durante las actualizaciones
+        generador = random.Random(1234)
+        puntos = {f"equipo_{numero:05d}": generador.randint(0, 50) for numero in range(3 * CTE_TAMANYO_BLOQUE)}
+        clasificacion = ClasificacionLiga(puntos)
+        self._comprobar(clasificacion, puntos)
+
+        for _ in range(5):
+            deltas = {equipo: generador.randint(-20, 40) for equipo in generador.sample(sorted(puntos), CTE_TAMANYO_BLOQUE)}
+            deltas.update({f"nuevo_{generador.randint(0, 10 ** 6):07d}": generador.randint(0, 80) for _ in range(CTE_TAMANYO_BLOQUE)})
+
+            clasificacion.aplicar_deltas(deltas)
+
+            for equipo, delta in deltas.items():
+                puntos[equipo] = puntos.get(equipo, 0) + delta
+
+            for equipo in generador.sample(sorted(puntos), CTE_TAMANYO_BLOQUE // 2):
+                clasificacion.eliminar_equipo(equipo)
+                del puntos[equipo]
+
+            self._comprobar(clasificacion, puntos)
+
+
+if __name__ == "__main__":
+    unittest.main()
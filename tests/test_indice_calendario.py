@@ -0,0 +1,75 @@
+# tests/test_indice_calendario.py
+
+import unittest
+from datetime import datetime
+from utils.indice_calendario import IndiceCalendario
+
+CTE_FORMATO_FECHA = "%d-%m-%Y %H:%M:%S"
+
+
+def _vuelta(descripcion: str, inicio: str, fin: str) -> dict:
+    return {'url': f"https://www.ejemplo.com/{descripcion}", 'descripcion': descripcion, 'numero_etapas': 1,
+            'tipo_vuelta': "vuelta", 'fecha_inicio': inicio, 'fecha_fin': fin}
+
+
+class TestIndiceCalendario(unittest.TestCase):
+
+    def setUp(self) -> None:
+        grupos = [
+            {'nombre': "Vueltas", 'genero': "masculino", 'url': "https://www.ejemplo.com/vueltas/", 'tipo_grupo': "grupo_vueltas",
+             'desglose_grupo_competiciones': [
+                 # La más larga, para que la ventana de búsqueda tenga que mirar antes del rango
+                 _vuelta("larga", "01-05-2026 00:00:00", "31-05-2026 00:00:00"),
+                 _vuelta("corta", "10-05-2026 00:00:00", "12-05-2026 00:00:00"),
+                 _vuelta("junio", "05-06-2026 00:00:00", "07-06-2026 00:00:00"),
+                 _vuelta("sin_fechas", "", "")
+             ]},
+            {'nombre': "Clásicas", 'genero': "femenino", 'url': "https://www.ejemplo.com/clasicas/", 'tipo_grupo': "grupo_clasicas",
+             'desglose_grupo_competiciones': [
+                 {'numero_clasica': "1", 'fecha_clasica': "12-05-2026 10:00:00", 'nombre_clasica': "clasica", 'categoria': "A"}
+             ]}
+        ]
+        self.indice = IndiceCalendario(grupos, CTE_FORMATO_FECHA)
+
+
+    def _nombres(self, elementos: list) -> list:
+        return [elemento['competicion'].get('descripcion') or elemento['competicion'].get('nombre_clasica')
+                for elemento in elementos]
+
+
+    def test_sin_fechas_no_se_indexa(self) -> None:
+        self.assertEqual(len(self.indice), 4)
+
+
+    def test_solapes_por_dia(self) -> None:
+        self.assertEqual(self._nombres(self.indice.competiciones_en_dia(datetime(2026, 5, 12, 18))),
+                         ["larga", "corta", "clasica"])
+        self.assertEqual(self._nombres(self.indice.competiciones_en_dia(datetime(2026, 5, 20))), ["larga"])
+        self.assertEqual(self.indice.competiciones_en_dia(datetime(2026, 6, 1)), [])
+
+
+    def test_solapes_por_rango(self) -> None:
+        # El fin del rango coincide con el inicio de 'junio' y su inicio con el fin de 'larga': ambos extremos se incluyen
+        self.assertEqual(self._nombres(self.indice.competiciones_en_rango(datetime(2026, 5, 31), datetime(2026, 6, 5))),
+                         ["larga", "junio"])
+        self.assertEqual(self._nombres(self.indice.competiciones_en_rango(datetime(2026, 5, 11, 12), datetime(2026, 5, 12, 9))),
+                         ["larga", "corta"])
+        self.assertEqual(self.indice.competiciones_en_rango(datetime(2026, 6, 8), datetime(2026, 12, 31)), [])
+
+
+    def test_siguiente_inicio(self) -> None:
+        self.assertEqual(self.indice.siguiente_inicio(datetime(2026, 1, 1)), datetime(2026, 5, 1))
+        # Una competición que empieza justo en el instante de referencia no es la siguiente
+        self.assertEqual(self.indice.siguiente_inicio(datetime(2026, 5, 10)), datetime(2026, 5, 12, 10))
+        self.assertIsNone(self.indice.siguiente_inicio(datetime(2026, 6, 5)))
+
+
+    def test_proximas_competiciones(self) -> None:
+        self.assertEqual(self._nombres(self.indice.proximas_competiciones(datetime(2026, 5, 5), 2)), ["corta", "clasica"])
+        self.assertEqual(self._nombres(self.indice.proximas_competiciones(datetime(2026, 5, 5), 10)),
+                         ["corta", "clasica", "junio"])
+        self.assertEqual(self.indice.proximas_competiciones(datetime(2026, 5, 5), -1), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
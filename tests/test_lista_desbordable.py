@@ -0,0 +1,78 @@
+# tests/test_lista_desbordable.py
+
+import os
+import tempfile
+import unittest
+from utils.lista_desbordable import ListaDesbordable
+
+
+class TestListaDesbordable(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directorio = tempfile.TemporaryDirectory()
+
+
+    def tearDown(self) -> None:
+        self.directorio.cleanup()
+
+
+    def test_recorrido_e_indices_en_el_limite_del_volcado(self) -> None:
+        elementos = [{'numero': numero, 'nombre': f"élément {numero}"} for numero in range(7)]
+
+        with ListaDesbordable(3, self.directorio.name) as lista:
+            for elemento in elementos:
+                lista.append(elemento)
+
+            self.assertEqual(len(lista), 7)
+            self.assertEqual(lista.elementos_volcados, 4)
+            self.assertEqual(list(lista), elementos)
+            # Se puede recorrer más de una vez
+            self.assertEqual(list(lista), elementos)
+            self.assertEqual([lista[indice] for indice in range(7)], elementos)
+            # El último en memoria y el primero volcado
+            self.assertEqual((lista[2], lista[3]), (elementos[2], elementos[3]))
+            self.assertEqual((lista[-1], lista[-5]), (elementos[6], elementos[2]))
+
+            for indice in (7, -8):
+                with self.assertRaises(IndexError):
+                    lista[indice]
+
+
+    def test_acceso_por_indice_entre_recorridos(self) -> None:
+        with ListaDesbordable(1, self.directorio.name) as lista:
+            for numero in range(5):
+                lista.append(numero)
+
+            recorridos = []
+
+            for elemento in lista:
+                recorridos.append((elemento, lista[4 - elemento]))
+
+            self.assertEqual(recorridos, [(numero, 4 - numero) for numero in range(5)])
+
+
+    def test_sin_volcado(self) -> None:
+        with ListaDesbordable(10, self.directorio.name) as lista:
+            lista.append("a")
+            lista.append("b")
+
+            self.assertEqual((list(lista), lista.elementos_volcados), (["a", "b"], 0))
+
+        self.assertEqual(os.listdir(self.directorio.name), [])
+
+
+    def test_todo_volcado_y_cierre(self) -> None:
+        lista = ListaDesbordable(0, self.directorio.name)
+
+        for numero in range(3):
+            lista.append([numero])
+
+        self.assertEqual((list(lista), lista.elementos_volcados), ([[0], [1], [2]], 3))
+
+        lista.cerrar()
+
+        self.assertEqual((len(lista), list(lista)), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
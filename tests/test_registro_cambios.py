@@ -0,0 +1,91 @@
+# tests/test_registro_cambios.py
+
+import tempfile
+import unittest
+from utils.excepciones import ExcepcionCambios
+from utils.registro_cambios import RegistroCambios, CTE_CAMBIO_ALTA, CTE_CAMBIO_BAJA, CTE_CAMBIO_FECHAS
+
+
+def _grupo(*clasicas: tuple) -> dict:
+    return {'nombre': "Clásicas", 'genero': "femenino", 'url': "https://www.ejemplo.com/clasicas/", 'tipo_grupo': "grupo_clasicas",
+            'desglose_grupo_competiciones': [{'numero_clasica': numero, 'fecha_clasica': fecha, 'nombre_clasica': f"Clásica {numero}",
+                                              'categoria': "A"} for numero, fecha in clasicas]}
+
+
+class TestLeerDesde(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directorio = tempfile.TemporaryDirectory()
+        self.registro = RegistroCambios(self.directorio.name)
+
+
+    def tearDown(self) -> None:
+        self.directorio.cleanup()
+
+
+    def _registrar_tres(self) -> None:
+        self.registro.registrar([_grupo(("1", "01-03-2026 11:00:00"), ("2", "02-03-2026 11:00:00"))])
+        self.registro.registrar([_grupo(("1", "08-03-2026 11:00:00"), ("2", "02-03-2026 11:00:00"))])
+
+
+    def test_registro_vacio(self) -> None:
+        self.assertEqual(self.registro.leer_desde(0, 10), ([], 0))
+
+        with self.assertRaises(ExcepcionCambios):
+            self.registro.leer_desde(1, 10)
+
+
+    def test_secuencias_consecutivas(self) -> None:
+        self._registrar_tres()
+        cambios, ultima = self.registro.leer_desde(0, 10)
+
+        self.assertEqual(ultima, 3)
+        self.assertEqual([cambio['secuencia'] for cambio in cambios], [1, 2, 3])
+        self.assertEqual([cambio['tipo'] for cambio in cambios], [CTE_CAMBIO_ALTA, CTE_CAMBIO_ALTA, CTE_CAMBIO_FECHAS])
+
+
+    def test_cursor_intermedio_y_limite(self) -> None:
+        self._registrar_tres()
+
+        cambios, ultima = self.registro.leer_desde(1, 1)
+        self.assertEqual(([cambio['secuencia'] for cambio in cambios], ultima), ([2], 3))
+
+        cambios, _ = self.registro.leer_desde(1, 100)
+        self.assertEqual([cambio['secuencia'] for cambio in cambios], [2, 3])
+
+        self.assertEqual(self.registro.leer_desde(1, 0), ([], 3))
+
+
+    def test_cursor_al_final(self) -> None:
+        self._registrar_tres()
+
+        self.assertEqual(self.registro.leer_desde(3, 10), ([], 3))
+
+
+    def test_cursor_fuera_del_registro(self) -> None:
+        self._registrar_tres()
+
+        for cursor in (-1, 4):
+            with self.assertRaises(ExcepcionCambios):
+                self.registro.leer_desde(cursor, 10)
+
+
+    def test_sin_cambios_no_avanza(self) -> None:
+        self._registrar_tres()
+
+        self.assertEqual(self.registro.registrar([_grupo(("1", "08-03-2026 11:00:00"), ("2", "02-03-2026 11:00:00"))]), [])
+        self.assertEqual(self.registro.ultima_secuencia(), 3)
+
+
+    def test_reapertura_continua_la_secuencia(self) -> None:
+        self._registrar_tres()
+        registro = RegistroCambios(self.directorio.name)
+
+        cambios = registro.registrar([_grupo(("2", "02-03-2026 11:00:00"))])
+
+        self.assertEqual([(cambio['secuencia'], cambio['tipo']) for cambio in cambios], [(4, CTE_CAMBIO_BAJA)])
+        self.assertEqual(registro.leer_desde(3, 10)[0][0]['clave'], cambios[0]['clave'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# tests/test_snapshot_calendario.py
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from utils.excepciones import ExcepcionSnapshot
+from utils.snapshot_calendario import LectorSnapshot, publicar_snapshot
+
+CTE_FORMATO_FECHA = "%d-%m-%Y %H:%M:%S"
+
+CTE_GRUPOS = [
+    {
+        'nombre': "Grandes vueltas",
+        'genero': "masculino",
+        'url': "https://www.ejemplo.com/vueltas/2026/",
+        'tipo_grupo': "grupo_vueltas",
+        'desglose_grupo_competiciones': [
+            {'url': "https://www.ejemplo.com/giro/2026", 'descripcion': "Giro d'Italia", 'numero_etapas': 21,
+             'tipo_vuelta': "gran_vuelta", 'fecha_inicio': "09-05-2026 00:00:00", 'fecha_fin': "31-05-2026 00:00:00"},
+            {'url': "https://www.ejemplo.com/vuelta/2026", 'descripcion': "Vuelta a España", 'numero_etapas': 21,
+             'tipo_vuelta': "gran_vuelta", 'fecha_inicio': "22-08-2026 00:00:00", 'fecha_fin': "13-09-2026 00:00:00"}
+        ]
+    },
+    {
+        'nombre': "Clásicas femeninas",
+        'genero': "femenino",
+        'url': "https://www.ejemplo.com/clasicas/2026/",
+        'tipo_grupo': "grupo_clasicas",
+        'desglose_grupo_competiciones': [
+            {'numero_clasica': "1", 'fecha_clasica': "05-04-2026 10:30:00", 'nombre_clasica': "Ronde van Vlaanderen",
+             'categoria': "WWT"},
+            {'numero_clasica': "2", 'fecha_clasica': "12-04-2026 11:00:00", 'nombre_clasica': "Paris-Roubaix",
+             'categoria': "WWT"}
+        ]
+    },
+    {
+        'nombre': "Grupo vacío",
+        'genero': "masculino",
+        'url': "https://www.ejemplo.com/vacio/2026/",
+        'tipo_grupo': "grupo_vueltas",
+        'desglose_grupo_competiciones': []
+    }
+]
+
+
+class TestSnapshotCalendario(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "calendario.snap")
+
+
+    def tearDown(self) -> None:
+        self.directorio.cleanup()
+
+
+    def test_ida_y_vuelta(self) -> None:
+        bytes_escritos = publicar_snapshot(self.ruta, CTE_GRUPOS, CTE_FORMATO_FECHA, generado=1700000000)
+        lector = LectorSnapshot(self.ruta)
+
+        self.assertEqual(bytes_escritos, os.path.getsize(self.ruta))
+        self.assertEqual(lector.obtener_grupos_desglosados(), CTE_GRUPOS)
+        self.assertEqual(lector.obtener_fecha_generacion(), 1700000000)
+        self.assertEqual(lector.obtener_formato_fecha(), CTE_FORMATO_FECHA)
+        self.assertEqual(lector.obtener_numero_competiciones(), 4)
+
+
+    def test_indice_del_snapshot(self) -> None:
+        publicar_snapshot(self.ruta, CTE_GRUPOS, CTE_FORMATO_FECHA)
+        indice = LectorSnapshot(self.ruta).crear_indice_calendario()
+
+        competiciones = indice.competiciones_en_dia(datetime(2026, 5, 20))
+
+        self.assertEqual(len(indice), 4)
+        self.assertEqual([elemento['competicion']['descripcion'] for elemento in competiciones], ["Giro d'Italia"])
+        self.assertEqual(competiciones[0]['grupo'], "Grandes vueltas")
+        self.assertEqual(indice.siguiente_inicio(datetime(2026, 4, 6)), datetime(2026, 4, 12, 11, 0))
+
+
+    def test_publicacion_nueva_sustituye_a_la_anterior(self) -> None:
+        publicar_snapshot(self.ruta, CTE_GRUPOS, CTE_FORMATO_FECHA)
+        lector = LectorSnapshot(self.ruta, intervalo_comprobacion=0)
+        lector.obtener_numero_competiciones()
+
+        publicar_snapshot(self.ruta, CTE_GRUPOS[1:], CTE_FORMATO_FECHA)
+
+        self.assertEqual(lector.obtener_grupos_desglosados(), CTE_GRUPOS[1:])
+
+
+    def test_fichero_inexistente_o_invalido(self) -> None:
+        with self.assertRaises(ExcepcionSnapshot):
+            LectorSnapshot(self.ruta).obtener_numero_competiciones()
+
+        with open(self.ruta, "wb") as fichero:
+            fichero.write(b"XXXX" + bytes(64))
+
+        with self.assertRaises(ExcepcionSnapshot):
+            LectorSnapshot(self.ruta).obtener_numero_competiciones()
+
+
+if __name__ == "__main__":
+    unittest.main()
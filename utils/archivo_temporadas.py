@@ -0,0 +1,482 @@
+# utils/archivo_temporadas.py
+
+import os
+import shutil
+import struct
+import zlib
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from utils import fichero_utils
+from utils.excepciones import ExcepcionArchivo
+from utils.snapshot_calendario import CTE_EPOCH, CTE_FECHA_NULA, fecha_a_epoch
+
+# Cabecera de cada fichero de columna: magic, versión, tipo y número de filas
+CTE_MAGIC_COLUMNA = b"FCOL"
+CTE_VERSION_COLUMNA = 1
+CTE_ESTRUCTURA_CABECERA = struct.Struct("<4sHcxI")
+CTE_EXTENSION_COLUMNA = ".col"
+
+# Tipo de columna de cadenas codificadas con diccionario; el resto son códigos de array
+CTE_TIPO_DICCIONARIO = b"D"
+CTE_TIPOS_NUMERICOS = (b"q", b"i", b"d", b"I")
+
+CTE_NIVEL_COMPRESION = 6
+
+# Columnas de cada tabla del archivo: nombre -> tipo
+CTE_ESQUEMA = {
+    "grupos": {"nombre": "D", "genero": "D", "url": "D", "tipo_grupo": "D"},
+    "vueltas": {"grupo": "I", "descripcion": "D", "url": "D", "tipo_vuelta": "D",
+                "numero_etapas": "i", "fecha_inicio": "q", "fecha_fin": "q"},
+    "clasicas": {"grupo": "I", "numero_clasica": "i", "fecha_clasica": "q", "nombre_clasica": "D", "categoria": "D"},
+    "resultados": {"competicion": "D", "etapa": "i", "ciclista": "D", "posicion": "i", "puntos": "d"},
+}
+
+Columna = Union[array, List[str]]
+
+
+class ArchivoTemporadas:
+
+    """
+    Archivo histórico del calendario y los resultados en formato columnar comprimido.
+
+    Cada temporada es un directorio con un fichero por tabla y columna ('<tabla>.<columna>.col'),
+    de modo que una consulta solo lee y descomprime las columnas que usa. Las columnas numéricas
+    se guardan como arrays contiguos y las de texto codificadas con diccionario (lista de valores
+    distintos + códigos), lo que comprime mucho columnas repetitivas como 'genero', 'tipo_vuelta'
+    o 'categoria' y permite agrupar por ellas sin decodificar.
+
+    Las fechas se guardan como segundos desde epoch (CTE_FECHA_NULA si no hay fecha). La temporada
+    de un grupo es el año de su primera competición.
+
+    Atributos:
+        directorio (str): Directorio raíz del archivo.
+    """
+
+    def __init__(self, directorio: str) -> None:
+        self.directorio = directorio
+
+
+    def guardar_calendario(self, grupos_desglosados: List[dict], formato_fecha: str,
+                           resultados_competiciones: Optional[dict] = None) -> List[int]:
+
+        """
+        Archiva el calendario desglosado (y los resultados disponibles), sustituyendo cada temporada
+        que aparece en él. Las temporadas que no aparecen se conservan, y si no se dan resultados
+        se conservan los ya archivados de cada temporada.
+
+        Parámetros:
+            grupos_desglosados (list[dict]): Salida de DesglosarGruposCompeticiones.ejecutar().
+            formato_fecha (str): Formato de las fechas del calendario.
+            resultados_competiciones (dict, optional): URL de la vuelta -> ResultadosCompeticion.
+
+        Salida:
+            list[int]: Temporadas escritas.
+
+        Lanza:
+            ExcepcionArchivo: Si ocurre algún error al convertir o escribir el archivo.
+        """
+
+        try:
+            tablas_temporadas: Dict[int, Dict[str, Dict[str, list]]] = {}
+            temporadas_vueltas = {}
+
+            for grupo in grupos_desglosados:
+                desglose = grupo.get('desglose_grupo_competiciones') or []
+                temporada = obtener_temporada_grupo(desglose, formato_fecha)
+                tablas = tablas_temporadas.setdefault(temporada, {tabla: {columna: [] for columna in columnas}
+                                                                  for tabla, columnas in CTE_ESQUEMA.items()})
+                indice_grupo = len(tablas["grupos"]["nombre"])
+                self._agregar_fila(tablas["grupos"], nombre=grupo['nombre'], genero=grupo['genero'],
+                                   url=grupo['url'], tipo_grupo=grupo['tipo_grupo'])
+
+                for competicion in desglose:
+                    if 'fecha_clasica' in competicion:
+                        self._agregar_fila(tablas["clasicas"], grupo=indice_grupo,
+                                           numero_clasica=int(competicion['numero_clasica']),
+                                           fecha_clasica=fecha_a_epoch(competicion['fecha_clasica'], formato_fecha),
+                                           nombre_clasica=competicion['nombre_clasica'],
+                                           categoria=competicion['categoria'])
+
+                    else:
+                        self._agregar_fila(tablas["vueltas"], grupo=indice_grupo,
+                                           descripcion=competicion['descripcion'], url=competicion['url'],
+                                           tipo_vuelta=competicion['tipo_vuelta'],
+                                           numero_etapas=int(competicion['numero_etapas'] or 0),
+                                           fecha_inicio=fecha_a_epoch(competicion['fecha_inicio'], formato_fecha),
+                                           fecha_fin=fecha_a_epoch(competicion['fecha_fin'], formato_fecha))
+                        temporadas_vueltas[competicion['url']] = temporada
+
+            for url, resultados in (resultados_competiciones or {}).items():
+                if url in temporadas_vueltas:
+                    self._agregar_resultados(tablas_temporadas[temporadas_vueltas[url]]["resultados"], url, resultados)
+
+            for temporada, tablas in tablas_temporadas.items():
+                if resultados_competiciones is None:
+                    del tablas["resultados"]
+
+                self._escribir_temporada(temporada, tablas)
+
+            return sorted(tablas_temporadas)
+
+        except ExcepcionArchivo:
+            raise
+
+        except Exception as e:
+            raise ExcepcionArchivo(f"Error al archivar el calendario en '{self.directorio}'") from e
+
+
+    def obtener_temporadas(self) -> List[int]:
+
+        """
+        Devuelve las temporadas archivadas.
+
+        Parámetros:
+            None
+
+        Salida:
+            list[int]: Años de las temporadas, en orden.
+        """
+
+        if not os.path.isdir(self.directorio):
+            return []
+
+        return sorted(int(nombre) for nombre in os.listdir(self.directorio) if nombre.isdigit())
+
+
+    def leer_columna(self, temporada: int, tabla: str, columna: str) -> Columna:
+
+        """
+        Lee y decodifica una columna de una temporada.
+
+        Parámetros:
+            temporada (int): Año de la temporada.
+            tabla (str): Tabla ('grupos', 'vueltas', 'clasicas' o 'resultados').
+            columna (str): Columna de la tabla.
+
+        Salida:
+            array | list[str]: Valores de la columna (array para numéricas, lista para textos).
+
+        Lanza:
+            ExcepcionArchivo: Si la columna no existe o el fichero está dañado.
+        """
+
+        tipo, datos = self._leer_fichero_columna(temporada, tabla, columna)
+
+        if tipo == CTE_TIPO_DICCIONARIO:
+            diccionario, codigos = datos
+            return [diccionario[codigo] for codigo in codigos]
+
+        return datos
+
+
+    def leer_columna_codificada(self, temporada: int, tabla: str, columna: str) -> Tuple[List[str], array]:
+
+        """
+        Lee una columna de texto sin decodificarla.
+
+        Parámetros:
+            temporada (int): Año de la temporada.
+            tabla (str): Tabla.
+            columna (str): Columna de texto de la tabla.
+
+        Salida:
+            tuple: (diccionario de valores distintos, array de códigos 'I' con un código por fila).
+
+        Lanza:
+            ExcepcionArchivo: Si la columna no existe, no es de texto o el fichero está dañado.
+        """
+
+        tipo, datos = self._leer_fichero_columna(temporada, tabla, columna)
+
+        if tipo != CTE_TIPO_DICCIONARIO:
+            raise ExcepcionArchivo(f"La columna '{tabla}.{columna}' no es de texto")
+
+        return datos
+
+
+    def leer_columnas(self, tabla: str, columnas: Iterable[str],
+                      temporadas: Optional[Iterable[int]] = None) -> Dict[str, Columna]:
+
+        """
+        Lee varias columnas de una tabla concatenando las temporadas pedidas. Solo se leen los
+        ficheros de esas columnas.
+
+        Parámetros:
+            tabla (str): Tabla.
+            columnas (Iterable[str]): Columnas a leer.
+            temporadas (Iterable[int], optional): Temporadas a leer. Default son todas.
+
+        Salida:
+            dict: Columna -> valores concatenados (alineados fila a fila entre columnas).
+
+        Lanza:
+            ExcepcionArchivo: Si alguna columna no existe o algún fichero está dañado.
+        """
+
+        temporadas = self.obtener_temporadas() if temporadas is None else list(temporadas)
+        resultado = {}
+
+        for columna in columnas:
+            valores = None
+
+            for temporada in temporadas:
+                leidos = self.leer_columna(temporada, tabla, columna)
+                valores = leidos if valores is None else valores + leidos
+
+            resultado[columna] = valores if valores is not None else self._columna_vacia(tabla, columna)
+
+        return resultado
+
+
+    def contar_por(self, tabla: str, columna: str, temporadas: Optional[Iterable[int]] = None) -> Dict[str, int]:
+
+        """
+        Cuenta las filas por valor de una columna de texto sin decodificar fila a fila
+        (se cuentan los códigos y solo se traduce el diccionario).
+
+        Parámetros:
+            tabla (str): Tabla.
+            columna (str): Columna de texto.
+            temporadas (Iterable[int], optional): Temporadas a considerar. Default son todas.
+
+        Salida:
+            dict: Valor -> número de filas.
+
+        Lanza:
+            ExcepcionArchivo: Si la columna no existe, no es de texto o algún fichero está dañado.
+        """
+
+        totales = Counter()
+
+        for temporada in (self.obtener_temporadas() if temporadas is None else temporadas):
+            diccionario, codigos = self.leer_columna_codificada(temporada, tabla, columna)
+
+            for codigo, numero in Counter(codigos).items():
+                totales[diccionario[codigo]] += numero
+
+        return dict(totales)
+
+
+    @staticmethod
+    def epoch_a_datetime(segundos: int) -> Optional[datetime]:
+
+        """
+        Convierte una fecha archivada a datetime.
+
+        Parámetros:
+            segundos (int): Segundos desde epoch o CTE_FECHA_NULA.
+
+        Salida:
+            datetime: Fecha o None si es nula.
+        """
+
+        return None if segundos == CTE_FECHA_NULA else CTE_EPOCH + timedelta(seconds=segundos)
+
+
+    @staticmethod
+    def _agregar_fila(tabla: Dict[str, list], **valores) -> None:
+        for columna, valor in valores.items():
+            tabla[columna].append(valor)
+
+
+    def _agregar_resultados(self, tabla: Dict[str, list], url: str, resultados) -> None:
+
+        """
+        Añade en formato largo (una fila por ciclista y etapa con posición) los resultados de una vuelta.
+
+        Parámetros:
+            tabla (dict): Columnas de la tabla 'resultados'.
+            url (str): URL de la vuelta.
+            resultados (ResultadosCompeticion): Resultados de la vuelta.
+
+        Salida:
+            None
+        """
+
+        import numpy as np
+
+        puntos = resultados.obtener_puntos_etapas()
+        posiciones = resultados.obtener_posiciones_etapas()
+        filas, columnas = np.nonzero(posiciones)
+
+        tabla["competicion"].extend([url] * len(filas))
+        tabla["etapa"].extend((columnas + 1).tolist())
+        tabla["ciclista"].extend(resultados.ciclistas[fila] for fila in filas.tolist())
+        tabla["posicion"].extend(posiciones[filas, columnas].tolist())
+        tabla["puntos"].extend(puntos[filas, columnas].tolist())
+
+
+    def _escribir_temporada(self, temporada: int, tablas: Dict[str, Dict[str, list]]) -> None:
+
+        """
+        Escribe todas las columnas de una temporada en un directorio temporal y lo intercambia
+        con el de la temporada, para que un lector no mezcle columnas de dos versiones. Las tablas
+        que no se dan se copian de la versión anterior (o se escriben vacías si no existía).
+
+        Parámetros:
+            temporada (int): Año de la temporada.
+            tablas (dict): Tabla -> columna -> valores.
+
+        Salida:
+            None
+        """
+
+        directorio_temporada = os.path.join(self.directorio, str(temporada))
+        directorio_nuevo = f"{directorio_temporada}.nuevo"
+        directorio_anterior = f"{directorio_temporada}.anterior"
+
+        shutil.rmtree(directorio_nuevo, ignore_errors=True)
+        os.makedirs(directorio_nuevo)
+
+        for tabla, esquema in CTE_ESQUEMA.items():
+            for columna, tipo in esquema.items():
+                nombre_fichero = f"{tabla}.{columna}{CTE_EXTENSION_COLUMNA}"
+                ruta_anterior = os.path.join(directorio_temporada, nombre_fichero)
+                ruta = os.path.join(directorio_nuevo, nombre_fichero)
+
+                if tabla not in tablas and os.path.exists(ruta_anterior):
+                    shutil.copyfile(ruta_anterior, ruta)
+
+                else:
+                    valores = tablas[tabla][columna] if tabla in tablas else []
+                    fichero_utils.escribir_atomico(ruta, self._serializar_columna(tipo.encode("ascii"), valores))
+
+        shutil.rmtree(directorio_anterior, ignore_errors=True)
+
+        if os.path.exists(directorio_temporada):
+            os.replace(directorio_temporada, directorio_anterior)
+
+        os.replace(directorio_nuevo, directorio_temporada)
+        shutil.rmtree(directorio_anterior, ignore_errors=True)
+
+
+    @staticmethod
+    def _serializar_columna(tipo: bytes, valores: list) -> bytes:
+
+        """
+        Serializa una columna: cabecera sin comprimir y contenido comprimido con zlib.
+
+        Las columnas de texto se guardan como: número de valores distintos (u32), offsets (u32),
+        bytes UTF-8 de los valores y códigos de cada fila (u32).
+
+        Parámetros:
+            tipo (bytes): Tipo de la columna (CTE_TIPO_DICCIONARIO o código de array).
+            valores (list): Valores de la columna.
+
+        Salida:
+            bytes: Contenido del fichero.
+        """
+
+        if tipo == CTE_TIPO_DICCIONARIO:
+            indices: Dict[str, int] = {}
+            codigos = array('I', (indices.setdefault(valor or "", len(indices)) for valor in valores))
+            textos = [valor.encode("utf-8") for valor in indices]
+            offsets = array('I', [0])
+
+            for texto in textos:
+                offsets.append(offsets[-1] + len(texto))
+
+            contenido = struct.pack("<I", len(textos)) + offsets.tobytes() + b"".join(textos) + codigos.tobytes()
+
+        else:
+            contenido = array(tipo.decode("ascii"), valores).tobytes()
+
+        cabecera = CTE_ESTRUCTURA_CABECERA.pack(CTE_MAGIC_COLUMNA, CTE_VERSION_COLUMNA, tipo, len(valores))
+
+        return cabecera + zlib.compress(contenido, CTE_NIVEL_COMPRESION)
+
+
+    def _leer_fichero_columna(self, temporada: int, tabla: str, columna: str) -> tuple:
+
+        """
+        Lee y descomprime el fichero de una columna.
+
+        Parámetros:
+            temporada (int): Año de la temporada.
+            tabla (str): Tabla.
+            columna (str): Columna.
+
+        Salida:
+            tuple: (tipo, datos); datos es un array para columnas numéricas o (diccionario, códigos)
+                   para columnas de texto.
+
+        Lanza:
+            ExcepcionArchivo: Si el fichero no existe o está dañado.
+        """
+
+        ruta = os.path.join(self.directorio, str(temporada), f"{tabla}.{columna}{CTE_EXTENSION_COLUMNA}")
+
+        try:
+            with open(ruta, "rb") as fichero:
+                contenido = fichero.read()
+
+            magic, version, tipo, numero_filas = CTE_ESTRUCTURA_CABECERA.unpack_from(contenido)
+
+            if magic != CTE_MAGIC_COLUMNA or version != CTE_VERSION_COLUMNA:
+                raise ExcepcionArchivo(f"El fichero {ruta} no es una columna del archivo o su versión no está soportada")
+
+            datos = zlib.decompress(contenido[CTE_ESTRUCTURA_CABECERA.size:])
+
+            if tipo == CTE_TIPO_DICCIONARIO:
+                numero_textos, = struct.unpack_from("<I", datos)
+                offsets = array('I')
+                offsets.frombytes(datos[4:4 + 4 * (numero_textos + 1)])
+                inicio_textos = 4 + 4 * (numero_textos + 1)
+                diccionario = [datos[inicio_textos + offsets[i]:inicio_textos + offsets[i + 1]].decode("utf-8")
+                               for i in range(numero_textos)]
+                codigos = array('I')
+                codigos.frombytes(datos[inicio_textos + offsets[-1]:])
+                columna_leida = (diccionario, codigos)
+                filas_leidas = len(codigos)
+
+            elif tipo in CTE_TIPOS_NUMERICOS:
+                columna_leida = array(tipo.decode("ascii"))
+                columna_leida.frombytes(datos)
+                filas_leidas = len(columna_leida)
+
+            else:
+                raise ExcepcionArchivo(f"Tipo de columna desconocido en {ruta}")
+
+            if filas_leidas != numero_filas:
+                raise ExcepcionArchivo(f"El fichero {ruta} tiene {filas_leidas} filas y su cabecera indica {numero_filas}")
+
+            return tipo, columna_leida
+
+        except ExcepcionArchivo:
+            raise
+
+        except (OSError, struct.error, zlib.error, UnicodeDecodeError, ValueError) as e:
+            raise ExcepcionArchivo(f"No se pudo leer la columna '{tabla}.{columna}' de la temporada {temporada}") from e
+
+
+    @staticmethod
+    def _columna_vacia(tabla: str, columna: str) -> Columna:
+
+        tipo = CTE_ESQUEMA.get(tabla, {}).get(columna)
+
+        if tipo is None:
+            raise ExcepcionArchivo(f"La columna '{tabla}.{columna}' no existe en el archivo")
+
+        return [] if tipo == "D" else array(tipo)
+
+
+def obtener_temporada_grupo(desglose: List[dict], formato_fecha: str) -> int:
+
+    """
+    Devuelve la temporada de un grupo: el año de su primera competición con fecha.
+
+    Parámetros:
+        desglose (list[dict]): Competiciones del grupo.
+        formato_fecha (str): Formato de las fechas.
+
+    Salida:
+        int: Año de la temporada (el actual si ninguna competición tiene fecha).
+    """
+
+    fechas = [fecha_a_epoch(competicion.get('fecha_inicio') or competicion.get('fecha_clasica'), formato_fecha)
+              for competicion in desglose]
+    fechas = [fecha for fecha in fechas if fecha != CTE_FECHA_NULA]
+
+    return ArchivoTemporadas.epoch_a_datetime(min(fechas)).year if fechas else datetime.now().year
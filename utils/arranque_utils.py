@@ -0,0 +1,85 @@
+# utils/arranque_utils.py
+
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+from utils.excepciones import ExcepcionBase
+
+# Prefijo de las líneas que escribe el intérprete con -X importtime
+CTE_PREFIJO_IMPORTTIME = "import time:"
+
+
+def medir_importaciones(modulo: str) -> List[Tuple[str, int, int]]:
+
+    """
+    Importa un módulo en un intérprete nuevo con '-X importtime' y recoge el coste de cada importación.
+
+    Se usa un proceso aparte para medir un arranque en frío, sin los módulos que ya estén
+    cargados en el proceso actual.
+
+    Parámetros:
+        modulo (str): Nombre del módulo a importar (ej. 'scripts.cron_actualizar_calendario').
+
+    Salida:
+        list[tuple]: Tuplas (módulo, tiempo propio en µs, tiempo acumulado en µs) en orden de importación.
+
+    Lanza:
+        ExcepcionBase: Si el módulo no se puede importar.
+    """
+
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join(ruta for ruta in sys.path if ruta))
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                               capture_output=True, text=True, env=entorno)
+
+    if resultado.returncode != 0:
+        raise ExcepcionBase(f"No se pudo importar '{modulo}' para medir el arranque:\n{resultado.stderr[-2000:]}")
+
+    importaciones = []
+
+    for linea in resultado.stderr.splitlines():
+
+        if not linea.startswith(CTE_PREFIJO_IMPORTTIME):
+            continue
+
+        campos = linea[len(CTE_PREFIJO_IMPORTTIME):].split("|")
+
+        if len(campos) != 3 or not campos[0].strip().isdigit():
+            continue
+
+        importaciones.append((campos[2].strip(), int(campos[0]), int(campos[1])))
+
+    return importaciones
+
+
+def generar_informe_importaciones(modulo: str, numero_modulos: int = 20, fases: List[Tuple[str, float]] = None) -> str:
+
+    """
+    Genera un informe de texto con los módulos que más tiempo aportan al arranque.
+
+    Parámetros:
+        modulo (str): Módulo de entrada cuyo arranque se quiere medir.
+        numero_modulos (int, optional): Número de módulos a mostrar. Default es 20.
+        fases (list[tuple], optional): Fases adicionales medidas en el proceso (nombre, segundos).
+
+    Salida:
+        str: Informe listo para imprimir.
+    """
+
+    importaciones = medir_importaciones(modulo)
+    total_us = sum(propio for _, propio, _ in importaciones)
+    lineas = [f"Arranque de '{modulo}': {len(importaciones)} módulos importados en {total_us / 1000:.1f} ms", ""]
+
+    lineas.append(f"{'Acumulado (ms)':>15} {'Propio (ms)':>12}  Módulo")
+
+    for nombre, propio, acumulado in sorted(importaciones, key=lambda i: i[2], reverse=True)[:numero_modulos]:
+        lineas.append(f"{acumulado / 1000:>15.1f} {propio / 1000:>12.1f}  {nombre}")
+
+    if fases:
+        lineas.append("")
+        lineas.append("Fases de inicialización:")
+
+        for nombre, segundos in fases:
+            lineas.append(f"{segundos * 1000:>15.1f} ms  {nombre}")
+
+    return "\n".join(lineas)
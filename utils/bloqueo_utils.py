@@ -0,0 +1,87 @@
+# utils/bloqueo_utils.py
+
+import fcntl
+import os
+from typing import Optional, TextIO
+
+
+class BloqueoFichero:
+
+    """
+    Bloqueo exclusivo entre procesos basado en flock sobre un fichero.
+
+    Se usa para garantizar que nunca haya dos actualizaciones del calendario a la vez,
+    ya vengan del cron del sistema o del daemon. El sistema operativo libera el bloqueo
+    si el proceso muere, así que no quedan bloqueos huérfanos.
+
+    Atributos:
+        ruta_bloqueo (str): Ruta del fichero de bloqueo.
+    """
+
+    def __init__(self, ruta_bloqueo: str) -> None:
+
+        """
+        Inicializa el bloqueo sin adquirirlo.
+
+        Parámetros:
+            ruta_bloqueo (str): Ruta del fichero de bloqueo.
+
+        Salida:
+            None
+        """
+
+        self.ruta_bloqueo = ruta_bloqueo
+        self._fichero: Optional[TextIO] = None
+
+
+    def adquirir(self) -> bool:
+
+        """
+        Intenta adquirir el bloqueo sin esperar.
+
+        Parámetros:
+            None
+
+        Salida:
+            bool: True si se ha adquirido, False si otro proceso lo tiene.
+        """
+
+        if self._fichero is not None:
+            return True
+
+        directorio = os.path.dirname(os.path.abspath(self.ruta_bloqueo))
+        os.makedirs(directorio, exist_ok=True)
+        fichero = open(self.ruta_bloqueo, "a+")
+
+        try:
+            fcntl.flock(fichero.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        except BlockingIOError:
+            fichero.close()
+            return False
+
+        fichero.seek(0)
+        fichero.truncate()
+        fichero.write(str(os.getpid()))
+        fichero.flush()
+        self._fichero = fichero
+
+        return True
+
+
+    def liberar(self) -> None:
+
+        """
+        Libera el bloqueo si está adquirido.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        if self._fichero is not None:
+            fcntl.flock(self._fichero.fileno(), fcntl.LOCK_UN)
+            self._fichero.close()
+            self._fichero = None
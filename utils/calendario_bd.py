@@ -0,0 +1,200 @@
+# utils/calendario_bd.py
+
+from typing import List, Optional
+from utils import db_utils, fecha_utils
+from utils.db_utils import Conexion
+from utils.excepciones import ExcepcionBaseDeDatos
+
+# Formato de las fechas en la base de datos (válido como DATETIME de MySQL y ordenable como texto en SQLite)
+CTE_FORMATO_FECHA_BD = "%Y-%m-%d %H:%M:%S"
+
+# Tipos y sentencias comunes a MySQL y SQLite: sin autoincrementos ni índices fuera del CREATE TABLE
+CTE_ESQUEMA = (
+    """CREATE TABLE IF NOT EXISTS grupos_competiciones (
+        id_grupo INTEGER NOT NULL PRIMARY KEY,
+        nombre VARCHAR(255) NOT NULL,
+        genero VARCHAR(32) NOT NULL,
+        url VARCHAR(512) NOT NULL,
+        tipo_grupo VARCHAR(32) NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS vueltas (
+        id_grupo INTEGER NOT NULL,
+        orden INTEGER NOT NULL,
+        descripcion VARCHAR(255) NOT NULL,
+        url VARCHAR(512) NOT NULL,
+        numero_etapas INTEGER,
+        tipo_vuelta VARCHAR(64),
+        fecha_inicio DATETIME,
+        fecha_fin DATETIME,
+        PRIMARY KEY (id_grupo, orden),
+        FOREIGN KEY (id_grupo) REFERENCES grupos_competiciones (id_grupo) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS clasicas (
+        id_grupo INTEGER NOT NULL,
+        orden INTEGER NOT NULL,
+        numero_clasica VARCHAR(16),
+        fecha_clasica DATETIME,
+        nombre_clasica VARCHAR(255) NOT NULL,
+        categoria VARCHAR(64),
+        PRIMARY KEY (id_grupo, orden),
+        FOREIGN KEY (id_grupo) REFERENCES grupos_competiciones (id_grupo) ON DELETE CASCADE
+    )""",
+)
+
+CTE_INSERTAR_GRUPO = "INSERT INTO grupos_competiciones (id_grupo, nombre, genero, url, tipo_grupo) VALUES (?, ?, ?, ?, ?)"
+CTE_INSERTAR_VUELTA = ("INSERT INTO vueltas (id_grupo, orden, descripcion, url, numero_etapas, tipo_vuelta, fecha_inicio, fecha_fin) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+CTE_INSERTAR_CLASICA = ("INSERT INTO clasicas (id_grupo, orden, numero_clasica, fecha_clasica, nombre_clasica, categoria) "
+                        "VALUES (?, ?, ?, ?, ?, ?)")
+
+CTE_BORRAR_CALENDARIO = ("DELETE FROM vueltas", "DELETE FROM clasicas", "DELETE FROM grupos_competiciones")
+
+CTE_LEER_GRUPOS = "SELECT id_grupo, nombre, genero, url, tipo_grupo FROM grupos_competiciones ORDER BY id_grupo"
+CTE_LEER_VUELTAS = ("SELECT id_grupo, descripcion, url, numero_etapas, tipo_vuelta, fecha_inicio, fecha_fin "
+                    "FROM vueltas ORDER BY id_grupo, orden")
+CTE_LEER_CLASICAS = ("SELECT id_grupo, numero_clasica, fecha_clasica, nombre_clasica, categoria "
+                     "FROM clasicas ORDER BY id_grupo, orden")
+
+
+def crear_esquema(conexion: Conexion) -> None:
+
+    """
+    Crea las tablas del calendario si no existen.
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con db_utils.obtener_conexion.
+
+    Salida:
+        None
+
+    Lanza:
+        ExcepcionBaseDeDatos: Si alguna sentencia falla.
+    """
+
+    for sentencia in CTE_ESQUEMA:
+        db_utils.ejecutar_consulta(conexion, sentencia)
+
+    conexion.commit()
+
+
+def guardar_calendario(conexion: Conexion, grupos_desglosados: List[dict], formato_fecha: str) -> int:
+
+    """
+    Sustituye el calendario guardado por el calendario desglosado en una única transacción,
+    escribiendo cada tabla con un solo lote.
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con db_utils.obtener_conexion.
+        grupos_desglosados (list[dict]): Salida de DesglosarGruposCompeticiones.ejecutar().
+        formato_fecha (str): Formato de las fechas del calendario.
+
+    Salida:
+        int: Número de filas escritas.
+
+    Lanza:
+        ExcepcionBaseDeDatos: Si alguna sentencia falla (la transacción se deshace).
+    """
+
+    filas_grupos = []
+    filas_vueltas = []
+    filas_clasicas = []
+
+    for id_grupo, grupo in enumerate(grupos_desglosados, start=1):
+        filas_grupos.append((id_grupo, grupo['nombre'], grupo['genero'], grupo['url'], grupo['tipo_grupo']))
+
+        for orden, competicion in enumerate(grupo.get('desglose_grupo_competiciones') or []):
+
+            if 'fecha_clasica' in competicion:
+                filas_clasicas.append((id_grupo, orden, competicion['numero_clasica'],
+                                       _a_fecha_bd(competicion['fecha_clasica'], formato_fecha),
+                                       competicion['nombre_clasica'], competicion['categoria']))
+
+            else:
+                filas_vueltas.append((id_grupo, orden, competicion['descripcion'], competicion['url'],
+                                      _a_entero(competicion['numero_etapas']), competicion['tipo_vuelta'],
+                                      _a_fecha_bd(competicion['fecha_inicio'], formato_fecha),
+                                      _a_fecha_bd(competicion['fecha_fin'], formato_fecha)))
+
+    try:
+        for sentencia in CTE_BORRAR_CALENDARIO:
+            db_utils.ejecutar_consulta(conexion, sentencia)
+
+        filas_escritas = db_utils.ejecutar_lote(conexion, CTE_INSERTAR_GRUPO, filas_grupos)
+        filas_escritas += db_utils.ejecutar_lote(conexion, CTE_INSERTAR_VUELTA, filas_vueltas)
+        filas_escritas += db_utils.ejecutar_lote(conexion, CTE_INSERTAR_CLASICA, filas_clasicas)
+        conexion.commit()
+
+        return filas_escritas
+
+    except ExcepcionBaseDeDatos:
+        conexion.rollback()
+        raise
+
+
+def leer_calendario(conexion: Conexion, formato_fecha: str) -> List[dict]:
+
+    """
+    Lee el calendario guardado con la misma forma que devuelve DesglosarGruposCompeticiones.ejecutar().
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con db_utils.obtener_conexion.
+        formato_fecha (str): Formato de salida de las fechas.
+
+    Salida:
+        list[dict]: Calendario desglosado.
+
+    Lanza:
+        ExcepcionBaseDeDatos: Si alguna consulta falla.
+    """
+
+    grupos = {}
+
+    for id_grupo, nombre, genero, url, tipo_grupo in db_utils.ejecutar_consulta(conexion, CTE_LEER_GRUPOS):
+        grupos[id_grupo] = {'nombre': nombre, 'genero': genero, 'url': url, 'tipo_grupo': tipo_grupo,
+                            'desglose_grupo_competiciones': []}
+
+    for id_grupo, descripcion, url, numero_etapas, tipo_vuelta, fecha_inicio, fecha_fin in \
+            db_utils.ejecutar_consulta(conexion, CTE_LEER_VUELTAS):
+        grupos[id_grupo]['desglose_grupo_competiciones'].append({
+            'url': url,
+            'descripcion': descripcion,
+            'numero_etapas': numero_etapas,
+            'tipo_vuelta': tipo_vuelta,
+            'fecha_inicio': _de_fecha_bd(fecha_inicio, formato_fecha),
+            'fecha_fin': _de_fecha_bd(fecha_fin, formato_fecha)
+        })
+
+    for id_grupo, numero_clasica, fecha_clasica, nombre_clasica, categoria in \
+            db_utils.ejecutar_consulta(conexion, CTE_LEER_CLASICAS):
+        grupos[id_grupo]['desglose_grupo_competiciones'].append({
+            'numero_clasica': numero_clasica,
+            'fecha_clasica': _de_fecha_bd(fecha_clasica, formato_fecha),
+            'nombre_clasica': nombre_clasica,
+            'categoria': categoria
+        })
+
+    return list(grupos.values())
+
+
+def _a_entero(valor) -> Optional[int]:
+    return int(valor) if valor not in (None, "") else None
+
+
+def _a_fecha_bd(fecha: Optional[str], formato_fecha: str) -> Optional[str]:
+    return fecha_utils.convertir_formato_fecha(fecha, formato_fecha, CTE_FORMATO_FECHA_BD) if fecha else None
+
+
+def _de_fecha_bd(fecha, formato_fecha: str) -> Optional[str]:
+
+    """
+    Convierte una fecha leída de la base de datos al formato del calendario
+    (MySQL devuelve datetime y SQLite el texto guardado).
+    """
+
+    if fecha is None:
+        return None
+
+    if isinstance(fecha, str):
+        return fecha_utils.convertir_formato_fecha(fecha, CTE_FORMATO_FECHA_BD, formato_fecha)
+
+    return fecha.strftime(formato_fecha)
@@ -0,0 +1,358 @@
+# utils/clasificacion_liga.py
+
+import bisect
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Tamaño objetivo de cada bloque de la lista ordenada; un bloque se parte al doblarlo
+CTE_TAMANYO_BLOQUE = 512
+
+
+class ClasificacionLiga:
+
+    """
+    Clasificación de los equipos de una liga ordenada por puntos, mantenida de forma incremental.
+
+    Es una lista ordenada por bloques: los equipos se guardan como claves (-puntos, equipo) en
+    bloques ordenados de unos CTE_TAMANYO_BLOQUE elementos, con el último elemento de cada bloque
+    para localizar el bloque por bisect y un árbol de Fenwick con el tamaño de cada bloque para
+    calcular posiciones. Cambiar los puntos de un equipo es O(log n) en comparaciones más el
+    desplazamiento dentro de un único bloque, y las consultas de posición, top-N y vecinos
+    no reordenan nada.
+
+    La posición de un equipo tiene en cuenta los empates: es el número de equipos con más
+    puntos más uno. A igualdad de puntos, top-N y vecinos ordenan por nombre de equipo.
+    """
+
+    def __init__(self, puntos_equipos: Optional[Dict[str, float]] = None) -> None:
+
+        """
+        Construye la clasificación (ordenando una única vez si se dan equipos iniciales).
+
+        Parámetros:
+            puntos_equipos (dict, optional): Equipo -> puntos iniciales.
+
+        Salida:
+            None
+        """
+
+        self._puntos: Dict[str, float] = dict(puntos_equipos or {})
+        claves = sorted((-puntos, equipo) for equipo, puntos in self._puntos.items())
+        self._bloques: List[List[Tuple[float, str]]] = [claves[inicio:inicio + CTE_TAMANYO_BLOQUE]
+                                                        for inicio in range(0, len(claves), CTE_TAMANYO_BLOQUE)]
+        self._reconstruir_indices()
+
+
+    def __len__(self) -> int:
+        return len(self._puntos)
+
+
+    def __contains__(self, equipo: str) -> bool:
+        return equipo in self._puntos
+
+
+    def obtener_puntos(self, equipo: str) -> float:
+
+        """
+        Devuelve los puntos de un equipo.
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+
+        Salida:
+            float: Puntos del equipo.
+
+        Lanza:
+            KeyError: Si el equipo no está en la clasificación.
+        """
+
+        return self._puntos[equipo]
+
+
+    def establecer_puntos(self, equipo: str, puntos: float) -> None:
+
+        """
+        Fija los puntos de un equipo, añadiéndolo si no estaba.
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+            puntos (float): Puntos totales del equipo.
+
+        Salida:
+            None
+        """
+
+        anteriores = self._puntos.get(equipo)
+
+        if anteriores == puntos:
+            return
+
+        if anteriores is not None:
+            self._eliminar_clave((-anteriores, equipo))
+
+        self._insertar_clave((-puntos, equipo))
+        self._puntos[equipo] = puntos
+
+
+    def aplicar_deltas(self, deltas: Dict[str, float]) -> None:
+
+        """
+        Suma a cada equipo los puntos de su delta (ej. los puntos de la última etapa).
+
+        Parámetros:
+            deltas (dict): Equipo -> puntos a sumar. Los equipos nuevos parten de 0.
+
+        Salida:
+            None
+        """
+
+        for equipo, delta in deltas.items():
+            if delta:
+                self.establecer_puntos(equipo, self._puntos.get(equipo, 0.0) + delta)
+
+            elif equipo not in self._puntos:
+                self.establecer_puntos(equipo, 0.0)
+
+
+    def eliminar_equipo(self, equipo: str) -> None:
+
+        """
+        Quita un equipo de la clasificación.
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+
+        Salida:
+            None
+
+        Lanza:
+            KeyError: Si el equipo no está en la clasificación.
+        """
+
+        self._eliminar_clave((-self._puntos.pop(equipo), equipo))
+
+
+    def obtener_posicion(self, equipo: str) -> int:
+
+        """
+        Devuelve la posición de un equipo (número de equipos con más puntos más uno).
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+
+        Salida:
+            int: Posición desde 1.
+
+        Lanza:
+            KeyError: Si el equipo no está en la clasificación.
+        """
+
+        return self._contar_menores((-self._puntos[equipo], "")) + 1
+
+
+    def obtener_top(self, numero: int) -> List[dict]:
+
+        """
+        Devuelve los primeros equipos de la clasificación.
+
+        Parámetros:
+            numero (int): Número de equipos.
+
+        Salida:
+            list[dict]: Equipos con 'posicion', 'equipo' y 'puntos'.
+        """
+
+        return self._describir(0, self._iterar_desde(0), numero)
+
+
+    def obtener_vecinos(self, equipo: str, numero: int) -> List[dict]:
+
+        """
+        Devuelve un equipo junto a los 'numero' equipos anteriores y posteriores en la clasificación.
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+            numero (int): Equipos a cada lado.
+
+        Salida:
+            list[dict]: Equipos con 'posicion', 'equipo' y 'puntos', en orden de clasificación.
+
+        Lanza:
+            KeyError: Si el equipo no está en la clasificación.
+        """
+
+        indice = self._contar_menores((-self._puntos[equipo], equipo))
+        inicio = max(0, indice - numero)
+
+        return self._describir(inicio, self._iterar_desde(inicio), indice - inicio + numero + 1)
+
+
+    def _describir(self, inicio: int, claves: Iterator[Tuple[float, str]], numero: int) -> List[dict]:
+
+        """
+        Convierte hasta 'numero' claves consecutivas, que empiezan en el índice 'inicio', en
+        elementos de salida con su posición (con empates).
+
+        Parámetros:
+            inicio (int): Índice en la clasificación de la primera clave.
+            claves (Iterator[tuple]): Claves (-puntos, equipo) en orden.
+            numero (int): Máximo de elementos.
+
+        Salida:
+            list[dict]: Equipos con 'posicion', 'equipo' y 'puntos'.
+        """
+
+        elementos = []
+        posicion = None
+        puntos_anteriores = None
+
+        for desplazamiento, (puntos_negados, equipo) in zip(range(numero), claves):
+
+            if puntos_negados != puntos_anteriores:
+                posicion = self._contar_menores((puntos_negados, "")) + 1 if posicion is None else inicio + desplazamiento + 1
+                puntos_anteriores = puntos_negados
+
+            elementos.append({'posicion': posicion, 'equipo': equipo, 'puntos': -puntos_negados})
+
+        return elementos
+
+
+    def _iterar_desde(self, indice: int) -> Iterator[Tuple[float, str]]:
+
+        """
+        Recorre las claves desde el índice indicado de la clasificación.
+
+        Parámetros:
+            indice (int): Índice de la primera clave (desde 0).
+
+        Salida:
+            Iterator[tuple]: Claves (-puntos, equipo) en orden.
+        """
+
+        numero_bloque, desplazamiento = self._localizar_indice(indice)
+
+        for bloque in self._bloques[numero_bloque:]:
+            yield from bloque[desplazamiento:]
+            desplazamiento = 0
+
+
+    def _contar_menores(self, clave: Tuple[float, str]) -> int:
+
+        """
+        Cuenta las claves estrictamente menores (mejor clasificadas) que la dada.
+
+        Parámetros:
+            clave (tuple): Clave (-puntos, equipo).
+
+        Salida:
+            int: Número de claves menores.
+        """
+
+        if not self._bloques:
+            return 0
+
+        numero_bloque = min(bisect.bisect_left(self._ultimos, clave), len(self._bloques) - 1)
+
+        return self._sumar_tamanyos(numero_bloque) + bisect.bisect_left(self._bloques[numero_bloque], clave)
+
+
+    def _insertar_clave(self, clave: Tuple[float, str]) -> None:
+
+        if not self._bloques:
+            self._bloques.append([clave])
+            self._reconstruir_indices()
+            return
+
+        numero_bloque = min(bisect.bisect_left(self._ultimos, clave), len(self._bloques) - 1)
+        bloque = self._bloques[numero_bloque]
+        bisect.insort(bloque, clave)
+
+        if len(bloque) > 2 * CTE_TAMANYO_BLOQUE:
+            self._bloques[numero_bloque:numero_bloque + 1] = [bloque[:CTE_TAMANYO_BLOQUE], bloque[CTE_TAMANYO_BLOQUE:]]
+            self._reconstruir_indices()
+
+        else:
+            self._ultimos[numero_bloque] = bloque[-1]
+            self._actualizar_tamanyo(numero_bloque, 1)
+
+
+    def _eliminar_clave(self, clave: Tuple[float, str]) -> None:
+
+        numero_bloque = min(bisect.bisect_left(self._ultimos, clave), len(self._bloques) - 1)
+        bloque = self._bloques[numero_bloque]
+        del bloque[bisect.bisect_left(bloque, clave)]
+
+        if not bloque:
+            del self._bloques[numero_bloque]
+            self._reconstruir_indices()
+
+        else:
+            self._ultimos[numero_bloque] = bloque[-1]
+            self._actualizar_tamanyo(numero_bloque, -1)
+
+
+    def _reconstruir_indices(self) -> None:
+
+        """
+        Recalcula los últimos elementos de cada bloque y el árbol de Fenwick de tamaños
+        (solo al crear o eliminar bloques).
+        """
+
+        self._ultimos = [bloque[-1] for bloque in self._bloques]
+        self._fenwick = [0] * (len(self._bloques) + 1)
+
+        for numero_bloque, bloque in enumerate(self._bloques):
+            self._actualizar_tamanyo(numero_bloque, len(bloque))
+
+
+    def _actualizar_tamanyo(self, numero_bloque: int, incremento: int) -> None:
+
+        posicion = numero_bloque + 1
+
+        while posicion < len(self._fenwick):
+            self._fenwick[posicion] += incremento
+            posicion += posicion & -posicion
+
+
+    def _sumar_tamanyos(self, numero_bloques: int) -> int:
+
+        """
+        Suma los tamaños de los primeros 'numero_bloques' bloques.
+        """
+
+        total = 0
+        posicion = numero_bloques
+
+        while posicion > 0:
+            total += self._fenwick[posicion]
+            posicion -= posicion & -posicion
+
+        return total
+
+
+    def _localizar_indice(self, indice: int) -> Tuple[int, int]:
+
+        """
+        Localiza el bloque y el desplazamiento de un índice global descendiendo por el árbol de Fenwick.
+
+        Parámetros:
+            indice (int): Índice en la clasificación (desde 0).
+
+        Salida:
+            tuple: (número de bloque, desplazamiento dentro del bloque). Si el índice supera el
+                   número de equipos, apunta al final.
+        """
+
+        posicion = 0
+        restante = indice
+        paso = 1 << (len(self._fenwick) - 1).bit_length()
+
+        while paso:
+            siguiente = posicion + paso
+
+            if siguiente < len(self._fenwick) and self._fenwick[siguiente] <= restante:
+                posicion = siguiente
+                restante -= self._fenwick[siguiente]
+
+            paso >>= 1
+
+        return posicion, restante
@@ -1,12 +1,16 @@
 # utils/config.py
 
 import logging
-from typing import Dict
+import os
+from typing import Dict, TYPE_CHECKING
 import utils.properties_utils as properties_utils
 import utils.string_utils as string_utils
 import utils.logging_utils as logging_utils
 from utils.excepciones import ExcepcionConfig
 
+if TYPE_CHECKING:
+    import configparser
+
 class Config:
 
     """
@@ -70,6 +74,11 @@ class Config:
         """
         Inicializa el logger y los atributos de la clase.
 
+        El fichero general se lee una sola vez y sirve tanto para el logging como para la
+        configuración general, y el del proceso se lee también ahora si existe, de modo que
+        los errores de configuración se detectan al arrancar. Los procesos sin fichero propio
+        solo fallan si lo solicitan.
+
         Parámetros:
             ruta_config (str): Ruta del directorio de configuración.
             nombre_config (str): Nombre del archivo de configuración de propiedades.
@@ -79,14 +88,24 @@ class Config:
             None
 
         Lanza:
-            ExcepcionConfig: Si ocurre un error al inicializar el logger.
+            ExcepcionConfig: Si ocurre un error al inicializar el logger o al leer los ficheros de configuración.
         """
 
         try:
             self.proceso = proceso
-            self.logger = logging_utils.inicializar_logging(ruta_config, nombre_config, proceso)
-            self.fichero_config_general = self._inicializar_fichero_config(ruta_config, nombre_config)
-            self.fichero_config_proceso = self._inicializar_fichero_config(ruta_config, proceso)
+            self.ruta_config = ruta_config
+            self.nombre_config = nombre_config
+
+            nombre_properties = string_utils.obtener_nombre_properties_proceso(f"{ruta_config}{nombre_config}")
+            propiedades_generales = properties_utils.leer_properties(nombre_properties)
+            self.logger = logging_utils.inicializar_logging(ruta_config, nombre_config, proceso, propiedades_generales)
+            self.fichero_config_general = self._aplanar_properties(propiedades_generales, nombre_properties)
+
+            nombre_properties_proceso = string_utils.obtener_nombre_properties_proceso(f"{ruta_config}{proceso}")
+            self.fichero_config_proceso = None
+
+            if os.path.exists(nombre_properties_proceso):
+                self.fichero_config_proceso = self._inicializar_fichero_config(ruta_config, proceso)
 
         except Exception as e:
             raise ExcepcionConfig(f"Error al inicializar la configuración de '{proceso}'") from e
@@ -132,8 +151,14 @@ class Config:
 
         Salida:
             dict: Diccionario con las claves y valores de la configuración del proceso.
+
+        Lanza:
+            ExcepcionConfig: Si el proceso no tiene fichero de configuración propio.
         """
 
+        if self.fichero_config_proceso is None:
+            self.fichero_config_proceso = self._inicializar_fichero_config(self.ruta_config, self.proceso)
+
         return self.fichero_config_proceso
 
 
@@ -155,18 +180,33 @@ class Config:
 
         try:
             nombre_properties = string_utils.obtener_nombre_properties_proceso(f"{ruta_config}{nombre_proceso}")
-            config = properties_utils.leer_properties(nombre_properties)
-            configuracion_dict = {}
+            return self._aplanar_properties(properties_utils.leer_properties(nombre_properties), nombre_properties)
 
-            for seccion in config:
+        except Exception as e:
+            raise ExcepcionConfig(f"Error inesperado al leer el fichero de configuración de '{nombre_proceso}'") from e
 
-                for clave, valor in config[seccion].items():
-                    clave_formateada = f"{seccion}.{clave}"
-                    configuracion_dict[clave_formateada] = valor
 
-            self.logger.info(f"Configuración cargada exitosamente desde {nombre_properties}")
+    def _aplanar_properties(self, config: 'configparser.ConfigParser', nombre_properties: str) -> Dict[str, str]:
 
-            return configuracion_dict
+        """
+        Convierte un fichero de configuración leído en un diccionario con claves del tipo 'seccion.propiedad'.
 
-        except Exception as e:
-            raise ExcepcionConfig(f"Error inesperado al leer el fichero de configuración de '{nombre_proceso}'") from e
\ No newline at end of file
+        Parámetros:
+            config (ConfigParser): Fichero de configuración leído.
+            nombre_properties (str): Ruta del fichero (para el log).
+
+        Salida:
+            dict: Diccionario con las claves y valores de la configuración.
+        """
+
+        configuracion_dict = {}
+
+        for seccion in config:
+
+            for clave, valor in config[seccion].items():
+                clave_formateada = f"{seccion}.{clave}"
+                configuracion_dict[clave_formateada] = valor
+
+        self.logger.info(f"Configuración cargada exitosamente desde {nombre_properties}")
+
+        return configuracion_dict
\ No newline at end of file
@@ -1,31 +1,289 @@
 # utils/db_utils.py
 
-import mysql.connector
-from mysql.connector import connection
+import os
+from typing import Iterable, List, Optional, Sequence, TYPE_CHECKING, Union
 from utils.properties_utils import leer_properties, obtener_property
-from utils.excepciones import ExcepcionConexionBaseDeDatos
+from utils.excepciones import ExcepcionBaseDeDatos, ExcepcionConexionBaseDeDatos, ExcepcionProperties
 
-def obtener_conexion(ruta_properties: str) -> connection:
+# mysql.connector y sqlite3 se importan al abrir la primera conexión para no penalizar el arranque
+if TYPE_CHECKING:
+    import sqlite3
+    from mysql.connector import connection
+
+# Backends soportados ([database] backend en config.properties)
+CTE_BACKEND_MYSQL = "mysql"
+CTE_BACKEND_SQLITE = "sqlite"
+
+# Sentencias preparadas que SQLite mantiene en caché por conexión
+CTE_SENTENCIAS_CACHE_SQLITE = 256
+
+# Milisegundos que SQLite espera a que se libere un bloqueo de escritura antes de fallar
+CTE_ESPERA_BLOQUEO_SQLITE_MS = 5000
+
+Conexion = Union['connection', 'sqlite3.Connection']
+
+
+def obtener_conexion(ruta_properties: str) -> Conexion:
 
     """
     Obtiene una conexión a la base de datos usando los valores de un archivo de configuración .properties.
 
+    El backend se elige con la clave 'backend' de la sección [database] ('mysql' por defecto o 'sqlite').
+    Con SQLite la base de datos es el fichero indicado en 'ruta_sqlite'.
+
     Parámetros:
         ruta_properties (str): Ruta al archivo de configuración .properties
                                que contiene las credenciales
                                y parámetros de la base de datos.
 
     Salida:
-        mysql.connector.connection: Objeto de conexión a la base de datos.
+        mysql.connector.connection | sqlite3.Connection: Objeto de conexión a la base de datos.
 
     Lanza:
         ExcepcionConexionBaseDeDatos: Si ocurre algún error al intentar conectarse a la base de datos,
-                                      como problemas con el archivo de configuración o MySQL.
+                                      como problemas con el archivo de configuración, MySQL o SQLite.
     """
 
     try:
         propiedades = leer_properties(ruta_properties)
+        backend = obtener_property(propiedades, 'database', 'backend', CTE_BACKEND_MYSQL).strip().lower()
+
+    except ExcepcionProperties as ep:
+        raise ExcepcionConexionBaseDeDatos(f"El archivo de configuración '{ruta_properties}' no fue encontrado") from ep
+
+    if backend == CTE_BACKEND_SQLITE:
+        return _obtener_conexion_sqlite(propiedades)
+
+    if backend == CTE_BACKEND_MYSQL:
+        return _obtener_conexion_mysql(propiedades)
+
+    raise ExcepcionConexionBaseDeDatos(f"Backend de base de datos no soportado: '{backend}'")
+
+
+def es_sqlite(conexion: Conexion) -> bool:
+
+    """
+    Indica si una conexión es de SQLite.
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con obtener_conexion.
+
+    Salida:
+        bool: True si la conexión es de SQLite, False si es de MySQL.
+    """
+
+    import sqlite3
+
+    return isinstance(conexion, sqlite3.Connection)
+
+
+def ejecutar_consulta(conexion: Conexion, consulta_sql: str, parametros: Sequence = ()) -> List[tuple]:
+
+    """
+    Ejecuta una consulta como sentencia preparada y devuelve sus filas.
+
+    Las consultas se escriben con marcadores '?', que aceptan tanto SQLite como el cursor
+    preparado de MySQL; así el mismo texto sirve para los dos backends y la sentencia se
+    prepara una vez y se reutiliza.
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con obtener_conexion.
+        consulta_sql (str): Consulta con marcadores '?'.
+        parametros (Sequence): Valores de los marcadores.
+
+    Salida:
+        list[tuple]: Filas devueltas (vacía si la sentencia no devuelve filas).
+
+    Lanza:
+        ExcepcionBaseDeDatos: Si la consulta falla.
+    """
+
+    cursor = None
+
+    try:
+        cursor = conexion.cursor() if es_sqlite(conexion) else conexion.cursor(prepared=True)
+        cursor.execute(consulta_sql, tuple(parametros))
+
+        return cursor.fetchall() if cursor.description else []
+
+    except Exception as e:
+        raise ExcepcionBaseDeDatos(consulta_sql) from e
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+def ejecutar_lote(conexion: Conexion, consulta_sql: str, filas: Iterable[Sequence]) -> int:
+
+    """
+    Ejecuta una sentencia de escritura para un lote de filas con una sola llamada a executemany.
+
+    En SQLite la sentencia se prepara una vez y se ejecuta por cada fila dentro de la transacción
+    en curso; en MySQL el conector agrupa los INSERT del lote en una única sentencia multi-fila
+    (para eso usa el estilo de marcadores '%s', al que se traducen los '?').
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con obtener_conexion.
+        consulta_sql (str): Sentencia con marcadores '?'.
+        filas (Iterable[Sequence]): Valores de cada fila.
+
+    Salida:
+        int: Número de filas del lote.
+
+    Lanza:
+        ExcepcionBaseDeDatos: Si la sentencia falla.
+    """
+
+    filas = [tuple(fila) for fila in filas]
+
+    if not filas:
+        return 0
+
+    cursor = None
+
+    try:
+        cursor = conexion.cursor()
+        cursor.executemany(consulta_sql if es_sqlite(conexion) else consulta_sql.replace('?', '%s'), filas)
+
+        return len(filas)
+
+    except Exception as e:
+        raise ExcepcionBaseDeDatos(consulta_sql) from e
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+class ConexionPersistente:
+
+    """
+    Conexión a la base de datos que se mantiene abierta entre usos, para procesos de larga duración
+    como el daemon del calendario, que así no abren y cierran una conexión en cada actualización.
+
+    La conexión se abre en el primer uso y se comprueba antes de cada uno; si se ha perdido (reinicio
+    del servidor, wait_timeout de MySQL...) o se ha invalidado tras un fallo, se abre otra.
+
+    Atributos:
+        ruta_properties (str): Ruta del archivo .properties con la sección [database].
+    """
+
+    def __init__(self, ruta_properties: str) -> None:
+
+        """
+        Inicializa la conexión persistente sin abrirla.
+
+        Parámetros:
+            ruta_properties (str): Ruta del archivo .properties con la sección [database].
+
+        Salida:
+            None
+        """
+
+        self.ruta_properties = ruta_properties
+        self._conexion: Optional[Conexion] = None
+
 
+    def obtener(self) -> Conexion:
+
+        """
+        Devuelve la conexión abierta, abriendo una nueva si no la hay o ya no responde.
+
+        Parámetros:
+            None
+
+        Salida:
+            Conexion: Conexión lista para usarse.
+
+        Lanza:
+            ExcepcionConexionBaseDeDatos: Si no se puede abrir la conexión.
+        """
+
+        if self._conexion is not None and not _conexion_activa(self._conexion):
+            self.invalidar()
+
+        if self._conexion is None:
+            self._conexion = obtener_conexion(self.ruta_properties)
+
+        return self._conexion
+
+
+    def invalidar(self) -> None:
+
+        """
+        Cierra la conexión (ignorando errores) para que el siguiente uso abra otra; se llama tras un fallo.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        conexion, self._conexion = self._conexion, None
+
+        if conexion is not None:
+            try:
+                conexion.close()
+
+            except Exception:
+                pass
+
+
+    def cerrar(self) -> None:
+
+        """
+        Cierra la conexión al terminar el proceso.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        self.invalidar()
+
+
+def _conexion_activa(conexion: Conexion) -> bool:
+
+    """
+    Comprueba que una conexión sigue respondiendo con una consulta trivial.
+
+    Parámetros:
+        conexion (Conexion): Conexión obtenida con obtener_conexion.
+
+    Salida:
+        bool: True si la consulta responde.
+    """
+
+    try:
+        ejecutar_consulta(conexion, "SELECT 1")
+        return True
+
+    except ExcepcionBaseDeDatos:
+        return False
+
+
+def _obtener_conexion_mysql(propiedades) -> 'connection':
+
+    """
+    Abre una conexión a MySQL con los datos de la sección [database] (host, name, user, password y port).
+
+    Parámetros:
+        propiedades (ConfigParser): Propiedades con la sección [database].
+
+    Salida:
+        mysql.connector.connection: Conexión abierta.
+
+    Lanza:
+        ExcepcionConexionBaseDeDatos: Si falta alguna clave o MySQL rechaza la conexión.
+    """
+
+    import mysql.connector
+
+    try:
         conexion = mysql.connector.connect(
             host=obtener_property(propiedades, 'database', 'host'),
             database=obtener_property(propiedades, 'database', 'name'),
@@ -33,11 +291,8 @@ def obtener_conexion(ruta_properties: str) -> connection:
             password=obtener_property(propiedades, 'database', 'password'),
             port=obtener_property(propiedades, 'database', 'port')
         )
-        
-        return conexion
 
-    except FileNotFoundError as fnfe:
-        raise ExcepcionConexionBaseDeDatos(f"El archivo de configuración '{ruta_properties}' no fue encontrado") from fnfe
+        return conexion
 
     except KeyError as ke:
         raise ExcepcionConexionBaseDeDatos(f"Falta una clave requerida en el archivo de configuración: {ke.args[0]}") from ke
@@ -46,4 +301,54 @@ def obtener_conexion(ruta_properties: str) -> connection:
         raise ExcepcionConexionBaseDeDatos(f"Error de conexión a MySQL") from mce
 
     except Exception as e:
-        raise ExcepcionConexionBaseDeDatos(f"Error inesperado al intentar conectarse a la base de datos") from e
\ No newline at end of file
+        raise ExcepcionConexionBaseDeDatos(f"Error inesperado al intentar conectarse a la base de datos") from e
+
+
+def _obtener_conexion_sqlite(propiedades) -> 'sqlite3.Connection':
+
+    """
+    Abre la base de datos SQLite en modo WAL: los lectores no bloquean al escritor ni al revés,
+    y cada commit solo añade páginas al fichero de WAL (synchronous=NORMAL sigue siendo seguro
+    ante caídas del proceso en este modo).
+
+    Parámetros:
+        propiedades (ConfigParser): Propiedades con la sección [database].
+
+    Salida:
+        sqlite3.Connection: Conexión abierta.
+
+    Lanza:
+        ExcepcionConexionBaseDeDatos: Si falta la ruta o no se puede abrir la base de datos.
+    """
+
+    import sqlite3
+
+    ruta_sqlite: Optional[str] = None
+
+    try:
+        ruta_sqlite = obtener_property(propiedades, 'database', 'ruta_sqlite')
+
+        if not ruta_sqlite:
+            raise ExcepcionConexionBaseDeDatos("Falta la clave 'ruta_sqlite' de la sección [database]")
+
+        directorio = os.path.dirname(ruta_sqlite)
+
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        conexion = sqlite3.connect(ruta_sqlite, timeout=CTE_ESPERA_BLOQUEO_SQLITE_MS / 1000,
+                                   cached_statements=CTE_SENTENCIAS_CACHE_SQLITE)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        conexion.execute("PRAGMA foreign_keys=ON")
+
+        return conexion
+
+    except ExcepcionConexionBaseDeDatos:
+        raise
+
+    except sqlite3.Error as se:
+        raise ExcepcionConexionBaseDeDatos(f"Error al abrir la base de datos SQLite '{ruta_sqlite}'") from se
+
+    except Exception as e:
+        raise ExcepcionConexionBaseDeDatos(f"Error inesperado al intentar conectarse a la base de datos") from e
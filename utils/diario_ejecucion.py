@@ -0,0 +1,175 @@
+# utils/diario_ejecucion.py
+
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+from utils import fichero_utils
+from utils.excepciones import ExcepcionDiarioEjecucion
+
+# Ficheros del diario dentro de su directorio
+CTE_FICHERO_METADATOS = "diario.json"
+CTE_FICHERO_FALLOS = "fallos.json"
+CTE_PREFIJO_FICHERO_GRUPO = "grupo_"
+
+
+class DiarioEjecucion:
+
+    """
+    Diario de una actualización del calendario con un punto de control por grupo desglosado.
+
+    Cada grupo terminado se guarda en disco de forma atómica, de modo que una ejecución que
+    falla o se interrumpe se reanuda en la siguiente sin volver a descargar los grupos ya hechos.
+    Los grupos que fallan se registran con su error y número de intentos.
+
+    El diario se identifica por la lista de URLs de grupos a desglosar: si la web publica otros
+    grupos, se empieza un diario nuevo. Un diario más antiguo que 'antiguedad_maxima_segundos'
+    se descarta para no reutilizar datos obsoletos.
+
+    Atributos:
+        directorio (str): Directorio de este diario.
+    """
+
+    def __init__(self, directorio_base: str, urls_grupos: List[str], antiguedad_maxima_segundos: float) -> None:
+
+        """
+        Abre el diario de la lista de grupos indicada, creándolo o descartando uno caducado.
+
+        Parámetros:
+            directorio_base (str): Directorio donde se guardan los diarios.
+            urls_grupos (list[str]): URLs de los grupos que se van a desglosar.
+            antiguedad_maxima_segundos (float): Antigüedad a partir de la que el diario se descarta.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionDiarioEjecucion: Si no se puede crear el diario.
+        """
+
+        self.directorio = os.path.join(directorio_base, fichero_utils.calcular_huella("\n".join(sorted(urls_grupos))))
+        self._ruta_fallos = os.path.join(self.directorio, CTE_FICHERO_FALLOS)
+        ruta_metadatos = os.path.join(self.directorio, CTE_FICHERO_METADATOS)
+
+        try:
+            metadatos = fichero_utils.leer_json(ruta_metadatos)
+
+            if metadatos is not None and time.time() - metadatos.get("inicio", 0) > antiguedad_maxima_segundos:
+                shutil.rmtree(self.directorio, ignore_errors=True)
+                metadatos = None
+
+            if metadatos is None:
+                os.makedirs(self.directorio, exist_ok=True)
+                fichero_utils.escribir_json_atomico(ruta_metadatos, {"inicio": time.time(), "grupos": len(urls_grupos)})
+
+            self.reanudado = metadatos is not None
+
+        except OSError as e:
+            raise ExcepcionDiarioEjecucion(f"No se pudo abrir el diario de ejecución en '{self.directorio}'") from e
+
+
+    def obtener_grupo(self, url: str) -> Optional[dict]:
+
+        """
+        Devuelve el desglose guardado de un grupo.
+
+        Parámetros:
+            url (str): URL del grupo.
+
+        Salida:
+            dict: Grupo desglosado o None si todavía no se ha completado.
+        """
+
+        return fichero_utils.leer_json(self._ruta_grupo(url))
+
+
+    def guardar_grupo(self, url: str, grupo: dict) -> None:
+
+        """
+        Guarda el punto de control de un grupo desglosado y elimina su fallo si lo tenía.
+
+        Parámetros:
+            url (str): URL del grupo.
+            grupo (dict): Grupo desglosado.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionDiarioEjecucion: Si no se puede escribir el punto de control.
+        """
+
+        try:
+            fichero_utils.escribir_json_atomico(self._ruta_grupo(url), grupo)
+
+            fallos = self.obtener_fallos()
+
+            if fallos.pop(url, None) is not None:
+                fichero_utils.escribir_json_atomico(self._ruta_fallos, fallos)
+
+        except OSError as e:
+            raise ExcepcionDiarioEjecucion(f"No se pudo guardar el grupo '{url}' en el diario de ejecución") from e
+
+
+    def registrar_fallo(self, url: str, nombre: str, error: str) -> int:
+
+        """
+        Registra el fallo de un grupo, acumulando los intentos entre ejecuciones.
+
+        Parámetros:
+            url (str): URL del grupo.
+            nombre (str): Nombre del grupo.
+            error (str): Descripción del error.
+
+        Salida:
+            int: Número de intentos fallidos del grupo.
+
+        Lanza:
+            ExcepcionDiarioEjecucion: Si no se puede escribir el registro de fallos.
+        """
+
+        fallos = self.obtener_fallos()
+        intentos = fallos.get(url, {}).get("intentos", 0) + 1
+        fallos[url] = {"nombre": nombre, "error": error, "intentos": intentos, "fecha": time.time()}
+
+        try:
+            fichero_utils.escribir_json_atomico(self._ruta_fallos, fallos)
+
+        except OSError as e:
+            raise ExcepcionDiarioEjecucion(f"No se pudo registrar el fallo del grupo '{url}'") from e
+
+        return intentos
+
+
+    def obtener_fallos(self) -> Dict[str, dict]:
+
+        """
+        Devuelve los grupos con fallos registrados.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: URL del grupo -> {'nombre', 'error', 'intentos', 'fecha'}.
+        """
+
+        return fichero_utils.leer_json(self._ruta_fallos, {})
+
+
+    def eliminar(self) -> None:
+
+        """
+        Elimina el diario una vez que la actualización ha terminado completa.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+
+    def _ruta_grupo(self, url: str) -> str:
+        return os.path.join(self.directorio, f"{CTE_PREFIJO_FICHERO_GRUPO}{fichero_utils.calcular_huella(url)}.json")
@@ -136,6 +136,176 @@ class ExcepcionFecha(ExcepcionBase):
         super().__init__(self.mensaje)
 
 
+class ExcepcionSnapshot(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al publicar o leer el snapshot binario del calendario.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en el tratamiento del snapshot del calendario") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionDiarioEjecucion(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al leer o escribir el diario de una ejecución.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en el tratamiento del diario de ejecución") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionOptimizador(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando no se puede calcular o evaluar un equipo de fantasy.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en la optimización del equipo") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionResultados(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al ingerir, guardar o leer resultados de etapas.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en el tratamiento de los resultados de etapas") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionArchivo(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al escribir o leer el archivo histórico de temporadas.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en el tratamiento del archivo de temporadas") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionPruebaCarga(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando no se puede preparar o ejecutar una prueba de carga de la aplicación web.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en la prueba de carga de la aplicación web") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionExportacion(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al exportar el calendario o al actualizar sus feeds.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en la exportación del calendario") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionCambios(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error al registrar o leer los cambios del calendario.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en el registro de cambios del calendario") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionRevalidacion(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando ocurre un error con el estado de revalidación de las URLs.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Error en la revalidación de las URLs") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
+class ExcepcionPlazoAgotado(ExcepcionBase):
+
+    """
+    Excepción lanzada cuando se agota el plazo total de una ejecución y no se inicia más trabajo.
+    
+    Parámetros:
+        mensaje (str): Mensaje descriptivo del error.
+
+    Salida:
+        None
+    """
+
+    def __init__(self, mensaje: str = "Plazo de ejecución agotado") -> None:
+        self.mensaje = mensaje
+        super().__init__(self.mensaje)
+
+
 class ManejoExcepciones:
 
     @staticmethod
@@ -167,6 +337,30 @@ class ManejoExcepciones:
 
         return "\n".join(trazas)
 
+    @staticmethod
+    def causada_por(excepcion: BaseException, tipo: type) -> bool:
+
+        """
+        Indica si una excepción o alguna de las que la han causado (encadenadas con 'from') es del tipo indicado.
+
+        Parámetros:
+            excepcion (BaseException): La excepción principal.
+            tipo (type): Tipo de excepción buscado.
+
+        Salida:
+            bool: True si el tipo aparece en la cadena de la excepción.
+        """
+
+        excepcion_actual = excepcion
+
+        while excepcion_actual:
+            if isinstance(excepcion_actual, tipo):
+                return True
+
+            excepcion_actual = excepcion_actual.__cause__
+
+        return False
+
     @staticmethod
     def _recopilar_excepciones_y_trazas(excepcion: Exception) -> tuple:
 
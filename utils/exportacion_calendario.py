@@ -0,0 +1,623 @@
+# utils/exportacion_calendario.py
+
+import csv
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils import fichero_utils
+from utils.archivo_temporadas import obtener_temporada_grupo
+from utils.excepciones import ExcepcionExportacion
+
+CTE_FORMATO_ICS = "ics"
+CTE_FORMATO_CSV = "csv"
+CTE_FORMATO_JSONL = "jsonl"
+
+# Tipo de contenido de cada formato de exportación
+CTE_TIPOS_CONTENIDO = {
+    CTE_FORMATO_ICS: "text/calendar; charset=utf-8",
+    CTE_FORMATO_CSV: "text/csv; charset=utf-8",
+    CTE_FORMATO_JSONL: "application/x-ndjson; charset=utf-8"
+}
+
+CTE_COLUMNAS_EXPORTACION = ("temporada", "grupo", "genero", "tipo", "nombre", "fecha_inicio", "fecha_fin",
+                            "numero_etapas", "tipo_vuelta", "numero_clasica", "categoria", "url")
+
+CTE_TIPO_VUELTA = "vuelta"
+CTE_TIPO_CLASICA = "clasica"
+
+CTE_PRODID_ICS = "-//fantasy-ciclismo//calendario de competiciones//ES"
+CTE_DOMINIO_UID_ICS = "fantasy-ciclismo"
+CTE_LONGITUD_LINEA_ICS = 75
+
+CTE_NOMBRE_INDICE_FEEDS = "indice.json"
+
+# Forma parte de la huella de los fragmentos: al cambiar cómo se renderizan, se regeneran todos
+CTE_VERSION_FRAGMENTOS = 2
+CTE_DIRECTORIO_FRAGMENTOS = "fragmentos"
+
+
+def iterar_competiciones(grupos_desglosados: Iterable[dict], formato_fecha: str, temporada: Optional[int] = None,
+                         genero: Optional[str] = None) -> Iterator[dict]:
+
+    """
+    Recorre las competiciones del calendario desglosado como filas planas, una por vuelta o clásica.
+
+    Parámetros:
+        grupos_desglosados (Iterable[dict]): Salida de DesglosarGruposCompeticiones.ejecutar() o del snapshot.
+        formato_fecha (str): Formato de las fechas del calendario.
+        temporada (int, optional): Si se indica, solo los grupos de esa temporada.
+        genero (str, optional): Si se indica, solo los grupos de ese género.
+
+    Salida:
+        Iterator[dict]: Filas con las columnas de CTE_COLUMNAS_EXPORTACION (fechas como datetime.date o None).
+    """
+
+    for grupo in grupos_desglosados:
+        if genero is not None and grupo.get('genero') != genero:
+            continue
+
+        desglose = grupo.get('desglose_grupo_competiciones') or []
+        temporada_grupo = obtener_temporada_grupo(desglose, formato_fecha)
+
+        if temporada is not None and temporada_grupo != temporada:
+            continue
+
+        yield from _filas_grupo(grupo, temporada_grupo, formato_fecha)
+
+
+def generar_exportacion(grupos_desglosados: Iterable[dict], formato: str, formato_fecha: str,
+                        temporada: Optional[int] = None, genero: Optional[str] = None,
+                        generado: Optional[int] = None) -> Iterator[str]:
+
+    """
+    Genera la exportación del calendario trozo a trozo (cabecera, una competición por trozo y pie),
+    para escribirla o servirla sin construirla entera en memoria.
+
+    Parámetros:
+        grupos_desglosados (Iterable[dict]): Calendario desglosado.
+        formato (str): CTE_FORMATO_ICS, CTE_FORMATO_CSV o CTE_FORMATO_JSONL.
+        formato_fecha (str): Formato de las fechas del calendario.
+        temporada (int, optional): Si se indica, solo los grupos de esa temporada.
+        genero (str, optional): Si se indica, solo los grupos de ese género.
+        generado (int, optional): Instante de generación del calendario en segundos desde epoch (DTSTAMP
+                                  de iCalendar), normalmente el del snapshot. Default es el instante actual.
+
+    Salida:
+        Iterator[str]: Trozos del documento.
+
+    Lanza:
+        ExcepcionExportacion: Si el formato no existe.
+    """
+
+    cabecera, renderizar_fila, pie = _obtener_renderizador(formato, generado)
+
+    yield cabecera(f"Calendario {temporada or ''} {genero or ''}".strip())
+
+    for fila in iterar_competiciones(grupos_desglosados, formato_fecha, temporada, genero):
+        yield renderizar_fila(fila)
+
+    yield pie()
+
+
+class FeedsCalendario:
+
+    """
+    Ficheros de exportación pre-generados por temporada y género ('<temporada>_<genero>.<formato>')
+    que la aplicación sirve tal cual a los suscriptores del calendario.
+
+    Cada grupo se renderiza en un fragmento por formato, identificado por la huella de su contenido;
+    cada feed es la cabecera, los fragmentos de sus grupos y el pie. En cada actualización solo se
+    renderizan los grupos cuya huella no tiene ya fragmento (los que han cambiado), solo se
+    reescriben los feeds cuya lista de fragmentos ha cambiado y se borran los fragmentos y feeds
+    que ya no se usan. Los feeds se escriben de forma atómica concatenando los fragmentos desde disco.
+
+    Atributos:
+        directorio (str): Directorio de los feeds.
+        formato_fecha (str): Formato de las fechas del calendario.
+    """
+
+    def __init__(self, directorio: str, formato_fecha: str) -> None:
+
+        """
+        Inicializa los feeds sin leer todavía su índice.
+
+        Parámetros:
+            directorio (str): Directorio de los feeds (los fragmentos van en su subdirectorio CTE_DIRECTORIO_FRAGMENTOS).
+            formato_fecha (str): Formato de las fechas del calendario.
+
+        Salida:
+            None
+        """
+
+        self.directorio = directorio
+        self.formato_fecha = formato_fecha
+        self._ruta_indice = os.path.join(directorio, CTE_NOMBRE_INDICE_FEEDS)
+        self._directorio_fragmentos = os.path.join(directorio, CTE_DIRECTORIO_FRAGMENTOS)
+        self._version_indice: Optional[Tuple[int, int]] = None
+        self._indice: Dict[str, List[str]] = {}
+        self._bloqueo = threading.Lock()
+
+
+    def actualizar(self, grupos_desglosados: Iterable[dict], generado: Optional[int] = None) -> dict:
+
+        """
+        Regenera los fragmentos de los grupos que han cambiado y los feeds afectados.
+
+        Los fragmentos nuevos llevan como DTSTAMP de iCalendar el instante de generación del
+        calendario, y los de los grupos sin cambios conservan el suyo.
+
+        Parámetros:
+            grupos_desglosados (Iterable[dict]): Calendario desglosado.
+            generado (int, optional): Instante de generación del calendario en segundos desde epoch,
+                                      normalmente el del snapshot. Default es el instante actual.
+
+        Salida:
+            dict: 'grupos', 'fragmentos_renderizados', 'feeds_escritos' y 'feeds' (número total).
+
+        Lanza:
+            ExcepcionExportacion: Si ocurre algún error al escribir los feeds.
+        """
+
+        try:
+            os.makedirs(self._directorio_fragmentos, exist_ok=True)
+            generado = int(time.time()) if generado is None else generado
+            feeds: Dict[str, List[str]] = {}
+            grupos = renderizados = escritos = 0
+
+            for grupo in grupos_desglosados:
+                grupos += 1
+                huella = fichero_utils.calcular_huella(f"{CTE_VERSION_FRAGMENTOS}|"
+                                                       f"{json.dumps(grupo, sort_keys=True, ensure_ascii=False)}")
+                desglose = grupo.get('desglose_grupo_competiciones') or []
+                temporada = obtener_temporada_grupo(desglose, self.formato_fecha)
+                feeds.setdefault(f"{temporada}_{grupo.get('genero')}", []).append(huella)
+
+                if self._renderizar_fragmentos(huella, grupo, temporada, generado):
+                    renderizados += 1
+
+            try:
+                indice_anterior = self.leer_indice()
+
+            except ExcepcionExportacion:
+                # Índice dañado: se reescriben todos los feeds y se vuelve a generar
+                indice_anterior = {}
+
+            for nombre, huellas in feeds.items():
+                if indice_anterior.get(nombre) != huellas or not all(os.path.exists(self._ruta_feed(nombre, formato))
+                                                                     for formato in CTE_TIPOS_CONTENIDO):
+                    for formato in CTE_TIPOS_CONTENIDO:
+                        fichero_utils.escribir_atomico_trozos(self._ruta_feed(nombre, formato),
+                                                              self._componer_feed(nombre, huellas, formato))
+                    escritos += 1
+
+            fichero_utils.escribir_json_atomico(self._ruta_indice, feeds)
+            self._eliminar_obsoletos(feeds)
+
+            return {'grupos': grupos, 'fragmentos_renderizados': renderizados, 'feeds_escritos': escritos,
+                    'feeds': len(feeds)}
+
+        except ExcepcionExportacion:
+            raise
+
+        except Exception as e:
+            raise ExcepcionExportacion(f"Error al actualizar los feeds del calendario en '{self.directorio}'") from e
+
+
+    def leer_indice(self) -> Dict[str, List[str]]:
+
+        """
+        Devuelve los feeds publicados con las huellas de sus grupos.
+
+        El índice solo se vuelve a leer cuando cambia su mtime o su tamaño, por lo que consultarlo
+        en cada petición de un feed cuesta un stat.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Nombre del feed ('<temporada>_<genero>') -> huellas de sus grupos (vacío si aún no hay feeds).
+
+        Lanza:
+            ExcepcionExportacion: Si el índice de feeds está dañado.
+        """
+
+        try:
+            estado = os.stat(self._ruta_indice)
+
+        except OSError:
+            return {}
+
+        version = (estado.st_mtime_ns, estado.st_size)
+
+        with self._bloqueo:
+            if self._version_indice != version:
+                indice = fichero_utils.leer_json(self._ruta_indice)
+
+                if not isinstance(indice, dict):
+                    raise ExcepcionExportacion(f"El índice de feeds '{self._ruta_indice}' está dañado")
+
+                self._indice = indice
+                self._version_indice = version
+
+            return self._indice
+
+
+    def obtener_ruta_feed(self, nombre: str, formato: str) -> Optional[str]:
+
+        """
+        Devuelve la ruta del fichero de un feed publicado.
+
+        Parámetros:
+            nombre (str): Nombre del feed ('<temporada>_<genero>').
+            formato (str): Formato del feed.
+
+        Salida:
+            str: Ruta del fichero o None si el feed o el formato no existen.
+
+        Lanza:
+            ExcepcionExportacion: Si el índice de feeds está dañado.
+        """
+
+        # Solo se aceptan los nombres del índice, nunca rutas arbitrarias
+        if formato not in CTE_TIPOS_CONTENIDO or nombre not in self.leer_indice():
+            return None
+
+        ruta = self._ruta_feed(nombre, formato)
+
+        return ruta if os.path.exists(ruta) else None
+
+
+    def _renderizar_fragmentos(self, huella: str, grupo: dict, temporada: int, generado: int) -> bool:
+
+        """
+        Renderiza los fragmentos de un grupo en todos los formatos si no existen ya.
+
+        Parámetros:
+            huella (str): Huella del contenido del grupo.
+            grupo (dict): Grupo desglosado.
+            temporada (int): Temporada del grupo.
+            generado (int): Instante de generación del calendario en segundos desde epoch.
+
+        Salida:
+            bool: True si se ha renderizado algún fragmento.
+        """
+
+        renderizado = False
+
+        for formato in CTE_TIPOS_CONTENIDO:
+            ruta = self._ruta_fragmento(huella, formato)
+
+            if not os.path.exists(ruta):
+                _, renderizar_fila, _ = _obtener_renderizador(formato, generado)
+                filas = _filas_grupo(grupo, temporada, self.formato_fecha)
+                fichero_utils.escribir_atomico_trozos(ruta, (renderizar_fila(fila).encode("utf-8") for fila in filas))
+                renderizado = True
+
+        return renderizado
+
+
+    def _componer_feed(self, nombre: str, huellas: List[str], formato: str) -> Iterator[bytes]:
+
+        """
+        Compone un feed como cabecera, fragmentos de sus grupos leídos de disco y pie.
+
+        Parámetros:
+            nombre (str): Nombre del feed ('<temporada>_<genero>').
+            huellas (list[str]): Huellas de los grupos del feed, en orden.
+            formato (str): Formato del feed.
+
+        Salida:
+            Iterator[bytes]: Trozos del fichero del feed.
+        """
+
+        cabecera, _, pie = _obtener_renderizador(formato)
+
+        yield cabecera(f"Calendario {nombre.replace('_', ' ')}").encode("utf-8")
+
+        for huella in huellas:
+            with open(self._ruta_fragmento(huella, formato), "rb") as fichero:
+                yield fichero.read()
+
+        yield pie().encode("utf-8")
+
+
+    def _eliminar_obsoletos(self, feeds: Dict[str, List[str]]) -> None:
+
+        """
+        Borra los fragmentos que ya no usa ningún feed y los feeds que ya no están en el índice.
+
+        Parámetros:
+            feeds (dict): Nombre del feed -> huellas de sus grupos, tal como queda publicado.
+
+        Salida:
+            None
+        """
+
+        huellas_usadas = {huella for huellas in feeds.values() for huella in huellas}
+
+        for nombre_fichero in os.listdir(self._directorio_fragmentos):
+            if nombre_fichero.split(".")[0] not in huellas_usadas:
+                os.remove(os.path.join(self._directorio_fragmentos, nombre_fichero))
+
+        for nombre_fichero in os.listdir(self.directorio):
+            nombre, _, formato = nombre_fichero.rpartition(".")
+
+            if formato in CTE_TIPOS_CONTENIDO and nombre not in feeds:
+                os.remove(os.path.join(self.directorio, nombre_fichero))
+
+
+    def _ruta_feed(self, nombre: str, formato: str) -> str:
+
+        """
+        Devuelve la ruta del fichero de un feed.
+
+        Parámetros:
+            nombre (str): Nombre del feed ('<temporada>_<genero>').
+            formato (str): Formato del feed.
+
+        Salida:
+            str: Ruta '<directorio>/<nombre>.<formato>'.
+        """
+
+        return os.path.join(self.directorio, f"{nombre}.{formato}")
+
+
+    def _ruta_fragmento(self, huella: str, formato: str) -> str:
+
+        """
+        Devuelve la ruta del fragmento de un grupo.
+
+        Parámetros:
+            huella (str): Huella del contenido del grupo.
+            formato (str): Formato del fragmento.
+
+        Salida:
+            str: Ruta '<directorio>/fragmentos/<huella>.<formato>'.
+        """
+
+        return os.path.join(self._directorio_fragmentos, f"{huella}.{formato}")
+
+
+def _filas_grupo(grupo: dict, temporada: int, formato_fecha: str) -> Iterator[dict]:
+
+    """
+    Convierte las competiciones de un grupo en filas planas de exportación.
+
+    Parámetros:
+        grupo (dict): Grupo desglosado.
+        temporada (int): Temporada del grupo.
+        formato_fecha (str): Formato de las fechas del calendario.
+
+    Salida:
+        Iterator[dict]: Una fila por vuelta o clásica, con las columnas de CTE_COLUMNAS_EXPORTACION.
+    """
+
+    for competicion in grupo.get('desglose_grupo_competiciones') or []:
+        fila = dict.fromkeys(CTE_COLUMNAS_EXPORTACION)
+        fila.update(temporada=temporada, grupo=grupo.get('nombre'), genero=grupo.get('genero'))
+
+        if 'fecha_clasica' in competicion:
+            fecha = _convertir_fecha(competicion.get('fecha_clasica'), formato_fecha)
+            fila.update(tipo=CTE_TIPO_CLASICA, nombre=competicion.get('nombre_clasica'), fecha_inicio=fecha, fecha_fin=fecha,
+                        numero_clasica=competicion.get('numero_clasica'), categoria=competicion.get('categoria'),
+                        url=grupo.get('url'))
+
+        else:
+            fila.update(tipo=CTE_TIPO_VUELTA, nombre=competicion.get('descripcion'),
+                        fecha_inicio=_convertir_fecha(competicion.get('fecha_inicio'), formato_fecha),
+                        fecha_fin=_convertir_fecha(competicion.get('fecha_fin'), formato_fecha),
+                        numero_etapas=competicion.get('numero_etapas'), tipo_vuelta=competicion.get('tipo_vuelta'),
+                        url=competicion.get('url'))
+
+        yield fila
+
+
+def _convertir_fecha(fecha: Optional[str], formato_fecha: str):
+
+    """
+    Convierte una fecha del calendario en datetime.date.
+
+    Parámetros:
+        fecha (str): Fecha con el formato del calendario (puede ser None o vacía).
+        formato_fecha (str): Formato de las fechas del calendario.
+
+    Salida:
+        date: La fecha, o None si falta o no es válida.
+    """
+
+    try:
+        return datetime.strptime(fecha, formato_fecha).date() if fecha else None
+
+    except ValueError:
+        return None
+
+
+def _obtener_renderizador(formato: str, generado: Optional[int] = None) -> Tuple[Callable[[str], str],
+                                                                                Callable[[dict], str], Callable[[], str]]:
+
+    """
+    Devuelve las funciones que renderizan la cabecera, cada fila y el pie de un formato.
+
+    Parámetros:
+        formato (str): CTE_FORMATO_ICS, CTE_FORMATO_CSV o CTE_FORMATO_JSONL.
+        generado (int, optional): Instante de generación en segundos desde epoch (DTSTAMP de iCalendar).
+                                  Default es el instante actual.
+
+    Salida:
+        tuple: (cabecera(titulo) -> str, fila(dict) -> str, pie() -> str).
+
+    Lanza:
+        ExcepcionExportacion: Si el formato no existe.
+    """
+
+    dtstamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(int(time.time()) if generado is None else generado))
+    renderizadores = {
+        CTE_FORMATO_ICS: (_cabecera_ics, partial(_fila_ics, dtstamp=dtstamp), lambda: "END:VCALENDAR\r\n"),
+        CTE_FORMATO_CSV: (_cabecera_csv, _fila_csv, lambda: ""),
+        CTE_FORMATO_JSONL: (lambda titulo: "", _fila_jsonl, lambda: "")
+    }
+
+    if formato not in renderizadores:
+        raise ExcepcionExportacion(f"Formato de exportación '{formato}' no soportado; disponibles: {', '.join(renderizadores)}")
+
+    return renderizadores[formato]
+
+
+def _cabecera_csv(titulo: str) -> str:
+
+    """
+    Renderiza la cabecera CSV con los nombres de las columnas.
+
+    Parámetros:
+        titulo (str): Título del documento (no se usa en CSV).
+
+    Salida:
+        str: Línea de cabecera.
+    """
+
+    return _fila_csv(dict(zip(CTE_COLUMNAS_EXPORTACION, CTE_COLUMNAS_EXPORTACION)))
+
+
+def _fila_csv(fila: dict) -> str:
+
+    """
+    Renderiza una fila como línea CSV (los valores None quedan vacíos).
+
+    Parámetros:
+        fila (dict): Fila de iterar_competiciones.
+
+    Salida:
+        str: Línea CSV terminada en CRLF.
+    """
+
+    salida = io.StringIO()
+    csv.writer(salida).writerow(["" if fila[columna] is None else fila[columna] for columna in CTE_COLUMNAS_EXPORTACION])
+    return salida.getvalue()
+
+
+def _fila_jsonl(fila: dict) -> str:
+
+    """
+    Renderiza una fila como objeto JSON en una línea (fechas en formato ISO).
+
+    Parámetros:
+        fila (dict): Fila de iterar_competiciones.
+
+    Salida:
+        str: Línea JSON terminada en salto de línea.
+    """
+
+    return json.dumps({columna: valor.isoformat() if hasattr(valor, 'isoformat') else valor for columna, valor in fila.items()},
+                      ensure_ascii=False) + "\n"
+
+
+def _cabecera_ics(titulo: str) -> str:
+
+    """
+    Renderiza el inicio del VCALENDAR con el nombre del calendario.
+
+    Parámetros:
+        titulo (str): Nombre del calendario (X-WR-CALNAME).
+
+    Salida:
+        str: Líneas de cabecera de iCalendar.
+    """
+
+    return "".join(_linea_ics(linea) for linea in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{CTE_PRODID_ICS}",
+                                                    "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{_escapar_ics(titulo)}"))
+
+
+def _fila_ics(fila: dict, dtstamp: str) -> str:
+
+    """
+    Renderiza una competición como VEVENT de día completo (las competiciones sin fecha se omiten).
+
+    El UID depende de la competición y DTSTAMP (RFC 5545: cuándo se creó el objeto) es el instante
+    de generación del calendario, no el de la exportación, para que el mismo snapshot produzca
+    siempre la misma salida.
+
+    Parámetros:
+        fila (dict): Fila de iterar_competiciones.
+        dtstamp (str): Instante de generación en UTC con el formato de iCalendar (aaaammddThhmmssZ).
+
+    Salida:
+        str: Líneas del evento (vacío si no tiene fecha).
+    """
+
+    if fila['fecha_inicio'] is None:
+        return ""
+
+    inicio = fila['fecha_inicio']
+    fin = (fila['fecha_fin'] or inicio) + timedelta(days=1)
+
+    if fila['tipo'] == CTE_TIPO_CLASICA:
+        identificador = f"{fila['url']}#{fila['numero_clasica']}"
+        descripcion = f"Clásica {fila['numero_clasica']}, categoría {fila['categoria']}"
+    else:
+        identificador = fila['url']
+        descripcion = f"{fila['tipo_vuelta']}, {fila['numero_etapas']} etapas"
+
+    uid = fichero_utils.calcular_huella(f"{identificador}|{fila['nombre']}")
+    lineas = ("BEGIN:VEVENT",
+              f"UID:{uid}@{CTE_DOMINIO_UID_ICS}",
+              f"DTSTAMP:{dtstamp}",
+              f"DTSTART;VALUE=DATE:{inicio:%Y%m%d}",
+              f"DTEND;VALUE=DATE:{fin:%Y%m%d}",
+              f"SUMMARY:{_escapar_ics(fila['nombre'] or '')}",
+              f"DESCRIPTION:{_escapar_ics(descripcion)}",
+              f"CATEGORIES:{_escapar_ics(fila['grupo'] or '')}",
+              f"URL:{fila['url'] or ''}",
+              "END:VEVENT")
+
+    return "".join(_linea_ics(linea) for linea in lineas)
+
+
+def _escapar_ics(texto: str) -> str:
+
+    """
+    Escapa un texto para un valor TEXT de iCalendar (barra invertida, ';', ',' y saltos de línea).
+
+    Parámetros:
+        texto (str): Texto a escapar.
+
+    Salida:
+        str: Texto escapado.
+    """
+
+    return texto.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _linea_ics(linea: str) -> str:
+
+    """
+    Termina una línea de iCalendar con CRLF plegándola según RFC 5545: como mucho 75 octetos por
+    línea física, continuando con CRLF y un espacio y sin partir caracteres UTF-8.
+
+    Parámetros:
+        linea (str): Línea lógica sin terminar.
+
+    Salida:
+        str: Línea plegada y terminada en CRLF.
+    """
+
+    partes = []
+    inicio = octetos = 0
+
+    for posicion, caracter in enumerate(linea):
+        longitud = len(caracter.encode("utf-8"))
+        limite = CTE_LONGITUD_LINEA_ICS if not partes else CTE_LONGITUD_LINEA_ICS - 1
+
+        if octetos + longitud > limite:
+            partes.append(linea[inicio:posicion])
+            inicio, octetos = posicion, 0
+
+        octetos += longitud
+
+    partes.append(linea[inicio:])
+
+    return "\r\n ".join(partes) + "\r\n"
@@ -0,0 +1,121 @@
+# utils/fichero_utils.py
+
+import hashlib
+import json
+import os
+from typing import Any, Iterable
+
+# Máscara de permisos del proceso, leída una sola vez (os.umask solo se puede consultar cambiándola)
+_MASCARA_PERMISOS = os.umask(0)
+os.umask(_MASCARA_PERMISOS)
+
+
+def calcular_huella(texto: str) -> str:
+
+    """
+    Calcula una huella corta y estable de un texto para usarla en nombres de fichero.
+
+    Parámetros:
+        texto (str): Texto de entrada (ej. una URL).
+
+    Salida:
+        str: Huella hexadecimal de 16 caracteres.
+    """
+
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def escribir_atomico(ruta: str, contenido: bytes) -> None:
+
+    """
+    Escribe el contenido en un temporal del mismo directorio y lo renombra sobre la ruta destino.
+
+    Los lectores nunca ven un fichero a medio escribir: o ven el anterior o el nuevo completo.
+
+    Parámetros:
+        ruta (str): Ruta destino.
+        contenido (bytes): Bytes a escribir.
+
+    Salida:
+        None
+    """
+
+    escribir_atomico_trozos(ruta, (contenido,))
+
+
+def escribir_atomico_trozos(ruta: str, trozos: Iterable[bytes]) -> None:
+
+    """
+    Igual que escribir_atomico, pero escribiendo el contenido a medida que lo produce un iterable,
+    sin tenerlo entero en memoria.
+
+    El fichero se publica con los permisos de uno creado con open() (0666 menos la umask) y no con
+    los 0600 con que tempfile crea el temporal; así lo pueden leer procesos de otro usuario, como
+    los workers de la web.
+
+    Parámetros:
+        ruta (str): Ruta destino.
+        trozos (Iterable[bytes]): Trozos del contenido, en orden.
+
+    Salida:
+        None
+    """
+
+    import tempfile
+
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix=f".{os.path.basename(ruta)}_", suffix=".tmp")
+
+    try:
+        with os.fdopen(descriptor, "wb") as fichero:
+            for trozo in trozos:
+                fichero.write(trozo)
+
+            fichero.flush()
+            os.fchmod(fichero.fileno(), 0o666 & ~_MASCARA_PERMISOS)
+            os.fsync(fichero.fileno())
+
+        os.replace(ruta_temporal, ruta)
+
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+
+def escribir_json_atomico(ruta: str, datos: Any) -> None:
+
+    """
+    Serializa los datos a JSON (UTF-8) y los escribe de forma atómica.
+
+    Parámetros:
+        ruta (str): Ruta destino.
+        datos (Any): Datos serializables a JSON.
+
+    Salida:
+        None
+    """
+
+    escribir_atomico(ruta, json.dumps(datos, ensure_ascii=False).encode("utf-8"))
+
+
+def leer_json(ruta: str, valor_por_defecto: Any = None) -> Any:
+
+    """
+    Lee un fichero JSON, devolviendo el valor por defecto si no existe o está corrupto.
+
+    Parámetros:
+        ruta (str): Ruta del fichero.
+        valor_por_defecto (Any, optional): Valor devuelto si no se puede leer. Default es None.
+
+    Salida:
+        Any: Datos leídos o el valor por defecto.
+    """
+
+    try:
+        with open(ruta, "r", encoding="utf-8") as fichero:
+            return json.load(fichero)
+
+    except (OSError, ValueError):
+        return valor_por_defecto
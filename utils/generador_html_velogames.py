@@ -0,0 +1,244 @@
+# utils/generador_html_velogames.py
+
+import os
+import random
+from datetime import datetime, timedelta
+from html import escape
+from typing import Optional
+
+# Los nombres de los meses se escriben en inglés, como en la web, sin depender del locale
+CTE_MESES_INGLES = ("January", "February", "March", "April", "May", "June", "July",
+                    "August", "September", "October", "November", "December")
+
+CTE_CATEGORIAS_CLASICAS = "ABC"
+CTE_CIUDADES = ("Torino", "Milano", "Firenze", "Lyon", "Grenoble", "Bilbao", "Granada", "Liège", "Gent", "Roubaix",
+                "Sanremo", "Como", "Zürich", "Bergen", "Kraków", "Málaga")
+
+
+class GeneradorHtmlVelogames:
+
+    """
+    Genera páginas sintéticas con el marcado de Velogames que esperan los subprocesos de scrapping:
+    portada (h1.kilo 'All contests' seguido de los enlaces a.button.small de cada grupo), página
+    de un grupo de vueltas (un div.postcontent con span.race, fecha de inicio y enlace por vuelta),
+    página de un grupo de clásicas (div.postcontent sin span.race) y las páginas races.php de
+    etapas (table.responsive con una fila por etapa, días de descanso 'NULL' y 'End-Of-Tour') y
+    de clásicas (tabla de número, fecha, nombre y categoría).
+
+    El contenido es determinista: cada página depende solo de la semilla, su tipo, su índice y su
+    tamaño, no del orden en que se generen. Sirve para medir cómo escala el parseo con páginas de
+    miles de elementos y, escrito en un directorio, como web local para pruebas completas del cron.
+
+    Atributos:
+        semilla (int): Semilla de los datos aleatorios.
+        anyo (int): Temporada de las competiciones.
+        url_base (str): URL en la que se sirven las páginas (sin '/' final).
+    """
+
+    def __init__(self, semilla: int = 0, anyo: Optional[int] = None, url_base: str = "https://www.velogames.com") -> None:
+        self.semilla = semilla
+        self.anyo = anyo if anyo is not None else datetime.now().year
+        self.url_base = url_base.rstrip("/")
+
+
+    def url_grupo(self, indice_grupo: int) -> str:
+        return f"{self.url_base}/grupo{indice_grupo}/{self.anyo}/"
+
+
+    def url_vuelta(self, indice_grupo: int, indice_vuelta: int) -> str:
+        return f"{self.url_base}/grupo{indice_grupo}/vuelta{indice_vuelta}/{self.anyo}"
+
+
+    def pagina_portada(self, numero_grupos: int) -> str:
+
+        """
+        Genera la portada con los enlaces a los grupos (los pares son de vueltas y los impares de clásicas).
+
+        Parámetros:
+            numero_grupos (int): Número de grupos enlazados tras 'All contests'.
+
+        Salida:
+            str: HTML de la portada.
+        """
+
+        aleatorio = self._aleatorio("portada", 0, numero_grupos)
+        partes = ['<html><head><meta charset="utf-8"><title>Velogames</title></head><body>',
+                  '<h1 class="kilo">Featured</h1>']
+
+        # Los destacados van antes de 'All contests' y no deben contarse como grupos
+        for indice in range(min(3, numero_grupos)):
+            partes.append(f'<a class="button small" href="{self.url_grupo(indice)}">GO TO VELOGAMES Destacado {indice}</a>')
+
+        partes.append('<h1 class="kilo">All contests</h1>')
+
+        for indice in range(numero_grupos):
+            genero = "WOMENS " if indice % 3 == 2 else ""
+            tipo = "Tours" if indice % 2 == 0 else "Classics"
+            partes.append(f'<div class="contest"><img src="/img/{aleatorio.randrange(100)}.png" alt="">'
+                          f'<a class="button small" href="{self.url_grupo(indice)}">GO TO VELOGAMES {genero}{tipo} {indice}</a></div>')
+
+        partes.append('</body></html>')
+
+        return "\n".join(partes)
+
+
+    def pagina_grupo_vueltas(self, numero_vueltas: int, indice_grupo: int = 0) -> str:
+
+        """
+        Genera la página de un grupo de vueltas.
+
+        Parámetros:
+            numero_vueltas (int): Número de vueltas del grupo.
+            indice_grupo (int, optional): Índice del grupo (para las URLs). Default es 0.
+
+        Salida:
+            str: HTML de la página del grupo.
+        """
+
+        aleatorio = self._aleatorio("grupo_vueltas", indice_grupo, numero_vueltas)
+        partes = ['<html><head><meta charset="utf-8"></head><body>']
+
+        for indice in range(numero_vueltas):
+            inicio = datetime(self.anyo, 1, 20) + timedelta(days=aleatorio.randrange(280))
+            fin = inicio + timedelta(days=aleatorio.choice((4, 5, 6, 7, 22)))
+            nombre = f"{aleatorio.choice(CTE_CIUDADES)} Tour {indice_grupo}-{indice}"
+            partes.append(f'<div class="postcontent"><h2>VELOGAMES {escape(nombre)}</h2>'
+                          f'<span class="race">Race</span><span>{self._fecha_web(inicio)}\n- {self._fecha_web(fin)}</span>'
+                          f'<p>{escape(nombre)} fantasy game.</p>'
+                          f'<a class="button small" href="{self.url_vuelta(indice_grupo, indice)}">Play</a></div>')
+
+        partes.append('</body></html>')
+
+        return "\n".join(partes)
+
+
+    def pagina_grupo_clasicas(self, indice_grupo: int = 0) -> str:
+
+        """
+        Genera la página de un grupo de clásicas (las clásicas están en su races.php).
+
+        Parámetros:
+            indice_grupo (int, optional): Índice del grupo. Default es 0.
+
+        Salida:
+            str: HTML de la página del grupo.
+        """
+
+        return ('<html><head><meta charset="utf-8"></head><body>'
+                f'<div class="postcontent"><h2>VELOGAMES Classics {indice_grupo}</h2><p>Season-long classics game.</p>'
+                f'<a class="button small" href="{self.url_grupo(indice_grupo)}races.php">Races</a></div>'
+                '</body></html>')
+
+
+    def pagina_etapas(self, numero_etapas: int, indice: int = 0) -> str:
+
+        """
+        Genera la página races.php de una vuelta, con un día de descanso cada nueve etapas y la fila final 'End-Of-Tour'.
+
+        Parámetros:
+            numero_etapas (int): Número de etapas de la vuelta.
+            indice (int, optional): Índice de la vuelta. Default es 0.
+
+        Salida:
+            str: HTML de la página de etapas.
+        """
+
+        aleatorio = self._aleatorio("etapas", indice, numero_etapas)
+        partes = ['<html><head><meta charset="utf-8"></head><body>',
+                  '<table class="menu"><tr><td><a href="/">Home</a></td></tr></table>',
+                  '<table class="responsive"><thead><tr><th>Stage</th><th>Route</th><th>Type</th></tr></thead><tbody>']
+
+        for etapa in range(1, numero_etapas + 1):
+            partes.append(f'<tr><td>Stage {etapa}</td><td>{aleatorio.choice(CTE_CIUDADES)} - {aleatorio.choice(CTE_CIUDADES)}</td>'
+                          f'<td>{aleatorio.choice(("Flat", "Hilly", "Mountain", "ITT"))}</td></tr>')
+
+            if etapa % 9 == 0 and etapa < numero_etapas:
+                partes.append('<tr><td>NULL</td><td>Rest day</td><td></td></tr>')
+
+        partes.append('<tr><td>End-Of-Tour</td><td></td><td></td></tr></tbody></table></body></html>')
+
+        return "\n".join(partes)
+
+
+    def pagina_clasicas(self, numero_clasicas: int, indice: int = 0) -> str:
+
+        """
+        Genera la página races.php de un grupo de clásicas, con las clásicas ordenadas por fecha.
+
+        Parámetros:
+            numero_clasicas (int): Número de clásicas.
+            indice (int, optional): Índice del grupo. Default es 0.
+
+        Salida:
+            str: HTML de la página de clásicas.
+        """
+
+        aleatorio = self._aleatorio("clasicas", indice, numero_clasicas)
+        inicio = datetime(self.anyo, 2, 1, 11)
+        dias = sorted(aleatorio.randrange(270) for _ in range(numero_clasicas))
+        partes = ['<html><head><meta charset="utf-8"></head><body>',
+                  '<table class="responsive"><tr><th>#</th><th>Date</th><th>Race</th><th>Category</th></tr>']
+
+        for numero, dia in enumerate(dias, start=1):
+            partes.append(f'<tr><td>{numero}</td><td>{(inicio + timedelta(days=dia)):%Y-%m-%d %H:%M:%S}</td>'
+                          f'<td>{escape(aleatorio.choice(CTE_CIUDADES))} Classic {numero}</td>'
+                          f'<td>Cat {aleatorio.choice(CTE_CATEGORIAS_CLASICAS)}</td></tr>')
+
+        partes.append('</table></body></html>')
+
+        return "\n".join(partes)
+
+
+    def escribir_sitio(self, directorio: str, numero_grupos: int, vueltas_por_grupo: int,
+                       etapas_por_vuelta: int, clasicas_por_grupo: int) -> int:
+
+        """
+        Escribe un sitio estático completo (portada, grupos y races.php) con la estructura de rutas
+        de las URLs generadas, para servirlo en 'url_base' (ej. python -m http.server).
+
+        Parámetros:
+            directorio (str): Directorio raíz del sitio.
+            numero_grupos (int): Número de grupos.
+            vueltas_por_grupo (int): Vueltas de cada grupo de vueltas.
+            etapas_por_vuelta (int): Etapas de cada vuelta.
+            clasicas_por_grupo (int): Clásicas de cada grupo de clásicas.
+
+        Salida:
+            int: Número de páginas escritas.
+        """
+
+        paginas = {"index.html": self.pagina_portada(numero_grupos)}
+
+        for indice_grupo in range(numero_grupos):
+            ruta_grupo = f"grupo{indice_grupo}/{self.anyo}"
+
+            if indice_grupo % 2 == 0:
+                paginas[f"{ruta_grupo}/index.html"] = self.pagina_grupo_vueltas(vueltas_por_grupo, indice_grupo)
+
+                for indice_vuelta in range(vueltas_por_grupo):
+                    paginas[f"grupo{indice_grupo}/vuelta{indice_vuelta}/{self.anyo}/races.php"] = \
+                        self.pagina_etapas(etapas_por_vuelta, indice_grupo * vueltas_por_grupo + indice_vuelta)
+
+            else:
+                paginas[f"{ruta_grupo}/index.html"] = self.pagina_grupo_clasicas(indice_grupo)
+                paginas[f"{ruta_grupo}/races.php"] = self.pagina_clasicas(clasicas_por_grupo, indice_grupo)
+
+        for ruta, html in paginas.items():
+            ruta_completa = os.path.join(directorio, ruta)
+            os.makedirs(os.path.dirname(ruta_completa), exist_ok=True)
+
+            with open(ruta_completa, "w", encoding="utf-8") as fichero:
+                fichero.write(html)
+
+        return len(paginas)
+
+
+    def _aleatorio(self, tipo: str, indice: int, tamanyo: int) -> random.Random:
+        return random.Random(f"{self.semilla}:{tipo}:{indice}:{tamanyo}")
+
+
+    @staticmethod
+    def _fecha_web(fecha: datetime) -> str:
+        dia = fecha.day
+        sufijo = "th" if 11 <= dia <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(dia % 10, "th")
+        return f"{dia}{sufijo} {CTE_MESES_INGLES[fecha.month - 1]}"
@@ -0,0 +1,282 @@
+# utils/indice_calendario.py
+
+import bisect
+import calendar
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from utils.excepciones import ExcepcionFecha
+
+# Segundos de un día completo (para consultas por día)
+CTE_SEGUNDOS_DIA = 24 * 60 * 60
+
+
+class IndiceCalendario:
+
+    """
+    Índice de intervalos de fechas sobre el calendario desglosado.
+
+    Las competiciones se guardan ordenadas por fecha de inicio en arrays paralelos. Como la duración
+    de una competición está acotada (la más larga es una gran vuelta), las consultas de fecha y de
+    rango se resuelven con bisect sobre la ventana [desde - duración máxima, hasta] en lugar de
+    recorrer y volver a parsear todo el calendario.
+
+    Cada elemento devuelto es un diccionario con:
+        - 'grupo' (str): Nombre del grupo de competiciones.
+        - 'genero' (str): Género del grupo.
+        - 'tipo_grupo' (str): Tipo de grupo (vueltas o clásicas).
+        - 'competicion' (dict): La vuelta o la clásica tal y como aparece en el desglose.
+    """
+
+    def __init__(self, grupos_desglosados: List[dict], formato_fecha: str) -> None:
+
+        """
+        Construye el índice a partir de la salida de DesglosarGruposCompeticiones.ejecutar().
+
+        Parámetros:
+            grupos_desglosados (list[dict]): Calendario desglosado.
+            formato_fecha (str): Formato de las fechas de las competiciones (ej. "%d-%m-%Y %H:%M:%S").
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionFecha: Si alguna fecha del calendario no cumple el formato indicado.
+        """
+
+        entradas = []
+
+        for grupo in grupos_desglosados:
+
+            for competicion in grupo.get('desglose_grupo_competiciones') or []:
+                inicio, fin = obtener_intervalo_competicion(competicion, formato_fecha)
+
+                if inicio is None:
+                    continue
+
+                entradas.append((inicio, fin, {
+                    'grupo': grupo['nombre'],
+                    'genero': grupo['genero'],
+                    'tipo_grupo': grupo['tipo_grupo'],
+                    'competicion': competicion
+                }))
+
+        self._cargar(entradas, None)
+
+
+    @classmethod
+    def desde_intervalos(cls, intervalos: Iterable[Tuple[int, int, Any]],
+                         resolver: Callable[[Any], dict]) -> 'IndiceCalendario':
+
+        """
+        Construye el índice a partir de intervalos ya calculados, sin tener el calendario en memoria.
+
+        Cada intervalo lleva una referencia (ej. la posición de la competición en el snapshot) que
+        'resolver' convierte en el elemento devuelto solo cuando una consulta lo incluye.
+
+        Parámetros:
+            intervalos (Iterable[tuple]): Tuplas (inicio, fin, referencia) con las fechas en segundos desde epoch.
+            resolver (Callable): Devuelve el elemento ('grupo', 'genero', 'tipo_grupo', 'competicion') de una referencia.
+
+        Salida:
+            IndiceCalendario: Índice construido.
+        """
+
+        indice = cls.__new__(cls)
+        indice._cargar(list(intervalos), resolver)
+
+        return indice
+
+
+    def _cargar(self, entradas: list, resolver: Optional[Callable[[Any], dict]]) -> None:
+
+        """
+        Ordena los intervalos por inicio y fin y los reparte en los arrays paralelos del índice.
+
+        Parámetros:
+            entradas (list): Tuplas (inicio, fin, referencia) con las fechas en segundos desde epoch. Se ordena in situ.
+            resolver (Callable): Convierte una referencia en el elemento devuelto (None si la referencia ya es el elemento).
+
+        Salida:
+            None
+        """
+
+        entradas.sort(key=lambda entrada: (entrada[0], entrada[1]))
+
+        self._inicios = [entrada[0] for entrada in entradas]
+        self._fines = [entrada[1] for entrada in entradas]
+        self._referencias = [entrada[2] for entrada in entradas]
+        self._resolver = resolver
+        self._duracion_maxima = max((fin - inicio for inicio, fin, _ in entradas), default=0)
+
+
+    def _elemento(self, posicion: int) -> dict:
+
+        """
+        Devuelve el elemento de una posición del índice, resolviéndolo si el índice tiene resolver.
+
+        Parámetros:
+            posicion (int): Posición en los arrays ordenados por inicio.
+
+        Salida:
+            dict: Elemento con 'grupo', 'genero', 'tipo_grupo' y 'competicion'.
+        """
+
+        referencia = self._referencias[posicion]
+        return referencia if self._resolver is None else self._resolver(referencia)
+
+
+    def __len__(self) -> int:
+
+        """
+        Devuelve el número de competiciones con fechas del índice.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Número de competiciones indexadas.
+        """
+
+        return len(self._referencias)
+
+
+    def competiciones_en_dia(self, fecha: datetime) -> List[dict]:
+
+        """
+        Devuelve las competiciones que se disputan en algún momento del día indicado.
+
+        Parámetros:
+            fecha (datetime): Cualquier instante del día a consultar.
+
+        Salida:
+            list[dict]: Competiciones activas ese día, ordenadas por inicio.
+        """
+
+        inicio_dia = _a_segundos(datetime(fecha.year, fecha.month, fecha.day))
+
+        return self._buscar_solapes(inicio_dia, inicio_dia + CTE_SEGUNDOS_DIA - 1)
+
+
+    def competiciones_en_rango(self, desde: datetime, hasta: datetime) -> List[dict]:
+
+        """
+        Devuelve las competiciones cuyo intervalo se solapa con el rango [desde, hasta].
+
+        Parámetros:
+            desde (datetime): Inicio del rango.
+            hasta (datetime): Fin del rango (incluido).
+
+        Salida:
+            list[dict]: Competiciones que se solapan con el rango, ordenadas por inicio.
+        """
+
+        return self._buscar_solapes(_a_segundos(desde), _a_segundos(hasta))
+
+
+    def proximas_competiciones(self, fecha: datetime, numero: int) -> List[dict]:
+
+        """
+        Devuelve las siguientes competiciones que empiezan después del instante indicado.
+
+        Parámetros:
+            fecha (datetime): Instante de referencia.
+            numero (int): Número máximo de competiciones a devolver.
+
+        Salida:
+            list[dict]: Hasta 'numero' competiciones ordenadas por fecha de inicio.
+        """
+
+        posicion = bisect.bisect_right(self._inicios, _a_segundos(fecha))
+
+        return [self._elemento(posicion) for posicion in range(posicion, min(len(self._inicios), posicion + max(numero, 0)))]
+
+
+    def siguiente_inicio(self, fecha: datetime) -> Optional[datetime]:
+
+        """
+        Devuelve la fecha de inicio de la siguiente competición posterior al instante indicado.
+
+        Parámetros:
+            fecha (datetime): Instante de referencia.
+
+        Salida:
+            datetime: Fecha de inicio de la siguiente competición o None si no hay más.
+        """
+
+        posicion = bisect.bisect_right(self._inicios, _a_segundos(fecha))
+
+        if posicion == len(self._inicios):
+            return None
+
+        return datetime(1970, 1, 1) + timedelta(seconds=self._inicios[posicion])
+
+
+    def _buscar_solapes(self, desde: int, hasta: int) -> List[dict]:
+
+        """
+        Busca las competiciones cuyo intervalo [inicio, fin] se solapa con [desde, hasta].
+
+        Solo se recorren las competiciones que empiezan dentro de la ventana
+        [desde - duración máxima, hasta], localizada con dos búsquedas binarias.
+
+        Parámetros:
+            desde (int): Inicio del rango en segundos desde epoch.
+            hasta (int): Fin del rango en segundos desde epoch.
+
+        Salida:
+            list[dict]: Competiciones que se solapan con el rango.
+        """
+
+        limite = bisect.bisect_right(self._inicios, hasta)
+        primera = bisect.bisect_left(self._inicios, desde - self._duracion_maxima, 0, limite)
+
+        return [self._elemento(posicion) for posicion in range(primera, limite) if self._fines[posicion] >= desde]
+
+
+def obtener_intervalo_competicion(competicion: dict, formato_fecha: str) -> tuple:
+
+    """
+    Obtiene el intervalo (inicio, fin) en segundos de una vuelta o de una clásica.
+
+    Parámetros:
+        competicion (dict): Vuelta (fecha_inicio/fecha_fin) o clásica (fecha_clasica).
+        formato_fecha (str): Formato de las fechas.
+
+    Salida:
+        tuple: (inicio, fin) en segundos desde epoch, o (None, None) si no tiene fecha.
+
+    Lanza:
+        ExcepcionFecha: Si la fecha no cumple el formato indicado.
+    """
+
+    try:
+        if 'fecha_clasica' in competicion:
+            inicio = _a_segundos(datetime.strptime(competicion['fecha_clasica'], formato_fecha))
+            return inicio, inicio
+
+        if not competicion.get('fecha_inicio'):
+            return None, None
+
+        inicio = _a_segundos(datetime.strptime(competicion['fecha_inicio'], formato_fecha))
+        fecha_fin = competicion.get('fecha_fin')
+        fin = _a_segundos(datetime.strptime(fecha_fin, formato_fecha)) if fecha_fin else inicio
+
+        return inicio, max(inicio, fin)
+
+    except ValueError as ve:
+        raise ExcepcionFecha(f"Fecha inválida en la competición {competicion}") from ve
+
+
+def _a_segundos(fecha: datetime) -> int:
+
+    """
+    Convierte un datetime sin zona horaria a segundos desde epoch.
+
+    Parámetros:
+        fecha (datetime): Fecha a convertir.
+
+    Salida:
+        int: Segundos desde epoch.
+    """
+
+    return calendar.timegm(fecha.timetuple())
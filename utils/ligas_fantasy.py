@@ -0,0 +1,217 @@
+# utils/ligas_fantasy.py
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from utils import fichero_utils
+from utils.clasificacion_liga import ClasificacionLiga
+from utils.excepciones import ExcepcionResultados
+from utils.metricas import MetricasWeb
+from utils.resultados_competicion import ResultadosCompeticion
+
+
+class LigaFantasy:
+
+    """
+    Liga de equipos de fantasy de una competición con su clasificación incremental.
+
+    Cada vez que se ingieren etapas nuevas, los puntos de esas etapas se reparten entre los
+    equipos con una única operación de NumPy (np.bincount sobre la pertenencia ciclista-equipo)
+    y se aplican como deltas a la clasificación, sin recalcular ni reordenar toda la liga.
+
+    Atributos:
+        identificador (str): Identificador de la liga.
+        url_competicion (str): URL de la competición en la que se juega la liga.
+        clasificacion (ClasificacionLiga): Clasificación de los equipos.
+    """
+
+    def __init__(self, identificador: str, url_competicion: str, equipos: Dict[str, List[str]]) -> None:
+
+        """
+        Crea la liga con todos los equipos a cero puntos.
+
+        Parámetros:
+            identificador (str): Identificador de la liga.
+            url_competicion (str): URL de la competición.
+            equipos (dict): Nombre del equipo -> nombres de sus ciclistas.
+
+        Salida:
+            None
+        """
+
+        self.identificador = identificador
+        self.url_competicion = url_competicion
+        self.clasificacion = ClasificacionLiga({equipo: 0.0 for equipo in equipos})
+        self._equipos = list(equipos)
+        self._ciclistas_equipos = [list(ciclistas) for ciclistas in equipos.values()]
+        self._etapas_aplicadas = set()
+        self._pertenencia: Optional[Tuple[int, object, object]] = None
+
+
+    def actualizar(self, resultados: ResultadosCompeticion) -> List[int]:
+
+        """
+        Aplica a la clasificación las etapas ingeridas que la liga todavía no tenía.
+
+        Parámetros:
+            resultados (ResultadosCompeticion): Resultados de la competición de la liga.
+
+        Salida:
+            list[int]: Etapas aplicadas en esta llamada.
+        """
+
+        import numpy as np
+
+        etapas_nuevas = [etapa for etapa in resultados.obtener_etapas_ingeridas() if etapa not in self._etapas_aplicadas]
+
+        if not etapas_nuevas:
+            return []
+
+        filas, indices_equipo = self._obtener_pertenencia(resultados)
+        puntos_ciclistas = resultados.obtener_puntos_etapas()[:, [etapa - 1 for etapa in etapas_nuevas]].sum(axis=1)
+        deltas = np.bincount(indices_equipo, weights=puntos_ciclistas[filas], minlength=len(self._equipos))
+
+        self.clasificacion.aplicar_deltas({self._equipos[indice]: float(deltas[indice]) for indice in np.flatnonzero(deltas)})
+        self._etapas_aplicadas.update(etapas_nuevas)
+
+        return etapas_nuevas
+
+
+    def _obtener_pertenencia(self, resultados: ResultadosCompeticion) -> tuple:
+
+        """
+        Devuelve la pertenencia ciclista-equipo como dos vectores paralelos (fila del ciclista en
+        los resultados, índice del equipo). Solo se recalcula cuando aparecen ciclistas nuevos.
+
+        Parámetros:
+            resultados (ResultadosCompeticion): Resultados de la competición.
+
+        Salida:
+            tuple: (filas, indices_equipo).
+        """
+
+        import numpy as np
+
+        if self._pertenencia is None or self._pertenencia[0] != len(resultados.ciclistas):
+            filas_ciclistas = {ciclista: fila for fila, ciclista in enumerate(resultados.ciclistas)}
+            filas = []
+            indices_equipo = []
+
+            for indice_equipo, ciclistas in enumerate(self._ciclistas_equipos):
+                for ciclista in ciclistas:
+                    fila = filas_ciclistas.get(ciclista)
+
+                    if fila is not None:
+                        filas.append(fila)
+                        indices_equipo.append(indice_equipo)
+
+            self._pertenencia = (len(resultados.ciclistas), np.array(filas, dtype=np.int64),
+                                 np.array(indices_equipo, dtype=np.int64))
+
+        return self._pertenencia[1], self._pertenencia[2]
+
+
+class RegistroLigas:
+
+    """
+    Ligas definidas en un fichero JSON, actualizadas a medida que el cron guarda resultados nuevos.
+
+    Formato del fichero:
+        {"<liga>": {"competicion": "<url>", "equipos": {"<equipo>": ["<ciclista>", ...]}}}
+
+    Antes de responder por una liga se comprueba (con un stat) si el fichero de resultados de
+    su competición ha cambiado; solo entonces se cargan los resultados y se aplican las etapas nuevas.
+    """
+
+    def __init__(self, ruta_ligas: str, directorio_resultados: str, metricas: Optional[MetricasWeb] = None) -> None:
+
+        """
+        Carga la definición de las ligas. Si el fichero no existe no hay ninguna liga definida.
+
+        Parámetros:
+            ruta_ligas (str): Ruta del fichero JSON de ligas.
+            directorio_resultados (str): Directorio de resultados de las competiciones.
+            metricas (MetricasWeb, optional): Métricas donde registrar si los resultados se sirven de memoria.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionResultados: Si el fichero de ligas no se puede leer o no tiene el formato esperado.
+        """
+
+        definicion = fichero_utils.leer_json(ruta_ligas) if os.path.exists(ruta_ligas) else {}
+
+        if not isinstance(definicion, dict):
+            raise ExcepcionResultados(f"No se pudo leer la definición de ligas de {ruta_ligas}")
+
+        try:
+            self._ligas = {identificador: LigaFantasy(identificador, liga['competicion'], liga['equipos'])
+                           for identificador, liga in definicion.items()}
+
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ExcepcionResultados(f"La definición de ligas de {ruta_ligas} no tiene el formato esperado") from e
+
+        self._directorio_resultados = directorio_resultados
+        self._metricas = metricas
+        self._versiones_resultados: Dict[str, Tuple[int, int]] = {}
+        self._bloqueo = threading.Lock()
+
+
+    def obtener_liga(self, identificador: str) -> Optional[LigaFantasy]:
+
+        """
+        Devuelve una liga con las últimas etapas guardadas ya aplicadas.
+
+        Parámetros:
+            identificador (str): Identificador de la liga.
+
+        Salida:
+            LigaFantasy: La liga o None si no existe.
+
+        Lanza:
+            ExcepcionResultados: Si los resultados guardados de la competición no se pueden leer.
+        """
+
+        liga = self._ligas.get(identificador)
+
+        if liga is not None:
+            with self._bloqueo:
+                self._actualizar_liga(liga)
+
+        return liga
+
+
+    def _actualizar_liga(self, liga: LigaFantasy) -> None:
+
+        """
+        Aplica a la liga los resultados guardados de su competición si han cambiado desde la última vez.
+
+        Parámetros:
+            liga (LigaFantasy): Liga a actualizar.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionResultados: Si los resultados guardados de la competición no se pueden leer.
+        """
+
+        ruta = ResultadosCompeticion.obtener_ruta(self._directorio_resultados, liga.url_competicion)
+
+        try:
+            estado = os.stat(ruta)
+
+        except FileNotFoundError:
+            return
+
+        version = (estado.st_mtime_ns, estado.st_size)
+
+        acierto = self._versiones_resultados.get(liga.identificador) == version
+
+        if not acierto:
+            liga.actualizar(ResultadosCompeticion.cargar(self._directorio_resultados, liga.url_competicion))
+            self._versiones_resultados[liga.identificador] = version
+
+        if self._metricas is not None:
+            self._metricas.registrar_cache("resultados_ligas", acierto)
@@ -0,0 +1,83 @@
+# utils/limitador_tasa.py
+
+import threading
+import time
+from typing import Optional
+
+
+class LimitadorTasa:
+
+    """
+    Limitador de peticiones por segundo (cubo de fichas) compartido por todos los hilos del proceso.
+
+    Cada petición consume una ficha; las fichas se reponen a 'peticiones_por_segundo' y se
+    acumulan hasta 'rafaga', de modo que tras un periodo sin peticiones se permite una pequeña
+    ráfaga y después el ritmo queda fijado. Quien no encuentra ficha espera fuera del lock el
+    tiempo justo hasta la siguiente.
+
+    Atributos:
+        peticiones_por_segundo (float): Ritmo sostenido permitido.
+        rafaga (int): Peticiones que se pueden hacer seguidas tras estar inactivo.
+    """
+
+    def __init__(self, peticiones_por_segundo: float, rafaga: int = 1) -> None:
+
+        """
+        Inicializa el limitador con la ráfaga completa disponible.
+
+        Parámetros:
+            peticiones_por_segundo (float): Ritmo sostenido permitido. Para no limitar, no se crea el limitador.
+            rafaga (int, optional): Peticiones seguidas permitidas tras estar inactivo (mínimo 1). Default es 1.
+
+        Salida:
+            None
+
+        Lanza:
+            ValueError: Si 'peticiones_por_segundo' no es positivo.
+        """
+
+        if not peticiones_por_segundo > 0:
+            raise ValueError(f"'peticiones_por_segundo' debe ser positivo: {peticiones_por_segundo}")
+
+        self.peticiones_por_segundo = peticiones_por_segundo
+        self.rafaga = max(1, rafaga)
+        self._fichas = float(self.rafaga)
+        self._ultima_reposicion = time.monotonic()
+        self._bloqueo = threading.Lock()
+
+
+    def esperar(self, maximo_segundos: Optional[float] = None) -> Optional[float]:
+
+        """
+        Bloquea hasta que se puede hacer la siguiente petición y consume su ficha.
+
+        Con 'maximo_segundos', si la ficha no va a llegar antes de ese tiempo se espera solo hasta
+        él y se vuelve sin consumirla.
+
+        Parámetros:
+            maximo_segundos (float, optional): Tiempo máximo de espera. Default es sin límite.
+
+        Salida:
+            float: Segundos esperados, o None si la ficha no llega dentro de 'maximo_segundos'.
+        """
+
+        esperado = 0.0
+
+        while True:
+            with self._bloqueo:
+                ahora = time.monotonic()
+                self._fichas = min(self.rafaga, self._fichas + (ahora - self._ultima_reposicion) * self.peticiones_por_segundo)
+                self._ultima_reposicion = ahora
+
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return esperado
+
+                espera = (1 - self._fichas) / self.peticiones_por_segundo
+
+            if maximo_segundos is not None and esperado + espera > maximo_segundos:
+                time.sleep(max(0.0, maximo_segundos - esperado))
+                return None
+
+            time.sleep(espera)
+            esperado += espera
@@ -0,0 +1,213 @@
+# utils/lista_desbordable.py
+
+import json
+import os
+import tempfile
+from array import array
+from typing import Any, Iterator, List, Optional
+
+
+class ListaDesbordable:
+
+    """
+    Lista de solo añadido que mantiene en memoria como mucho 'maximo_en_memoria' elementos y
+    vuelca el resto, serializados como JSON (una línea por elemento), a un fichero temporal.
+
+    De cada elemento volcado solo queda en memoria su offset en el fichero (8 bytes), por lo
+    que la memoria usada no crece con el número de elementos. Se puede recorrer tantas veces
+    como se quiera (los elementos volcados se leen de uno en uno) y acceder por índice.
+    El fichero se borra al cerrar la lista o al terminar el proceso.
+
+    Atributos:
+        maximo_en_memoria (int): Elementos que se mantienen en memoria antes de volcar a disco.
+    """
+
+    def __init__(self, maximo_en_memoria: int, directorio: Optional[str] = None) -> None:
+
+        """
+        Crea la lista vacía (el fichero temporal se crea al volcar el primer elemento).
+
+        Parámetros:
+            maximo_en_memoria (int): Elementos que se mantienen en memoria.
+            directorio (str, optional): Directorio del fichero temporal. Default es el del sistema.
+
+        Salida:
+            None
+        """
+
+        self.maximo_en_memoria = max(0, maximo_en_memoria)
+        self._directorio = directorio
+        self._en_memoria: List[Any] = []
+        self._offsets = array('Q')
+        self._fichero = None
+
+
+    def __len__(self) -> int:
+
+        """
+        Devuelve el número total de elementos, en memoria y volcados.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Número de elementos de la lista.
+        """
+
+        return len(self._en_memoria) + len(self._offsets)
+
+
+    def __iter__(self) -> Iterator[Any]:
+
+        """
+        Recorre los elementos en orden de inserción: primero los de memoria y después los volcados,
+        leídos del fichero de uno en uno.
+
+        Parámetros:
+            None
+
+        Salida:
+            Iterator[Any]: Elementos de la lista.
+        """
+
+        yield from self._en_memoria
+
+        for indice in range(len(self._offsets)):
+            yield self._leer_volcado(indice)
+
+
+    def __getitem__(self, indice: int) -> Any:
+
+        """
+        Devuelve el elemento de una posición. Los primeros están en memoria; el resto se leen del
+        fichero de volcado a partir de su offset.
+
+        Parámetros:
+            indice (int): Posición del elemento (los negativos cuentan desde el final).
+
+        Salida:
+            Any: Elemento de esa posición.
+
+        Lanza:
+            IndexError: Si la posición está fuera de la lista.
+        """
+
+        if indice < 0:
+            indice += len(self)
+
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de la lista")
+
+        if indice < len(self._en_memoria):
+            return self._en_memoria[indice]
+
+        return self._leer_volcado(indice - len(self._en_memoria))
+
+
+    def __enter__(self) -> 'ListaDesbordable':
+
+        """
+        Permite usar la lista como gestor de contexto, que la cierra al salir.
+
+        Parámetros:
+            None
+
+        Salida:
+            ListaDesbordable: La propia lista.
+        """
+
+        return self
+
+
+    def __exit__(self, *args) -> None:
+
+        """
+        Cierra la lista al salir del contexto.
+
+        Parámetros:
+            args: Excepción del bloque, si la hubo (no se suprime).
+
+        Salida:
+            None
+        """
+
+        self.cerrar()
+
+
+    @property
+    def elementos_volcados(self) -> int:
+
+        """
+        Número de elementos volcados a disco.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Elementos guardados en el fichero de volcado.
+        """
+
+        return len(self._offsets)
+
+
+    def append(self, elemento: Any) -> None:
+
+        """
+        Añade un elemento, volcándolo a disco si ya se ha alcanzado el máximo en memoria.
+
+        Parámetros:
+            elemento (Any): Elemento serializable a JSON.
+
+        Salida:
+            None
+        """
+
+        if len(self._en_memoria) < self.maximo_en_memoria and not self._offsets:
+            self._en_memoria.append(elemento)
+            return
+
+        if self._fichero is None:
+            if self._directorio:
+                os.makedirs(self._directorio, exist_ok=True)
+
+            self._fichero = tempfile.TemporaryFile(mode="w+b", dir=self._directorio, prefix="desbordamiento_")
+
+        self._fichero.seek(0, os.SEEK_END)
+        self._offsets.append(self._fichero.tell())
+        self._fichero.write(json.dumps(elemento, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+    def cerrar(self) -> None:
+
+        """
+        Libera los elementos en memoria y borra el fichero de volcado.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        self._en_memoria = []
+        self._offsets = array('Q')
+
+        if self._fichero is not None:
+            self._fichero.close()
+            self._fichero = None
+
+
+    def _leer_volcado(self, indice: int) -> Any:
+
+        """
+        Lee y deserializa un elemento del fichero de volcado.
+
+        Parámetros:
+            indice (int): Posición del elemento entre los volcados (no en la lista completa).
+
+        Salida:
+            Any: Elemento deserializado.
+        """
+
+        self._fichero.seek(self._offsets[indice])
+        return json.loads(self._fichero.readline().decode("utf-8"))
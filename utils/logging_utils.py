@@ -1,11 +1,15 @@
 # utils/logging_utils.py
 
 from logging.handlers import RotatingFileHandler
+from typing import Optional, TYPE_CHECKING
 from utils.properties_utils import leer_properties, obtener_property
 from utils.excepciones import ExcepcionProperties, ExcepcionLogging
 import logging
 import os
 
+if TYPE_CHECKING:
+    import configparser
+
 # Constantes
 CTE_NIVELES_LOGGING = {
     'DEBUG': logging.DEBUG,
@@ -16,7 +20,8 @@ CTE_NIVELES_LOGGING = {
 }
 
 
-def inicializar_logging(ruta_config: str, nombre_config: str, proceso: str) -> logging.Logger:
+def inicializar_logging(ruta_config: str, nombre_config: str, proceso: str,
+                        fichero_config: Optional['configparser.ConfigParser'] = None) -> logging.Logger:
 
     """
     Inicializa el sistema de logging con salidas tanto a archivo como a consola.
@@ -25,6 +30,8 @@ def inicializar_logging(ruta_config: str, nombre_config: str, proceso: str) -> l
         ruta_config (str): Ruta del fichero de configuración del log.
         nombre_config (str): Nombre del fichero de configuración del log.
         proceso (str): Nombre del proceso que llama a la inicialización del log.
+        fichero_config (ConfigParser, optional): Fichero de configuración ya leído, para no volver a leerlo.
+                                                 Default es None (se lee de ruta_config + nombre_config).
 
     Salida:
         logging.Logger: Objeto de logger configurado.
@@ -33,7 +40,7 @@ def inicializar_logging(ruta_config: str, nombre_config: str, proceso: str) -> l
         ExcepcionLogging: Si ocurre algún error en la configuración de logging.
     """
     try:
-        directorio_logs, tamanyo_maximo_mb, archivos_rotativos, nivel_archivo, nivel_consola = _cargar_configuracion_logging(ruta_config, nombre_config)
+        directorio_logs, tamanyo_maximo_mb, archivos_rotativos, nivel_archivo, nivel_consola = _cargar_configuracion_logging(ruta_config, nombre_config, fichero_config)
         ruta_log = _generar_ruta_log(directorio_logs, proceso)
         logger = _configurar_logger(proceso, nivel_archivo, nivel_consola, ruta_log, tamanyo_maximo_mb, archivos_rotativos)
 
@@ -43,7 +50,8 @@ def inicializar_logging(ruta_config: str, nombre_config: str, proceso: str) -> l
         raise ExcepcionLogging(f"Error al inicializar el logging.") from e
 
 
-def _cargar_configuracion_logging(ruta_config: str, nombre_config: str) -> tuple:
+def _cargar_configuracion_logging(ruta_config: str, nombre_config: str,
+                                  fichero_config: Optional['configparser.ConfigParser'] = None) -> tuple:
 
     """
     Método privado para cargar la configuración de logging desde un archivo de properties.
@@ -51,6 +59,7 @@ def _cargar_configuracion_logging(ruta_config: str, nombre_config: str) -> tuple
     Parámetros:
         ruta_config (str): Ruta del fichero de configuración del log.
         nombre_config (str): Nombre del fichero de configuración del log.
+        fichero_config (ConfigParser, optional): Fichero de configuración ya leído. Default es None.
 
     Salida:
         tuple: (directorio_logs, tamanyo_maximo_mb, archivos_rotativos, nivel_archivo, nivel_consola)
@@ -60,7 +69,8 @@ def _cargar_configuracion_logging(ruta_config: str, nombre_config: str) -> tuple
     """
 
     try:
-        fichero_config = leer_properties(f"{ruta_config}{nombre_config}")
+        if fichero_config is None:
+            fichero_config = leer_properties(f"{ruta_config}{nombre_config}")
 
         directorio_logs = obtener_property(fichero_config, 'logging', 'dir', default='logs')
         tamanyo_maximo_mb = int(obtener_property(fichero_config, 'logging', 'max_size_mb', default=1)) * 1024 * 1024
@@ -0,0 +1,122 @@
+# utils/memoria_utils.py
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+import logging
+
+CTE_BYTES_MIB = 1024 * 1024
+
+
+class ContabilidadMemoria:
+
+    """
+    Mide con tracemalloc la memoria de cada etapa del proceso (obtención de grupos, desglose,
+    publicación...) y la registra en el log.
+
+    Por cada etapa se anota la memoria asignada al empezar, el pico alcanzado durante la etapa y
+    la que queda asignada al terminar. Las etapas se pueden anidar: el pico de la etapa externa
+    incluye el de las internas. tracemalloc solo ve las asignaciones de Python de este proceso
+    (no las de los procesos del pool de parseo) y ralentiza la ejecución, por eso la medición se
+    activa por configuración.
+
+    Atributos:
+        activa (bool): Si es False las etapas no miden nada.
+        etapas (dict): Nombre de la etapa -> medidas en bytes y segundos.
+    """
+
+    def __init__(self, logger: logging.Logger, activa: bool = True) -> None:
+
+        """
+        Inicializa la contabilidad sin etapas medidas. tracemalloc no se arranca hasta la primera etapa.
+
+        Parámetros:
+            logger (logging.Logger): Logger donde se registran las medidas.
+            activa (bool, optional): Si es False las etapas no miden nada. Default es True.
+
+        Salida:
+            None
+        """
+
+        self.logger = logger
+        self.activa = activa
+        self.etapas: Dict[str, dict] = {}
+        self._pila: List[dict] = []
+        self._tracemalloc_iniciado = False
+
+
+    @contextmanager
+    def etapa(self, nombre: str) -> Iterator[None]:
+
+        """
+        Mide la memoria del bloque de código de una etapa.
+
+        Parámetros:
+            nombre (str): Nombre de la etapa.
+
+        Salida:
+            Iterator[None]: Contexto de la etapa.
+        """
+
+        if not self.activa:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_iniciado = True
+
+        actual, pico_previo = tracemalloc.get_traced_memory()
+
+        # reset_peak descarta el pico de la etapa externa hasta ahora: se conserva en su marco
+        if self._pila:
+            self._pila[-1]['pico_previo'] = max(self._pila[-1]['pico_previo'], pico_previo)
+
+        tracemalloc.reset_peak()
+        marco = {'inicio_bytes': actual, 'pico_previo': 0, 'inicio': time.perf_counter()}
+        self._pila.append(marco)
+
+        try:
+            yield
+
+        finally:
+            self._pila.pop()
+            final, pico = tracemalloc.get_traced_memory()
+            pico = max(pico, marco['pico_previo'])
+
+            if self._pila:
+                self._pila[-1]['pico_previo'] = max(self._pila[-1]['pico_previo'], pico)
+
+            self.etapas[nombre] = {
+                'inicio_bytes': marco['inicio_bytes'],
+                'pico_bytes': pico,
+                'final_bytes': final,
+                'segundos': time.perf_counter() - marco['inicio']
+            }
+            self.logger.info(f"Memoria de la etapa '{nombre}': pico {pico / CTE_BYTES_MIB:.1f} MiB "
+                             f"(+{(pico - marco['inicio_bytes']) / CTE_BYTES_MIB:.1f} MiB), "
+                             f"al terminar {final / CTE_BYTES_MIB:.1f} MiB, "
+                             f"{self.etapas[nombre]['segundos']:.2f} s")
+
+
+    def finalizar(self) -> None:
+
+        """
+        Registra el resumen de todas las etapas y detiene tracemalloc si lo inició esta contabilidad.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        if self.etapas:
+            etapa_maxima = max(self.etapas, key=lambda nombre: self.etapas[nombre]['pico_bytes'])
+            self.logger.info(f"Pico de memoria del proceso: {self.etapas[etapa_maxima]['pico_bytes'] / CTE_BYTES_MIB:.1f} MiB "
+                             f"en la etapa '{etapa_maxima}'")
+
+        if self._tracemalloc_iniciado and not self._pila:
+            tracemalloc.stop()
+            self._tracemalloc_iniciado = False
@@ -0,0 +1,412 @@
+# utils/metricas.py
+
+import bisect
+import glob
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils import fichero_utils
+
+# Límites superiores (segundos) de los buckets del histograma de latencias
+CTE_LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Prefijo común de todas las métricas expuestas
+CTE_PREFIJO_METRICAS = "fantasy_ciclismo"
+
+CTE_ESTADO_OK = "ok"
+CTE_ESTADO_ERROR = "error"
+
+# Segundos entre dos publicaciones de las métricas de un worker en el directorio compartido
+CTE_INTERVALO_PUBLICACION_METRICAS = 1.0
+
+# Fichero de las métricas de cada worker en el directorio compartido ('{}' es su pid)
+CTE_PATRON_FICHERO_METRICAS = "web_{}.json"
+
+
+class MetricasWeb:
+
+    """
+    Métricas de ejecución de la aplicación web: peticiones por ruta, método y código de estado,
+    histograma de latencias por ruta y aciertos/fallos de las cachés en memoria.
+
+    Los contadores son del proceso. Sin 'directorio', /metrics solo muestra los del worker que
+    atiende la petición. Con 'directorio' (compartido por todos los workers de la aplicación),
+    cada worker publica los suyos en un fichero propio como mucho cada 'intervalo_publicacion'
+    segundos y al exportar, y la exportación suma los de todos los ficheros; así, con varios
+    workers pre-forked tras el mismo puerto, cualquiera de ellos devuelve el total, con un retraso
+    de como mucho 'intervalo_publicacion' segundos para lo atendido por los demás. Los ficheros
+    de los workers que terminan se conservan para que los contadores no retrocedan.
+
+    Registrar una petición es una búsqueda binaria en los límites y unos incrementos bajo un lock.
+
+    Atributos:
+        directorio (str): Directorio compartido de las métricas de los workers (None sin agregado).
+        intervalo_publicacion (float): Segundos mínimos entre dos publicaciones del worker.
+    """
+
+    def __init__(self, limites_latencia: Tuple[float, ...] = CTE_LIMITES_LATENCIA, directorio: Optional[str] = None,
+                 intervalo_publicacion: float = CTE_INTERVALO_PUBLICACION_METRICAS) -> None:
+
+        """
+        Inicializa los contadores vacíos.
+
+        Parámetros:
+            limites_latencia (tuple, optional): Límites superiores de los buckets del histograma, en segundos.
+                                                Default es CTE_LIMITES_LATENCIA.
+            directorio (str, optional): Directorio compartido donde agregar las métricas de todos los
+                                        workers. Default es None (solo las del proceso).
+            intervalo_publicacion (float, optional): Segundos mínimos entre dos publicaciones del worker.
+                                                     Default es CTE_INTERVALO_PUBLICACION_METRICAS.
+
+        Salida:
+            None
+        """
+
+        self._limites = tuple(limites_latencia)
+        self.directorio = directorio
+        self.intervalo_publicacion = intervalo_publicacion
+        self._peticiones: Dict[Tuple[str, str, int], int] = {}
+        self._latencias: Dict[str, List] = {}
+        self._caches: Dict[str, List[int]] = {}
+        self._ultima_publicacion = 0.0
+        self._bloqueo = threading.Lock()
+
+
+    def registrar_peticion(self, ruta: str, metodo: str, estado: int, duracion: float) -> None:
+
+        """
+        Registra una petición atendida.
+
+        Parámetros:
+            ruta (str): Regla de la ruta (ej. '/calendario/dia/<fecha>'), no la URL concreta.
+            metodo (str): Método HTTP.
+            estado (int): Código de estado de la respuesta.
+            duracion (float): Segundos empleados en atenderla.
+
+        Salida:
+            None
+        """
+
+        bucket = bisect.bisect_left(self._limites, duracion)
+
+        with self._bloqueo:
+            clave = (ruta, metodo, estado)
+            self._peticiones[clave] = self._peticiones.get(clave, 0) + 1
+
+            histograma = self._latencias.get(ruta)
+
+            if histograma is None:
+                # Un contador por bucket más el de +Inf, y la suma de duraciones
+                histograma = self._latencias[ruta] = [[0] * (len(self._limites) + 1), 0.0]
+
+            histograma[0][bucket] += 1
+            histograma[1] += duracion
+
+        self._publicar(forzar=False)
+
+
+    def registrar_cache(self, cache: str, acierto: bool) -> None:
+
+        """
+        Registra un acceso a una caché.
+
+        Parámetros:
+            cache (str): Nombre de la caché.
+            acierto (bool): True si el valor se sirvió de la caché.
+
+        Salida:
+            None
+        """
+
+        with self._bloqueo:
+            contadores = self._caches.setdefault(cache, [0, 0])
+            contadores[0 if acierto else 1] += 1
+
+        self._publicar(forzar=False)
+
+
+    def exportar(self) -> List[str]:
+
+        """
+        Devuelve las métricas en el formato de texto de Prometheus: las del proceso o, con directorio
+        compartido, la suma de las de todos los workers.
+
+        Parámetros:
+            None
+
+        Salida:
+            list[str]: Líneas de la exposición.
+        """
+
+        if self.directorio is None:
+            estados = [self._copiar_estado()]
+
+        else:
+            self._publicar(forzar=True)
+            estados = [estado for estado in (fichero_utils.leer_json(ruta) for ruta in
+                                             glob.glob(os.path.join(self.directorio, CTE_PATRON_FICHERO_METRICAS.format("*"))))
+                       if isinstance(estado, dict) and estado.get('limites') == list(self._limites)]
+
+        peticiones, latencias, caches = self._sumar_estados(estados)
+
+        lineas = [f"# HELP {CTE_PREFIJO_METRICAS}_peticiones_total Peticiones atendidas por ruta, método y estado.",
+                  f"# TYPE {CTE_PREFIJO_METRICAS}_peticiones_total counter"]
+
+        for (ruta, metodo, estado), numero in sorted(peticiones.items()):
+            lineas.append(f'{CTE_PREFIJO_METRICAS}_peticiones_total{{ruta="{_escapar(ruta)}",metodo="{metodo}",'
+                          f'estado="{estado}"}} {numero}')
+
+        lineas += [f"# HELP {CTE_PREFIJO_METRICAS}_latencia_segundos Latencia de las peticiones por ruta.",
+                   f"# TYPE {CTE_PREFIJO_METRICAS}_latencia_segundos histogram"]
+
+        for ruta, (buckets, suma) in sorted(latencias.items()):
+            etiqueta = f'ruta="{_escapar(ruta)}"'
+            acumulado = 0
+
+            for limite, numero in zip(self._limites + (float("inf"),), buckets):
+                acumulado += numero
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                lineas.append(f'{CTE_PREFIJO_METRICAS}_latencia_segundos_bucket{{{etiqueta},le="{le}"}} {acumulado}')
+
+            lineas.append(f"{CTE_PREFIJO_METRICAS}_latencia_segundos_sum{{{etiqueta}}} {suma:.6f}")
+            lineas.append(f"{CTE_PREFIJO_METRICAS}_latencia_segundos_count{{{etiqueta}}} {acumulado}")
+
+        lineas += [f"# HELP {CTE_PREFIJO_METRICAS}_cache_accesos_total Accesos a las cachés en memoria por resultado.",
+                   f"# TYPE {CTE_PREFIJO_METRICAS}_cache_accesos_total counter"]
+
+        for cache, (aciertos, fallos) in sorted(caches.items()):
+            lineas.append(f'{CTE_PREFIJO_METRICAS}_cache_accesos_total{{cache="{cache}",resultado="acierto"}} {aciertos}')
+            lineas.append(f'{CTE_PREFIJO_METRICAS}_cache_accesos_total{{cache="{cache}",resultado="fallo"}} {fallos}')
+
+        lineas += [f"# HELP {CTE_PREFIJO_METRICAS}_cache_ratio_aciertos Proporción de aciertos de las cachés en memoria.",
+                   f"# TYPE {CTE_PREFIJO_METRICAS}_cache_ratio_aciertos gauge"]
+
+        for cache, (aciertos, fallos) in sorted(caches.items()):
+            lineas.append(f'{CTE_PREFIJO_METRICAS}_cache_ratio_aciertos{{cache="{cache}"}} '
+                          f'{aciertos / (aciertos + fallos) if aciertos + fallos else 0.0:.6f}')
+
+        return lineas
+
+
+    def _copiar_estado(self) -> dict:
+
+        """
+        Copia los contadores del proceso en un diccionario serializable a JSON.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: 'limites', 'peticiones' ([ruta, método, estado, número]), 'latencias' (ruta -> [buckets, suma])
+                  y 'caches' (caché -> [aciertos, fallos]).
+        """
+
+        with self._bloqueo:
+            return {'limites': list(self._limites),
+                    'peticiones': [[ruta, metodo, estado, numero] for (ruta, metodo, estado), numero in self._peticiones.items()],
+                    'latencias': {ruta: [list(histograma[0]), histograma[1]] for ruta, histograma in self._latencias.items()},
+                    'caches': {cache: list(contadores) for cache, contadores in self._caches.items()}}
+
+
+    def _publicar(self, forzar: bool) -> None:
+
+        """
+        Escribe los contadores del proceso en su fichero del directorio compartido si ha pasado el
+        intervalo de publicación desde la última vez (o siempre, si se fuerza).
+
+        Parámetros:
+            forzar (bool): Si es True, publica aunque no haya pasado el intervalo.
+
+        Salida:
+            None
+        """
+
+        if self.directorio is None:
+            return
+
+        ahora = time.monotonic()
+
+        with self._bloqueo:
+            if not forzar and ahora - self._ultima_publicacion < self.intervalo_publicacion:
+                return
+
+            self._ultima_publicacion = ahora
+
+        # El pid se toma al publicar: la instancia puede haberse creado antes del fork de los workers
+        fichero_utils.escribir_json_atomico(os.path.join(self.directorio, CTE_PATRON_FICHERO_METRICAS.format(os.getpid())),
+                                            self._copiar_estado())
+
+
+    def _sumar_estados(self, estados: Iterable[dict]) -> Tuple[dict, dict, dict]:
+
+        """
+        Suma los contadores de varios procesos.
+
+        Parámetros:
+            estados (Iterable[dict]): Contadores de cada proceso (ver _copiar_estado).
+
+        Salida:
+            tuple: (ruta, método, estado) -> peticiones, ruta -> (buckets, suma) y caché -> (aciertos, fallos).
+        """
+
+        peticiones: Dict[Tuple[str, str, int], int] = {}
+        latencias: Dict[str, Tuple[List[int], float]] = {}
+        caches: Dict[str, Tuple[int, int]] = {}
+
+        for estado in estados:
+            for ruta, metodo, codigo, numero in estado.get('peticiones', []):
+                peticiones[(ruta, metodo, codigo)] = peticiones.get((ruta, metodo, codigo), 0) + numero
+
+            for ruta, (buckets, suma) in estado.get('latencias', {}).items():
+                acumulados, suma_acumulada = latencias.get(ruta, ([0] * (len(self._limites) + 1), 0.0))
+                latencias[ruta] = ([a + b for a, b in zip(acumulados, buckets)], suma_acumulada + suma)
+
+            for cache, (aciertos, fallos) in estado.get('caches', {}).items():
+                aciertos_acumulados, fallos_acumulados = caches.get(cache, (0, 0))
+                caches[cache] = (aciertos_acumulados + aciertos, fallos_acumulados + fallos)
+
+        return peticiones, latencias, caches
+
+
+class EstadisticasCron:
+
+    """
+    Estadísticas de la última actualización del calendario, compartidas entre el cron (que las
+    escribe de forma atómica al terminar cada actualización) y la aplicación web (que las lee).
+
+    La lectura solo vuelve a parsear el fichero cuando cambia su mtime o su tamaño, por lo que
+    consultarlas en cada petición de métricas cuesta un stat.
+
+    Atributos:
+        ruta (str): Ruta del fichero JSON de estadísticas.
+    """
+
+    def __init__(self, ruta: str) -> None:
+
+        """
+        Inicializa las estadísticas sin leer todavía el fichero.
+
+        Parámetros:
+            ruta (str): Ruta del fichero JSON de estadísticas.
+
+        Salida:
+            None
+        """
+
+        self.ruta = ruta
+        self._version: Optional[Tuple[int, int]] = None
+        self._estadisticas: dict = {}
+        self._bloqueo = threading.Lock()
+
+
+    def publicar(self, estado: str, inicio: float, fin: float, **datos) -> None:
+
+        """
+        Escribe las estadísticas de una actualización conservando el instante de la última correcta.
+
+        Parámetros:
+            estado (str): CTE_ESTADO_OK o CTE_ESTADO_ERROR.
+            inicio (float): Instante de inicio (segundos desde epoch).
+            fin (float): Instante de fin (segundos desde epoch).
+            **datos: Otros valores numéricos de la actualización (ej. competiciones=...).
+
+        Salida:
+            None
+        """
+
+        anteriores = fichero_utils.leer_json(self.ruta, {}) or {}
+        estadisticas = {
+            'estado': estado,
+            'inicio': inicio,
+            'fin': fin,
+            'duracion_segundos': fin - inicio,
+            'ultima_correcta': fin if estado == CTE_ESTADO_OK else anteriores.get('ultima_correcta'),
+            'errores_consecutivos': 0 if estado == CTE_ESTADO_OK else anteriores.get('errores_consecutivos', 0) + 1
+        }
+        estadisticas.update(datos)
+
+        fichero_utils.escribir_json_atomico(self.ruta, estadisticas)
+
+
+    def leer(self) -> dict:
+
+        """
+        Devuelve las últimas estadísticas publicadas.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Estadísticas o diccionario vacío si todavía no se ha publicado ninguna.
+        """
+
+        try:
+            estado = os.stat(self.ruta)
+
+        except OSError:
+            return {}
+
+        version = (estado.st_mtime_ns, estado.st_size)
+
+        with self._bloqueo:
+            if self._version != version:
+                self._estadisticas = fichero_utils.leer_json(self.ruta, {}) or {}
+                self._version = version
+
+            return self._estadisticas
+
+
+    def exportar(self, ahora: Optional[float] = None) -> List[str]:
+
+        """
+        Devuelve las estadísticas en el formato de texto de Prometheus.
+
+        Parámetros:
+            ahora (float, optional): Instante de referencia para las edades. Default es time.time().
+
+        Salida:
+            list[str]: Líneas de la exposición (vacía si no hay estadísticas).
+        """
+
+        estadisticas = self.leer()
+
+        if not estadisticas:
+            return []
+
+        ahora = time.time() if ahora is None else ahora
+        prefijo = f"{CTE_PREFIJO_METRICAS}_actualizacion"
+        lineas = [f"# TYPE {prefijo}_duracion_segundos gauge",
+                  f"{prefijo}_duracion_segundos {estadisticas.get('duracion_segundos', 0.0):.3f}",
+                  f"# TYPE {prefijo}_correcta gauge",
+                  f"{prefijo}_correcta {1 if estadisticas.get('estado') == CTE_ESTADO_OK else 0}",
+                  f"# TYPE {prefijo}_errores_consecutivos gauge",
+                  f"{prefijo}_errores_consecutivos {estadisticas.get('errores_consecutivos', 0)}",
+                  f"# TYPE {prefijo}_edad_segundos gauge",
+                  f"{prefijo}_edad_segundos {ahora - estadisticas.get('fin', ahora):.3f}"]
+
+        if estadisticas.get('ultima_correcta') is not None:
+            lineas += [f"# TYPE {prefijo}_edad_ultima_correcta_segundos gauge",
+                       f"{prefijo}_edad_ultima_correcta_segundos {ahora - estadisticas['ultima_correcta']:.3f}"]
+
+        for clave, valor in sorted(estadisticas.items()):
+            if clave not in ('estado', 'inicio', 'fin', 'duracion_segundos', 'ultima_correcta', 'errores_consecutivos') \
+                    and isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                lineas += [f"# TYPE {prefijo}_{clave} gauge", f"{prefijo}_{clave} {valor}"]
+
+        return lineas
+
+
+def _escapar(valor: str) -> str:
+
+    """
+    Escapa el valor de una etiqueta para el formato de texto de Prometheus (barra invertida, comillas y saltos de línea).
+
+    Parámetros:
+        valor (str): Valor de la etiqueta.
+
+    Salida:
+        str: Valor escapado.
+    """
+
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,218 @@
+# utils/optimizador_equipo.py
+
+from typing import Optional, TYPE_CHECKING
+from utils.excepciones import ExcepcionOptimizador
+
+# numpy se importa en el primer uso para no penalizar el arranque de los procesos que no lo usan
+if TYPE_CHECKING:
+    import numpy
+    from utils.tabla_ciclistas import TablaCiclistas
+
+
+class OptimizadorEquipo:
+
+    """
+    Selección del equipo de fantasy con más puntos proyectados dentro del presupuesto y del
+    número de ciclistas de la competición.
+
+    Resuelve una mochila 0/1 con restricción de cardinalidad por programación dinámica sobre
+    la matriz (número de ciclistas elegidos x presupuesto). Cada ciclista actualiza la matriz
+    completa con una única operación vectorizada de NumPy, de modo que el bucle de Python es
+    solo sobre los ciclistas (unos 180 en una gran vuelta). Para reconstruir el equipo se guarda,
+    por ciclista, la matriz booleana de estados en los que mejora al incluirlo.
+
+    Los precios se discretizan en 'divisiones_precio' unidades por crédito (2 admite precios
+    de medio crédito); un precio que no cae en esa rejilla se redondea hacia arriba para no
+    superar nunca el presupuesto.
+
+    Atributos:
+        presupuesto (float): Presupuesto máximo del equipo.
+        numero_ciclistas (int): Número exacto de ciclistas del equipo.
+    """
+
+    def __init__(self, precios: 'numpy.ndarray', puntos: 'numpy.ndarray', presupuesto: float,
+                 numero_ciclistas: int, divisiones_precio: int = 1) -> None:
+
+        """
+        Prepara los datos de los ciclistas candidatos.
+
+        Parámetros:
+            precios (numpy.ndarray): Precio de cada ciclista.
+            puntos (numpy.ndarray): Puntos proyectados de cada ciclista.
+            presupuesto (float): Presupuesto máximo del equipo.
+            numero_ciclistas (int): Número exacto de ciclistas del equipo.
+            divisiones_precio (int, optional): Unidades por crédito al discretizar precios. Default es 1.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionOptimizador: Si los datos o las reglas no son coherentes.
+        """
+
+        import numpy as np
+
+        self._precios = np.asarray(precios, dtype=np.float64)
+        self._puntos = np.asarray(puntos, dtype=np.float64)
+
+        if self._precios.shape != self._puntos.shape or self._precios.ndim != 1:
+            raise ExcepcionOptimizador("Los precios y los puntos deben ser vectores de la misma longitud")
+
+        if numero_ciclistas < 1 or presupuesto <= 0 or divisiones_precio < 1:
+            raise ExcepcionOptimizador("El presupuesto, el número de ciclistas y las divisiones de precio deben ser positivos")
+
+        if np.any(self._precios < 0):
+            raise ExcepcionOptimizador("Hay ciclistas con precio negativo")
+
+        self.presupuesto = presupuesto
+        self.numero_ciclistas = numero_ciclistas
+        self._capacidad = int(np.floor(presupuesto * divisiones_precio + 1e-9))
+        self._costes = np.ceil(self._precios * divisiones_precio - 1e-9).astype(np.int64)
+
+
+    @classmethod
+    def desde_tabla(cls, tabla_ciclistas: 'TablaCiclistas', url_competicion: str, presupuesto: float,
+                    numero_ciclistas: int, divisiones_precio: int = 1,
+                    puntos_proyectados: Optional['numpy.ndarray'] = None) -> 'OptimizadorEquipo':
+
+        """
+        Crea el optimizador con los ciclistas de una competición de la tabla columnar, sin copiar
+        sus columnas (se leen con numpy.frombuffer).
+
+        Los índices que devuelven optimizar() y evaluar_alineaciones() son relativos a la
+        competición: la fila de la tabla es tabla_ciclistas.rango_competicion(url)[0] + índice.
+
+        Parámetros:
+            tabla_ciclistas (TablaCiclistas): Tabla de ciclistas.
+            url_competicion (str): URL de la competición.
+            presupuesto (float): Presupuesto máximo del equipo.
+            numero_ciclistas (int): Número exacto de ciclistas del equipo.
+            divisiones_precio (int, optional): Unidades por crédito al discretizar precios. Default es 1.
+            puntos_proyectados (numpy.ndarray, optional): Proyección de puntos propia; por defecto
+                                                          se usan los puntos de la tabla.
+
+        Salida:
+            OptimizadorEquipo: Optimizador de la competición.
+
+        Lanza:
+            ExcepcionOptimizador: Si la competición no tiene ciclistas en la tabla.
+        """
+
+        import numpy as np
+
+        inicio, fin = tabla_ciclistas.rango_competicion(url_competicion)
+
+        if fin <= inicio:
+            raise ExcepcionOptimizador(f"No hay ciclistas de la competición '{url_competicion}'")
+
+        precios = np.frombuffer(tabla_ciclistas.precios, dtype=np.float64)[inicio:fin]
+        puntos = np.frombuffer(tabla_ciclistas.puntos, dtype=np.float64)[inicio:fin] if puntos_proyectados is None \
+            else puntos_proyectados
+
+        return cls(precios, puntos, presupuesto, numero_ciclistas, divisiones_precio)
+
+
+    def optimizar(self) -> dict:
+
+        """
+        Calcula el equipo con más puntos proyectados que cumple presupuesto y número de ciclistas.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: Equipo óptimo con:
+                - 'ciclistas' (list[int]): Índices de los ciclistas elegidos, en orden ascendente.
+                - 'puntos' (float): Puntos proyectados del equipo.
+                - 'coste' (float): Coste del equipo.
+
+        Lanza:
+            ExcepcionOptimizador: Si no existe ningún equipo válido.
+        """
+
+        import numpy as np
+
+        numero_candidatos = len(self._costes)
+        k = self.numero_ciclistas
+        capacidad = self._capacidad
+
+        if numero_candidatos < k:
+            raise ExcepcionOptimizador(f"Hay {numero_candidatos} ciclistas y el equipo necesita {k}")
+
+        # mejor[j, b]: máximo de puntos con j ciclistas y coste <= b
+        mejor = np.full((k + 1, capacidad + 1), -np.inf)
+        mejor[0, :] = 0.0
+        incluido = np.zeros((numero_candidatos, k + 1, capacidad + 1), dtype=bool)
+
+        for i in range(numero_candidatos):
+            coste = self._costes[i]
+
+            if coste > capacidad:
+                continue
+
+            # Se parte de la matriz anterior completa, así cada ciclista entra como mucho una vez
+            candidato = mejor[:-1, :capacidad + 1 - coste] + self._puntos[i]
+            mejora = candidato > mejor[1:, coste:]
+            incluido[i, 1:, coste:] = mejora
+            mejor[1:, coste:] = np.where(mejora, candidato, mejor[1:, coste:])
+
+        if not np.isfinite(mejor[k, capacidad]):
+            raise ExcepcionOptimizador(f"No hay ningún equipo de {k} ciclistas dentro del presupuesto {self.presupuesto}")
+
+        elegidos = []
+        j, b = k, capacidad
+
+        for i in range(numero_candidatos - 1, -1, -1):
+
+            if j == 0:
+                break
+
+            if incluido[i, j, b]:
+                elegidos.append(i)
+                j -= 1
+                b -= self._costes[i]
+
+        elegidos.reverse()
+
+        return {'ciclistas': elegidos,
+                'puntos': float(self._puntos[elegidos].sum()),
+                'coste': float(self._precios[elegidos].sum())}
+
+
+    def evaluar_alineaciones(self, alineaciones: 'numpy.ndarray') -> dict:
+
+        """
+        Evalúa a la vez muchas alineaciones candidatas (análisis what-if).
+
+        Parámetros:
+            alineaciones (numpy.ndarray): Matriz (número de alineaciones x número de ciclistas) con
+                                          los índices de los ciclistas de cada alineación.
+
+        Salida:
+            dict: Vectores con una posición por alineación:
+                - 'puntos' (numpy.ndarray): Puntos proyectados.
+                - 'coste' (numpy.ndarray): Coste total.
+                - 'validas' (numpy.ndarray): True si cumple presupuesto y número de ciclistas sin repetir ninguno.
+
+        Lanza:
+            ExcepcionOptimizador: Si la matriz no tiene la forma esperada o contiene índices fuera de rango.
+        """
+
+        import numpy as np
+
+        alineaciones = np.asarray(alineaciones, dtype=np.int64)
+
+        if alineaciones.ndim != 2:
+            raise ExcepcionOptimizador("Las alineaciones deben ser una matriz de índices de ciclistas")
+
+        if alineaciones.size and (alineaciones.min() < 0 or alineaciones.max() >= len(self._precios)):
+            raise ExcepcionOptimizador("Hay alineaciones con índices de ciclista fuera de rango")
+
+        puntos = self._puntos[alineaciones].sum(axis=1)
+        coste = self._precios[alineaciones].sum(axis=1)
+        ordenadas = np.sort(alineaciones, axis=1)
+        sin_repetidos = np.all(ordenadas[:, 1:] != ordenadas[:, :-1], axis=1)
+        validas = (sin_repetidos & (self._costes[alineaciones].sum(axis=1) <= self._capacidad)
+                   & (alineaciones.shape[1] == self.numero_ciclistas))
+
+        return {'puntos': puntos, 'coste': coste, 'validas': validas}
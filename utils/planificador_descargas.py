@@ -0,0 +1,168 @@
+# utils/planificador_descargas.py
+
+import calendar
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from utils import string_utils
+from utils.excepciones import ExcepcionFecha
+from utils.indice_calendario import obtener_intervalo_competicion, CTE_SEGUNDOS_DIA
+from utils.plazo_ejecucion import PlazoEjecucion
+
+# Prioridad de un grupo que no estaba en el calendario anterior (como una carrera que empieza mañana)
+CTE_PRIORIDAD_GRUPO_NUEVO = 1.0
+
+# Prioridad de un grupo conocido sin ninguna competición con fechas
+CTE_PRIORIDAD_SIN_FECHAS = 365.0
+
+
+class PlanificadorDescargas:
+
+    """
+    Decide en qué orden se descargan los grupos de una actualización y cuándo se agota su tiempo.
+
+    La prioridad de un grupo (menor es antes) son los días que separan hoy de la competición más
+    cercana del grupo según el calendario anterior: 0 si alguna está en curso, los días hasta el
+    inicio para las futuras y los días desde el fin multiplicados por 'factor_pasado' para las
+    terminadas, que rara vez cambian. Los grupos nuevos van justo detrás de los que están en curso.
+
+    El tiempo disponible es el plazo de la ejecución (el mismo que acota cada petición HTTP): una vez
+    agotado, los grupos que quedan por descargar y que ya estaban en el calendario anterior se
+    descartan y conservan sus datos anteriores; como son los de menor prioridad, son las
+    competiciones terminadas hace tiempo o muy lejanas.
+
+    Atributos:
+        plazo (PlazoEjecucion): Plazo de la ejecución (None sin límite).
+        factor_pasado (float): Peso de cada día transcurrido desde el fin de una competición.
+    """
+
+    def __init__(self, grupos_anteriores: Iterable[dict], formato_fecha: str, plazo: Optional[PlazoEjecucion] = None,
+                 factor_pasado: float = 3.0, ahora: Optional[datetime] = None) -> None:
+
+        """
+        Calcula la prioridad de los grupos del calendario anterior.
+
+        Parámetros:
+            grupos_anteriores (Iterable[dict]): Calendario desglosado anterior (ej. el del snapshot publicado).
+            formato_fecha (str): Formato de las fechas de las competiciones.
+            plazo (PlazoEjecucion, optional): Plazo de la ejecución. Default es sin límite.
+            factor_pasado (float, optional): Peso de los días desde el fin de una competición. Default es 3.0.
+            ahora (datetime, optional): Instante de referencia. Default es el actual.
+
+        Salida:
+            None
+        """
+
+        self.plazo = plazo
+        self.factor_pasado = factor_pasado
+        self._grupos_anteriores: Dict[str, dict] = {}
+        self._prioridades: Dict[str, float] = {}
+
+        inicio_dia = _segundos_inicio_dia(ahora or datetime.now())
+
+        for grupo in grupos_anteriores:
+            url = string_utils.completar_url(grupo['url'])
+            self._grupos_anteriores[url] = grupo
+            self._prioridades[url] = min((self._prioridad_competicion(competicion, formato_fecha, inicio_dia)
+                                          for competicion in grupo.get('desglose_grupo_competiciones') or []),
+                                         default=CTE_PRIORIDAD_SIN_FECHAS)
+
+
+    def prioridad(self, url: str) -> float:
+
+        """
+        Devuelve la prioridad de descarga de un grupo (menor es antes).
+
+        Parámetros:
+            url (str): URL del grupo.
+
+        Salida:
+            float: Prioridad del grupo.
+        """
+
+        return self._prioridades.get(url, CTE_PRIORIDAD_GRUPO_NUEVO)
+
+
+    def grupo_anterior(self, url: str) -> Optional[dict]:
+
+        """
+        Devuelve el desglose de un grupo en el calendario anterior, para conservarlo si no se descarga.
+
+        Parámetros:
+            url (str): URL completa del grupo.
+
+        Salida:
+            dict: Grupo desglosado anterior (None si el grupo es nuevo).
+        """
+
+        return self._grupos_anteriores.get(url)
+
+
+    def presupuesto_agotado(self) -> bool:
+
+        """
+        Indica si se ha agotado el plazo de la ejecución y hay que dejar de descargar grupos conocidos.
+
+        Parámetros:
+            None
+
+        Salida:
+            bool: True si el plazo tiene límite y ya ha vencido.
+        """
+
+        return self.plazo is not None and self.plazo.agotado()
+
+
+    def _prioridad_competicion(self, competicion: dict, formato_fecha: str, inicio_dia: int) -> float:
+
+        """
+        Calcula la prioridad de una competición en días respecto al día de hoy (el día completo que
+        empieza en 'inicio_dia'), con estas reglas en orden:
+            - Sin fechas o con fechas inválidas: CTE_PRIORIDAD_SIN_FECHAS (después de casi todo).
+            - Terminada antes de hoy: días transcurridos desde su fin multiplicados por 'factor_pasado'. Son
+              fraccionarios, así que una competición que terminó anoche va casi tan pronto como una en curso.
+            - Empieza después de hoy: días desde el inicio de hoy hasta su inicio (1.0 si empieza mañana a las
+              00:00, lo mismo que CTE_PRIORIDAD_GRUPO_NUEVO).
+            - En otro caso (está en curso o empieza o termina hoy): 0.0, la máxima prioridad.
+        La prioridad del grupo es la mínima de las de sus competiciones.
+
+        Parámetros:
+            competicion (dict): Vuelta o clásica del desglose anterior.
+            formato_fecha (str): Formato de las fechas de la competición.
+            inicio_dia (int): Inicio del día de hoy en segundos desde epoch.
+
+        Salida:
+            float: Prioridad de la competición (menor es antes).
+        """
+
+        try:
+            inicio, fin = obtener_intervalo_competicion(competicion, formato_fecha)
+
+        except ExcepcionFecha:
+            return CTE_PRIORIDAD_SIN_FECHAS
+
+        if inicio is None:
+            return CTE_PRIORIDAD_SIN_FECHAS
+
+        if fin < inicio_dia:
+            return self.factor_pasado * (inicio_dia - fin) / CTE_SEGUNDOS_DIA
+
+        if inicio >= inicio_dia + CTE_SEGUNDOS_DIA:
+            return (inicio - inicio_dia) / CTE_SEGUNDOS_DIA
+
+        return 0.0
+
+
+def _segundos_inicio_dia(fecha: datetime) -> int:
+
+    """
+    Devuelve el inicio (00:00) del día de una fecha en segundos desde epoch, en la misma escala UTC
+    que obtener_intervalo_competicion.
+
+    Parámetros:
+        fecha (datetime): Cualquier instante del día.
+
+    Salida:
+        int: Segundos desde epoch de las 00:00 de ese día.
+    """
+
+    return calendar.timegm(datetime(fecha.year, fecha.month, fecha.day).timetuple())
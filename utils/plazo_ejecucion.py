@@ -0,0 +1,128 @@
+# utils/plazo_ejecucion.py
+
+import threading
+import time
+from typing import List, Optional
+from utils.excepciones import ExcepcionPlazoAgotado
+
+
+class PlazoEjecucion:
+
+    """
+    Plazo total de una ejecución, que se propaga hasta cada petición HTTP.
+
+    Cada petición usa como timeout el menor entre el suyo y el tiempo que le queda al plazo, y
+    una vez agotado no se lanzan más peticiones (ExcepcionPlazoAgotado). Las partes del trabajo
+    que se dejan sin hacer se registran en 'omisiones' para informar de ellas al terminar.
+
+    Atributos:
+        presupuesto_segundos (float): Duración del plazo (0 sin límite).
+        omisiones (list[str]): Descripción de lo que se ha dejado sin hacer por agotarse el plazo.
+    """
+
+    def __init__(self, presupuesto_segundos: Optional[float] = 0) -> None:
+
+        """
+        Inicializa el plazo, que empieza a contar en ese momento.
+
+        Parámetros:
+            presupuesto_segundos (float, optional): Duración del plazo en segundos (0 o None sin límite). Default es 0.
+
+        Salida:
+            None
+        """
+
+        self.presupuesto_segundos = presupuesto_segundos or 0
+        self.omisiones: List[str] = []
+        self._limite = time.monotonic() + self.presupuesto_segundos if self.presupuesto_segundos > 0 else None
+        self._bloqueo = threading.Lock()
+
+
+    def restante(self) -> Optional[float]:
+
+        """
+        Devuelve los segundos que quedan de plazo.
+
+        Parámetros:
+            None
+
+        Salida:
+            float: Segundos restantes (0 si se ha agotado), o None si el plazo no tiene límite.
+        """
+
+        if self._limite is None:
+            return None
+
+        return max(0.0, self._limite - time.monotonic())
+
+
+    def agotado(self) -> bool:
+
+        """
+        Indica si el plazo se ha agotado.
+
+        Parámetros:
+            None
+
+        Salida:
+            bool: True si el plazo tiene límite y ya ha vencido.
+        """
+
+        return self._limite is not None and time.monotonic() >= self._limite
+
+
+    def comprobar(self, descripcion: str) -> None:
+
+        """
+        Lanza ExcepcionPlazoAgotado si el plazo se ha agotado.
+
+        Parámetros:
+            descripcion (str): Trabajo que se iba a hacer (para el mensaje de error).
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionPlazoAgotado: Si el plazo se ha agotado.
+        """
+
+        if self.agotado():
+            raise ExcepcionPlazoAgotado(f"Plazo de ejecución de {self.presupuesto_segundos:g} s agotado: {descripcion}")
+
+
+    def acotar_timeout(self, timeout: float, descripcion: str) -> float:
+
+        """
+        Devuelve el timeout de una operación acotado por el tiempo que queda de plazo.
+
+        Parámetros:
+            timeout (float): Timeout propio de la operación.
+            descripcion (str): Operación (para el mensaje de error).
+
+        Salida:
+            float: min(timeout, segundos restantes).
+
+        Lanza:
+            ExcepcionPlazoAgotado: Si el plazo ya se ha agotado.
+        """
+
+        self.comprobar(descripcion)
+        restante = self.restante()
+
+        return timeout if restante is None else min(timeout, restante)
+
+
+    def registrar_omision(self, descripcion: str) -> None:
+
+        """
+        Registra una parte del trabajo que se deja sin hacer por agotarse el plazo (seguro entre hilos).
+
+        Parámetros:
+            descripcion (str): Trabajo omitido.
+
+        Salida:
+            None
+        """
+
+        with self._bloqueo:
+            self.omisiones.append(descripcion)
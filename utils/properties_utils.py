@@ -1,10 +1,14 @@
 # utils/properties_utils.py
 
-import configparser
 import os
+from typing import TYPE_CHECKING
 from utils.excepciones import ExcepcionProperties
 
-def leer_properties(ruta_properties: str) -> configparser.ConfigParser:
+# configparser se importa en el primer uso para no penalizar el arranque
+if TYPE_CHECKING:
+    import configparser
+
+def leer_properties(ruta_properties: str) -> 'configparser.ConfigParser':
 
     """
     Lee un archivo .properties y devuelve un objeto ConfigParser con las propiedades cargadas.
@@ -22,6 +26,8 @@ def leer_properties(ruta_properties: str) -> configparser.ConfigParser:
     if not os.path.exists(ruta_properties):
         raise ExcepcionProperties(f"El archivo de propiedades '{ruta_properties}' no existe o no se puede acceder")
 
+    import configparser
+
     try:
         config = configparser.ConfigParser()
         config.read(ruta_properties)
@@ -31,7 +37,7 @@ def leer_properties(ruta_properties: str) -> configparser.ConfigParser:
         raise ExcepcionProperties(f"Error al leer el archivo de propiedades: {ruta_properties}") from e
 
 
-def obtener_property(propiedades: configparser.ConfigParser, 
+def obtener_property(propiedades: 'configparser.ConfigParser', 
                      seccion: str, 
                      clave: str, 
                      default: str = None) -> str:
@@ -52,6 +58,8 @@ def obtener_property(propiedades: configparser.ConfigParser,
                                 un valor por defecto.
     """
 
+    import configparser
+
     try:
         return propiedades.get(seccion, clave, fallback=default)
 
@@ -0,0 +1,332 @@
+# utils/registro_cambios.py
+
+import json
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+from utils import fichero_utils
+from utils.excepciones import ExcepcionCambios
+
+CTE_CAMBIO_ALTA = "alta"
+CTE_CAMBIO_BAJA = "baja"
+CTE_CAMBIO_FECHAS = "cambio_fechas"
+CTE_CAMBIO_ETAPAS = "cambio_etapas"
+CTE_CAMBIO_MODIFICACION = "modificacion"
+
+# Campos de una competición que determinan el tipo de cambio (el resto cuenta como modificación)
+CTE_CAMPOS_FECHAS = ("fecha_inicio", "fecha_fin", "fecha_clasica")
+CTE_CAMPOS_ETAPAS = ("numero_etapas",)
+
+CTE_CAMPOS_GRUPO = ("nombre", "genero", "url", "tipo_grupo")
+
+CTE_NOMBRE_REGISTRO = "cambios.jsonl"
+CTE_NOMBRE_INDICE = "cambios.idx"
+CTE_NOMBRE_ESTADO = "estado.json"
+
+# Cada entrada del índice es el offset (uint64) en el registro del cambio con esa secuencia
+CTE_ENTRADA_INDICE = struct.Struct("<Q")
+
+
+class RegistroCambios:
+
+    """
+    Registro de solo añadido de los cambios del calendario entre actualizaciones, con números de
+    secuencia consecutivos (el primer cambio es el 1), para que los consumidores (notificaciones,
+    cachés...) se sincronicen leyendo solo los cambios posteriores a su cursor.
+
+    Se guarda en tres ficheros del directorio:
+        - cambios.jsonl: un cambio por línea, en orden de secuencia.
+        - cambios.idx: el offset de cada cambio en cambios.jsonl (8 bytes por cambio), de modo que
+          leer desde un cursor es un seek, y el número de cambios registrados es su tamaño / 8.
+        - estado.json: el calendario tras el último cambio aplicado, para detectar los siguientes.
+
+    Cada cambio se escribe primero en el registro y después en el índice, y solo cuenta lo que está
+    en el índice: un lector concurrente nunca ve un cambio a medias. Si una actualización se
+    interrumpe, al abrir el registro se descarta la cola no indexada y el estado se pone al día
+    aplicando los cambios indexados posteriores a él.
+
+    Atributos:
+        directorio (str): Directorio del registro.
+    """
+
+    def __init__(self, directorio: str) -> None:
+        self.directorio = directorio
+        self._ruta_registro = os.path.join(directorio, CTE_NOMBRE_REGISTRO)
+        self._ruta_indice = os.path.join(directorio, CTE_NOMBRE_INDICE)
+        self._ruta_estado = os.path.join(directorio, CTE_NOMBRE_ESTADO)
+        self._bloqueo = threading.Lock()
+
+
+    def ultima_secuencia(self) -> int:
+
+        """
+        Devuelve la secuencia del último cambio registrado (0 si no hay ninguno).
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Última secuencia.
+        """
+
+        try:
+            return os.path.getsize(self._ruta_indice) // CTE_ENTRADA_INDICE.size
+
+        except OSError:
+            return 0
+
+
+    def registrar(self, grupos_desglosados: Iterable[dict]) -> List[dict]:
+
+        """
+        Detecta los cambios del calendario respecto al estado registrado y los añade al registro.
+
+        La primera vez todas las competiciones se registran como altas, de modo que un consumidor
+        que empieza en el cursor 0 recibe el calendario completo.
+
+        Parámetros:
+            grupos_desglosados (Iterable[dict]): Calendario desglosado de la actualización.
+
+        Salida:
+            list[dict]: Cambios registrados, con su secuencia.
+
+        Lanza:
+            ExcepcionCambios: Si ocurre algún error al leer o escribir el registro.
+        """
+
+        with self._bloqueo:
+            try:
+                os.makedirs(self.directorio, exist_ok=True)
+                estado = self._recuperar_estado()
+                cambios = detectar_cambios(estado['competiciones'], grupos_desglosados)
+
+                if cambios:
+                    self._anyadir(cambios, estado['secuencia'])
+
+                    for cambio in cambios:
+                        _aplicar_cambio(estado['competiciones'], cambio)
+
+                    estado['secuencia'] = cambios[-1]['secuencia']
+                    fichero_utils.escribir_json_atomico(self._ruta_estado, estado)
+
+                return cambios
+
+            except ExcepcionCambios:
+                raise
+
+            except Exception as e:
+                raise ExcepcionCambios(f"Error al registrar los cambios del calendario en '{self.directorio}'") from e
+
+
+    def leer_desde(self, cursor: int, limite: int) -> Tuple[List[dict], int]:
+
+        """
+        Devuelve los cambios posteriores a un cursor.
+
+        Parámetros:
+            cursor (int): Secuencia del último cambio que ya tiene el consumidor (0 para empezar desde el principio).
+            limite (int): Número máximo de cambios devueltos.
+
+        Salida:
+            tuple: (cambios en orden de secuencia, última secuencia registrada).
+
+        Lanza:
+            ExcepcionCambios: Si el cursor es negativo o posterior al último cambio registrado
+                              (el registro se ha reiniciado y el consumidor debe empezar de nuevo).
+        """
+
+        ultima = self.ultima_secuencia()
+
+        if cursor < 0 or cursor > ultima:
+            raise ExcepcionCambios(f"Cursor {cursor} fuera del registro de cambios (última secuencia {ultima})")
+
+        numero = min(max(0, limite), ultima - cursor)
+
+        if numero == 0:
+            return [], ultima
+
+        try:
+            with open(self._ruta_indice, "rb") as indice:
+                indice.seek(cursor * CTE_ENTRADA_INDICE.size)
+                offset, = CTE_ENTRADA_INDICE.unpack(indice.read(CTE_ENTRADA_INDICE.size))
+
+            with open(self._ruta_registro, "rb") as registro:
+                registro.seek(offset)
+                cambios = [json.loads(registro.readline()) for _ in range(numero)]
+
+            return cambios, ultima
+
+        except (OSError, ValueError, struct.error) as e:
+            raise ExcepcionCambios(f"Error al leer el registro de cambios desde el cursor {cursor}") from e
+
+
+    def _recuperar_estado(self) -> dict:
+
+        """
+        Lee el estado, descartando la cola del registro que no llegó al índice y aplicando al estado
+        los cambios indexados que no llegó a incorporar una actualización interrumpida.
+
+        Parámetros:
+            None
+
+        Salida:
+            dict: {'secuencia': int, 'competiciones': clave -> {'grupo', 'competicion'}}.
+        """
+
+        ultima = self.ultima_secuencia()
+        fin_indexado = 0
+
+        if ultima:
+            with open(self._ruta_indice, "rb") as indice:
+                indice.seek((ultima - 1) * CTE_ENTRADA_INDICE.size)
+                offset, = CTE_ENTRADA_INDICE.unpack(indice.read(CTE_ENTRADA_INDICE.size))
+
+            with open(self._ruta_registro, "rb") as registro:
+                registro.seek(offset)
+                fin_indexado = offset + len(registro.readline())
+
+        for ruta, tamanyo in ((self._ruta_registro, fin_indexado), (self._ruta_indice, ultima * CTE_ENTRADA_INDICE.size)):
+            if os.path.exists(ruta) and os.path.getsize(ruta) > tamanyo:
+                os.truncate(ruta, tamanyo)
+
+        estado = fichero_utils.leer_json(self._ruta_estado) or {'secuencia': 0, 'competiciones': {}}
+
+        if estado['secuencia'] > ultima:
+            raise ExcepcionCambios(f"El estado del registro de cambios (secuencia {estado['secuencia']}) es posterior "
+                                   f"al registro (secuencia {ultima})")
+
+        while estado['secuencia'] < ultima:
+            cambios, _ = self.leer_desde(estado['secuencia'], ultima - estado['secuencia'])
+
+            for cambio in cambios:
+                _aplicar_cambio(estado['competiciones'], cambio)
+
+            estado['secuencia'] = cambios[-1]['secuencia']
+
+        return estado
+
+
+    def _anyadir(self, cambios: List[dict], secuencia: int) -> None:
+
+        """
+        Numera los cambios a continuación de 'secuencia' y los añade al registro y después al índice.
+
+        Parámetros:
+            cambios (list[dict]): Cambios detectados (se les añade 'secuencia' e 'instante').
+            secuencia (int): Última secuencia registrada.
+
+        Salida:
+            None
+        """
+
+        instante = time.time()
+        offsets = []
+
+        with open(self._ruta_registro, "ab") as registro:
+            offset = registro.tell()
+
+            for cambio in cambios:
+                secuencia += 1
+                cambio['secuencia'] = secuencia
+                cambio['instante'] = instante
+                linea = json.dumps(cambio, ensure_ascii=False, sort_keys=True).encode("utf-8") + b"\n"
+                registro.write(linea)
+                offsets.append(offset)
+                offset += len(linea)
+
+            registro.flush()
+            os.fsync(registro.fileno())
+
+        with open(self._ruta_indice, "ab") as indice:
+            indice.write(b"".join(CTE_ENTRADA_INDICE.pack(offset) for offset in offsets))
+            indice.flush()
+            os.fsync(indice.fileno())
+
+
+def detectar_cambios(competiciones_anteriores: Dict[str, dict], grupos_desglosados: Iterable[dict]) -> List[dict]:
+
+    """
+    Compara el calendario con el estado anterior y devuelve los cambios por competición.
+
+    Una competición se identifica por su URL (vueltas) o por la URL de su grupo y su número (clásicas).
+    Una competición que cambia en varios aspectos genera un cambio de cada tipo, todos con la
+    competición completa actual y, en 'anterior', los valores previos de los campos de ese tipo.
+
+    Parámetros:
+        competiciones_anteriores (dict): Clave -> {'grupo', 'competicion'} del estado anterior.
+        grupos_desglosados (Iterable[dict]): Calendario desglosado actual.
+
+    Salida:
+        list[dict]: Cambios sin numerar ('tipo', 'clave', 'grupo', 'competicion' y, si procede, 'anterior').
+    """
+
+    cambios = []
+    vistas = set()
+
+    for grupo in grupos_desglosados:
+        datos_grupo = {campo: grupo.get(campo) for campo in CTE_CAMPOS_GRUPO}
+
+        for competicion in grupo.get('desglose_grupo_competiciones') or []:
+            clave = obtener_clave_competicion(grupo, competicion)
+
+            if clave in vistas:
+                continue
+
+            vistas.add(clave)
+            anterior = competiciones_anteriores.get(clave)
+
+            if anterior is None:
+                cambios.append({'tipo': CTE_CAMBIO_ALTA, 'clave': clave, 'grupo': datos_grupo, 'competicion': competicion})
+                continue
+
+            campos_cambiados = [campo for campo in set(competicion) | set(anterior['competicion'])
+                                if competicion.get(campo) != anterior['competicion'].get(campo)]
+
+            if anterior['grupo'] != datos_grupo:
+                campos_cambiados.append('grupo')
+
+            for tipo, campos_tipo in ((CTE_CAMBIO_FECHAS, CTE_CAMPOS_FECHAS), (CTE_CAMBIO_ETAPAS, CTE_CAMPOS_ETAPAS),
+                                      (CTE_CAMBIO_MODIFICACION, None)):
+                campos = sorted(campo for campo in campos_cambiados
+                                if (campo in campos_tipo if campos_tipo else
+                                    campo not in CTE_CAMPOS_FECHAS + CTE_CAMPOS_ETAPAS))
+
+                if campos:
+                    cambios.append({'tipo': tipo, 'clave': clave, 'grupo': datos_grupo, 'competicion': competicion,
+                                    'anterior': {campo: anterior['grupo'] if campo == 'grupo' else anterior['competicion'].get(campo)
+                                                 for campo in campos}})
+
+    for clave in sorted(set(competiciones_anteriores) - vistas):
+        anterior = competiciones_anteriores[clave]
+        cambios.append({'tipo': CTE_CAMBIO_BAJA, 'clave': clave, 'grupo': anterior['grupo'],
+                        'competicion': anterior['competicion']})
+
+    return cambios
+
+
+def obtener_clave_competicion(grupo: dict, competicion: dict) -> str:
+
+    """
+    Devuelve el identificador estable de una competición entre actualizaciones.
+
+    Parámetros:
+        grupo (dict): Grupo de la competición.
+        competicion (dict): Vuelta o clásica.
+
+    Salida:
+        str: URL de la vuelta, o '<URL del grupo>#<número>' para las clásicas.
+    """
+
+    if 'fecha_clasica' in competicion:
+        return f"{grupo.get('url')}#{competicion.get('numero_clasica')}"
+
+    return competicion.get('url') or f"{grupo.get('url')}#{competicion.get('descripcion')}"
+
+
+def _aplicar_cambio(competiciones: Dict[str, dict], cambio: dict) -> None:
+    if cambio['tipo'] == CTE_CAMBIO_BAJA:
+        competiciones.pop(cambio['clave'], None)
+    else:
+        competiciones[cambio['clave']] = {'grupo': cambio['grupo'], 'competicion': cambio['competicion']}
@@ -0,0 +1,384 @@
+# utils/resultados_competicion.py
+
+import os
+from typing import Dict, List, Optional, Sequence, TYPE_CHECKING
+from utils import fichero_utils
+from utils.excepciones import ExcepcionResultados
+
+# numpy se importa en el primer uso para no penalizar el arranque de los procesos que no lo usan
+if TYPE_CHECKING:
+    import numpy
+
+# Posición que indica que el ciclista no tiene puesto en la etapa (no tomó la salida, abandono...)
+CTE_SIN_POSICION = 0
+
+# Filas que se reservan de una vez al aparecer ciclistas nuevos
+CTE_FILAS_MINIMAS = 64
+
+
+class ResultadosCompeticion:
+
+    """
+    Resultados por etapa de una vuelta, en matrices NumPy con los ciclistas como filas y las
+    etapas como columnas.
+
+    Cada etapa se ingiere una sola vez: se guarda su columna de posiciones, se convierte a puntos
+    indexando la tabla de puntos por posición (una operación vectorizada) y se suma al vector de
+    totales. Así la clasificación acumulada se actualiza con un coste proporcional a la etapa nueva,
+    no al histórico de la carrera.
+
+    Atributos:
+        url (str): URL de la competición.
+        numero_etapas (int): Número de etapas de la competición.
+        ciclistas (list[str]): Nombre del ciclista de cada fila.
+    """
+
+    def __init__(self, url: str, numero_etapas: int, puntos_posicion: Sequence[float]) -> None:
+
+        """
+        Inicializa los resultados vacíos de una competición.
+
+        Parámetros:
+            url (str): URL de la competición.
+            numero_etapas (int): Número de etapas.
+            puntos_posicion (Sequence[float]): Puntos de la posición 1, 2, 3...; el resto puntúa 0.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionResultados: Si el número de etapas no es válido.
+        """
+
+        import numpy as np
+
+        if numero_etapas < 1:
+            raise ExcepcionResultados(f"La competición '{url}' debe tener al menos una etapa")
+
+        self.url = url
+        self.numero_etapas = numero_etapas
+        self.ciclistas: List[str] = []
+        self._filas: Dict[str, int] = {}
+
+        # Índice 0 = sin posición; la posición p puntúa _puntos_posicion[p]
+        self._puntos_posicion = np.concatenate(([0.0], np.asarray(puntos_posicion, dtype=np.float64)))
+        self._posiciones = np.zeros((CTE_FILAS_MINIMAS, numero_etapas), dtype=np.int32)
+        self._puntos = np.zeros((CTE_FILAS_MINIMAS, numero_etapas), dtype=np.float64)
+        self._totales = np.zeros(CTE_FILAS_MINIMAS, dtype=np.float64)
+        self._etapas_ingeridas = np.zeros(numero_etapas, dtype=bool)
+
+
+    def etapa_ingerida(self, numero_etapa: int) -> bool:
+
+        """
+        Indica si los resultados de una etapa ya se han ingerido.
+
+        Parámetros:
+            numero_etapa (int): Número de la etapa (desde 1).
+
+        Salida:
+            bool: True si la etapa ya está ingerida.
+        """
+
+        return bool(self._etapas_ingeridas[numero_etapa - 1])
+
+
+    def etapas_pendientes(self, hasta_etapa: Optional[int] = None) -> List[int]:
+
+        """
+        Devuelve las etapas que todavía no se han ingerido.
+
+        Parámetros:
+            hasta_etapa (int, optional): Última etapa a considerar. Default es la última de la competición.
+
+        Salida:
+            list[int]: Números de etapa pendientes, en orden.
+        """
+
+        import numpy as np
+
+        limite = self.numero_etapas if hasta_etapa is None else min(hasta_etapa, self.numero_etapas)
+
+        return [int(indice) + 1 for indice in np.flatnonzero(~self._etapas_ingeridas[:limite])]
+
+
+    def obtener_etapas_ingeridas(self) -> List[int]:
+
+        """
+        Devuelve las etapas ya ingeridas.
+
+        Parámetros:
+            None
+
+        Salida:
+            list[int]: Números de etapa ingeridos, en orden.
+        """
+
+        import numpy as np
+
+        return [int(indice) + 1 for indice in np.flatnonzero(self._etapas_ingeridas)]
+
+
+    def agregar_etapa(self, numero_etapa: int, ciclistas: Sequence[str], posiciones: Sequence[int]) -> None:
+
+        """
+        Ingiere los resultados de una etapa y actualiza los totales.
+
+        Parámetros:
+            numero_etapa (int): Número de la etapa (desde 1).
+            ciclistas (Sequence[str]): Nombres de los ciclistas clasificados.
+            posiciones (Sequence[int]): Posición de cada ciclista (CTE_SIN_POSICION si no tiene).
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionResultados: Si la etapa no existe, ya estaba ingerida o los datos no cuadran.
+        """
+
+        import numpy as np
+
+        if not 1 <= numero_etapa <= self.numero_etapas:
+            raise ExcepcionResultados(f"La etapa {numero_etapa} no existe en '{self.url}'")
+
+        if self._etapas_ingeridas[numero_etapa - 1]:
+            raise ExcepcionResultados(f"La etapa {numero_etapa} de '{self.url}' ya estaba ingerida")
+
+        if len(ciclistas) != len(posiciones):
+            raise ExcepcionResultados(f"La etapa {numero_etapa} de '{self.url}' tiene distinto número de ciclistas y posiciones")
+
+        filas = np.fromiter((self._obtener_fila(ciclista) for ciclista in ciclistas), dtype=np.int64, count=len(ciclistas))
+        posiciones = np.asarray(posiciones, dtype=np.int32)
+        puntos = self._convertir_a_puntos(posiciones)
+
+        columna = numero_etapa - 1
+        self._posiciones[filas, columna] = posiciones
+        self._puntos[filas, columna] = puntos
+        np.add.at(self._totales, filas, puntos)
+        self._etapas_ingeridas[columna] = True
+
+
+    def obtener_totales(self) -> 'numpy.ndarray':
+
+        """
+        Devuelve los puntos acumulados de cada ciclista (fila).
+
+        Parámetros:
+            None
+
+        Salida:
+            numpy.ndarray: Vector de totales, alineado con 'ciclistas' (vista, no copia).
+        """
+
+        return self._totales[:len(self.ciclistas)]
+
+
+    def obtener_puntos_etapas(self) -> 'numpy.ndarray':
+
+        """
+        Devuelve la matriz de puntos por ciclista y etapa.
+
+        Parámetros:
+            None
+
+        Salida:
+            numpy.ndarray: Matriz (ciclistas x etapas) (vista, no copia).
+        """
+
+        return self._puntos[:len(self.ciclistas)]
+
+
+    def obtener_posiciones_etapas(self) -> 'numpy.ndarray':
+
+        """
+        Devuelve la matriz de posiciones por ciclista y etapa.
+
+        Parámetros:
+            None
+
+        Salida:
+            numpy.ndarray: Matriz (ciclistas x etapas) con CTE_SIN_POSICION donde no hay posición (vista, no copia).
+        """
+
+        return self._posiciones[:len(self.ciclistas)]
+
+
+    def clasificacion(self, numero: Optional[int] = None) -> List[dict]:
+
+        """
+        Devuelve la clasificación acumulada por puntos.
+
+        Parámetros:
+            numero (int, optional): Número de ciclistas a devolver. Default son todos.
+
+        Salida:
+            list[dict]: Ciclistas ordenados con 'posicion', 'ciclista' y 'puntos'.
+        """
+
+        import numpy as np
+
+        totales = self.obtener_totales()
+
+        if numero is not None and numero < len(totales):
+            candidatos = np.argpartition(-totales, numero)[:numero]
+            orden = candidatos[np.argsort(-totales[candidatos], kind='stable')]
+
+        else:
+            orden = np.argsort(-totales, kind='stable')
+
+        return [{'posicion': posicion, 'ciclista': self.ciclistas[fila], 'puntos': float(totales[fila])}
+                for posicion, fila in enumerate(orden.tolist(), start=1)]
+
+
+    def guardar(self, directorio: str) -> str:
+
+        """
+        Guarda los resultados en un fichero .npz del directorio (uno por competición) de forma atómica.
+
+        Parámetros:
+            directorio (str): Directorio de resultados.
+
+        Salida:
+            str: Ruta del fichero escrito.
+
+        Lanza:
+            ExcepcionResultados: Si no se puede escribir el fichero.
+        """
+
+        import io
+        import numpy as np
+
+        ruta = self.obtener_ruta(directorio, self.url)
+        numero_ciclistas = len(self.ciclistas)
+        buffer = io.BytesIO()
+
+        try:
+            np.savez(buffer, url=np.array(self.url), ciclistas=np.array(self.ciclistas, dtype=str),
+                     puntos_posicion=self._puntos_posicion, posiciones=self._posiciones[:numero_ciclistas],
+                     etapas_ingeridas=self._etapas_ingeridas)
+            fichero_utils.escribir_atomico(ruta, buffer.getvalue())
+
+        except OSError as e:
+            raise ExcepcionResultados(f"No se pudieron guardar los resultados de '{self.url}' en {ruta}") from e
+
+        return ruta
+
+
+    @classmethod
+    def cargar(cls, directorio: str, url: str, numero_etapas: Optional[int] = None,
+               puntos_posicion: Optional[Sequence[float]] = None) -> 'ResultadosCompeticion':
+
+        """
+        Carga los resultados guardados de una competición o los crea vacíos si no hay fichero.
+
+        Con tabla de puntos, los puntos se recalculan desde las posiciones por si ha cambiado;
+        sin ella (lectores como la aplicación web) se usan el número de etapas y la tabla guardados.
+
+        Parámetros:
+            directorio (str): Directorio de resultados.
+            url (str): URL de la competición.
+            numero_etapas (int, optional): Número de etapas de la competición. Default es el guardado.
+            puntos_posicion (Sequence[float], optional): Puntos de la posición 1, 2, 3... Default es la guardada.
+
+        Salida:
+            ResultadosCompeticion: Resultados de la competición.
+
+        Lanza:
+            ExcepcionResultados: Si el fichero existe pero no se puede leer o no corresponde a la competición,
+                                 o si no existe y no se han indicado etapas y tabla de puntos.
+        """
+
+        import numpy as np
+
+        ruta = cls.obtener_ruta(directorio, url)
+
+        if not os.path.exists(ruta):
+            if numero_etapas is None or puntos_posicion is None:
+                raise ExcepcionResultados(f"No hay resultados guardados de '{url}'")
+
+            return cls(url, numero_etapas, puntos_posicion)
+
+        try:
+            with np.load(ruta, allow_pickle=False) as datos:
+                posiciones = datos['posiciones']
+                etapas_ingeridas = datos['etapas_ingeridas']
+                ciclistas = datos['ciclistas'].tolist()
+                puntos_guardados = datos['puntos_posicion'][1:]
+
+        except (OSError, ValueError, KeyError) as e:
+            raise ExcepcionResultados(f"No se pudieron leer los resultados de '{url}' en {ruta}") from e
+
+        numero_etapas = len(etapas_ingeridas) if numero_etapas is None else numero_etapas
+        resultados = cls(url, numero_etapas, puntos_guardados if puntos_posicion is None else puntos_posicion)
+
+        if posiciones.shape[1] != numero_etapas:
+            raise ExcepcionResultados(f"Los resultados guardados de '{url}' tienen {posiciones.shape[1]} etapas "
+                                      f"y la competición {numero_etapas}")
+
+        for ciclista in ciclistas:
+            resultados._obtener_fila(ciclista)
+
+        numero_ciclistas = len(ciclistas)
+        resultados._posiciones[:numero_ciclistas] = posiciones
+        resultados._puntos[:numero_ciclistas] = resultados._convertir_a_puntos(posiciones)
+        resultados._totales[:numero_ciclistas] = resultados._puntos[:numero_ciclistas].sum(axis=1)
+        resultados._etapas_ingeridas[:] = etapas_ingeridas
+
+        return resultados
+
+
+    @staticmethod
+    def obtener_ruta(directorio: str, url: str) -> str:
+        return os.path.join(directorio, f"resultados_{fichero_utils.calcular_huella(url)}.npz")
+
+
+    def _convertir_a_puntos(self, posiciones: 'numpy.ndarray') -> 'numpy.ndarray':
+
+        """
+        Aplica la tabla de puntos por posición a un array de posiciones de cualquier forma.
+
+        Parámetros:
+            posiciones (numpy.ndarray): Posiciones (CTE_SIN_POSICION o fuera de la tabla puntúan 0).
+
+        Salida:
+            numpy.ndarray: Puntos con la misma forma que las posiciones.
+        """
+
+        import numpy as np
+
+        puntuables = (posiciones > 0) & (posiciones < len(self._puntos_posicion))
+
+        return self._puntos_posicion[np.where(puntuables, posiciones, CTE_SIN_POSICION)]
+
+
+    def _obtener_fila(self, ciclista: str) -> int:
+
+        """
+        Devuelve la fila de un ciclista, añadiéndolo (y ampliando las matrices) si es nuevo.
+
+        Parámetros:
+            ciclista (str): Nombre del ciclista.
+
+        Salida:
+            int: Fila del ciclista.
+        """
+
+        import numpy as np
+
+        fila = self._filas.get(ciclista)
+
+        if fila is not None:
+            return fila
+
+        fila = len(self.ciclistas)
+
+        if fila == len(self._totales):
+            filas_nuevas = max(CTE_FILAS_MINIMAS, fila)
+            self._posiciones = np.vstack((self._posiciones, np.zeros((filas_nuevas, self.numero_etapas), dtype=np.int32)))
+            self._puntos = np.vstack((self._puntos, np.zeros((filas_nuevas, self.numero_etapas), dtype=np.float64)))
+            self._totales = np.concatenate((self._totales, np.zeros(filas_nuevas, dtype=np.float64)))
+
+        self._filas[ciclista] = fila
+        self.ciclistas.append(ciclista)
+
+        return fila
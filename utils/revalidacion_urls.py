@@ -0,0 +1,249 @@
+# utils/revalidacion_urls.py
+
+import heapq
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Set
+from utils import fichero_utils
+from utils.excepciones import ExcepcionRevalidacion
+
+# Las URLs que no se consultan durante este número de intervalos máximos se eliminan del estado
+CTE_INTERVALOS_MAXIMOS_RETENCION = 10
+
+
+class RevalidacionUrls:
+
+    """
+    Intervalo de revalidación propio para cada URL, aprendido de los cambios observados en ella.
+
+    De cada URL se guarda el último resultado extraído de la página (no el HTML) y su huella.
+    Cada vez que se vuelve a descargar, si el resultado no ha cambiado el intervalo se multiplica
+    por 'factor_crecimiento' (hasta 'intervalo_maximo_segundos'), y si ha cambiado vuelve a
+    'intervalo_minimo_segundos'. Así la portada o una vuelta en curso se descargan en cada
+    ejecución, mientras que una vuelta terminada o una página de la temporada siguiente acaban
+    descargándose una vez cada 'intervalo_maximo_segundos', que es lo máximo que puede tardar en
+    verse un cambio en ellas. Hasta que vence, una URL se omite y se usa su último resultado.
+
+    Todas las decisiones de una ejecución se toman con el instante en que se abrió el estado, y
+    el estado se guarda al final con guardar(). Es seguro usarla desde varios hilos.
+
+    Atributos:
+        ruta (str): Fichero JSON con el estado de las URLs.
+        intervalo_minimo_segundos (float): Intervalo tras un cambio (y el de una URL nueva).
+        intervalo_maximo_segundos (float): Intervalo máximo entre dos descargas de una URL.
+        factor_crecimiento (float): Factor por el que crece el intervalo si no hay cambios.
+        estadisticas (dict): Contadores de la ejecución ('descargadas', 'cambiadas', 'omitidas').
+    """
+
+    def __init__(self, ruta: str, intervalo_minimo_segundos: float, intervalo_maximo_segundos: float,
+                 factor_crecimiento: float = 2.0) -> None:
+
+        """
+        Abre el estado de revalidación (vacío si no existe o está corrupto).
+
+        Parámetros:
+            ruta (str): Fichero JSON con el estado de las URLs.
+            intervalo_minimo_segundos (float): Intervalo tras un cambio.
+            intervalo_maximo_segundos (float): Intervalo máximo entre dos descargas de una URL.
+            factor_crecimiento (float, optional): Factor de crecimiento del intervalo. Default es 2.0.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionRevalidacion: Si los intervalos o el factor no son válidos.
+        """
+
+        if not 0 <= intervalo_minimo_segundos <= intervalo_maximo_segundos or factor_crecimiento < 1:
+            raise ExcepcionRevalidacion(f"Intervalos de revalidación no válidos: mínimo {intervalo_minimo_segundos}s, "
+                                        f"máximo {intervalo_maximo_segundos}s, factor {factor_crecimiento}")
+
+        self.ruta = ruta
+        self.intervalo_minimo_segundos = intervalo_minimo_segundos
+        self.intervalo_maximo_segundos = intervalo_maximo_segundos
+        self.factor_crecimiento = factor_crecimiento
+        self.estadisticas = {'descargadas': 0, 'cambiadas': 0, 'omitidas': 0}
+        self._ahora = time.time()
+        self._urls: Dict[str, dict] = fichero_utils.leer_json(ruta, {}).get('urls', {})
+        self._bloqueo = threading.Lock()
+
+
+    def vencida(self, url: str) -> bool:
+
+        """
+        Indica si una URL debe descargarse en esta ejecución (nunca descargada o con el intervalo vencido).
+
+        Parámetros:
+            url (str): URL de la página.
+
+        Salida:
+            bool: True si hay que descargarla.
+        """
+
+        with self._bloqueo:
+            entrada = self._urls.get(url)
+            return entrada is None or entrada['proxima'] <= self._ahora
+
+
+    def obtener(self, url: str, descargar: Callable[[], Any]) -> Any:
+
+        """
+        Devuelve el resultado de una URL: el guardado si todavía no ha vencido o, si no, el de
+        'descargar', que se registra para ajustar su intervalo.
+
+        Parámetros:
+            url (str): URL de la página.
+            descargar (Callable): Descarga la página y devuelve el resultado extraído (serializable a JSON).
+
+        Salida:
+            Any: Resultado de la URL.
+        """
+
+        if not self.vencida(url):
+            return self.resultado_omitido(url)
+
+        resultado = descargar()
+        self.registrar(url, resultado)
+
+        return resultado
+
+
+    def conocida(self, url: str) -> bool:
+
+        """
+        Indica si hay un resultado registrado de una URL (de esta ejecución o de una anterior).
+
+        Parámetros:
+            url (str): URL de la página.
+
+        Salida:
+            bool: True si la URL tiene resultado registrado.
+        """
+
+        with self._bloqueo:
+            return url in self._urls
+
+
+    def resultado_omitido(self, url: str) -> Any:
+
+        """
+        Devuelve el último resultado de una URL que no se descarga en esta ejecución.
+
+        Parámetros:
+            url (str): URL de la página.
+
+        Salida:
+            Any: Último resultado registrado.
+        """
+
+        with self._bloqueo:
+            self.estadisticas['omitidas'] += 1
+            self._urls[url]['consultada'] = self._ahora
+            return self._urls[url]['resultado']
+
+
+    def seleccionar(self, urls: Iterable[str], maximo: int = 0) -> Set[str]:
+
+        """
+        Elige las URLs que se descargan en esta ejecución: las nunca descargadas y, de las vencidas,
+        las que más retraso llevan respecto a su intervalo, hasta 'maximo'.
+
+        Parámetros:
+            urls (Iterable[str]): URLs candidatas.
+            maximo (int, optional): Máximo de URLs ya conocidas que se revalidan (0 sin límite). Default es 0.
+
+        Salida:
+            set[str]: URLs que hay que descargar; el resto se obtienen con resultado_omitido().
+        """
+
+        seleccionadas = set()
+        cola = []
+
+        with self._bloqueo:
+            for url in urls:
+                entrada = self._urls.get(url)
+
+                if entrada is None:
+                    seleccionadas.add(url)
+
+                elif entrada['proxima'] <= self._ahora:
+                    # Retraso relativo al intervalo: una URL que cambia a menudo pasa delante de una fría con el mismo retraso
+                    retraso = (self._ahora - entrada['proxima']) / max(1.0, entrada['intervalo'])
+                    heapq.heappush(cola, (-retraso, url))
+
+        revalidadas = 0
+
+        while cola and (maximo <= 0 or revalidadas < maximo):
+            seleccionadas.add(heapq.heappop(cola)[1])
+            revalidadas += 1
+
+        return seleccionadas
+
+
+    def registrar(self, url: str, resultado: Any) -> bool:
+
+        """
+        Registra el resultado de una URL recién descargada y ajusta su intervalo.
+
+        Parámetros:
+            url (str): URL de la página.
+            resultado (Any): Resultado extraído (serializable a JSON).
+
+        Salida:
+            bool: True si el resultado ha cambiado respecto al registrado (o la URL es nueva).
+        """
+
+        huella = fichero_utils.calcular_huella(json.dumps(resultado, ensure_ascii=False, sort_keys=True))
+
+        with self._bloqueo:
+            entrada = self._urls.get(url)
+            cambiada = entrada is None or entrada['huella'] != huella
+
+            if cambiada:
+                intervalo = self.intervalo_minimo_segundos
+            else:
+                intervalo = min(self.intervalo_maximo_segundos,
+                                max(self.intervalo_minimo_segundos, entrada['intervalo']) * self.factor_crecimiento)
+
+            self._urls[url] = {
+                'huella': huella,
+                'resultado': resultado,
+                'intervalo': intervalo,
+                'proxima': self._ahora + intervalo,
+                'consultada': self._ahora,
+                'descargas': (entrada or {}).get('descargas', 0) + 1,
+                'cambios': (entrada or {}).get('cambios', 0) + (1 if cambiada else 0)
+            }
+
+            self.estadisticas['descargadas'] += 1
+            self.estadisticas['cambiadas'] += 1 if cambiada else 0
+
+            return cambiada
+
+
+    def guardar(self) -> None:
+
+        """
+        Guarda el estado de forma atómica, eliminando las URLs que hace mucho que no se consultan.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionRevalidacion: Si no se puede escribir el estado.
+        """
+
+        limite = self._ahora - CTE_INTERVALOS_MAXIMOS_RETENCION * self.intervalo_maximo_segundos
+
+        with self._bloqueo:
+            urls = {url: entrada for url, entrada in self._urls.items() if entrada['consultada'] >= limite}
+
+        try:
+            fichero_utils.escribir_json_atomico(self.ruta, {'urls': urls})
+
+        except OSError as e:
+            raise ExcepcionRevalidacion(f"No se pudo guardar el estado de revalidación en '{self.ruta}'") from e
@@ -0,0 +1,639 @@
+# utils/snapshot_calendario.py
+
+import calendar
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from utils import fichero_utils
+from utils.excepciones import ExcepcionSnapshot
+from utils.indice_calendario import IndiceCalendario
+
+# Constantes del formato binario
+CTE_MAGIC_SNAPSHOT = b"FCAL"
+CTE_VERSION_SNAPSHOT = 1
+
+# Cabecera: magic, versión, flags, fecha de generación (epoch), nº grupos, nº competiciones,
+# nº cadenas e índice de la cadena con el formato de fecha
+CTE_ESTRUCTURA_CABECERA = struct.Struct("<4sHHqIIII")
+
+# Grupo: nombre, género, url, tipo de grupo, primera competición, número de competiciones
+CTE_ESTRUCTURA_GRUPO = struct.Struct("<IIIIII")
+
+# Competición: grupo, tipo de registro, descripción, url, tipo (tipo de vuelta o categoría),
+# número de clásica, fecha de inicio, fecha de fin, número de etapas
+CTE_ESTRUCTURA_COMPETICION = struct.Struct("<IIIIIIqqi")
+
+CTE_ESTRUCTURA_OFFSET_CADENA = struct.Struct("<I")
+
+CTE_REGISTRO_VUELTA = 0
+CTE_REGISTRO_CLASICA = 1
+
+CTE_FECHA_NULA = -(2 ** 63)
+CTE_EPOCH = datetime(1970, 1, 1)
+
+
+def publicar_snapshot(ruta_snapshot: str, grupos_desglosados: List[dict], formato_fecha: str,
+                      generado: Optional[int] = None) -> int:
+
+    """
+    Escribe el calendario desglosado en un fichero binario versionado de forma atómica.
+
+    El fichero contiene una cabecera, un array de registros de grupos de ancho fijo, un array
+    de registros de competiciones de ancho fijo y una tabla de cadenas (offsets + bytes UTF-8).
+    Se escribe en un temporal del mismo directorio y se sustituye con os.replace, de modo que
+    los lectores nunca ven un fichero a medio escribir.
+
+    Parámetros:
+        ruta_snapshot (str): Ruta del fichero de snapshot a publicar.
+        grupos_desglosados (list[dict]): Salida de DesglosarGruposCompeticiones.ejecutar().
+        formato_fecha (str): Formato de las fechas de las competiciones (ej. "%d-%m-%Y %H:%M:%S").
+        generado (int, optional): Instante de generación en segundos desde epoch. Default es el instante actual.
+
+    Salida:
+        int: Número de bytes escritos.
+
+    Lanza:
+        ExcepcionSnapshot: Si ocurre algún error al generar o escribir el snapshot.
+    """
+
+    try:
+        tabla_cadenas = _TablaCadenas()
+        registros_grupos = []
+        registros_competiciones = []
+
+        for grupo in grupos_desglosados:
+            primera_competicion = len(registros_competiciones)
+
+            for competicion in grupo.get('desglose_grupo_competiciones') or []:
+                registros_competiciones.append(_empaquetar_competicion(len(registros_grupos), competicion,
+                                                                       tabla_cadenas, formato_fecha))
+
+            registros_grupos.append(CTE_ESTRUCTURA_GRUPO.pack(
+                tabla_cadenas.indice(grupo['nombre']),
+                tabla_cadenas.indice(grupo['genero']),
+                tabla_cadenas.indice(grupo['url']),
+                tabla_cadenas.indice(grupo['tipo_grupo']),
+                primera_competicion,
+                len(registros_competiciones) - primera_competicion
+            ))
+
+        indice_formato = tabla_cadenas.indice(formato_fecha)
+        offsets, datos_cadenas = tabla_cadenas.serializar()
+
+        cabecera = CTE_ESTRUCTURA_CABECERA.pack(CTE_MAGIC_SNAPSHOT, CTE_VERSION_SNAPSHOT, 0,
+                                                int(time.time()) if generado is None else generado,
+                                                len(registros_grupos), len(registros_competiciones),
+                                                tabla_cadenas.longitud(), indice_formato)
+
+        contenido = b"".join([cabecera, *registros_grupos, *registros_competiciones, offsets, datos_cadenas])
+        fichero_utils.escribir_atomico(ruta_snapshot, contenido)
+
+        return len(contenido)
+
+    except Exception as e:
+        raise ExcepcionSnapshot(f"Error al publicar el snapshot del calendario en '{ruta_snapshot}'") from e
+
+
+def _empaquetar_competicion(indice_grupo: int, competicion: dict, tabla_cadenas: '_TablaCadenas', formato_fecha: str) -> bytes:
+
+    """
+    Empaqueta una vuelta por etapas o una clásica en un registro de ancho fijo.
+
+    Parámetros:
+        indice_grupo (int): Posición del grupo al que pertenece la competición.
+        competicion (dict): Diccionario de la vuelta o de la clásica.
+        tabla_cadenas (_TablaCadenas): Tabla de cadenas donde se internan los textos.
+        formato_fecha (str): Formato de las fechas de la competición.
+
+    Salida:
+        bytes: Registro empaquetado.
+    """
+
+    if 'fecha_clasica' in competicion:
+        fecha_clasica = fecha_a_epoch(competicion['fecha_clasica'], formato_fecha)
+
+        return CTE_ESTRUCTURA_COMPETICION.pack(
+            indice_grupo,
+            CTE_REGISTRO_CLASICA,
+            tabla_cadenas.indice(competicion['nombre_clasica']),
+            tabla_cadenas.indice(""),
+            tabla_cadenas.indice(competicion['categoria']),
+            tabla_cadenas.indice(str(competicion['numero_clasica'])),
+            fecha_clasica,
+            fecha_clasica,
+            0
+        )
+
+    return CTE_ESTRUCTURA_COMPETICION.pack(
+        indice_grupo,
+        CTE_REGISTRO_VUELTA,
+        tabla_cadenas.indice(competicion['descripcion']),
+        tabla_cadenas.indice(competicion['url']),
+        tabla_cadenas.indice(competicion['tipo_vuelta']),
+        tabla_cadenas.indice(""),
+        fecha_a_epoch(competicion['fecha_inicio'], formato_fecha),
+        fecha_a_epoch(competicion['fecha_fin'], formato_fecha),
+        int(competicion['numero_etapas'])
+    )
+
+
+def fecha_a_epoch(fecha: Optional[str], formato_fecha: str) -> int:
+
+    """
+    Convierte una fecha en texto a segundos desde epoch (la fecha se trata como UTC, sin zona).
+
+    Parámetros:
+        fecha (str): Fecha en texto o None.
+        formato_fecha (str): Formato de la fecha.
+
+    Salida:
+        int: Segundos desde epoch o CTE_FECHA_NULA si no hay fecha.
+    """
+
+    if not fecha:
+        return CTE_FECHA_NULA
+
+    return calendar.timegm(datetime.strptime(fecha, formato_fecha).timetuple())
+
+
+def epoch_a_fecha(segundos: int, formato_fecha: str) -> Optional[str]:
+
+    """
+    Convierte segundos desde epoch al texto de fecha con el formato indicado.
+
+    Parámetros:
+        segundos (int): Segundos desde epoch o CTE_FECHA_NULA.
+        formato_fecha (str): Formato de salida.
+
+    Salida:
+        str: Fecha formateada o None si la fecha es nula.
+    """
+
+    if segundos == CTE_FECHA_NULA:
+        return None
+
+    return (CTE_EPOCH + timedelta(seconds=segundos)).strftime(formato_fecha)
+
+
+class _TablaCadenas:
+
+    """
+    Tabla de cadenas internadas para el snapshot. El índice 0 siempre es la cadena vacía.
+    """
+
+    def __init__(self) -> None:
+
+        """
+        Inicializa la tabla con la cadena vacía en el índice 0.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        self._indices: Dict[str, int] = {}
+        self._cadenas: List[bytes] = []
+        self.indice("")
+
+
+    def indice(self, cadena: Optional[str]) -> int:
+
+        """
+        Devuelve el índice de una cadena en la tabla, internándola si es nueva. None se guarda como la cadena vacía
+        y cualquier otro valor como su str().
+
+        Parámetros:
+            cadena (str): Cadena a internar.
+
+        Salida:
+            int: Índice de la cadena (el que se guarda como uint32 en los registros de grupos y competiciones).
+        """
+
+        cadena = "" if cadena is None else str(cadena)
+        indice = self._indices.get(cadena)
+
+        if indice is None:
+            indice = len(self._cadenas)
+            self._indices[cadena] = indice
+            self._cadenas.append(cadena.encode("utf-8"))
+
+        return indice
+
+
+    def longitud(self) -> int:
+
+        """
+        Devuelve el número de cadenas de la tabla, incluida la vacía.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Número de cadenas (el 'nº cadenas' de la cabecera).
+        """
+
+        return len(self._cadenas)
+
+
+    def serializar(self) -> Tuple[bytes, bytes]:
+
+        """
+        Serializa la tabla en sus dos bloques del fichero: los offsets y los datos.
+
+        Los offsets son longitud() + 1 enteros uint32 little-endian (CTE_ESTRUCTURA_OFFSET_CADENA), relativos al
+        inicio del bloque de datos: la cadena i ocupa los bytes [offset[i], offset[i + 1]) y el último offset es la
+        longitud total. Los datos son las cadenas en UTF-8 concatenadas, sin separadores ni terminadores.
+
+        Parámetros:
+            None
+
+        Salida:
+            tuple[bytes, bytes]: Bloque de offsets y bloque de datos.
+        """
+
+        offsets = bytearray()
+        posicion = 0
+
+        for cadena in self._cadenas:
+            offsets += CTE_ESTRUCTURA_OFFSET_CADENA.pack(posicion)
+            posicion += len(cadena)
+
+        offsets += CTE_ESTRUCTURA_OFFSET_CADENA.pack(posicion)
+
+        return bytes(offsets), b"".join(self._cadenas)
+
+
+class _MapaSnapshot:
+
+    """
+    Proyección en memoria de un fichero de snapshot ya validado. Los accesos leen directamente
+    del mmap sin copiar el fichero ni deserializarlo entero.
+    """
+
+    def __init__(self, ruta: str) -> None:
+
+        """
+        Proyecta el fichero y valida su cabecera.
+
+        El fichero se compone, en este orden y sin relleno, de:
+            - Cabecera (CTE_ESTRUCTURA_CABECERA, 32 bytes) en el offset 0.
+            - numero_grupos registros de CTE_ESTRUCTURA_GRUPO (24 bytes) desde offset_grupos.
+            - numero_competiciones registros de CTE_ESTRUCTURA_COMPETICION (44 bytes) desde offset_competiciones.
+            - nº cadenas + 1 offsets uint32 (CTE_ESTRUCTURA_OFFSET_CADENA) desde offset_tabla_cadenas.
+            - Bytes UTF-8 de las cadenas desde offset_datos_cadenas.
+        Todos los enteros son little-endian.
+
+        Parámetros:
+            ruta (str): Ruta del fichero de snapshot.
+
+        Salida:
+            None
+
+        Lanza:
+            ExcepcionSnapshot: Si el fichero no empieza por CTE_MAGIC_SNAPSHOT o su versión no es CTE_VERSION_SNAPSHOT.
+            OSError: Si no se puede abrir o proyectar el fichero.
+            struct.error: Si el fichero es más corto que la cabecera.
+        """
+
+        with open(ruta, "rb") as fichero:
+            estado = os.fstat(fichero.fileno())
+            self.identidad = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+            self.mapa = mmap.mmap(fichero.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, generado, n_grupos, n_competiciones, n_cadenas, indice_formato = \
+            CTE_ESTRUCTURA_CABECERA.unpack_from(self.mapa, 0)
+
+        if magic != CTE_MAGIC_SNAPSHOT:
+            raise ExcepcionSnapshot(f"El fichero '{ruta}' no es un snapshot del calendario")
+
+        if version != CTE_VERSION_SNAPSHOT:
+            raise ExcepcionSnapshot(f"Versión de snapshot no soportada en '{ruta}': {version}")
+
+        self.version = version
+        self.generado = generado
+        self.numero_grupos = n_grupos
+        self.numero_competiciones = n_competiciones
+        self.offset_grupos = CTE_ESTRUCTURA_CABECERA.size
+        self.offset_competiciones = self.offset_grupos + n_grupos * CTE_ESTRUCTURA_GRUPO.size
+        self.offset_tabla_cadenas = self.offset_competiciones + n_competiciones * CTE_ESTRUCTURA_COMPETICION.size
+        self.offset_datos_cadenas = self.offset_tabla_cadenas + (n_cadenas + 1) * CTE_ESTRUCTURA_OFFSET_CADENA.size
+        self.formato_fecha = self.cadena(indice_formato)
+
+
+    def cadena(self, indice: int) -> str:
+
+        """
+        Lee una cadena de la tabla: sus offsets inicial y final son los uint32 de las posiciones
+        offset_tabla_cadenas + 4 * indice y la siguiente, relativos a offset_datos_cadenas.
+
+        Parámetros:
+            indice (int): Índice de la cadena (0 es la cadena vacía).
+
+        Salida:
+            str: Cadena decodificada de UTF-8.
+        """
+
+        posicion = self.offset_tabla_cadenas + indice * CTE_ESTRUCTURA_OFFSET_CADENA.size
+        inicio = CTE_ESTRUCTURA_OFFSET_CADENA.unpack_from(self.mapa, posicion)[0]
+        fin = CTE_ESTRUCTURA_OFFSET_CADENA.unpack_from(self.mapa, posicion + CTE_ESTRUCTURA_OFFSET_CADENA.size)[0]
+
+        with memoryview(self.mapa) as vista:
+            return str(vista[self.offset_datos_cadenas + inicio:self.offset_datos_cadenas + fin], "utf-8")
+
+
+    def grupo(self, indice: int) -> tuple:
+
+        """
+        Lee el registro de un grupo en offset_grupos + 24 * indice.
+
+        Parámetros:
+            indice (int): Posición del grupo, de 0 a numero_grupos - 1.
+
+        Salida:
+            tuple: (nombre, género, url, tipo de grupo, primera competición, número de competiciones), todos
+                   uint32; los cuatro primeros son índices de la tabla de cadenas y la primera competición es
+                   la posición de su primer registro de competición.
+        """
+
+        return CTE_ESTRUCTURA_GRUPO.unpack_from(self.mapa, self.offset_grupos + indice * CTE_ESTRUCTURA_GRUPO.size)
+
+
+    def competicion(self, indice: int) -> tuple:
+
+        """
+        Lee el registro de una competición en offset_competiciones + 44 * indice.
+
+        Parámetros:
+            indice (int): Posición de la competición, de 0 a numero_competiciones - 1.
+
+        Salida:
+            tuple: (grupo, tipo de registro, descripción, url, tipo, número de clásica, fecha de inicio,
+                   fecha de fin, número de etapas). Los seis primeros son uint32: la posición del grupo,
+                   CTE_REGISTRO_VUELTA o CTE_REGISTRO_CLASICA, tres índices de la tabla de cadenas y el número
+                   de clásica. Las fechas son int64 en segundos desde CTE_EPOCH (CTE_FECHA_NULA si no hay)
+                   y el número de etapas es un int32.
+        """
+
+        return CTE_ESTRUCTURA_COMPETICION.unpack_from(self.mapa,
+                                                      self.offset_competiciones + indice * CTE_ESTRUCTURA_COMPETICION.size)
+
+
+class LectorSnapshot:
+
+    """
+    Lector de snapshots del calendario mediante mmap, compartible entre procesos worker.
+
+    Cada acceso comprueba (como mucho una vez por intervalo) si el fichero ha sido sustituido
+    por una publicación nueva y, en ese caso, cambia a la nueva proyección.
+
+    Atributos:
+        ruta_snapshot (str): Ruta del fichero de snapshot.
+        intervalo_comprobacion (float): Segundos mínimos entre comprobaciones de sustitución.
+    """
+
+    def __init__(self, ruta_snapshot: str, intervalo_comprobacion: float = 1.0) -> None:
+
+        """
+        Inicializa el lector sin abrir todavía el fichero.
+
+        Parámetros:
+            ruta_snapshot (str): Ruta del fichero de snapshot.
+            intervalo_comprobacion (float, optional): Segundos entre comprobaciones. Default es 1.0.
+
+        Salida:
+            None
+        """
+
+        self.ruta_snapshot = ruta_snapshot
+        self.intervalo_comprobacion = intervalo_comprobacion
+        self._mapa: Optional[_MapaSnapshot] = None
+        self._ultima_comprobacion = 0.0
+        self._bloqueo = threading.Lock()
+
+
+    def _obtener_mapa(self) -> _MapaSnapshot:
+
+        """
+        Devuelve la proyección vigente, cambiando a una nueva si el fichero ha sido reemplazado.
+
+        Parámetros:
+            None
+
+        Salida:
+            _MapaSnapshot: Proyección vigente del snapshot.
+
+        Lanza:
+            ExcepcionSnapshot: Si no existe snapshot publicado o el fichero no es válido.
+        """
+
+        ahora = time.monotonic()
+        mapa = self._mapa
+
+        if mapa is not None and ahora - self._ultima_comprobacion < self.intervalo_comprobacion:
+            return mapa
+
+        with self._bloqueo:
+            try:
+                estado = os.stat(self.ruta_snapshot)
+                identidad = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+                if self._mapa is None or self._mapa.identidad != identidad:
+                    self._mapa = _MapaSnapshot(self.ruta_snapshot)
+
+                self._ultima_comprobacion = ahora
+
+                return self._mapa
+
+            except FileNotFoundError as fnfe:
+                if self._mapa is not None:
+                    return self._mapa
+                raise ExcepcionSnapshot(f"No existe ningún snapshot publicado en '{self.ruta_snapshot}'") from fnfe
+
+            except ExcepcionSnapshot:
+                raise
+
+            except Exception as e:
+                raise ExcepcionSnapshot(f"Error al proyectar el snapshot '{self.ruta_snapshot}'") from e
+
+
+    def obtener_fecha_generacion(self) -> int:
+
+        """
+        Devuelve el instante de generación del snapshot vigente.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Segundos desde epoch en que se publicó el snapshot.
+        """
+
+        return self._obtener_mapa().generado
+
+
+    def obtener_identidad(self) -> tuple:
+
+        """
+        Devuelve una identidad del fichero vigente que cambia con cada publicación.
+
+        Parámetros:
+            None
+
+        Salida:
+            tuple: (inodo, mtime en nanosegundos, tamaño) del snapshot proyectado.
+        """
+
+        return self._obtener_mapa().identidad
+
+
+    def obtener_formato_fecha(self) -> str:
+
+        """
+        Devuelve el formato de fecha con el que se generó el snapshot vigente.
+
+        Parámetros:
+            None
+
+        Salida:
+            str: Formato de fecha (ej. "%d-%m-%Y %H:%M:%S").
+        """
+
+        return self._obtener_mapa().formato_fecha
+
+
+    def obtener_numero_competiciones(self) -> int:
+
+        """
+        Devuelve el número de competiciones (vueltas y clásicas) del snapshot vigente.
+
+        Parámetros:
+            None
+
+        Salida:
+            int: Número de registros de competiciones.
+        """
+
+        return self._obtener_mapa().numero_competiciones
+
+
+    def crear_indice_calendario(self) -> IndiceCalendario:
+
+        """
+        Construye el índice de fechas del snapshot vigente sin reconstruir el calendario.
+
+        Las fechas se leen como enteros de los registros de competiciones, y cada competición se lee
+        del mmap solo cuando una consulta la devuelve. El índice queda ligado a la proyección con la
+        que se construyó, aunque después se publique un snapshot nuevo.
+
+        Parámetros:
+            None
+
+        Salida:
+            IndiceCalendario: Índice de fechas del snapshot.
+        """
+
+        mapa = self._obtener_mapa()
+        intervalos = []
+
+        for indice in range(mapa.numero_competiciones):
+            registro = mapa.competicion(indice)
+            inicio, fin = registro[6], registro[7]
+
+            if inicio == CTE_FECHA_NULA:
+                continue
+
+            intervalos.append((inicio, inicio if fin == CTE_FECHA_NULA else max(inicio, fin), indice))
+
+        return IndiceCalendario.desde_intervalos(intervalos, lambda indice: self._construir_elemento_indice(mapa, indice))
+
+
+    def obtener_grupos_desglosados(self) -> List[dict]:
+
+        """
+        Reconstruye el calendario completo con la misma forma que DesglosarGruposCompeticiones.ejecutar().
+
+        Parámetros:
+            None
+
+        Salida:
+            list[dict]: Lista de grupos con su desglose de competiciones.
+        """
+
+        mapa = self._obtener_mapa()
+        grupos = []
+
+        for indice_grupo in range(mapa.numero_grupos):
+            nombre, genero, url, tipo_grupo, primera, numero = mapa.grupo(indice_grupo)
+
+            grupos.append({
+                'nombre': mapa.cadena(nombre),
+                'genero': mapa.cadena(genero),
+                'url': mapa.cadena(url),
+                'tipo_grupo': mapa.cadena(tipo_grupo),
+                'desglose_grupo_competiciones': [self._construir_competicion(mapa, indice)
+                                                 for indice in range(primera, primera + numero)]
+            })
+
+        return grupos
+
+
+    def _construir_elemento_indice(self, mapa: _MapaSnapshot, indice: int) -> dict:
+
+        """
+        Convierte un registro de competición en el elemento que devuelven las consultas de IndiceCalendario.
+
+        Parámetros:
+            mapa (_MapaSnapshot): Proyección de la que se lee el registro.
+            indice (int): Posición del registro.
+
+        Salida:
+            dict: {'grupo', 'genero', 'tipo_grupo', 'competicion'}.
+        """
+
+        nombre, genero, _, tipo_grupo, _, _ = mapa.grupo(mapa.competicion(indice)[0])
+
+        return {
+            'grupo': mapa.cadena(nombre),
+            'genero': mapa.cadena(genero),
+            'tipo_grupo': mapa.cadena(tipo_grupo),
+            'competicion': self._construir_competicion(mapa, indice)
+        }
+
+
+    def _construir_competicion(self, mapa: _MapaSnapshot, indice: int) -> dict:
+
+        """
+        Convierte un registro de competición en el diccionario equivalente del desglose.
+
+        Parámetros:
+            mapa (_MapaSnapshot): Proyección de la que se lee el registro.
+            indice (int): Posición del registro.
+
+        Salida:
+            dict: Diccionario de la vuelta o de la clásica.
+        """
+
+        _, tipo_registro, descripcion, url, tipo, numero, inicio, fin, numero_etapas = mapa.competicion(indice)
+
+        if tipo_registro == CTE_REGISTRO_CLASICA:
+            return {
+                'numero_clasica': mapa.cadena(numero),
+                'fecha_clasica': epoch_a_fecha(inicio, mapa.formato_fecha),
+                'nombre_clasica': mapa.cadena(descripcion),
+                'categoria': mapa.cadena(tipo)
+            }
+
+        return {
+            'url': mapa.cadena(url),
+            'descripcion': mapa.cadena(descripcion),
+            'numero_etapas': numero_etapas,
+            'tipo_vuelta': mapa.cadena(tipo),
+            'fecha_inicio': epoch_a_fecha(inicio, mapa.formato_fecha),
+            'fecha_fin': epoch_a_fecha(fin, mapa.formato_fecha)
+        }
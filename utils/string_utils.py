@@ -1,5 +1,9 @@
 # utils/string_utils.py
 
+import re
+from typing import Optional
+
+
 def comparar_cadenas_ignorando_case(cadena1: str, cadena2: str) -> bool:
 
     """
@@ -125,7 +129,59 @@ def eliminar_subcadena_ignorando_case(cadena_principal: str, subcadena: str) ->
     return cadena_principal
 
 
-import re
+def a_booleano(valor: str) -> bool:
+
+    """
+    Convierte un valor de configuración en texto a booleano.
+
+    Parámetros:
+        valor (str): Texto a convertir (ej. 'true', 'si', '1').
+
+    Salida:
+        bool: True si el texto representa un valor afirmativo, False en caso contrario.
+    """
+
+    return str(valor).strip().lower() in ('true', 'si', 'sí', '1', 'yes')
+
+
+def dividir_lista(valor: str, separador: str = ',') -> tuple:
+
+    """
+    Divide un valor de configuración en una tupla de elementos sin espacios sobrantes.
+
+    Parámetros:
+        valor (str): Texto con los elementos separados (ej. 'NULL,End-Of-Tour').
+        separador (str, optional): Separador de los elementos. Default es ','.
+
+    Salida:
+        tuple: Elementos del valor, sin elementos vacíos.
+    """
+
+    return tuple(elemento.strip() for elemento in (valor or "").split(separador) if elemento.strip())
+
+
+def a_numero(texto: str, valor_por_defecto: float = 0.0) -> float:
+
+    """
+    Convierte a número un texto de una celda HTML, ignorando símbolos y separadores de miles
+    (ej. '£22.5m', '1,250 pts').
+
+    Parámetros:
+        texto (str): Texto a convertir.
+        valor_por_defecto (float, optional): Valor si el texto no contiene un número. Default es 0.0.
+
+    Salida:
+        float: Número contenido en el texto o el valor por defecto.
+    """
+
+    limpio = "".join(caracter for caracter in (texto or "") if caracter.isdigit() or caracter in ".-")
+
+    try:
+        return float(limpio)
+
+    except ValueError:
+        return valor_por_defecto
+
 
 def sustituir_cadena_con_marcador(cadena_principal: str, texto_sustituir: str, texto_reemplazo: str, marcador: str = "yyyy") -> str:
 
@@ -152,4 +208,27 @@ def sustituir_cadena_con_marcador(cadena_principal: str, texto_sustituir: str, t
         
         return re.sub(patron, texto_reemplazado, cadena_principal, flags=re.IGNORECASE).strip()
     
-    return cadena_principal
\ No newline at end of file
+    return cadena_principal
+
+
+CTE_PATRON_ANYO_URL = re.compile(r"/(\d{4})(?=/|$)")
+
+def sustituir_anyo_url(url: str, anyo: int) -> Optional[str]:
+
+    """
+    Sustituye el primer segmento de año (/aaaa/) de una URL por otro año.
+
+    Ejemplo:
+        'https://www.velogames.com/italy/2024/' con 2019 se convierte en 'https://www.velogames.com/italy/2019/'
+
+    Parámetros:
+        url (str): URL de una competición de una temporada.
+        anyo (int): Año de la temporada deseada.
+
+    Salida:
+        str: URL de la misma competición en la temporada indicada, o None si la URL no tiene segmento de año.
+    """
+
+    url_temporada, sustituciones = CTE_PATRON_ANYO_URL.subn(f"/{anyo:04d}", url, count=1)
+
+    return url_temporada if sustituciones else None
@@ -0,0 +1,173 @@
+# utils/tabla_ciclistas.py
+
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+
+class TablaCiclistas:
+
+    """
+    Ciclistas de todas las competiciones en formato columnar.
+
+    Cada columna es un array contiguo (o una lista en el caso de los nombres), de modo que
+    filtrar, sumar u ordenar por precio o puntos no recorre diccionarios fila a fila y las
+    columnas numéricas se pueden pasar sin copia a NumPy con numpy.frombuffer.
+    Los equipos se codifican con un diccionario (índice en 'equipos') porque se repiten mucho.
+    Las filas de una competición quedan contiguas; su rango se obtiene con rango_competicion().
+
+    Atributos:
+        competiciones (list[str]): URLs de las competiciones, en orden de inserción.
+        equipos (list[str]): Nombres de equipo distintos.
+        nombres (list[str]): Columna de nombres de ciclista.
+        codigos_equipo (array): Columna de índices en 'equipos' ('I').
+        precios (array): Columna de precios ('d').
+        puntos (array): Columna de puntos ('d').
+    """
+
+    def __init__(self) -> None:
+
+        """
+        Inicializa una tabla vacía.
+
+        Parámetros:
+            None
+
+        Salida:
+            None
+        """
+
+        self.competiciones: List[str] = []
+        self.equipos: List[str] = []
+        self.nombres: List[str] = []
+        self.codigos_equipo = array('I')
+        self.precios = array('d')
+        self.puntos = array('d')
+        self._rangos: Dict[str, Tuple[int, int]] = {}
+        self._indices_equipo: Dict[str, int] = {}
+
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+
+    def agregar_competicion(self, url: str, filas: Iterable[Tuple[str, str, float, float]]) -> None:
+
+        """
+        Añade los ciclistas de una competición (sustituye los que tuviera si ya estaba).
+
+        Parámetros:
+            url (str): URL de la competición.
+            filas (Iterable[tuple]): Tuplas (nombre, equipo, precio, puntos).
+
+        Salida:
+            None
+        """
+
+        if url in self._rangos:
+            self._eliminar_competicion(url)
+
+        inicio = len(self.nombres)
+
+        for nombre, equipo, precio, puntos in filas:
+            self.nombres.append(nombre)
+            self.codigos_equipo.append(self._codificar_equipo(equipo))
+            self.precios.append(precio)
+            self.puntos.append(puntos)
+
+        self.competiciones.append(url)
+        self._rangos[url] = (inicio, len(self.nombres))
+
+
+    def rango_competicion(self, url: str) -> Tuple[int, int]:
+
+        """
+        Devuelve el rango de filas [inicio, fin) de una competición.
+
+        Parámetros:
+            url (str): URL de la competición.
+
+        Salida:
+            tuple: (inicio, fin). (0, 0) si la competición no está en la tabla.
+        """
+
+        return self._rangos.get(url, (0, 0))
+
+
+    def obtener_equipo(self, fila: int) -> str:
+
+        """
+        Devuelve el nombre de equipo de una fila.
+
+        Parámetros:
+            fila (int): Índice de la fila.
+
+        Salida:
+            str: Nombre del equipo.
+        """
+
+        return self.equipos[self.codigos_equipo[fila]]
+
+
+    def obtener_ciclistas(self, url: str) -> List[dict]:
+
+        """
+        Materializa como diccionarios los ciclistas de una competición.
+
+        Parámetros:
+            url (str): URL de la competición.
+
+        Salida:
+            list[dict]: Ciclistas con 'nombre', 'equipo', 'precio' y 'puntos'.
+        """
+
+        inicio, fin = self.rango_competicion(url)
+
+        return [{'nombre': self.nombres[fila],
+                 'equipo': self.obtener_equipo(fila),
+                 'precio': self.precios[fila],
+                 'puntos': self.puntos[fila]} for fila in range(inicio, fin)]
+
+
+    def _codificar_equipo(self, equipo: str) -> int:
+
+        """
+        Devuelve el código de un equipo, añadiéndolo al diccionario de equipos si es nuevo.
+
+        Parámetros:
+            equipo (str): Nombre del equipo.
+
+        Salida:
+            int: Posición del equipo en 'equipos'.
+        """
+
+        codigo = self._indices_equipo.get(equipo)
+
+        if codigo is None:
+            codigo = len(self.equipos)
+            self._indices_equipo[equipo] = codigo
+            self.equipos.append(equipo)
+
+        return codigo
+
+
+    def _eliminar_competicion(self, url: str) -> None:
+
+        """
+        Elimina las filas de una competición y desplaza los rangos de las posteriores.
+
+        Parámetros:
+            url (str): URL de la competición.
+
+        Salida:
+            None
+        """
+
+        inicio, fin = self._rangos.pop(url)
+        numero_filas = fin - inicio
+
+        for columna in (self.nombres, self.codigos_equipo, self.precios, self.puntos):
+            del columna[inicio:fin]
+
+        self.competiciones.remove(url)
+        self._rangos = {competicion: (inicio_c - numero_filas, fin_c - numero_filas) if inicio_c >= fin else (inicio_c, fin_c)
+                        for competicion, (inicio_c, fin_c) in self._rangos.items()}